@@ -45,6 +45,12 @@ class SharedKeyAuth(AuthBase):
         self._account_name = account_name
         self._key = key
 
+        # the key is decoded once, an invalid key being reported when a request is signed
+        try:
+            self._hmac = hmac.HMAC(base64.b64decode(key.encode('utf-8')), digestmod=hashlib.sha256)
+        except (AttributeError, TypeError, ValueError):
+            self._hmac = None
+
     def __call__(self, request):
 
         if not request.headers.get('ocp-date'):
@@ -52,62 +58,58 @@ class SharedKeyAuth(AuthBase):
             now = now.replace(tzinfo=TZ_UTC)
             request.headers['ocp-date'] = Serializer.serialize_rfc(now)
 
-        url = urlparse(request.url)
-        uri_path = url.path
-        uri_path = uri_path.replace('%5C', '/')
-        uri_path = uri_path.replace('%2F', '/')
+        # get headers to sign, and ocp- headers to sign, in a single pass
+        request_header_dict = {}
+        ocp_headers = []
+        for name, value in request.headers.items():
+            if value:
+                lower_name = name.lower()
+                request_header_dict[lower_name] = value
+                if 'ocp-' in name:
+                    ocp_headers.append((lower_name, value))
+        ocp_headers.sort()
 
         # method to sign
-        string_to_sign = request.method + '\n'
+        parts = [request.method, '\n']
+        for name in self.headers_to_sign:
+            parts.append(str(request_header_dict.get(name, '')))
+            parts.append('\n')
 
-        # get headers to sign
-        request_header_dict = {
-            key.lower(): val for key, val in request.headers.items() if val}
+        for name, value in ocp_headers:
+            parts.append("{}:{}\n".format(name, value))
 
-        request_headers = [
-            str(request_header_dict.get(x, '')) for x in self.headers_to_sign]
+        # get account_name, uri path and query string to sign
+        parts.append(self._canonicalize_url(request.url))
 
-        string_to_sign += '\n'.join(request_headers) + '\n'
+        # sign the request
+        auth_string = "SharedKey {}:{}".format(
+            self._account_name, self._sign_string(''.join(parts)))
 
-        # get ocp- header to sign
-        ocp_headers = []
-        for name, value in request.headers.items():
-            if 'ocp-' in name and value:
-                ocp_headers.append((name.lower(), value))
+        request.headers[self._header] = auth_string
 
-        for name, value in sorted(ocp_headers):
-            string_to_sign += "{}:{}\n".format(name, value)
+        return request
 
-        # get account_name and uri path to sign
-        string_to_sign += "/{}{}".format(self._account_name, uri_path)
+    def _canonicalize_url(self, request_url):
+        url = urlparse(request_url)
+        uri_path = url.path
+        uri_path = uri_path.replace('%5C', '/')
+        uri_path = uri_path.replace('%2F', '/')
 
-        # get query string to sign if it is not table service
+        parts = ["/{}{}".format(self._account_name, uri_path)]
         query_to_sign = parse_qs(url.query)
-
         for name in sorted(query_to_sign.keys()):
             value = query_to_sign[name][0]
             if value:
-                string_to_sign += "\n{}:{}".format(name, value)
-
-        # sign the request
-        auth_string = "SharedKey {}:{}".format(
-            self._account_name, self._sign_string(string_to_sign))
-
-        request.headers[self._header] = auth_string
-
-        return request
+                parts.append("\n{}:{}".format(name, value))
+        return ''.join(parts)
 
     def _sign_string(self, string_to_sign):
 
-        _key = self._key.encode('utf-8')
-        string_to_sign = string_to_sign.encode('utf-8')
-
-        try:
-            key = base64.b64decode(_key)
-        except TypeError:
+        if self._hmac is None:
             raise ValueError("Invalid key value: {}".format(self._key))
 
-        signed_hmac_sha256 = hmac.HMAC(key, string_to_sign, hashlib.sha256)
+        signed_hmac_sha256 = self._hmac.copy()
+        signed_hmac_sha256.update(string_to_sign.encode('utf-8'))
         digest = signed_hmac_sha256.digest()
 
         return base64.b64encode(digest).decode('utf-8')
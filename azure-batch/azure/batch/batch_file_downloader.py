@@ -0,0 +1,223 @@
+# coding=utf-8
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import requests
+from msrest.exceptions import ClientRequestError
+
+from . import models
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# suffix of the file recording the chunks downloaded, next to the local file
+_STATE_SUFFIX = '.download'
+
+
+class _IncompleteRangeError(IOError):
+    """The response of a range request ended before the end of the range."""
+
+
+class BatchFileDownloader(object):
+    """Downloads task and compute node files with concurrent ranged requests.
+
+    The size of the file is read with get_properties_from_task or
+    get_properties_from_compute_node, the local file is allocated to that
+    size, and chunks of chunk_size bytes are requested with `ocp_range` by
+    `threads` threads and written at their offset. The chunks downloaded are
+    recorded next to the local file until the download is complete, so that
+    an interrupted download only requests the missing chunks when it is
+    started again, provided the remote file has not changed.
+
+    :param client: The client used to download the files.
+    :type client: :class:`BatchServiceClient
+     <azure.batch.BatchServiceClient>`
+    :param int threads: The number of concurrent requests.
+    :param int chunk_size: The size in bytes of the ranges requested.
+    :param int max_retries: The number of times a chunk failing with a
+     connection error or a server error is requested again.
+    :param float retry_delay: The number of seconds waited before the first
+     retry of a chunk, doubled for each of the next ones.
+    """
+
+    def __init__(self, client, threads=8, chunk_size=DEFAULT_CHUNK_SIZE, max_retries=3, retry_delay=1):
+        if threads < 1:
+            raise ValueError("threads should be greater than zero.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be greater than zero.")
+        self._client = client
+        self.threads = threads
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def download_from_task(self, job_id, task_id, file_path, local_path, resume=True):
+        """Downloads a task file.
+
+        :param job_id: The ID of the job that contains the task.
+        :type job_id: str
+        :param task_id: The ID of the task whose file you want to download.
+        :type task_id: str
+        :param file_path: The path to the task file.
+        :type file_path: str
+        :param local_path: The path of the local file written.
+        :type local_path: str
+        :param bool resume: Whether to resume a previous download to
+         local_path.
+        :return: The size of the file.
+        :rtype: long
+        :raises:
+         :class:`BatchErrorException<azure.batch.models.BatchErrorException>`
+        """
+        properties = self._client.file.get_properties_from_task(job_id, task_id, file_path, raw=True)
+
+        def get_range(ocp_range, last_modified):
+            options = models.FileGetFromTaskOptions(ocp_range=ocp_range, if_unmodified_since=last_modified)
+            return self._client.file.get_from_task(job_id, task_id, file_path, options)
+
+        return self._download(properties.headers, get_range, local_path, resume)
+
+    def download_from_compute_node(self, pool_id, node_id, file_path, local_path, resume=True):
+        """Downloads a compute node file.
+
+        :param pool_id: The ID of the pool that contains the compute node.
+        :type pool_id: str
+        :param node_id: The ID of the compute node that contains the file.
+        :type node_id: str
+        :param file_path: The path to the compute node file.
+        :type file_path: str
+        :param local_path: The path of the local file written.
+        :type local_path: str
+        :param bool resume: Whether to resume a previous download to
+         local_path.
+        :return: The size of the file.
+        :rtype: long
+        :raises:
+         :class:`BatchErrorException<azure.batch.models.BatchErrorException>`
+        """
+        properties = self._client.file.get_properties_from_compute_node(pool_id, node_id, file_path, raw=True)
+
+        def get_range(ocp_range, last_modified):
+            options = models.FileGetFromComputeNodeOptions(ocp_range=ocp_range, if_unmodified_since=last_modified)
+            return self._client.file.get_from_compute_node(pool_id, node_id, file_path, options)
+
+        return self._download(properties.headers, get_range, local_path, resume)
+
+    def _download(self, headers, get_range, local_path, resume):
+        size = headers['Content-Length']
+        last_modified = headers.get('Last-Modified')
+        state_path = local_path + _STATE_SUFFIX
+        state = {
+            'size': size,
+            'etag': headers.get('ETag'),
+            'last_modified': str(last_modified),
+            'chunk_size': self.chunk_size,
+        }
+        chunk_count = (size + self.chunk_size - 1) // self.chunk_size
+
+        done = set()
+        if resume:
+            previous = _read_state(state_path)
+            if previous is not None and os.path.isfile(local_path) and \
+                    all(previous.get(key) == value for key, value in state.items()):
+                done = set(previous['done'])
+        if not done:
+            with open(local_path, 'wb') as local_file:
+                local_file.truncate(size)
+
+        chunks = queue.Queue()
+        for index in range(chunk_count):
+            if index not in done:
+                chunks.put(index)
+
+        lock = threading.Lock()
+        errors = []
+
+        def work():
+            with open(local_path, 'r+b') as local_file:
+                while not errors:
+                    try:
+                        index = chunks.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        self._download_chunk(get_range, last_modified, index, size, local_file)
+                    except Exception as err:  # pylint: disable=broad-except
+                        errors.append(err)
+                        return
+                    with lock:
+                        done.add(index)
+                        state['done'] = sorted(done)
+                        _write_state(state_path, state)
+
+        workers = [threading.Thread(target=work) for _ in range(min(self.threads, max(1, chunks.qsize())))]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            # the chunks downloaded are kept for the next attempt
+            raise errors[0]
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        return size
+
+    def _download_chunk(self, get_range, last_modified, index, size, local_file):
+        start = index * self.chunk_size
+        end = min(start + self.chunk_size, size) - 1
+        attempt = 0
+        while True:
+            if attempt:
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            data = []
+            try:
+                for block in get_range('bytes={}-{}'.format(start, end), last_modified):
+                    data.append(block)
+                data = b''.join(data)
+                if len(data) != end - start + 1:
+                    raise _IncompleteRangeError("Received {} bytes for the range {}-{}".format(len(data), start, end))
+                break
+            except Exception as err:  # pylint: disable=broad-except
+                # errors such as the file having changed since the download started are not retried
+                if attempt >= self.max_retries or not _is_transient(err):
+                    raise
+                attempt += 1
+
+        local_file.seek(start)
+        local_file.write(data)
+        local_file.flush()
+
+
+def _is_transient(error):
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status_code is not None:
+        return status_code == 408 or status_code >= 500
+    # the requests which failed without a response, or whose response was cut short
+    return isinstance(error, (ClientRequestError, requests.RequestException, _IncompleteRangeError))
+
+
+def _read_state(state_path):
+    try:
+        with open(state_path) as state_file:
+            return json.load(state_file)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_state(state_path, state):
+    with open(state_path, 'w') as state_file:
+        json.dump(state, state_file)
@@ -0,0 +1,205 @@
+# coding=utf-8
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import json
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from msrest import Serializer
+from msrest.exceptions import ClientRequestError
+
+from . import models
+
+# limits of a single addtaskcollection request
+MAX_TASKS_PER_REQUEST = 100
+MAX_REQUEST_SIZE = 1024 * 1024
+
+# size of the {"value": [...]} envelope and of the separator between two tasks
+_ENVELOPE_SIZE = len('{"value": []}')
+_SEPARATOR_SIZE = len(', ')
+
+_TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+_DONE = object()
+
+
+class TaskSubmissionResult(object):
+    """The aggregated outcome of a bulk task submission.
+
+    :ivar added: The results of the tasks added to the job.
+    :vartype added: list of :class:`TaskAddResult
+     <azure.batch.models.TaskAddResult>`
+    :ivar failed: The results of the tasks the service did not add, after
+     the retries of the server errors. The tasks missing from the results
+     of the service are reported with a server error status.
+    :vartype failed: list of :class:`TaskAddResult
+     <azure.batch.models.TaskAddResult>`
+    :ivar errors: The requests which failed as a whole, as (tasks, exception)
+     pairs. Whether these tasks were added is unknown.
+    :vartype errors: list of tuple
+    """
+
+    def __init__(self):
+        self.added = []
+        self.failed = []
+        self.errors = []
+
+    @property
+    def succeeded(self):
+        return not self.failed and not self.errors
+
+
+class BatchTaskSubmitter(object):
+    """Adds any number of tasks to a job, with concurrent addtaskcollection
+    requests.
+
+    The tasks are grouped in chunks of at most max_tasks_per_request tasks
+    and max_request_size bytes of request body, which are submitted by
+    `threads` threads. The tasks the service fails to add with a server
+    error, such as when it is busy, or does not return a result for, are
+    submitted again, up to max_retries times, as are the requests failing to
+    connect or with a transient status code. The tasks of a retried request
+    which already exist are counted as added by the previous attempt. Chunks
+    rejected as too large are split in two.
+
+    :param client: The client used to add the tasks.
+    :type client: :class:`BatchServiceClient
+     <azure.batch.BatchServiceClient>`
+    :param int threads: The number of concurrent requests.
+    :param int max_tasks_per_request: The maximum number of tasks per request.
+    :param int max_request_size: The maximum size in bytes of a request body.
+    :param int max_retries: The number of times the tasks and requests
+     failing with a server error are retried.
+    :param float retry_delay: The number of seconds waited before the first
+     retry, doubled for each of the next ones.
+    """
+
+    def __init__(self, client, threads=4, max_tasks_per_request=MAX_TASKS_PER_REQUEST,
+                 max_request_size=MAX_REQUEST_SIZE, max_retries=3, retry_delay=1):
+        if threads < 1:
+            raise ValueError("threads should be greater than zero.")
+        if not 0 < max_tasks_per_request <= MAX_TASKS_PER_REQUEST:
+            raise ValueError("max_tasks_per_request should be between 1 and {}.".format(MAX_TASKS_PER_REQUEST))
+        self._client = client
+        self.threads = threads
+        self.max_tasks_per_request = max_tasks_per_request
+        self.max_request_size = max_request_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+        self._serialize = Serializer(client_models)
+
+    def submit(self, job_id, tasks, task_add_collection_options=None, **operation_config):
+        """Adds tasks to a job.
+
+        :param job_id: The ID of the job to which the tasks are to be added.
+        :type job_id: str
+        :param tasks: The tasks to add, read lazily.
+        :type tasks: iterable of :class:`TaskAddParameter
+         <azure.batch.models.TaskAddParameter>`
+        :param task_add_collection_options: Additional parameters for the
+         requests
+        :type task_add_collection_options: :class:`TaskAddCollectionOptions
+         <azure.batch.models.TaskAddCollectionOptions>`
+        :param operation_config: :ref:`Operation configuration
+         overrides<msrest:optionsforoperations>`.
+        :rtype: :class:`TaskSubmissionResult
+         <azure.batch.batch_task_submitter.TaskSubmissionResult>`
+        """
+        result = TaskSubmissionResult()
+        lock = threading.Lock()
+        chunks = queue.Queue(self.threads * 2)
+
+        def work():
+            while True:
+                chunk = chunks.get()
+                if chunk is _DONE:
+                    break
+                self._add_chunk(job_id, chunk, task_add_collection_options, operation_config, result, lock)
+
+        workers = [threading.Thread(target=work) for _ in range(self.threads)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        try:
+            for chunk in self._get_chunks(tasks):
+                chunks.put(chunk)
+        finally:
+            for _ in workers:
+                chunks.put(_DONE)
+            for worker in workers:
+                worker.join()
+        return result
+
+    def _get_chunks(self, tasks):
+        chunk = []
+        chunk_size = _ENVELOPE_SIZE
+        for task in tasks:
+            task_size = len(json.dumps(self._serialize.body(task, 'TaskAddParameter')))
+            if chunk and (len(chunk) >= self.max_tasks_per_request or
+                          chunk_size + _SEPARATOR_SIZE + task_size > self.max_request_size):
+                yield chunk
+                chunk = []
+                chunk_size = _ENVELOPE_SIZE
+            chunk.append(task)
+            chunk_size += task_size + (_SEPARATOR_SIZE if len(chunk) > 1 else 0)
+        if chunk:
+            yield chunk
+
+    def _add_chunk(self, job_id, chunk, options, operation_config, result, lock):
+        pending = chunk
+        attempt = 0
+        while pending:
+            if attempt:
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                response = self._client.task.add_collection(job_id, pending, options, **operation_config)
+            except Exception as err:  # pylint: disable=broad-except
+                code = getattr(getattr(err, 'error', None), 'code', None)
+                if code == 'RequestBodyTooLarge' and len(pending) > 1:
+                    middle = len(pending) // 2
+                    self._add_chunk(job_id, pending[:middle], options, operation_config, result, lock)
+                    self._add_chunk(job_id, pending[middle:], options, operation_config, result, lock)
+                    return
+                # the requests which failed without a response, such as on a timeout, are retried as well
+                status_code = getattr(getattr(err, 'response', None), 'status_code', None)
+                transient = isinstance(err, ClientRequestError) or status_code in _TRANSIENT_STATUS_CODES
+                if transient and attempt < self.max_retries:
+                    attempt += 1
+                    continue
+                with lock:
+                    result.errors.append((pending, err))
+                return
+
+            tasks_by_id = {task.id: task for task in pending}
+            retries = []
+            with lock:
+                for task_result in response.value or []:
+                    status = getattr(task_result.status, 'value', task_result.status)
+                    code = getattr(task_result.error, 'code', None)
+                    task = tasks_by_id.pop(task_result.task_id, None)
+                    if status == models.TaskAddStatus.success.value or (attempt and code == 'TaskExists'):
+                        # a retried task may have been added by the request whose result was lost
+                        result.added.append(task_result)
+                    elif status == models.TaskAddStatus.server_error.value and \
+                            attempt < self.max_retries and task is not None:
+                        retries.append(task)
+                    else:
+                        result.failed.append(task_result)
+                # whether the tasks without a result were added is unknown, as for a failed request
+                for task in tasks_by_id.values():
+                    if attempt < self.max_retries:
+                        retries.append(task)
+                    else:
+                        result.failed.append(models.TaskAddResult(models.TaskAddStatus.server_error, task.id))
+            pending = retries
+            attempt += 1
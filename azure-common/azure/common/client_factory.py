@@ -6,12 +6,25 @@
 
 import io
 import os
+import threading
+from collections import OrderedDict
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 import adal
+import requests
 from msrestazure.azure_active_directory import AdalAuthentication
 
 from .credentials import get_azure_cli_credentials, get_cli_profile
 from .cloud import get_cli_active_cloud
 
+DEFAULT_MAX_CONNECTIONS = 10
+
+_DONE = object()
+
 def get_client_from_cli_profile(clientclass, **kwargs):
     """Return a SDK client initialized with current CLI credentials, CLI default subscription and CLI default cloud.
 
@@ -37,6 +50,9 @@ def get_client_from_cli_profile(clientclass, **kwargs):
     :raises: ImportError if azure-cli-core package is not available
     """
 
+    return clientclass(**_get_cli_parameters(kwargs))
+
+def _get_cli_parameters(kwargs):
     parameters = {}
     if 'credentials' not in kwargs or 'subscription_id' not in kwargs:
         credentials, subscription_id = get_azure_cli_credentials()
@@ -49,7 +65,7 @@ def get_client_from_cli_profile(clientclass, **kwargs):
         # api_version_profile = cloud.profile # TBC using _shared
         parameters['base_url'] = cloud.endpoints.resource_manager
     parameters.update(kwargs)
-    return clientclass(**parameters)
+    return parameters
 
 def get_client_from_auth_file(clientclass, auth_path=None, **kwargs):
     """Return a SDK client initialized with auth information in azureauth.properties.
@@ -94,6 +110,9 @@ def get_client_from_auth_file(clientclass, auth_path=None, **kwargs):
     :raises: KeyError if AZURE_AUTH_LOCATION is not an environment variable and no path is provided
     :raises: FileNotFoundError if provided file path does not exists
     """
+    return clientclass(**_get_auth_file_parameters(auth_path, kwargs))
+
+def _get_auth_file_parameters(auth_path, kwargs):
     auth_path = auth_path or os.environ['AZURE_AUTH_LOCATION']
 
     with io.open(auth_path, 'r', encoding='utf-8') as auth_fd:
@@ -108,13 +127,259 @@ def get_client_from_auth_file(clientclass, auth_path=None, **kwargs):
     if 'credentials' not in kwargs:
         authority_url = (config_dict['authURL'] + '/' + 
                          config_dict['tenant'])
-        context = adal.AuthenticationContext(authority_url, api_version=None)
-        parameters['credentials'] = AdalAuthentication(
-            context.acquire_token_with_client_credentials,
+        parameters['credentials'] = _get_adal_credentials(
+            authority_url,
             config_dict['managementURI'],
             config_dict['client'],
             config_dict['key']
         )
 
     parameters.update(kwargs)
-    return clientclass(**parameters)
+    return parameters
+
+# the credentials created from auth files, so that the clients created from the same service principal
+# share the token cache of their ADAL context
+_adal_credentials = {}
+_adal_credentials_lock = threading.Lock()
+
+def _get_adal_credentials(authority_url, resource, client_id, secret):
+    key = (authority_url, resource, client_id, secret)
+    with _adal_credentials_lock:
+        credentials = _adal_credentials.get(key)
+        if credentials is None:
+            context = adal.AuthenticationContext(authority_url, api_version=None)
+            credentials = AdalAuthentication(
+                context.acquire_token_with_client_credentials,
+                resource,
+                client_id,
+                secret
+            )
+            _adal_credentials[key] = credentials
+        return credentials
+
+def get_subscription_clients_from_cli_profile(clientclass, subscription_ids, **kwargs):
+    """Return SDK clients for several subscriptions, initialized with current CLI credentials and CLI default cloud.
+
+    The clients share the CLI credentials and a pool of HTTP connections, see SubscriptionClients.
+
+    Parameters provided in kwargs will override CLI parameters and be passed directly to the clients,
+    except max_connections which is passed to SubscriptionClients.
+
+    :Example:
+
+    .. code:: python
+
+        from azure.common.client_factory import get_subscription_clients_from_cli_profile
+        from azure.mgmt.compute import ComputeManagementClient
+        clients = get_subscription_clients_from_cli_profile(ComputeManagementClient, subscription_ids)
+        for result in clients.fan_out(lambda client: list(client.virtual_machines.list_all())):
+            print(result.subscription_id, result.result if result.succeeded else result.error)
+
+    .. versionadded:: 1.1.7
+
+    :param clientclass: A SDK client class
+    :param subscription_ids: The IDs of the subscriptions
+    :type subscription_ids: list of str
+    :return: The clients of the subscriptions
+    :rtype: SubscriptionClients
+    :raises: ImportError if azure-cli-core package is not available
+    """
+    max_connections = kwargs.pop('max_connections', DEFAULT_MAX_CONNECTIONS)
+    kwargs.setdefault('subscription_id', None)
+    parameters = _get_cli_parameters(kwargs)
+    del parameters['subscription_id']
+    return SubscriptionClients(clientclass, subscription_ids, max_connections=max_connections, **parameters)
+
+def get_subscription_clients_from_auth_file(clientclass, subscription_ids, auth_path=None, **kwargs):
+    """Return SDK clients for several subscriptions, initialized with auth information in azureauth.properties.
+
+    The clients share the credentials of the service principal and a pool of HTTP connections,
+    see SubscriptionClients. The subscription of the file is ignored.
+
+    Parameters provided in kwargs will override the file parameters and be passed directly to the clients,
+    except max_connections which is passed to SubscriptionClients.
+
+    :Example:
+
+    .. code:: python
+
+        from azure.common.client_factory import get_subscription_clients_from_auth_file
+        from azure.mgmt.compute import ComputeManagementClient
+        clients = get_subscription_clients_from_auth_file(ComputeManagementClient, subscription_ids)
+        for result in clients.fan_out(lambda client: list(client.virtual_machines.list_all())):
+            print(result.subscription_id, result.result if result.succeeded else result.error)
+
+    .. versionadded:: 1.1.7
+
+    :param clientclass: A SDK client class
+    :param subscription_ids: The IDs of the subscriptions
+    :type subscription_ids: list of str
+    :param str auth_path: Path to azureauth.properties
+    :return: The clients of the subscriptions
+    :rtype: SubscriptionClients
+    :raises: KeyError if AZURE_AUTH_LOCATION is not an environment variable and no path is provided
+    :raises: FileNotFoundError if provided file path does not exists
+    """
+    max_connections = kwargs.pop('max_connections', DEFAULT_MAX_CONNECTIONS)
+    parameters = _get_auth_file_parameters(auth_path, kwargs)
+    parameters.pop('subscription_id', None)
+    return SubscriptionClients(clientclass, subscription_ids, max_connections=max_connections, **parameters)
+
+class SubscriptionResult(object):
+    """The outcome of the operation run for one subscription by SubscriptionClients.fan_out.
+
+    .. versionadded:: 1.1.7
+
+    :ivar str subscription_id: The ID of the subscription
+    :ivar result: The value returned by the operation, None if it failed
+    :ivar error: The exception raised by the operation, None if it succeeded
+    """
+    __slots__ = ('subscription_id', 'result', 'error')
+
+    def __init__(self, subscription_id, result=None, error=None):
+        self.subscription_id = subscription_id
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+class SubscriptionClients(object):
+    """SDK clients of the same class for several subscriptions, sharing one credentials object,
+    and so one token cache, and one pool of HTTP connections.
+
+    The clients keep their HTTP session alive, and mount the same requests adapter on it. The
+    adapter keeps up to max_connections connections open to each host.
+
+    :Example:
+
+    .. code:: python
+
+        from azure.common.client_factory import SubscriptionClients
+        from azure.mgmt.compute import ComputeManagementClient
+        with SubscriptionClients(ComputeManagementClient, subscription_ids, credentials) as clients:
+            vms = clients['15dbcfa8-4b93-4c9a-881c-6189d39f04d4'].virtual_machines.list_all()
+
+    .. versionadded:: 1.1.7
+
+    :param clientclass: A SDK client class
+    :param subscription_ids: The IDs of the subscriptions
+    :type subscription_ids: list of str
+    :param credentials: The credentials shared by the clients
+    :param int max_connections: The maximum number of connections kept open to each host
+    :param kwargs: The other parameters of the clients, such as base_url
+    """
+
+    def __init__(self, clientclass, subscription_ids, credentials, max_connections=DEFAULT_MAX_CONNECTIONS, **kwargs):
+        if max_connections < 1:
+            raise ValueError("max_connections should be greater than zero.")
+        self.credentials = credentials
+        self._adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_connections)
+        self._clients = OrderedDict()
+        for subscription_id in subscription_ids:
+            client = clientclass(credentials=credentials, subscription_id=subscription_id, **kwargs)
+            self._share_connections(client.config)
+            self._clients[subscription_id] = client
+
+    def _share_connections(self, config):
+        adapter = self._adapter
+        configure_session = config.session_configuration_callback
+
+        def mount_adapter(session, global_config, local_config, **kwargs):
+            for protocol in ('http://', 'https://'):
+                current = session.adapters.get(protocol)
+                if current is not adapter:
+                    # msrest has configured the retries of the adapter being replaced
+                    if current is not None:
+                        adapter.max_retries = current.max_retries
+                    session.mount(protocol, adapter)
+            return configure_session(session, global_config, local_config, **kwargs)
+
+        config.keep_alive = True
+        config.session_configuration_callback = mount_adapter
+
+    def __getitem__(self, subscription_id):
+        return self._clients[subscription_id]
+
+    def __iter__(self):
+        return iter(self._clients)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def items(self):
+        """The (subscription ID, client) pairs.
+
+        :rtype: list of tuple
+        """
+        return list(self._clients.items())
+
+    def fan_out(self, operation, max_workers=8):
+        """Run an operation for every subscription, concurrently.
+
+        An error raised by the operation for a subscription is returned in the result of the
+        subscription, rather than raised.
+
+        :Example:
+
+        .. code:: python
+
+            for result in clients.fan_out(lambda client: list(client.virtual_machines.list_all())):
+                print(result.subscription_id, result.result if result.succeeded else result.error)
+
+        :param callable operation: Called with the client of a subscription, returns the result
+         for the subscription. Paged listings should be read within the operation, such as with list(),
+         so that their pages are requested concurrently too.
+        :param int max_workers: The maximum number of subscriptions the operation runs for concurrently
+        :return: The results, in the order the operations complete. The subscriptions not started yet
+         are skipped when the generator is closed.
+        :rtype: generator of SubscriptionResult
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers should be greater than zero.")
+        subscriptions = queue.Queue()
+        for subscription_id, client in self._clients.items():
+            subscriptions.put((subscription_id, client))
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def work():
+            try:
+                while not stop.is_set():
+                    try:
+                        subscription_id, client = subscriptions.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        results.put(SubscriptionResult(subscription_id, result=operation(client)))
+                    except Exception as err:  # pylint: disable=broad-except
+                        results.put(SubscriptionResult(subscription_id, error=err))
+            finally:
+                results.put(_DONE)
+
+        workers = [threading.Thread(target=work) for _ in range(min(max_workers, len(self._clients)))]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        try:
+            running = len(workers)
+            while running:
+                result = results.get()
+                if result is _DONE:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            stop.set()
+
+    def close(self):
+        """Close the connections of the clients."""
+        self._adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        self.close()
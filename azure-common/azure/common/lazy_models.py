@@ -0,0 +1,205 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import importlib
+import sys
+import types
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class LazyModelsModule(types.ModuleType):
+    """A models module importing the module defining a model the first time
+    the model is looked up.
+
+    A model is imported along with the models it depends on, those of its
+    attributes and its subtypes, so that the models already imported can
+    always deserialize the data of any of them.
+    """
+
+    def __getattr__(self, name):
+        # only called for the names which are not in the module yet
+        model_modules = self.__dict__.get('_model_modules', {})
+        if name not in model_modules:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name))
+        _import_models(self, name)
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__dict__.get('_model_modules', ())))
+
+
+def _get_package(module):
+    if hasattr(module, '__path__'):
+        return module.__name__
+    return module.__name__.rpartition('.')[0]
+
+
+def _get_dependencies(model):
+    for attribute in getattr(model, '_attribute_map', {}).values():
+        yield attribute['type'].strip('[]{}')
+    for subtypes in getattr(model, '_subtype_map', {}).values():
+        for subtype in subtypes.values():
+            yield subtype
+
+
+def _import_models(module, name):
+    model_modules = module._model_modules
+    package = _get_package(module)
+    imported = {}
+    pending = [name]
+    while pending:
+        name = pending.pop()
+        if name in imported or name in module.__dict__ or name not in model_modules:
+            continue
+        model = getattr(importlib.import_module('.' + model_modules[name], package), name)
+        imported[name] = model
+        pending.extend(_get_dependencies(model))
+    # published at once, so that no thread sees a model without its dependencies
+    module.__dict__.update(imported)
+
+
+def lazy_models(module_name, model_modules):
+    """Makes a models module import its models when they are first looked up,
+    rather than when the module is imported.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        from azure.common.lazy_models import lazy_models
+
+        __all__ = ['Resource', 'ResourcePaged']
+
+        lazy_models(__name__, {
+            'Resource': 'resource',
+            'ResourcePaged': 'resource_paged',
+        })
+
+    :param str module_name: The name of the models module, usually __name__
+    :param dict model_modules: The module defining each model, by model name.
+     The module names are relative to the package of the models module.
+    """
+    module = sys.modules[module_name]
+    try:
+        module.__class__ = LazyModelsModule
+    except TypeError:
+        # the class of a module can only be changed from Python 3.5
+        lazy_module = LazyModelsModule(module_name)
+        lazy_module.__dict__.update(module.__dict__)
+        sys.modules[module_name] = module = lazy_module
+    module._model_modules = model_modules
+
+
+class ModelDependencies(Mapping):
+    """The models of a models module made lazy with lazy_models, by name, to
+    be used as the dependencies of a Serializer or a Deserializer.
+
+    Looking up a model imports it. Since msrest copies the dependencies it is
+    given, such as for each paged listing, the copies only include the models
+    already imported: the model being copied for is always one of them, along
+    with the models it depends on.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        client_models = get_model_dependencies(models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
+
+    :param models: A models module made lazy with lazy_models
+    """
+
+    def __init__(self, models):
+        self._models = models
+        self._model_modules = models._model_modules
+
+    def __getitem__(self, name):
+        try:
+            if name in self._model_modules:
+                return getattr(self._models, name)
+        except TypeError:  # unhashable name
+            pass
+        raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self._model_modules)
+
+    def __len__(self):
+        return len(self._model_modules)
+
+    def keys(self):
+        """The names of the models already imported."""
+        loaded = self._models.__dict__
+        return [name for name in self._model_modules if name in loaded]
+
+    def values(self):
+        """The models whose module is already imported."""
+        package = _get_package(self._models)
+        models = []
+        for name, module_name in self._model_modules.items():
+            module = sys.modules.get(package + '.' + module_name)
+            if module is not None:
+                models.append(getattr(module, name))
+        return models
+
+
+# the dependencies of the clients, by models module name
+_dependencies = {}
+
+
+def get_model_dependencies(models):
+    """Gets the dependencies of the Serializer and Deserializer of the clients
+    using a models module, shared by all of them.
+
+    .. versionadded:: 1.1.7
+
+    :param models: A models module made lazy with lazy_models
+    :rtype: ModelDependencies
+    """
+    try:
+        return _dependencies[models.__name__]
+    except KeyError:
+        return _dependencies.setdefault(models.__name__, ModelDependencies(models))
+
+
+class operation_group(object):  # pylint: disable=invalid-name
+    """Decorates the property of a client returning an operation group, so
+    that the operation group is created on first access and then kept by the
+    client.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        @operation_group
+        def resource_groups(self):
+            return ResourceGroupsOperations(self._client, self.config, self._serialize, self._deserialize)
+    """
+
+    def __init__(self, create):
+        self._create = create
+        self.__name__ = create.__name__
+        self.__doc__ = create.__doc__
+
+    def __get__(self, client, owner):
+        if client is None:
+            return self
+        operations = self._create(client)
+        # found before this descriptor from now on
+        client.__dict__[self.__name__] = operations
+        return operations
@@ -0,0 +1,372 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from msrestazure import azure_operation
+from msrestazure.azure_exceptions import CloudError
+from msrestazure.azure_operation import (
+    BadResponse,
+    BadStatus,
+    LongRunningOperation,
+    OperationFailed,
+    failed,
+    finished,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class OperationScheduler(object):
+    """Polls the long running operations of many AzureOperationPoller on a
+    few threads.
+
+    The pollers are queued by the time of their next status request, which is
+    the Retry-After delay of their last response, or their timeout when the
+    response has no Retry-After header. Up to max_workers threads are started
+    as operations are scheduled, and then kept waiting for the next operation.
+
+    .. versionadded:: 1.1.7
+
+    :param int max_workers: The maximum number of status requests sent
+     concurrently
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        if max_workers < 1:
+            raise ValueError("max_workers should be greater than zero.")
+        self.max_workers = max_workers
+        # (time of the next poll, sequence number breaking the ties, poller)
+        self._pending = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._idle = 0
+        # the pollers scheduled whose operation is not complete
+        self._outstanding = 0
+
+    def __len__(self):
+        """The number of operations being polled."""
+        with self._condition:
+            return self._outstanding
+
+    def schedule(self, poller, delay, new=True):
+        """Schedules the next status request of a poller.
+
+        :param poller: The poller of the operation
+        :type poller: AzureOperationPoller
+        :param float delay: The number of seconds to wait before the request
+        :param bool new: Whether the poller is scheduled for the first time,
+         rather than after one of its status requests
+        """
+        with self._condition:
+            if new:
+                self._outstanding += 1
+            heapq.heappush(self._pending, (time.time() + delay, next(self._sequence), poller))
+            if not self._idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name="OperationScheduler")
+                worker.daemon = True
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._condition.notify()
+
+    def _next(self):
+        with self._condition:
+            self._idle += 1
+            try:
+                while True:
+                    if self._pending:
+                        wait = self._pending[0][0] - time.time()
+                        if wait <= 0:
+                            return heapq.heappop(self._pending)[2]
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+            finally:
+                self._idle -= 1
+
+    def _complete(self):
+        """Counts an operation as complete, before its poller is done."""
+        with self._condition:
+            self._outstanding -= 1
+
+    def _work(self):
+        while True:
+            poller = self._next()
+            delay = poller._poll_once()  # pylint: disable=protected-access
+            if delay is not None:
+                self.schedule(poller, delay, new=False)
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """Gets the scheduler of the pollers created without one.
+
+    .. versionadded:: 1.1.7
+
+    :rtype: OperationScheduler
+    """
+    global _default_scheduler  # pylint: disable=global-statement
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = OperationScheduler()
+        return _default_scheduler
+
+
+def set_default_scheduler(scheduler):
+    """Sets the scheduler of the pollers created without one, such as to
+    change the number of threads polling.
+
+    .. versionadded:: 1.1.7
+
+    :param OperationScheduler scheduler: The scheduler
+    """
+    global _default_scheduler  # pylint: disable=global-statement
+    with _default_scheduler_lock:
+        _default_scheduler = scheduler
+
+
+class AzureOperationPoller(azure_operation.AzureOperationPoller):
+    """Initiates long running operation and polls its status on the threads of
+    an OperationScheduler, rather than on a thread of its own.
+
+    .. versionadded:: 1.1.7
+
+    :param callable send_cmd: The API request to initiate the operation.
+    :param callable output_cmd: The function to deserialize the resource
+        of the operation.
+    :param callable update_cmd: The API request to check the status of
+        the operation.
+    :param int timeout: Time in seconds to wait between status calls,
+        default is 30.
+    :param OperationScheduler scheduler: The scheduler polling the status,
+        by default the one of get_default_scheduler.
+    """
+
+    def __init__(self, send_cmd, output_cmd, update_cmd, timeout=30, scheduler=None):  # pylint: disable=super-init-not-called
+        self._timeout = timeout
+        self._callbacks = []
+
+        try:
+            self._response = send_cmd()
+            self._operation = LongRunningOperation(self._response, output_cmd)
+            self._operation.set_initial_status(self._response)
+        except BadStatus:
+            self._operation.status = 'Failed'
+            raise CloudError(self._response)
+        except BadResponse as err:
+            self._operation.status = 'Failed'
+            raise CloudError(self._response, str(err))
+        except OperationFailed:
+            raise CloudError(self._response)
+
+        self._thread = None
+        self._done = threading.Event()
+        self._callbacks_lock = threading.Lock()
+        self._exception = None
+        self._update_cmd = update_cmd
+        self._initial_url = self._response.request.url
+        if finished(self.status()):
+            self._done.set()
+        else:
+            if scheduler is None:
+                scheduler = get_default_scheduler()
+            self._scheduler = scheduler
+            scheduler.schedule(self, self._get_delay())
+
+    def _get_delay(self):
+        retry_after = self._response.headers.get('retry-after')
+        if retry_after:
+            try:
+                return max(0, int(retry_after))
+            except ValueError:
+                pass
+        return self._timeout
+
+    def _poll_once(self):
+        """Sends one status request, as an iteration of the loop of
+        msrestazure's AzureOperationPoller._poll.
+
+        :returns: The number of seconds before the next status request, or
+         None if the operation is complete.
+        """
+        try:
+            headers = self._polling_cookie()
+            if self._operation.async_url:
+                self._response = self._update_cmd(self._operation.async_url, headers)
+                self._operation.set_async_url_if_present(self._response)
+                self._operation.get_status_from_async(self._response)
+            elif self._operation.location_url:
+                self._response = self._update_cmd(self._operation.location_url, headers)
+                self._operation.set_async_url_if_present(self._response)
+                self._operation.get_status_from_location(self._response)
+            elif self._operation.method == "PUT":
+                self._response = self._update_cmd(self._initial_url, headers)
+                self._operation.set_async_url_if_present(self._response)
+                self._operation.get_status_from_resource(self._response)
+            else:
+                raise BadResponse('Location header is missing from long running operation.')
+
+            if not finished(self.status()):
+                return self._get_delay()
+
+            if failed(self._operation.status):
+                raise OperationFailed("Operation failed or cancelled")
+            elif self._operation.should_do_final_get():
+                self._response = self._update_cmd(self._initial_url)
+                self._operation.get_status_from_resource(self._response)
+
+        except BadStatus:
+            self._operation.status = 'Failed'
+            self._exception = CloudError(self._response)
+
+        except BadResponse as err:
+            self._operation.status = 'Failed'
+            self._exception = CloudError(self._response, str(err))
+
+        except OperationFailed:
+            self._exception = CloudError(self._response)
+
+        except Exception as err:  # pylint: disable=broad-except
+            self._exception = err
+
+        self._scheduler._complete()  # pylint: disable=protected-access
+        with self._callbacks_lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for call in callbacks:
+            try:
+                call(self._operation)
+            except Exception:  # pylint: disable=broad-except
+                # the worker keeps polling the other operations
+                _LOGGER.exception("Done callback of %r failed", self)
+        return None
+
+    def wait(self, timeout=None):
+        """Wait on the long running operation for a specified length
+        of time.
+
+        :param int timeout: Perion of time to wait for the long running
+         operation to complete.
+        :raises ~msrestazure.azure_exceptions.CloudError: Server problem with the query.
+        """
+        self._done.wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+
+    def done(self):
+        """Check status of the long running operation.
+
+        :returns: 'True' if the process has completed, else 'False'.
+        """
+        return self._done.is_set()
+
+    def add_done_callback(self, func):
+        """Add callback function to be run once the long running operation
+        has completed - regardless of the status of the operation.
+
+        :param callable func: Callback function that takes at least one
+         argument, a completed LongRunningOperation.
+        :raises: ValueError if the long running operation has already
+         completed.
+        """
+        with self._callbacks_lock:
+            super(AzureOperationPoller, self).add_done_callback(func)
+
+    def remove_done_callback(self, func):
+        """Remove a callback from the long running operation.
+
+        :param callable func: The function to be removed from the callbacks.
+        :raises: ValueError if the long running operation has already
+         completed.
+        """
+        with self._callbacks_lock:
+            super(AzureOperationPoller, self).remove_done_callback(func)
+
+
+def _watch(pollers):
+    completed = queue.Queue()
+    for poller in pollers:
+        try:
+            poller.add_done_callback(lambda _, poller=poller: completed.put(poller))
+        except ValueError:  # already complete
+            completed.put(poller)
+    return completed
+
+
+def as_completed(pollers):
+    """Yields pollers as their long running operations complete.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        pollers = [client.virtual_machines.create_or_update(group, name, vm) for name, vm in vms.items()]
+        for poller in as_completed(pollers):
+            print(poller.result().name)
+
+    :param pollers: The pollers, such as returned by the long running
+     operations of the clients
+    :type pollers: list of :class:`AzureOperationPoller
+     <msrestazure.azure_operation.AzureOperationPoller>`
+    :rtype: generator of :class:`AzureOperationPoller
+     <msrestazure.azure_operation.AzureOperationPoller>`
+    """
+    pollers = list(pollers)
+    completed = _watch(pollers)
+    for _ in pollers:
+        yield completed.get()
+
+
+def wait_all(pollers, timeout=None):
+    """Waits for the long running operations of pollers to complete.
+
+    The errors of the operations are not raised, but by the result or the
+    wait methods of their poller.
+
+    .. versionadded:: 1.1.7
+
+    :param pollers: The pollers, such as returned by the long running
+     operations of the clients
+    :type pollers: list of :class:`AzureOperationPoller
+     <msrestazure.azure_operation.AzureOperationPoller>`
+    :param float timeout: The maximum number of seconds to wait, or None to
+     wait until all the operations complete
+    :return: The pollers whose operation completed, and the others.
+    :rtype: tuple of two lists
+    """
+    pollers = list(pollers)
+    completed = _watch(pollers)
+    deadline = None if timeout is None else time.time() + timeout
+    done = []
+    while len(done) < len(pollers):
+        try:
+            if deadline is None:
+                done.append(completed.get())
+            else:
+                done.append(completed.get(timeout=max(0, deadline - time.time())))
+        except queue.Empty:
+            break
+    done_ids = set(map(id, done))
+    not_done = [poller for poller in pollers if id(poller) not in done_ids]
+    return done, not_done
@@ -0,0 +1,153 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import threading
+
+
+class PageRequest(object):
+    """Requests a page on a daemon thread of its own, by calling get_page with
+    args, so that the page is received while the previous one is consumed.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        next_page = PageRequest(get_page, next_link)
+        for item in current_page:
+            process(item)
+        response = next_page.result()
+
+    :param callable get_page: The function requesting the page
+    :param args: The arguments get_page is called with, kept as the args
+     attribute
+    """
+
+    def __init__(self, get_page, *args):
+        self.args = args
+        self._response = None
+        self._error = None
+        self._thread = threading.Thread(target=self._request, args=(get_page,), name="PageRequest")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _request(self, get_page):
+        try:
+            self._response = get_page(*self.args)
+        except Exception as err:  # pylint: disable=broad-except
+            self._error = err
+
+    def result(self):
+        """Waits for the page and returns the result of get_page, or raises its
+        error."""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+
+def _advance_page(self):
+    """The advance_page method of the read ahead listings."""
+    if self.next_link is None:
+        raise StopIteration("End of paging")
+    self._current_page_iter_index = 0
+    next_page, self._next_page = self._next_page, None
+    if next_page is not None and next_page.args == (self.next_link,):
+        self._response = next_page.result()
+    else:
+        self._response = self._get_next(self.next_link)
+    self._derserializer(self, self._response)
+    if self.next_link:
+        self._next_page = PageRequest(self._get_next, self.next_link)
+    return self.current_page
+
+
+def _create_read_ahead_class(paged_class):
+    # a mixin would change the layout of the instances, which forbids changing their class
+    def reset(self):
+        super(read_ahead_class, self).reset()
+        self._next_page = None
+
+    read_ahead_class = type(paged_class.__name__, (paged_class,), {
+        '__module__': paged_class.__module__,
+        '_next_page': None,
+        'reset': reset,
+        'advance_page': _advance_page,
+    })
+    return read_ahead_class
+
+
+# the read ahead class of each Paged class, and the read ahead classes themselves
+_read_ahead_classes = {}
+
+
+def read_ahead(paged):
+    """Makes a Paged listing request its next page while the current page is
+    iterated, rather than when the end of the current page is reached.
+
+    The page size can be set with the top parameter of the operations whose
+    API supports $top, such as ResourcesOperations.list.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        for vm in read_ahead(client.virtual_machines.list_all()):
+            print(vm.name)
+
+    :param paged: The listing, as returned by a list operation
+    :type paged: :class:`Paged <msrest.paging.Paged>`
+    :return: The same listing
+    """
+    paged_class = type(paged)
+    try:
+        read_ahead_class = _read_ahead_classes[paged_class]
+    except KeyError:
+        read_ahead_class = _create_read_ahead_class(paged_class)
+        read_ahead_class = _read_ahead_classes.setdefault(paged_class, read_ahead_class)
+        _read_ahead_classes.setdefault(read_ahead_class, read_ahead_class)
+    paged.__class__ = read_ahead_class
+    return paged
+
+
+def iter_raw(paged, read_ahead=False):  # pylint: disable=redefined-outer-name
+    """Yields the items of a Paged listing as the dicts parsed from the JSON
+    of its pages, without deserializing them as models.
+
+    The pages are requested as the items are iterated, from the first one,
+    and the listing itself is left untouched.
+
+    .. versionadded:: 1.1.7
+
+    :Example:
+
+    .. code:: python
+
+        names = [vm['name'] for vm in iter_raw(client.virtual_machines.list_all())]
+
+    :param paged: The listing, as returned by a list operation
+    :type paged: :class:`Paged <msrest.paging.Paged>`
+    :param bool read_ahead: Whether to request the next page while the
+     current page is iterated
+    :rtype: generator of dict
+    """
+    attribute_map = type(paged)._attribute_map  # pylint: disable=protected-access
+    value_key = attribute_map['current_page']['key']
+    next_link_key = attribute_map['next_link']['key']
+    get_next = paged._get_next  # pylint: disable=protected-access
+
+    link = ""
+    next_page = None
+    while link is not None:
+        response = next_page.result() if next_page is not None else get_next(link)
+        page = response.json()
+        link = page.get(next_link_key) or None
+        next_page = PageRequest(get_next, link) if read_ahead and link else None
+        for item in page.get(value_key) or []:
+            yield item
@@ -33,7 +33,7 @@ except ImportError:
 
 setup(
     name='azure-common',
-    version='1.1.6',
+    version='1.1.7',
     description='Microsoft Azure Client Library for Python (Common)',
     long_description=open('README.rst', 'r').read(),
     license='MIT License',
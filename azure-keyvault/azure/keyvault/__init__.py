@@ -17,10 +17,14 @@ from .custom.key_vault_id import (KeyVaultId,
                                   CertificateIssuerId,
                                   CertificateOperationId,
                                   StorageAccountId,
-                                  StorageSasDefinitionId)
+                                  StorageSasDefinitionId,
+                                  KeyVaultObjectId)
 from .custom import http_bearer_challenge_cache as HttpBearerChallengeCache
 from .custom.http_bearer_challenge import HttpBearerChallenge
 from .custom.key_vault_authentication import KeyVaultAuthentication, KeyVaultAuthBase
+from .custom.key_vault_cache import KeyVaultCache
+from .custom.key_vault_crypto import KeyVaultCryptoProvider
+from .custom.key_vault_bulk import KeyVaultBulkOperations, BulkOperationResult
 from .version import VERSION
 
 __all__ = ['KeyVaultClient',
@@ -32,10 +36,15 @@ __all__ = ['KeyVaultClient',
            'CertificateOperationId',
            'StorageAccountId',
            'StorageSasDefinitionId',
+           'KeyVaultObjectId',
            'HttpBearerChallengeCache',
            'HttpBearerChallenge',
            'KeyVaultAuthentication',
-           'KeyVaultAuthBase']
+           'KeyVaultAuthBase',
+           'KeyVaultCache',
+           'KeyVaultCryptoProvider',
+           'KeyVaultBulkOperations',
+           'BulkOperationResult']
 
 __version__ = VERSION
 
@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 #---------------------------------------------------------------------------------------------
 
+import re
+import time
+from collections import OrderedDict
 from threading import Lock
 
 try:
@@ -10,68 +13,133 @@ try:
 except ImportError:
     import urlparse as parse # pylint: disable=import-error
 
-_cache = {}
-_lock = Lock()
+_NETLOC_END = re.compile(r'[/?#]')
+
+# a vault's challenge rarely changes, and a process talks to few vaults
+_DEFAULT_TTL = 3600
+_DEFAULT_MAX_SIZE = 256
+
+
+def _get_netloc(url):
+    # only the scheme and netloc prefix of the url is parsed, not its path and query
+    start = url.find('//')
+    if start >= 0:
+        end = _NETLOC_END.search(url, start + 2)
+        if end is not None:
+            url = url[:end.start()]
+    return parse.urlparse(url).netloc
+
+
+class ChallengeCache(object):
+    """
+    Caches the challenges returned by the key vaults, by the host of the vault.
+    :Example Usage:
+            cache = HttpBearerChallengeCache.ChallengeCache(ttl=3600, max_size=64)
+            client = KeyVaultClient(KeyVaultAuthentication(auth_callack, challenge_cache=cache))
+
+    The challenges are replaced with a new copy of the cache on every change, so that they are read without locking.
+    Challenges older than ttl seconds are no longer returned, and when max_size challenges are cached, the oldest one
+    is evicted. By default challenges expire after an hour and at most 256 are cached.
+    """
+
+    def __init__(self, ttl=_DEFAULT_TTL, max_size=_DEFAULT_MAX_SIZE):
+        """
+        Creates a new ChallengeCache instance.
+        :param ttl: The number of seconds a challenge is returned from the cache (3600 by default), or None for no
+         expiry.
+        :param max_size: The maximum number of cached challenges (256 by default), or None for no limit.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Parameter 'ttl' must be greater than zero.")
+        if max_size is not None and max_size < 1:
+            raise ValueError("Parameter 'max_size' must be greater than zero.")
+
+        self.ttl = ttl
+        self.max_size = max_size
+        # netloc -> (challenge, expires on), never modified once published
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_challenge_for_url(self, url):
+        """ Gets the challenge for the cached URL.
+        :param url: the URL the challenge is cached for.
+        :rtype: HttpBearerChallenge """
+        if not url:
+            raise ValueError('URL cannot be None')
+
+        entry = self._entries.get(_get_netloc(url))
+        if entry is None or (entry[1] is not None and time.time() >= entry[1]):
+            return None
+        return entry[0]
+
+    def remove_challenge_for_url(self, url):
+        """ Removes the cached challenge for the specified URL.
+        :param url: the URL for which to remove the cached challenge """
+        if not url:
+            raise ValueError('URL cannot be empty')
+
+        netloc = _get_netloc(url)
+        with self._lock:
+            entries = OrderedDict(self._entries)
+            del entries[netloc]
+            self._entries = entries
+
+    def set_challenge_for_url(self, url, challenge):
+        """ Caches the challenge for the specified URL.
+        :param url: the URL for which to cache the challenge
+        :param challenge: the challenge to cache """
+        if not url:
+            raise ValueError('URL cannot be empty')
+
+        if not challenge:
+            raise ValueError('Challenge cannot be empty')
+
+        netloc = _get_netloc(url)
+        if netloc != challenge.source_authority:
+            raise ValueError('Source URL and Challenge URL do not match')
+
+        now = time.time()
+        with self._lock:
+            entries = OrderedDict((key, entry) for key, entry in self._entries.items()
+                                  if key != netloc and (entry[1] is None or now < entry[1]))
+            entries[netloc] = (challenge, now + self.ttl if self.ttl is not None else None)
+            while self.max_size is not None and len(entries) > self.max_size:
+                entries.popitem(last=False)
+            self._entries = entries
+
+    def clear(self):
+        """ Clears the cache. """
+        with self._lock:
+            self._entries = OrderedDict()
+
+
+# the cache shared by the KeyVaultAuthentication instances created without a challenge cache
+_cache = ChallengeCache()
+
 
 def get_challenge_for_url(url):
     """ Gets the challenge for the cached URL.
     :param url: the URL the challenge is cached for.
     :rtype: HttpBearerChallenge """
-    if not url:
-        raise ValueError('URL cannot be None')
-
-    url = parse.urlparse(url)
-
-    _lock.acquire()
-
-    val = _cache.get(url.netloc)
-
-    _lock.release()
-
-    return val
+    return _cache.get_challenge_for_url(url)
 
 
 def remove_challenge_for_url(url):
     """ Removes the cached challenge for the specified URL.
     :param url: the URL for which to remove the cached challenge """
-    if not url:
-        raise ValueError('URL cannot be empty')
-
-    url = parse.urlparse(url)
-
-    _lock.acquire()
-
-    del _cache[url.netloc]
-
-    _lock.release()
+    _cache.remove_challenge_for_url(url)
 
 
 def set_challenge_for_url(url, challenge):
     """ Caches the challenge for the specified URL.
     :param url: the URL for which to cache the challenge
     :param challenge: the challenge to cache """
-    if not url:
-        raise ValueError('URL cannot be empty')
-
-    if not challenge:
-        raise ValueError('Challenge cannot be empty')
-
-    src_url = parse.urlparse(url)
-    if src_url.netloc != challenge.source_authority:
-        raise ValueError('Source URL and Challenge URL do not match')
-
-    _lock.acquire()
-
-    _cache[src_url.netloc] = challenge
-
-    _lock.release()
+    _cache.set_challenge_for_url(url, challenge)
 
 
 def clear():
     """ Clears the cache. """
-
-    _lock.acquire()
-
-    _cache.clear() # pylint: disable=redefined-outer-name,unused-variable
-
-    _lock.release()
+    _cache.clear()
@@ -3,20 +3,56 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 #---------------------------------------------------------------------------------------------
 
+import base64
+import json
 import threading
+import time
+from requests import Session
 from requests.auth import AuthBase
 from requests.cookies import extract_cookies_to_jar
 from msrest.authentication import Authentication
 from azure.keyvault import HttpBearerChallenge
 from azure.keyvault import HttpBearerChallengeCache as ChallengeCache
 
+# api-version of the unauthenticated requests sent to collect the challenge of a vault
+_CHALLENGE_API_VERSION = '2016-10-01'
+
+
+def _get_token_expiry(access_token):
+    """
+    Returns the expiry time, in seconds since Epoch, of a JWT access token, or None if it can't be read.
+    """
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode('ascii')).decode('utf-8'))
+        return float(claims['exp'])
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _get_token_key(challenge):
+    """
+    Returns the (authorization uri, resource, scope) key of the tokens cached for a challenge.
+    """
+    return challenge.get_authorization_server(), challenge.get_resource(), challenge.get_scope()
+
+
+class _AccessToken(object):
+    __slots__ = ('token_type', 'access_token', 'expires_on')
+
+    def __init__(self, token_type, access_token, expires_on):
+        self.token_type = token_type
+        self.access_token = access_token
+        self.expires_on = expires_on
+
 
 class KeyVaultAuthBase(AuthBase):
     """
     Used for handling authentication challenges, by hooking into the request AuthBase extension model.
     """
 
-    def __init__(self, authorization_callback):
+    def __init__(self, authorization_callback, refresh_margin=300, challenge_cache=None):
         """
         Creates a new KeyVaultAuthBase instance used for handling authentication challenges, by hooking into the request AuthBase
         extension model.
@@ -24,37 +60,50 @@ class KeyVaultAuthBase(AuthBase):
         This callback should take three str arguments: authorization uri, resource, and scope, and return 
         a tuple of (token type, access token).
                     return token['token_type'], token['access_token']
+        The callback may return a tuple of (token type, access token, expires on) instead, expires on being the expiry
+        time of the token in seconds since Epoch. Tokens are cached per authorization uri, resource and scope until they
+        expire, if their expiry time is returned or can be read from the access token.
+        :param refresh_margin: The number of seconds before its expiry at which a cached token is refreshed on a
+        background thread, while it keeps being used.
+        :param challenge_cache: The HttpBearerChallengeCache.ChallengeCache caching the challenges of the vaults. The
+        challenges are cached in the HttpBearerChallengeCache shared by the process when None.
         """
         self._callback = authorization_callback
         self._token = None
         self._thread_local = threading.local()
         self._thread_local.pos = None
         self._thread_local.auth_attempted = False
+        self.refresh_margin = refresh_margin
+        self._tokens = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._challenge_cache = challenge_cache if challenge_cache is not None else ChallengeCache
 
     def __call__(self, request):
         """
         Called prior to requests being sent.
         :param request: Request to be sent
-        :return: returns the original request, registering hooks on the response if it is the first time this url has been called and an 
-        auth challenge might be returned  
+        :return: returns the original request, registering hooks on the response to handle the auth challenge returned
+        if the url has not been called before or the token is rejected
         """
         # attempt to pre-fetch challenge if cached
         if self._callback:
-            challenge = ChallengeCache.get_challenge_for_url(request.url)
+            challenge = self._challenge_cache.get_challenge_for_url(request.url)
             if challenge:
                 # if challenge cached, use the authorization_callback to retrieve token and update the request
                 self.set_authorization_header(request, challenge)
-            else:
-                # if the challenge is not cached we will let the request proceed without the auth header so we
-                # get back the proper challenge in response. We register a callback to handle the response 401 response.
-                try:
-                    self._thread_local.pos = request.body.tell()
-                except AttributeError:
-                    self._thread_local.pos = None
-
-                self._thread_local.auth_attempted = False
-                request.register_hook('response', self.handle_401)
-                request.register_hook('response', self.handle_redirect)
+
+            # if the challenge is not cached we let the request proceed without the auth header so we get back the
+            # proper challenge in response, and a cached token may have been revoked. We register a callback to
+            # handle the 401 response in both cases.
+            try:
+                self._thread_local.pos = request.body.tell()
+            except AttributeError:
+                self._thread_local.pos = None
+
+            self._thread_local.auth_attempted = False
+            request.register_hook('response', self.handle_401)
+            request.register_hook('response', self.handle_redirect)
 
         return request
 
@@ -96,11 +145,16 @@ class KeyVaultAuthBase(AuthBase):
 
         # add the challenge to the cache
         challenge = HttpBearerChallenge(response.request.url, auth_header)
-        ChallengeCache.set_challenge_for_url(response.request.url, challenge)
+        self._challenge_cache.set_challenge_for_url(response.request.url, challenge)
 
-        # Consume content and release the original connection
+        # the token sent was rejected, a new one is acquired rather than taken from the cache
+        authorization = response.request.headers.get('Authorization')
+        if authorization:
+            self._discard_token(_get_token_key(challenge), authorization)
+
+        # Drain the body and release the original connection
         # to allow our new request to reuse the same one.
-        response.content
+        response.raw.read(decode_content=False)
         response.close()
 
         # copy the request to resend
@@ -118,11 +172,78 @@ class KeyVaultAuthBase(AuthBase):
         return _response
 
     def set_authorization_header(self, request, challenge):
-        auth = self._callback(
-            challenge.get_authorization_server(),
-            challenge.get_resource(),
-            challenge.get_scope())
-        request.headers['Authorization'] = '{} {}'.format(auth[0], auth[1])
+        token = self._get_token(_get_token_key(challenge))
+        request.headers['Authorization'] = '{} {}'.format(token.token_type, token.access_token)
+
+    def prewarm_challenges(self, vault_urls, session=None):
+        """
+        Collects the authentication challenges of vaults, and acquires their access tokens, ahead of the first requests
+        sent to them. The requests to these vaults are then authenticated right away, without an unauthenticated request
+        to collect the challenge.
+        :param vault_urls: The vault urls, for example https://myvault.vault.azure.net.
+        :param session: The requests session used to send the unauthenticated requests.
+        """
+        session = session or Session()
+        for vault_url in vault_urls:
+            challenge = self._challenge_cache.get_challenge_for_url(vault_url)
+            if not challenge:
+                response = session.get('{}/keys'.format(vault_url.rstrip('/')),
+                                       params={'api-version': _CHALLENGE_API_VERSION})
+                auth_header = response.headers.get('www-authenticate', '')
+                response.close()
+                if response.status_code != 401 or not HttpBearerChallenge.is_bearer_challenge(auth_header):
+                    continue
+                challenge = HttpBearerChallenge(response.request.url, auth_header)
+                self._challenge_cache.set_challenge_for_url(response.request.url, challenge)
+
+            if self._callback:
+                self._get_token(_get_token_key(challenge))
+
+    def _get_token(self, key):
+        """
+        Returns the cached token for an (authorization uri, resource, scope) key, refreshing it in the background if
+        it expires soon, or acquires a new token if none is cached or it is expired.
+        """
+        now = time.time()
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None and now < token.expires_on:
+                if now >= token.expires_on - self.refresh_margin and key not in self._refreshing:
+                    self._refreshing.add(key)
+                    thread = threading.Thread(target=self._refresh_token, args=(key,))
+                    thread.daemon = True
+                    thread.start()
+                return token
+
+        return self._acquire_token(key)
+
+    def _acquire_token(self, key):
+        auth = self._callback(*key)
+        expires_on = auth[2] if len(auth) > 2 else _get_token_expiry(auth[1])
+        token = _AccessToken(auth[0], auth[1], expires_on)
+        if expires_on is not None:
+            with self._lock:
+                self._tokens[key] = token
+        return token
+
+    def _discard_token(self, key, authorization):
+        """
+        Removes the cached token of a key if it is the one in the authorization header, not one refreshed since.
+        """
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None and authorization == '{} {}'.format(token.token_type, token.access_token):
+                del self._tokens[key]
+
+    def _refresh_token(self, key):
+        try:
+            self._acquire_token(key)
+        except Exception:  # pylint: disable=broad-except
+            # the cached token is used until it expires, when a new token is acquired again
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
 
 
 class KeyVaultAuthentication(Authentication):
@@ -140,18 +261,30 @@ class KeyVaultAuthentication(Authentication):
             self.keyvault_data_client = KeyVaultClient(KeyVaultAuthentication(auth_callack))
     """
 
-    def __init__(self, authorization_callback):
+    def __init__(self, authorization_callback, refresh_margin=300, challenge_cache=None):
         """
         Creates a new KeyVaultAuthentication instance used for authentication in the KeyVaultClient
         :param authorization_callback: A callback used to provide authentication credentials to the key vault data service.  
         This callback should take three str arguments: authorization uri, resource, and scope, and return 
-        a tuple of (token type, access token).
+        a tuple of (token type, access token), or of (token type, access token, expires on).
+        :param refresh_margin: The number of seconds before its expiry at which a cached token is refreshed on a
+        background thread. See KeyVaultAuthBase.
+        :param challenge_cache: The HttpBearerChallengeCache.ChallengeCache caching the challenges of the vaults, to
+        keep them apart from the other instances. See KeyVaultAuthBase.
         """
         super(KeyVaultAuthentication, self).__init__()
-        self.auth = KeyVaultAuthBase(authorization_callback)
+        self.auth = KeyVaultAuthBase(authorization_callback, refresh_margin, challenge_cache)
         self._callback = authorization_callback
         
     def signed_session(self):
         session = super(KeyVaultAuthentication, self).signed_session()
         session.auth = self.auth
         return session
+
+    def prewarm_challenges(self, vault_urls):
+        """
+        Collects the authentication challenges of vaults, and acquires their access tokens, ahead of the first requests
+        sent to them. See KeyVaultAuthBase.prewarm_challenges.
+        :param vault_urls: The vault urls, for example https://myvault.vault.azure.net.
+        """
+        self.auth.prewarm_challenges(vault_urls, super(KeyVaultAuthentication, self).signed_session())
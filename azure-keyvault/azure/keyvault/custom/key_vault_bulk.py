@@ -0,0 +1,343 @@
+#---------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+#---------------------------------------------------------------------------------------------
+
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue # pylint: disable=import-error
+
+from .key_vault_id import KeyVaultObjectId
+
+# seconds waited after a 429 response without a valid Retry-After header
+_DEFAULT_RETRY_AFTER = 1
+
+_DONE = object()
+
+
+def _get_retry_after(error):
+    """
+    Returns the number of seconds to wait before retrying a request throttled by the vault, or None if the error is
+    not a throttling error.
+    """
+    response = getattr(error, 'response', None)
+    if getattr(response, 'status_code', None) != 429:
+        return None
+    try:
+        return max(0, int(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER
+
+
+def _get_object_id(item, collection):
+    # items can be identifiers, or the items returned by the listings such as SecretItem and KeyItem
+    return KeyVaultObjectId.parse(getattr(item, 'id', None) or getattr(item, 'kid', None) or item, collection)
+
+
+class BulkOperationResult(object):
+    """
+    The outcome of the operation performed for one item of a bulk operation.
+    :ivar item: The item the operation was performed for.
+    :ivar result: The value returned by the operation, None if it failed.
+    :ivar error: The exception raised by the operation, None if it succeeded.
+    """
+    __slots__ = ('item', 'result', 'error')
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
+class _Throttle(object):
+    """
+    Limits the number of concurrent requests, halving the limit when the vault throttles the requests and raising it
+    back by one after as many successful requests as the limit.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self._active = 0
+        self._successes = 0
+        self._resume_at = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                wait = self._resume_at - time.time()
+                if wait <= 0 and self._active < self.limit:
+                    break
+                self._condition.wait(wait if wait > 0 else None)
+            self._active += 1
+
+    def release(self, retry_after=None):
+        with self._condition:
+            self._active -= 1
+            now = time.time()
+            if retry_after is None:
+                self._successes += 1
+                if self.limit < self.max_concurrency and self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+            else:
+                # the requests throttled while already waiting don't lower the limit again
+                if now >= self._resume_at:
+                    self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self._resume_at = max(self._resume_at, now + retry_after)
+            self._condition.notify_all()
+
+
+class KeyVaultBulkOperations(object):
+    """
+    Performs an operation for many secrets, keys or certificates concurrently, with a bounded number of requests in
+    flight.
+    :Example Usage:
+            bulk = KeyVaultBulkOperations(KeyVaultClient(KeyVaultAuthentication(auth_callack)), max_concurrency=16)
+            for result in bulk.get_all_secrets('https://myvault.vault.azure.net'):
+                if result.succeeded:
+                    print(result.item.id, result.result.value)
+
+    The bulk operations return a generator of BulkOperationResult, in the order the operations complete, holding the
+    result or the error of each item. The items are read lazily, so that the operations start while a listing such as
+    get_secrets is still being paged through, and are performed by max_concurrency threads. When the vault throttles
+    the requests with 429 responses, the number of concurrent requests is lowered, every request waits for the
+    Retry-After delay, and the throttled operations are retried up to max_retries times.
+    """
+
+    def __init__(self, client, max_concurrency=8, max_retries=5):
+        """
+        Creates a new KeyVaultBulkOperations instance.
+        :param client: The KeyVaultClient performing the operations.
+        :param max_concurrency: The maximum number of concurrent requests.
+        :param max_retries: The number of times an operation throttled by the vault is retried.
+        """
+        if client is None:
+            raise ValueError("Parameter 'client' must not be None.")
+        if max_concurrency < 1:
+            raise ValueError("Parameter 'max_concurrency' must be greater than zero.")
+        if max_retries < 0:
+            raise ValueError("Parameter 'max_retries' must not be negative.")
+
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._throttle = _Throttle(max_concurrency)
+
+    def map(self, operation, items):
+        """
+        Performs an operation for every item.
+        :param operation: A callable performing the operation for one item, and returning its result.
+        :param items: The items, read lazily.
+        :return: A generator of BulkOperationResult. Errors raised while reading the items are raised once the
+        operations of the items read before are done.
+        """
+        tasks = queue.Queue(self.max_concurrency * 2)
+        results = queue.Queue()
+        stop = threading.Event()
+        read_errors = []
+
+        def feed():
+            try:
+                for item in items:
+                    if stop.is_set():
+                        break
+                    tasks.put(item)
+            except Exception as ex:  # pylint: disable=broad-except
+                read_errors.append(ex)
+            finally:
+                for _ in range(self.max_concurrency):
+                    tasks.put(_DONE)
+
+        def work():
+            try:
+                while True:
+                    item = tasks.get()
+                    if item is _DONE:
+                        break
+                    if not stop.is_set():
+                        results.put(self._perform(operation, item))
+            finally:
+                results.put(_DONE)
+
+        threads = [threading.Thread(target=feed)]
+        threads.extend(threading.Thread(target=work) for _ in range(self.max_concurrency))
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            running = self.max_concurrency
+            while running:
+                result = results.get()
+                if result is _DONE:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            # the remaining items are skipped when the generator is closed before the end
+            stop.set()
+
+        if read_errors:
+            raise read_errors[0]
+
+    def get_secrets(self, secrets):
+        """
+        Gets secrets.
+        :param secrets: The secret identifiers, or SecretItem, such as returned by KeyVaultClient.get_secrets. The
+        latest version is returned when an identifier has no version.
+        :rtype: generator of BulkOperationResult of :class:`SecretBundle <azure.keyvault.models.SecretBundle>`
+        """
+        def get_secret(item):
+            secret_id = _get_object_id(item, 'secrets')
+            return self.client.get_secret(secret_id.vault, secret_id.name, secret_id.version)
+        return self.map(get_secret, secrets)
+
+    def get_all_secrets(self, vault_base_url, maxresults=None):
+        """
+        Gets the latest version of every secret of a vault, while the secrets are listed.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page of the listing.
+        :type maxresults: int
+        :rtype: generator of BulkOperationResult of :class:`SecretBundle <azure.keyvault.models.SecretBundle>`
+        """
+        return self.get_secrets(self.client.get_secrets(vault_base_url, maxresults))
+
+    def set_secrets(self, vault_base_url, secrets):
+        """
+        Sets secrets.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param secrets: The secrets, as a dict or as (name, value) pairs.
+        :rtype: generator of BulkOperationResult of :class:`SecretBundle <azure.keyvault.models.SecretBundle>`
+        """
+        items = secrets.items() if hasattr(secrets, 'items') else secrets
+        return self.map(lambda item: self.client.set_secret(vault_base_url, item[0], item[1]), items)
+
+    def delete_secrets(self, vault_base_url, secret_names):
+        """
+        Deletes secrets.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param secret_names: The names of the secrets.
+        :rtype: generator of BulkOperationResult of :class:`DeletedSecretBundle
+         <azure.keyvault.models.DeletedSecretBundle>`
+        """
+        return self.map(lambda name: self.client.delete_secret(vault_base_url, name), secret_names)
+
+    def backup_secrets(self, vault_base_url, secret_names):
+        """
+        Backs up secrets.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param secret_names: The names of the secrets.
+        :rtype: generator of BulkOperationResult of :class:`BackupSecretResult
+         <azure.keyvault.models.BackupSecretResult>`
+        """
+        return self.map(lambda name: self.client.backup_secret(vault_base_url, name), secret_names)
+
+    def get_keys(self, keys):
+        """
+        Gets the public part of keys.
+        :param keys: The key identifiers, or KeyItem, such as returned by KeyVaultClient.get_keys. The latest version
+        is returned when an identifier has no version.
+        :rtype: generator of BulkOperationResult of :class:`KeyBundle <azure.keyvault.models.KeyBundle>`
+        """
+        def get_key(item):
+            key_id = _get_object_id(item, 'keys')
+            return self.client.get_key(key_id.vault, key_id.name, key_id.version)
+        return self.map(get_key, keys)
+
+    def get_all_keys(self, vault_base_url, maxresults=None):
+        """
+        Gets the public part of the latest version of every key of a vault, while the keys are listed.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page of the listing.
+        :type maxresults: int
+        :rtype: generator of BulkOperationResult of :class:`KeyBundle <azure.keyvault.models.KeyBundle>`
+        """
+        return self.get_keys(self.client.get_keys(vault_base_url, maxresults))
+
+    def delete_keys(self, vault_base_url, key_names):
+        """
+        Deletes keys.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_names: The names of the keys.
+        :rtype: generator of BulkOperationResult of :class:`DeletedKeyBundle <azure.keyvault.models.DeletedKeyBundle>`
+        """
+        return self.map(lambda name: self.client.delete_key(vault_base_url, name), key_names)
+
+    def backup_keys(self, vault_base_url, key_names):
+        """
+        Backs up keys.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_names: The names of the keys.
+        :rtype: generator of BulkOperationResult of :class:`BackupKeyResult <azure.keyvault.models.BackupKeyResult>`
+        """
+        return self.map(lambda name: self.client.backup_key(vault_base_url, name), key_names)
+
+    def get_certificates(self, certificates):
+        """
+        Gets certificates.
+        :param certificates: The certificate identifiers, or CertificateItem, such as returned by
+        KeyVaultClient.get_certificates. The latest version is returned when an identifier has no version.
+        :rtype: generator of BulkOperationResult of :class:`CertificateBundle
+         <azure.keyvault.models.CertificateBundle>`
+        """
+        def get_certificate(item):
+            certificate_id = _get_object_id(item, 'certificates')
+            return self.client.get_certificate(certificate_id.vault, certificate_id.name, certificate_id.version)
+        return self.map(get_certificate, certificates)
+
+    def get_all_certificates(self, vault_base_url, maxresults=None):
+        """
+        Gets the latest version of every certificate of a vault, while the certificates are listed.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page of the listing.
+        :type maxresults: int
+        :rtype: generator of BulkOperationResult of :class:`CertificateBundle
+         <azure.keyvault.models.CertificateBundle>`
+        """
+        return self.get_certificates(self.client.get_certificates(vault_base_url, maxresults))
+
+    def delete_certificates(self, vault_base_url, certificate_names):
+        """
+        Deletes certificates.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param certificate_names: The names of the certificates.
+        :rtype: generator of BulkOperationResult of :class:`DeletedCertificateBundle
+         <azure.keyvault.models.DeletedCertificateBundle>`
+        """
+        return self.map(lambda name: self.client.delete_certificate(vault_base_url, name), certificate_names)
+
+    def _perform(self, operation, item):
+        retries = 0
+        while True:
+            self._throttle.acquire()
+            try:
+                result = operation(item)
+            except Exception as ex:  # pylint: disable=broad-except
+                retry_after = _get_retry_after(ex)
+                self._throttle.release(retry_after)
+                if retry_after is None or retries >= self.max_retries:
+                    return BulkOperationResult(item, error=ex)
+                retries += 1
+                continue
+            self._throttle.release()
+            return BulkOperationResult(item, result)
@@ -0,0 +1,197 @@
+#---------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+#---------------------------------------------------------------------------------------------
+
+import threading
+import time
+from collections import OrderedDict
+
+from .key_vault_id import KeyVaultId, KeyVaultObjectId, KeyId, SecretId, CertificateId
+
+
+class _CacheEntry(object):
+    __slots__ = ('value', 'expires_on')
+
+    def __init__(self, value, expires_on):
+        self.value = value
+        self.expires_on = expires_on
+
+
+class _Fetch(object):
+    """ A request to the vault in flight, shared by every caller asking for the same object. """
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class KeyVaultCache(object):
+    """
+    Caches the secrets, keys and certificates returned by a KeyVaultClient.
+    :Example Usage:
+            cache = KeyVaultCache(KeyVaultClient(KeyVaultAuthentication(auth_callack)), ttl=60)
+            secret = cache.get_secret('https://myvault.vault.azure.net', 'mysecret')
+
+    Objects are cached by their identifier, normalized with KeyVaultId, and are requested again from the vault once
+    they are older than ttl seconds. When max_size objects are cached, the least recently used one is evicted.
+    Concurrent requests for an object which is not cached result in a single request to the vault, whose result or
+    error is shared by all the callers.
+
+    The hits, stale_hits, misses and fetches attributes count the objects returned from the cache, the objects
+    returned from the cache while they were being refreshed, the objects which were not cached, and the requests
+    sent to the vault.
+    """
+
+    def __init__(self, client, ttl=300, max_size=1024, stale_ttl=0):
+        """
+        Creates a new KeyVaultCache instance.
+        :param client: The KeyVaultClient used to request the objects from the vault.
+        :param ttl: The number of seconds an object is returned from the cache before it is requested again.
+        :param max_size: The maximum number of cached objects.
+        :param stale_ttl: The number of seconds after ttl during which an expired object is still returned from the
+        cache, while it is refreshed on a background thread. Expired objects are requested again before being returned
+        when 0.
+        """
+        if client is None:
+            raise ValueError("Parameter 'client' must not be None.")
+        if ttl < 0:
+            raise ValueError("Parameter 'ttl' must not be negative.")
+        if max_size < 1:
+            raise ValueError("Parameter 'max_size' must be greater than zero.")
+        if stale_ttl < 0:
+            raise ValueError("Parameter 'stale_ttl' must not be negative.")
+
+        self.client = client
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._fetches = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_secret(self, vault_base_url, secret_name, secret_version=KeyVaultId.version_none):
+        """
+        Gets a secret from the cache, or from the vault if it is not cached.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param secret_name: The name of the secret.
+        :type secret_name: str
+        :param secret_version: The version of the secret. The latest version when empty.
+        :type secret_version: str
+        :rtype: :class:`SecretBundle <azure.keyvault.models.SecretBundle>`
+        """
+        secret_id = SecretId(vault=vault_base_url, name=secret_name, version=secret_version)
+        return self._get(secret_id, self.client.get_secret)
+
+    def get_key(self, vault_base_url, key_name, key_version=KeyVaultId.version_none):
+        """
+        Gets the public part of a key from the cache, or from the vault if it is not cached.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_name: The name of the key.
+        :type key_name: str
+        :param key_version: The version of the key. The latest version when empty.
+        :type key_version: str
+        :rtype: :class:`KeyBundle <azure.keyvault.models.KeyBundle>`
+        """
+        key_id = KeyId(vault=vault_base_url, name=key_name, version=key_version)
+        return self._get(key_id, self.client.get_key)
+
+    def get_certificate(self, vault_base_url, certificate_name, certificate_version=KeyVaultId.version_none):
+        """
+        Gets a certificate from the cache, or from the vault if it is not cached.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param certificate_name: The name of the certificate.
+        :type certificate_name: str
+        :param certificate_version: The version of the certificate. The latest version when empty.
+        :type certificate_version: str
+        :rtype: :class:`CertificateBundle <azure.keyvault.models.CertificateBundle>`
+        """
+        certificate_id = CertificateId(vault=vault_base_url, name=certificate_name, version=certificate_version)
+        return self._get(certificate_id, self.client.get_certificate)
+
+    def invalidate(self, object_id):
+        """
+        Removes an object from the cache, so that it is requested from the vault the next time it is asked for.
+        :param object_id: The identifier of the object, as a KeyVaultId, a KeyVaultObjectId or a str, which is parsed
+         with KeyVaultObjectId.parse.
+        """
+        if isinstance(object_id, (KeyVaultId, KeyVaultObjectId)):
+            key = object_id.id
+        else:
+            key = KeyVaultObjectId.parse(object_id).id
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """ Removes all the objects from the cache. """
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, object_id, get_object):
+        key = object_id.id
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and now < entry.expires_on + self.stale_ttl:
+                # re-insert the entry to mark it as the most recently used
+                self._entries[key] = entry
+                self.hits += 1
+                if now < entry.expires_on:
+                    return entry.value
+                self.stale_hits += 1
+                if key in self._fetches:
+                    return entry.value
+                fetch = self._fetches[key] = _Fetch()
+            else:
+                entry = None
+                self.misses += 1
+                fetch = self._fetches.get(key)
+                owner = fetch is None
+                if owner:
+                    fetch = self._fetches[key] = _Fetch()
+
+        if entry is not None:
+            # the expired object is returned while it is refreshed in the background
+            thread = threading.Thread(target=self._fetch, args=(key, object_id, get_object, fetch))
+            thread.daemon = True
+            thread.start()
+            return entry.value
+
+        if owner:
+            self._fetch(key, object_id, get_object, fetch)
+        else:
+            fetch.done.wait()
+
+        if fetch.error is not None:
+            raise fetch.error
+        return fetch.value
+
+    def _fetch(self, key, object_id, get_object, fetch):
+        try:
+            with self._lock:
+                self.fetches += 1
+            fetch.value = get_object(object_id.vault, object_id.name, object_id.version or KeyVaultId.version_none)
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = _CacheEntry(fetch.value, time.time() + self.ttl)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        except Exception as ex:  # pylint: disable=broad-except
+            fetch.error = ex
+        finally:
+            with self._lock:
+                del self._fetches[key]
+            fetch.done.set()
@@ -5,6 +5,7 @@
 
 import uuid
 from msrest.pipeline import ClientRawResponse
+from azure.common.paging import read_ahead
 
 from ..key_vault_client import KeyVaultClient as KeyVaultClientBase
 from ..models import KeyVaultErrorException
@@ -70,3 +71,162 @@ class CustomKeyVaultClient(KeyVaultClientBase):
             return client_raw_response
 
         return deserialized
+
+    def get_keys(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the keys in a specified key vault. See KeyVaultClient.get_keys.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`KeyItemPaged <azure.keyvault.models.KeyItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_keys(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_key_versions(self, vault_base_url, key_name, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the versions of a key in a specified key vault. See KeyVaultClient.get_key_versions.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_name: The name of the key.
+        :type key_name: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`KeyItemPaged <azure.keyvault.models.KeyItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_key_versions(
+            vault_base_url, key_name, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_deleted_keys(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the deleted keys in a specified key vault. See KeyVaultClient.get_deleted_keys.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`DeletedKeyItemPaged <azure.keyvault.models.DeletedKeyItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_deleted_keys(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_secrets(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the secrets in a specified key vault. See KeyVaultClient.get_secrets.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`SecretItemPaged <azure.keyvault.models.SecretItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_secrets(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_secret_versions(self, vault_base_url, secret_name, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the versions of a secret in a specified key vault. See KeyVaultClient.get_secret_versions.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param secret_name: The name of the secret.
+        :type secret_name: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`SecretItemPaged <azure.keyvault.models.SecretItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_secret_versions(
+            vault_base_url, secret_name, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_deleted_secrets(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the deleted secrets in a specified key vault. See KeyVaultClient.get_deleted_secrets.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`DeletedSecretItemPaged <azure.keyvault.models.DeletedSecretItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_deleted_secrets(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_certificates(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the certificates in a specified key vault. See KeyVaultClient.get_certificates.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`CertificateItemPaged <azure.keyvault.models.CertificateItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_certificates(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_certificate_versions(self, vault_base_url, certificate_name, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the versions of a certificate in a specified key vault. See KeyVaultClient.get_certificate_versions.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param certificate_name: The name of the certificate.
+        :type certificate_name: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`CertificateItemPaged <azure.keyvault.models.CertificateItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_certificate_versions(
+            vault_base_url, certificate_name, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
+
+    def get_deleted_certificates(self, vault_base_url, maxresults=None, custom_headers=None, raw=False, prefetch=False, **operation_config):
+        """List the deleted certificates in a specified key vault. See KeyVaultClient.get_deleted_certificates.
+
+        :param vault_base_url: The vault name, for example
+         https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param maxresults: Maximum number of results to return in a page.
+        :type maxresults: int
+        :param bool prefetch: requests the next page on a background thread
+         while the current page is consumed. See
+         :func:`read_ahead <azure.common.paging.read_ahead>`.
+        :rtype: :class:`DeletedCertificateItemPaged <azure.keyvault.models.DeletedCertificateItemPaged>`
+        """
+        paged = super(CustomKeyVaultClient, self).get_deleted_certificates(
+            vault_base_url, maxresults, custom_headers, raw, **operation_config)
+        return read_ahead(paged) if prefetch else paged
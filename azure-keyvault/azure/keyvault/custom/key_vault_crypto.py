@@ -0,0 +1,241 @@
+#---------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+#---------------------------------------------------------------------------------------------
+
+import binascii
+import calendar
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa, utils
+except ImportError:  # pragma: no cover
+    rsa = None
+
+from ..models import KeyOperationResult, KeyVerifyResult
+from .key_vault_cache import KeyVaultCache
+
+
+def _oaep_padding():
+    return padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA1()), algorithm=hashes.SHA1(), label=None)
+
+
+def _oaep_256_padding():
+    return padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+def _pkcs1v15_padding():
+    return padding.PKCS1v15()
+
+
+# paddings of the encryption algorithms performed locally, by JsonWebKeyEncryptionAlgorithm value
+_ENCRYPTION_PADDINGS = {
+    'RSA-OAEP': _oaep_padding,
+    'RSA-OAEP-256': _oaep_256_padding,
+    'RSA1_5': _pkcs1v15_padding,
+}
+
+# digest algorithms of the signature algorithms verified locally, by JsonWebKeySignatureAlgorithm value
+_SIGNATURE_HASHES = {
+    'RS256': lambda: hashes.SHA256(),
+    'RS384': lambda: hashes.SHA384(),
+    'RS512': lambda: hashes.SHA512(),
+}
+
+_RSA_KEY_TYPES = ('RSA', 'RSA-HSM')
+
+
+def _bytes_to_int(value):
+    return int(binascii.hexlify(value), 16)
+
+
+def _timestamp(value):
+    # seconds since Epoch of the unix-time attributes, deserialized as UTC datetimes
+    return calendar.timegm(value.utctimetuple())
+
+
+def _is_usable(attributes):
+    """
+    Returns whether the attributes of a key allow its use now, as the vault checks before performing an operation.
+    """
+    if attributes is None:
+        return True
+    if attributes.enabled is False:
+        return False
+    now = time.time()
+    if attributes.not_before is not None and now < _timestamp(attributes.not_before):
+        return False
+    if attributes.expires is not None and now >= _timestamp(attributes.expires):
+        return False
+    return True
+
+
+def _algorithm_value(algorithm):
+    # algorithms can be given as str or as JsonWebKeyEncryptionAlgorithm / JsonWebKeySignatureAlgorithm
+    return getattr(algorithm, 'value', algorithm)
+
+
+class KeyVaultCryptoProvider(object):
+    """
+    Performs the public key operations of RSA keys stored in a key vault in-process.
+    :Example Usage:
+            crypto = KeyVaultCryptoProvider(KeyVaultClient(KeyVaultAuthentication(auth_callack)))
+            result = crypto.wrap_key('https://myvault.vault.azure.net', 'mykey', '', 'RSA-OAEP', content_key)
+
+    encrypt and wrap_key with the RSA-OAEP, RSA-OAEP-256 and RSA1_5 algorithms, and verify with the RS256, RS384 and
+    RS512 algorithms, are performed with the public part of the key, which is requested once from the vault and
+    cached. The other operations and algorithms, the keys which are not RSA keys or do not allow the operation, the
+    keys which are disabled, expired or not yet valid, and the calls with custom_headers, raw or operation config are
+    sent to the vault with the KeyVaultClient, which returns the error of the vault for the keys it can't use.
+    """
+
+    def __init__(self, client, key_ttl=300, max_keys=128):
+        """
+        Creates a new KeyVaultCryptoProvider instance.
+        :param client: The KeyVaultClient used to request the keys and the operations which are not performed locally.
+        :param key_ttl: The number of seconds a key is cached before it is requested again, to pick up the new versions
+        of the keys requested without version.
+        :param max_keys: The maximum number of cached keys.
+        """
+        if rsa is None:
+            raise ImportError('KeyVaultCryptoProvider requires the cryptography package.')
+        if client is None:
+            raise ValueError("Parameter 'client' must not be None.")
+
+        self.client = client
+        self._keys = KeyVaultCache(client, ttl=key_ttl, max_size=max_keys)
+        self._public_keys = OrderedDict()
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+
+    def encrypt(self, vault_base_url, key_name, key_version, algorithm, value, **operation_config):
+        """
+        Encrypts a single block of data with the public part of a key.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_name: The name of the key.
+        :type key_name: str
+        :param key_version: The version of the key.
+        :type key_version: str
+        :param algorithm: algorithm identifier. Possible values include: 'RSA-OAEP', 'RSA-OAEP-256', 'RSA1_5'
+        :type algorithm: str or :class:`JsonWebKeyEncryptionAlgorithm
+         <azure.keyvault.models.JsonWebKeyEncryptionAlgorithm>`
+        :param value: The data to encrypt.
+        :type value: bytes
+        :rtype: :class:`KeyOperationResult <azure.keyvault.models.KeyOperationResult>`
+        """
+        result = self._encrypt(vault_base_url, key_name, key_version, algorithm, value, 'encrypt', operation_config)
+        if result is None:
+            return self.client.encrypt(vault_base_url, key_name, key_version, algorithm, value, **operation_config)
+        return result
+
+    def wrap_key(self, vault_base_url, key_name, key_version, algorithm, value, **operation_config):
+        """
+        Wraps a symmetric key with the public part of a key.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_name: The name of the key.
+        :type key_name: str
+        :param key_version: The version of the key.
+        :type key_version: str
+        :param algorithm: algorithm identifier. Possible values include: 'RSA-OAEP', 'RSA-OAEP-256', 'RSA1_5'
+        :type algorithm: str or :class:`JsonWebKeyEncryptionAlgorithm
+         <azure.keyvault.models.JsonWebKeyEncryptionAlgorithm>`
+        :param value: The symmetric key to wrap.
+        :type value: bytes
+        :rtype: :class:`KeyOperationResult <azure.keyvault.models.KeyOperationResult>`
+        """
+        result = self._encrypt(vault_base_url, key_name, key_version, algorithm, value, 'wrapKey', operation_config)
+        if result is None:
+            return self.client.wrap_key(vault_base_url, key_name, key_version, algorithm, value, **operation_config)
+        return result
+
+    def verify(self, vault_base_url, key_name, key_version, algorithm, digest, signature, **operation_config):
+        """
+        Verifies a signature with the public part of a key.
+        :param vault_base_url: The vault name, for example https://myvault.vault.azure.net.
+        :type vault_base_url: str
+        :param key_name: The name of the key.
+        :type key_name: str
+        :param key_version: The version of the key.
+        :type key_version: str
+        :param algorithm: The signing/verification algorithm. Possible values include: 'PS256', 'PS384', 'PS512',
+         'RS256', 'RS384', 'RS512', 'RSNULL'
+        :type algorithm: str or :class:`JsonWebKeySignatureAlgorithm
+         <azure.keyvault.models.JsonWebKeySignatureAlgorithm>`
+        :param digest: The digest used for signing.
+        :type digest: bytes
+        :param signature: The signature to be verified.
+        :type signature: bytes
+        :rtype: :class:`KeyVerifyResult <azure.keyvault.models.KeyVerifyResult>`
+        """
+        get_hash = _SIGNATURE_HASHES.get(_algorithm_value(algorithm))
+        public_key = None
+        if get_hash is not None and not operation_config:
+            _, public_key = self._get_public_key(vault_base_url, key_name, key_version, 'verify')
+        if public_key is None:
+            return self.client.verify(vault_base_url, key_name, key_version, algorithm, digest, signature,
+                                      **operation_config)
+
+        result = KeyVerifyResult()
+        try:
+            public_key.verify(signature, digest, padding.PKCS1v15(), utils.Prehashed(get_hash()))
+            result.value = True
+        except InvalidSignature:
+            result.value = False
+        return result
+
+    def decrypt(self, vault_base_url, key_name, key_version, algorithm, value, **operation_config):
+        """ Decrypts a single block of data in the vault. See KeyVaultClient.decrypt. """
+        return self.client.decrypt(vault_base_url, key_name, key_version, algorithm, value, **operation_config)
+
+    def unwrap_key(self, vault_base_url, key_name, key_version, algorithm, value, **operation_config):
+        """ Unwraps a symmetric key in the vault. See KeyVaultClient.unwrap_key. """
+        return self.client.unwrap_key(vault_base_url, key_name, key_version, algorithm, value, **operation_config)
+
+    def sign(self, vault_base_url, key_name, key_version, algorithm, value, **operation_config):
+        """ Creates a signature from a digest in the vault. See KeyVaultClient.sign. """
+        return self.client.sign(vault_base_url, key_name, key_version, algorithm, value, **operation_config)
+
+    def _encrypt(self, vault_base_url, key_name, key_version, algorithm, value, key_op, operation_config):
+        get_padding = _ENCRYPTION_PADDINGS.get(_algorithm_value(algorithm))
+        if get_padding is None or operation_config:
+            return None
+        kid, public_key = self._get_public_key(vault_base_url, key_name, key_version, key_op)
+        if public_key is None:
+            return None
+
+        result = KeyOperationResult()
+        result.kid = kid
+        result.result = public_key.encrypt(value, get_padding())
+        return result
+
+    def _get_public_key(self, vault_base_url, key_name, key_version, key_op):
+        """
+        Returns the kid and the public key of a key, or (None, None) if the operation can't be performed locally.
+        """
+        bundle = self._keys.get_key(vault_base_url, key_name, key_version)
+        # checked on each call, a cached key may have expired since it was requested
+        if not _is_usable(bundle.attributes):
+            return None, None
+        key = bundle.key
+        if key.kty not in _RSA_KEY_TYPES or not (key.n and key.e):
+            return None, None
+        if key.key_ops is not None and key_op not in key.key_ops:
+            return None, None
+
+        with self._lock:
+            public_key = self._public_keys.pop(key.kid, None)
+        if public_key is None:
+            public_numbers = rsa.RSAPublicNumbers(_bytes_to_int(key.e), _bytes_to_int(key.n))
+            public_key = public_numbers.public_key(default_backend())
+        with self._lock:
+            self._public_keys[key.kid] = public_key
+            while len(self._public_keys) > self._max_keys:
+                self._public_keys.popitem(last=False)
+        return key.kid, public_key
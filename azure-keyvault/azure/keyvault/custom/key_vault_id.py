@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # ---------------------------------------------------------------------------------------------
 
+import re
+import weakref
+
 try:
     import urllib.parse as parse
 except ImportError:
@@ -419,6 +422,102 @@ class StorageSasDefinitionId(KeyVaultIdentifier):
         super(StorageSasDefinitionId, self).__init__(uri=uri, collection='storage', vault=vault, account_name=account_name, sas_definition=sas_definition)
 
 
+# {vault}/{collection}/{name}/{version?} identifiers, the vault being scheme://hostname as parsed by urlparse
+_OBJECT_ID_PATTERN = re.compile(
+    r'^(?P<scheme>[a-zA-Z][a-zA-Z0-9+.-]*)://(?:[^@/?#]*@)?(?P<host>[^:/?#\s]+)(?::[0-9]*)?'
+    r'/+(?P<collection>[^/?#\s]+)/+(?P<name>[^/?#\s]+)(?:/+(?P<version>[^/?#\s]+))?/*(?:[?#].*)?$')
+
+# the KeyVaultObjectId in use, by the identifier they were parsed from
+_interned_ids = weakref.WeakValueDictionary()
+
+
+class KeyVaultObjectId(object):
+    """
+    A compact, immutable identifier of a key, secret or certificate, for processing many identifiers.
+    :Example Usage:
+            for item in client.get_secrets(vault_base_url):
+                secret_id = KeyVaultObjectId.parse(item.id, 'secrets')
+                print(secret_id.vault, secret_id.name, secret_id.base_id)
+
+    The id and base_id are formatted once, and the instances can be used as dict keys. KeyVaultObjectId.parse returns
+    the same instance for an identifier as long as the instance is in use, without parsing the identifier again.
+    """
+    __slots__ = ('vault', 'collection', 'name', 'version', 'base_id', 'id', '__weakref__')
+
+    def __init__(self, vault, collection, name, version=None):
+        """
+        :param vault: The vault URI, for example https://myvault.vault.azure.net.
+        :type vault: str
+        :param collection: The resource collection type, for example keys.
+        :type collection: str
+        :param name: The resource name.
+        :type name: str
+        :param version: The resource version.
+        :type version: str
+        """
+        vault = _validate_string_argument(vault, 'vault').rstrip('/')
+        collection = _validate_string_argument(collection, 'collection')
+        name = _validate_string_argument(name, 'name')
+        version = _validate_string_argument(version, 'version', True) or KeyVaultId.version_none
+        base_id = '{}/{}/{}'.format(vault, collection, name)
+
+        set_attribute = super(KeyVaultObjectId, self).__setattr__
+        set_attribute('vault', vault)
+        set_attribute('collection', collection)
+        set_attribute('name', name)
+        set_attribute('version', version)
+        set_attribute('base_id', base_id)
+        set_attribute('id', '{}/{}'.format(base_id, version) if version else base_id)
+
+    @classmethod
+    def parse(cls, id, collection=None):
+        """
+        Parses an identifier, returning the instance already parsed from it if it is still in use.
+        :param id: The resource uri.
+        :type id: str
+        :param collection: The expected resource collection type. Any collection is accepted when None.
+        :type collection: str
+        :rtype: KeyVaultObjectId
+        """
+        object_id = _interned_ids.get(id)
+        if object_id is None:
+            match = _OBJECT_ID_PATTERN.match(id.strip()) if hasattr(id, 'strip') else None
+            if match is None:
+                raise ValueError('invalid id: The specified uri "{}" is not a key vault object identifier'.format(id))
+            scheme, host, parsed_collection, name, version = match.groups()
+            object_id = cls('{}://{}'.format(scheme.lower(), host.lower()), parsed_collection, name, version)
+            object_id = _interned_ids.setdefault(id, object_id)
+
+        if collection is not None and collection != object_id.collection:
+            raise ValueError('invalid id: The collection "{}" does not match the expected "{}"'.format(
+                object_id.collection, collection))
+        return object_id
+
+    def __setattr__(self, name, value):
+        raise AttributeError('KeyVaultObjectId is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('KeyVaultObjectId is immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, KeyVaultObjectId) and self.id == other.id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __reduce__(self):
+        return KeyVaultObjectId, (self.vault, self.collection, self.name, self.version)
+
+    def __str__(self):
+        return self.id
+
+    def __repr__(self):
+        return 'KeyVaultObjectId({!r})'.format(self.id)
+
+
 def _validate_string_argument(prop, name, nullable=False):
     try:
         prop = prop.strip()
@@ -79,7 +79,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         'msrestazure~=0.4.7',
-        'azure-common~=1.1.5',
+        'azure-common~=1.1.7',
     ],
     cmdclass=cmdclass
 )
@@ -11,6 +11,7 @@
 
 from msrest.service_client import ServiceClient
 from msrest import Serializer, Deserializer
+from azure.common.lazy_models import get_model_dependencies, operation_group
 from msrestazure import AzureConfiguration
 from ..version import VERSION
 
@@ -75,10 +76,11 @@ class ComputeManagementClient(object):
         self.config = ComputeManagementClientConfiguration(credentials, subscription_id, base_url)
         self._client = ServiceClient(self.config.credentials, self.config)
 
-        client_models = {k: v for k, v in self.models(api_version).__dict__.items() if isinstance(v, type)}
+        client_models = get_model_dependencies(self.models(api_version))
         self.api_version = api_version
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
 
     @classmethod
     def models(cls, api_version=DEFAULT_API_VERSION):
@@ -103,7 +105,7 @@ class ComputeManagementClient(object):
             return models
         raise NotImplementedError("APIVersion {} is not available".format(api_version))
 
-    @property
+    @operation_group
     def availability_sets(self):
         """Instance depends on the API version:
 
@@ -124,7 +126,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def disks(self):
         """Instance depends on the API version:
 
@@ -139,7 +141,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def images(self):
         """Instance depends on the API version:
 
@@ -154,7 +156,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def resource_skus(self):
         """Instance depends on the API version:
 
@@ -166,7 +168,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def snapshots(self):
         """Instance depends on the API version:
 
@@ -181,7 +183,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def usage(self):
         """Instance depends on the API version:
 
@@ -202,7 +204,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_extension_images(self):
         """Instance depends on the API version:
 
@@ -223,7 +225,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_extensions(self):
         """Instance depends on the API version:
 
@@ -244,7 +246,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_images(self):
         """Instance depends on the API version:
 
@@ -265,7 +267,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_run_commands(self):
         """Instance depends on the API version:
 
@@ -277,7 +279,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_scale_set_extensions(self):
         """Instance depends on the API version:
 
@@ -289,7 +291,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_scale_set_vms(self):
         """Instance depends on the API version:
 
@@ -310,7 +312,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_scale_sets(self):
         """Instance depends on the API version:
 
@@ -331,7 +333,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machine_sizes(self):
         """Instance depends on the API version:
 
@@ -352,7 +354,7 @@ class ComputeManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_machines(self):
         """Instance depends on the API version:
 
@@ -11,6 +11,7 @@
 
 from msrest.service_client import ServiceClient
 from msrest import Serializer, Deserializer
+from azure.common.lazy_models import get_model_dependencies
 from msrestazure import AzureConfiguration
 from .version import VERSION
 from .operations.availability_sets_operations import AvailabilitySetsOperations
@@ -102,10 +103,11 @@ class ComputeManagementClient(object):
         self.config = ComputeManagementClientConfiguration(credentials, subscription_id, base_url)
         self._client = ServiceClient(self.config.credentials, self.config)
 
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+        client_models = get_model_dependencies(models)
         self.api_version = '2015-06-15'
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
 
         self.availability_sets = AvailabilitySetsOperations(
             self._client, self.config, self._serialize, self._deserialize)
@@ -9,133 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .instance_view_status import InstanceViewStatus
-from .sub_resource import SubResource
-from .sku import Sku
-from .availability_set import AvailabilitySet
-from .virtual_machine_size import VirtualMachineSize
-from .virtual_machine_extension_image import VirtualMachineExtensionImage
-from .virtual_machine_image_resource import VirtualMachineImageResource
-from .virtual_machine_extension_instance_view import VirtualMachineExtensionInstanceView
-from .virtual_machine_extension import VirtualMachineExtension
-from .purchase_plan import PurchasePlan
-from .os_disk_image import OSDiskImage
-from .data_disk_image import DataDiskImage
-from .virtual_machine_image import VirtualMachineImage
-from .usage_name import UsageName
-from .usage import Usage
-from .virtual_machine_capture_parameters import VirtualMachineCaptureParameters
-from .virtual_machine_capture_result import VirtualMachineCaptureResult
-from .plan import Plan
-from .hardware_profile import HardwareProfile
-from .image_reference import ImageReference
-from .key_vault_secret_reference import KeyVaultSecretReference
-from .key_vault_key_reference import KeyVaultKeyReference
-from .disk_encryption_settings import DiskEncryptionSettings
-from .virtual_hard_disk import VirtualHardDisk
-from .managed_disk_parameters import ManagedDiskParameters
-from .os_disk import OSDisk
-from .data_disk import DataDisk
-from .storage_profile import StorageProfile
-from .additional_unattend_content import AdditionalUnattendContent
-from .win_rm_listener import WinRMListener
-from .win_rm_configuration import WinRMConfiguration
-from .windows_configuration import WindowsConfiguration
-from .ssh_public_key import SshPublicKey
-from .ssh_configuration import SshConfiguration
-from .linux_configuration import LinuxConfiguration
-from .vault_certificate import VaultCertificate
-from .vault_secret_group import VaultSecretGroup
-from .os_profile import OSProfile
-from .network_interface_reference import NetworkInterfaceReference
-from .network_profile import NetworkProfile
-from .boot_diagnostics import BootDiagnostics
-from .diagnostics_profile import DiagnosticsProfile
-from .virtual_machine_extension_handler_instance_view import VirtualMachineExtensionHandlerInstanceView
-from .virtual_machine_agent_instance_view import VirtualMachineAgentInstanceView
-from .disk_instance_view import DiskInstanceView
-from .boot_diagnostics_instance_view import BootDiagnosticsInstanceView
-from .virtual_machine_identity import VirtualMachineIdentity
-from .virtual_machine_instance_view import VirtualMachineInstanceView
-from .virtual_machine import VirtualMachine
-from .upgrade_policy import UpgradePolicy
-from .image_os_disk import ImageOSDisk
-from .image_data_disk import ImageDataDisk
-from .image_storage_profile import ImageStorageProfile
-from .image import Image
-from .virtual_machine_scale_set_identity import VirtualMachineScaleSetIdentity
-from .virtual_machine_scale_set_os_profile import VirtualMachineScaleSetOSProfile
-from .virtual_machine_scale_set_managed_disk_parameters import VirtualMachineScaleSetManagedDiskParameters
-from .virtual_machine_scale_set_os_disk import VirtualMachineScaleSetOSDisk
-from .virtual_machine_scale_set_data_disk import VirtualMachineScaleSetDataDisk
-from .virtual_machine_scale_set_storage_profile import VirtualMachineScaleSetStorageProfile
-from .api_entity_reference import ApiEntityReference
-from .virtual_machine_scale_set_ip_configuration import VirtualMachineScaleSetIPConfiguration
-from .virtual_machine_scale_set_network_configuration import VirtualMachineScaleSetNetworkConfiguration
-from .virtual_machine_scale_set_network_profile import VirtualMachineScaleSetNetworkProfile
-from .virtual_machine_scale_set_extension import VirtualMachineScaleSetExtension
-from .virtual_machine_scale_set_extension_profile import VirtualMachineScaleSetExtensionProfile
-from .virtual_machine_scale_set_vm_profile import VirtualMachineScaleSetVMProfile
-from .virtual_machine_scale_set import VirtualMachineScaleSet
-from .virtual_machine_scale_set_vm_instance_ids import VirtualMachineScaleSetVMInstanceIDs
-from .virtual_machine_scale_set_vm_instance_required_ids import VirtualMachineScaleSetVMInstanceRequiredIDs
-from .virtual_machine_status_code_count import VirtualMachineStatusCodeCount
-from .virtual_machine_scale_set_instance_view_statuses_summary import VirtualMachineScaleSetInstanceViewStatusesSummary
-from .virtual_machine_scale_set_vm_extensions_summary import VirtualMachineScaleSetVMExtensionsSummary
-from .virtual_machine_scale_set_instance_view import VirtualMachineScaleSetInstanceView
-from .virtual_machine_scale_set_sku_capacity import VirtualMachineScaleSetSkuCapacity
-from .virtual_machine_scale_set_sku import VirtualMachineScaleSetSku
-from .virtual_machine_scale_set_vm import VirtualMachineScaleSetVM
-from .virtual_machine_scale_set_vm_instance_view import VirtualMachineScaleSetVMInstanceView
-from .api_error_base import ApiErrorBase
-from .inner_error import InnerError
-from .api_error import ApiError
-from .compute_long_running_operation_properties import ComputeLongRunningOperationProperties
-from .resource import Resource
-from .sub_resource_read_only import SubResourceReadOnly
-from .operation_status_response import OperationStatusResponse
-from .resource_update import ResourceUpdate
-from .image_disk_reference import ImageDiskReference
-from .creation_data import CreationData
-from .source_vault import SourceVault
-from .key_vault_and_secret_reference import KeyVaultAndSecretReference
-from .key_vault_and_key_reference import KeyVaultAndKeyReference
-from .encryption_settings import EncryptionSettings
-from .disk import Disk
-from .disk_update import DiskUpdate
-from .grant_access_data import GrantAccessData
-from .access_uri import AccessUri
-from .snapshot import Snapshot
-from .snapshot_update import SnapshotUpdate
-from .availability_set_paged import AvailabilitySetPaged
-from .virtual_machine_size_paged import VirtualMachineSizePaged
-from .usage_paged import UsagePaged
-from .image_paged import ImagePaged
-from .virtual_machine_paged import VirtualMachinePaged
-from .virtual_machine_scale_set_paged import VirtualMachineScaleSetPaged
-from .virtual_machine_scale_set_sku_paged import VirtualMachineScaleSetSkuPaged
-from .virtual_machine_scale_set_vm_paged import VirtualMachineScaleSetVMPaged
-from .disk_paged import DiskPaged
-from .snapshot_paged import SnapshotPaged
-from .compute_management_client_enums import (
-    StatusLevelTypes,
-    OperatingSystemTypes,
-    VirtualMachineSizeTypes,
-    CachingTypes,
-    DiskCreateOptionTypes,
-    StorageAccountTypes,
-    PassNames,
-    ComponentNames,
-    SettingNames,
-    ProtocolTypes,
-    ResourceIdentityType,
-    UpgradeMode,
-    OperatingSystemStateTypes,
-    VirtualMachineScaleSetSkuScaleType,
-    DiskCreateOption,
-    AccessLevel,
-    InstanceViewTypes,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'InstanceViewStatus',
@@ -264,3 +138,131 @@ __all__ = [
     'AccessLevel',
     'InstanceViewTypes',
 ]
+
+lazy_models(__name__, {
+    'InstanceViewStatus': 'instance_view_status',
+    'SubResource': 'sub_resource',
+    'Sku': 'sku',
+    'AvailabilitySet': 'availability_set',
+    'VirtualMachineSize': 'virtual_machine_size',
+    'VirtualMachineExtensionImage': 'virtual_machine_extension_image',
+    'VirtualMachineImageResource': 'virtual_machine_image_resource',
+    'VirtualMachineExtensionInstanceView': 'virtual_machine_extension_instance_view',
+    'VirtualMachineExtension': 'virtual_machine_extension',
+    'PurchasePlan': 'purchase_plan',
+    'OSDiskImage': 'os_disk_image',
+    'DataDiskImage': 'data_disk_image',
+    'VirtualMachineImage': 'virtual_machine_image',
+    'UsageName': 'usage_name',
+    'Usage': 'usage',
+    'VirtualMachineCaptureParameters': 'virtual_machine_capture_parameters',
+    'VirtualMachineCaptureResult': 'virtual_machine_capture_result',
+    'Plan': 'plan',
+    'HardwareProfile': 'hardware_profile',
+    'ImageReference': 'image_reference',
+    'KeyVaultSecretReference': 'key_vault_secret_reference',
+    'KeyVaultKeyReference': 'key_vault_key_reference',
+    'DiskEncryptionSettings': 'disk_encryption_settings',
+    'VirtualHardDisk': 'virtual_hard_disk',
+    'ManagedDiskParameters': 'managed_disk_parameters',
+    'OSDisk': 'os_disk',
+    'DataDisk': 'data_disk',
+    'StorageProfile': 'storage_profile',
+    'AdditionalUnattendContent': 'additional_unattend_content',
+    'WinRMListener': 'win_rm_listener',
+    'WinRMConfiguration': 'win_rm_configuration',
+    'WindowsConfiguration': 'windows_configuration',
+    'SshPublicKey': 'ssh_public_key',
+    'SshConfiguration': 'ssh_configuration',
+    'LinuxConfiguration': 'linux_configuration',
+    'VaultCertificate': 'vault_certificate',
+    'VaultSecretGroup': 'vault_secret_group',
+    'OSProfile': 'os_profile',
+    'NetworkInterfaceReference': 'network_interface_reference',
+    'NetworkProfile': 'network_profile',
+    'BootDiagnostics': 'boot_diagnostics',
+    'DiagnosticsProfile': 'diagnostics_profile',
+    'VirtualMachineExtensionHandlerInstanceView': 'virtual_machine_extension_handler_instance_view',
+    'VirtualMachineAgentInstanceView': 'virtual_machine_agent_instance_view',
+    'DiskInstanceView': 'disk_instance_view',
+    'BootDiagnosticsInstanceView': 'boot_diagnostics_instance_view',
+    'VirtualMachineIdentity': 'virtual_machine_identity',
+    'VirtualMachineInstanceView': 'virtual_machine_instance_view',
+    'VirtualMachine': 'virtual_machine',
+    'UpgradePolicy': 'upgrade_policy',
+    'ImageOSDisk': 'image_os_disk',
+    'ImageDataDisk': 'image_data_disk',
+    'ImageStorageProfile': 'image_storage_profile',
+    'Image': 'image',
+    'VirtualMachineScaleSetIdentity': 'virtual_machine_scale_set_identity',
+    'VirtualMachineScaleSetOSProfile': 'virtual_machine_scale_set_os_profile',
+    'VirtualMachineScaleSetManagedDiskParameters': 'virtual_machine_scale_set_managed_disk_parameters',
+    'VirtualMachineScaleSetOSDisk': 'virtual_machine_scale_set_os_disk',
+    'VirtualMachineScaleSetDataDisk': 'virtual_machine_scale_set_data_disk',
+    'VirtualMachineScaleSetStorageProfile': 'virtual_machine_scale_set_storage_profile',
+    'ApiEntityReference': 'api_entity_reference',
+    'VirtualMachineScaleSetIPConfiguration': 'virtual_machine_scale_set_ip_configuration',
+    'VirtualMachineScaleSetNetworkConfiguration': 'virtual_machine_scale_set_network_configuration',
+    'VirtualMachineScaleSetNetworkProfile': 'virtual_machine_scale_set_network_profile',
+    'VirtualMachineScaleSetExtension': 'virtual_machine_scale_set_extension',
+    'VirtualMachineScaleSetExtensionProfile': 'virtual_machine_scale_set_extension_profile',
+    'VirtualMachineScaleSetVMProfile': 'virtual_machine_scale_set_vm_profile',
+    'VirtualMachineScaleSet': 'virtual_machine_scale_set',
+    'VirtualMachineScaleSetVMInstanceIDs': 'virtual_machine_scale_set_vm_instance_ids',
+    'VirtualMachineScaleSetVMInstanceRequiredIDs': 'virtual_machine_scale_set_vm_instance_required_ids',
+    'VirtualMachineStatusCodeCount': 'virtual_machine_status_code_count',
+    'VirtualMachineScaleSetInstanceViewStatusesSummary': 'virtual_machine_scale_set_instance_view_statuses_summary',
+    'VirtualMachineScaleSetVMExtensionsSummary': 'virtual_machine_scale_set_vm_extensions_summary',
+    'VirtualMachineScaleSetInstanceView': 'virtual_machine_scale_set_instance_view',
+    'VirtualMachineScaleSetSkuCapacity': 'virtual_machine_scale_set_sku_capacity',
+    'VirtualMachineScaleSetSku': 'virtual_machine_scale_set_sku',
+    'VirtualMachineScaleSetVM': 'virtual_machine_scale_set_vm',
+    'VirtualMachineScaleSetVMInstanceView': 'virtual_machine_scale_set_vm_instance_view',
+    'ApiErrorBase': 'api_error_base',
+    'InnerError': 'inner_error',
+    'ApiError': 'api_error',
+    'ComputeLongRunningOperationProperties': 'compute_long_running_operation_properties',
+    'Resource': 'resource',
+    'SubResourceReadOnly': 'sub_resource_read_only',
+    'OperationStatusResponse': 'operation_status_response',
+    'ResourceUpdate': 'resource_update',
+    'ImageDiskReference': 'image_disk_reference',
+    'CreationData': 'creation_data',
+    'SourceVault': 'source_vault',
+    'KeyVaultAndSecretReference': 'key_vault_and_secret_reference',
+    'KeyVaultAndKeyReference': 'key_vault_and_key_reference',
+    'EncryptionSettings': 'encryption_settings',
+    'Disk': 'disk',
+    'DiskUpdate': 'disk_update',
+    'GrantAccessData': 'grant_access_data',
+    'AccessUri': 'access_uri',
+    'Snapshot': 'snapshot',
+    'SnapshotUpdate': 'snapshot_update',
+    'AvailabilitySetPaged': 'availability_set_paged',
+    'VirtualMachineSizePaged': 'virtual_machine_size_paged',
+    'UsagePaged': 'usage_paged',
+    'ImagePaged': 'image_paged',
+    'VirtualMachinePaged': 'virtual_machine_paged',
+    'VirtualMachineScaleSetPaged': 'virtual_machine_scale_set_paged',
+    'VirtualMachineScaleSetSkuPaged': 'virtual_machine_scale_set_sku_paged',
+    'VirtualMachineScaleSetVMPaged': 'virtual_machine_scale_set_vm_paged',
+    'DiskPaged': 'disk_paged',
+    'SnapshotPaged': 'snapshot_paged',
+    'StatusLevelTypes': 'compute_management_client_enums',
+    'OperatingSystemTypes': 'compute_management_client_enums',
+    'VirtualMachineSizeTypes': 'compute_management_client_enums',
+    'CachingTypes': 'compute_management_client_enums',
+    'DiskCreateOptionTypes': 'compute_management_client_enums',
+    'StorageAccountTypes': 'compute_management_client_enums',
+    'PassNames': 'compute_management_client_enums',
+    'ComponentNames': 'compute_management_client_enums',
+    'SettingNames': 'compute_management_client_enums',
+    'ProtocolTypes': 'compute_management_client_enums',
+    'ResourceIdentityType': 'compute_management_client_enums',
+    'UpgradeMode': 'compute_management_client_enums',
+    'OperatingSystemStateTypes': 'compute_management_client_enums',
+    'VirtualMachineScaleSetSkuScaleType': 'compute_management_client_enums',
+    'DiskCreateOption': 'compute_management_client_enums',
+    'AccessLevel': 'compute_management_client_enums',
+    'InstanceViewTypes': 'compute_management_client_enums',
+})
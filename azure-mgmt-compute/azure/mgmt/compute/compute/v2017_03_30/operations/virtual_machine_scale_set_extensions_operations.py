@@ -11,7 +11,7 @@
 
 from msrest.pipeline import ClientRawResponse
 from msrestazure.azure_exceptions import CloudError
-from msrestazure.azure_operation import AzureOperationPoller
+from azure.common.operation_scheduler import AzureOperationPoller
 import uuid
 
 from .. import models
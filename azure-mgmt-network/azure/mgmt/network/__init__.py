@@ -11,11 +11,12 @@
 
 from msrest.service_client import ServiceClient
 from msrest import Serializer, Deserializer
+from azure.common.lazy_models import get_model_dependencies, operation_group
 from msrestazure import AzureConfiguration
 from .version import VERSION
 from msrest.pipeline import ClientRawResponse
 from msrestazure.azure_exceptions import CloudError
-from msrestazure.azure_operation import AzureOperationPoller
+from azure.common.operation_scheduler import AzureOperationPoller
 import uuid
 
 
@@ -79,10 +80,11 @@ class NetworkManagementClient(object):
         self.config = NetworkManagementClientConfiguration(credentials, subscription_id, base_url)
         self._client = ServiceClient(self.config.credentials, self.config)
 
-        client_models = {k: v for k, v in self.models(api_version).__dict__.items() if isinstance(v, type)}
+        client_models = get_model_dependencies(self.models(api_version))
         self.api_version = api_version
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
 
     def check_dns_name_availability(
             self, location, domain_name_label=None, custom_headers=None, raw=False, **operation_config):
@@ -152,7 +154,7 @@ class NetworkManagementClient(object):
             return models
         raise NotImplementedError("APIVersion {} is not available".format(api_version))
 
-    @property
+    @operation_group
     def application_gateways(self):
         """Instance depends on the API version:
 
@@ -176,7 +178,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def bgp_service_communities(self):
         """Instance depends on the API version:
 
@@ -194,7 +196,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def express_route_circuit_authorizations(self):
         """Instance depends on the API version:
 
@@ -218,7 +220,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def express_route_circuit_peerings(self):
         """Instance depends on the API version:
 
@@ -242,7 +244,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def express_route_circuits(self):
         """Instance depends on the API version:
 
@@ -266,7 +268,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def express_route_service_providers(self):
         """Instance depends on the API version:
 
@@ -290,7 +292,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def load_balancers(self):
         """Instance depends on the API version:
 
@@ -314,7 +316,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def local_network_gateways(self):
         """Instance depends on the API version:
 
@@ -338,7 +340,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def network_interfaces(self):
         """Instance depends on the API version:
 
@@ -362,7 +364,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def network_security_groups(self):
         """Instance depends on the API version:
 
@@ -386,7 +388,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def network_watchers(self):
         """Instance depends on the API version:
 
@@ -407,7 +409,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def packet_captures(self):
         """Instance depends on the API version:
 
@@ -428,7 +430,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def public_ip_addresses(self):
         """Instance depends on the API version:
 
@@ -452,7 +454,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def route_filter_rules(self):
         """Instance depends on the API version:
 
@@ -470,7 +472,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def route_filters(self):
         """Instance depends on the API version:
 
@@ -488,7 +490,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def route_tables(self):
         """Instance depends on the API version:
 
@@ -512,7 +514,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def routes(self):
         """Instance depends on the API version:
 
@@ -536,7 +538,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def security_rules(self):
         """Instance depends on the API version:
 
@@ -560,7 +562,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def subnets(self):
         """Instance depends on the API version:
 
@@ -584,7 +586,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def usages(self):
         """Instance depends on the API version:
 
@@ -608,7 +610,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_network_gateway_connections(self):
         """Instance depends on the API version:
 
@@ -632,7 +634,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_network_gateways(self):
         """Instance depends on the API version:
 
@@ -656,7 +658,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_network_peerings(self):
         """Instance depends on the API version:
 
@@ -677,7 +679,7 @@ class NetworkManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def virtual_networks(self):
         """Instance depends on the API version:
 
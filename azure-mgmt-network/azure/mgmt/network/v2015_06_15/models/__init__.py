@@ -9,126 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .application_gateway_sku import ApplicationGatewaySku
-from .sub_resource import SubResource
-from .application_gateway_ip_configuration import ApplicationGatewayIPConfiguration
-from .application_gateway_ssl_certificate import ApplicationGatewaySslCertificate
-from .application_gateway_frontend_ip_configuration import ApplicationGatewayFrontendIPConfiguration
-from .application_gateway_frontend_port import ApplicationGatewayFrontendPort
-from .application_gateway_backend_address import ApplicationGatewayBackendAddress
-from .backend_address_pool import BackendAddressPool
-from .inbound_nat_rule import InboundNatRule
-from .security_rule import SecurityRule
-from .network_interface_dns_settings import NetworkInterfaceDnsSettings
-from .network_interface import NetworkInterface
-from .network_security_group import NetworkSecurityGroup
-from .route import Route
-from .route_table import RouteTable
-from .public_ip_address_dns_settings import PublicIPAddressDnsSettings
-from .public_ip_address import PublicIPAddress
-from .ip_configuration import IPConfiguration
-from .subnet import Subnet
-from .network_interface_ip_configuration import NetworkInterfaceIPConfiguration
-from .application_gateway_backend_address_pool import ApplicationGatewayBackendAddressPool
-from .application_gateway_backend_http_settings import ApplicationGatewayBackendHttpSettings
-from .application_gateway_http_listener import ApplicationGatewayHttpListener
-from .application_gateway_path_rule import ApplicationGatewayPathRule
-from .application_gateway_probe import ApplicationGatewayProbe
-from .application_gateway_request_routing_rule import ApplicationGatewayRequestRoutingRule
-from .application_gateway_url_path_map import ApplicationGatewayUrlPathMap
-from .application_gateway import ApplicationGateway
-from .resource import Resource
-from .dns_name_availability_result import DnsNameAvailabilityResult
-from .frontend_ip_configuration import FrontendIPConfiguration
-from .load_balancing_rule import LoadBalancingRule
-from .probe import Probe
-from .inbound_nat_pool import InboundNatPool
-from .outbound_nat_rule import OutboundNatRule
-from .load_balancer import LoadBalancer
-from .address_space import AddressSpace
-from .dhcp_options import DhcpOptions
-from .virtual_network import VirtualNetwork
-from .usage_name import UsageName
-from .usage import Usage
-from .virtual_network_gateway_ip_configuration import VirtualNetworkGatewayIPConfiguration
-from .virtual_network_gateway_sku import VirtualNetworkGatewaySku
-from .vpn_client_root_certificate import VpnClientRootCertificate
-from .vpn_client_revoked_certificate import VpnClientRevokedCertificate
-from .vpn_client_configuration import VpnClientConfiguration
-from .bgp_settings import BgpSettings
-from .virtual_network_gateway import VirtualNetworkGateway
-from .vpn_client_parameters import VpnClientParameters
-from .local_network_gateway import LocalNetworkGateway
-from .virtual_network_gateway_connection import VirtualNetworkGatewayConnection
-from .connection_shared_key_result import ConnectionSharedKeyResult
-from .connection_reset_shared_key import ConnectionResetSharedKey
-from .connection_shared_key import ConnectionSharedKey
-from .express_route_circuit_authorization import ExpressRouteCircuitAuthorization
-from .express_route_circuit_peering_config import ExpressRouteCircuitPeeringConfig
-from .express_route_circuit_stats import ExpressRouteCircuitStats
-from .express_route_circuit_peering import ExpressRouteCircuitPeering
-from .express_route_circuit_sku import ExpressRouteCircuitSku
-from .express_route_circuit_service_provider_properties import ExpressRouteCircuitServiceProviderProperties
-from .express_route_circuit import ExpressRouteCircuit
-from .express_route_circuit_arp_table import ExpressRouteCircuitArpTable
-from .express_route_circuit_routes_table import ExpressRouteCircuitRoutesTable
-from .express_route_service_provider_bandwidths_offered import ExpressRouteServiceProviderBandwidthsOffered
-from .express_route_service_provider import ExpressRouteServiceProvider
-from .error_details import ErrorDetails
-from .error import Error
-from .azure_async_operation_result import AzureAsyncOperationResult
-from .application_gateway_paged import ApplicationGatewayPaged
-from .route_table_paged import RouteTablePaged
-from .route_paged import RoutePaged
-from .public_ip_address_paged import PublicIPAddressPaged
-from .network_security_group_paged import NetworkSecurityGroupPaged
-from .security_rule_paged import SecurityRulePaged
-from .load_balancer_paged import LoadBalancerPaged
-from .virtual_network_paged import VirtualNetworkPaged
-from .subnet_paged import SubnetPaged
-from .network_interface_paged import NetworkInterfacePaged
-from .usage_paged import UsagePaged
-from .virtual_network_gateway_paged import VirtualNetworkGatewayPaged
-from .virtual_network_gateway_connection_paged import VirtualNetworkGatewayConnectionPaged
-from .local_network_gateway_paged import LocalNetworkGatewayPaged
-from .express_route_circuit_authorization_paged import ExpressRouteCircuitAuthorizationPaged
-from .express_route_circuit_peering_paged import ExpressRouteCircuitPeeringPaged
-from .express_route_circuit_arp_table_paged import ExpressRouteCircuitArpTablePaged
-from .express_route_circuit_routes_table_paged import ExpressRouteCircuitRoutesTablePaged
-from .express_route_circuit_stats_paged import ExpressRouteCircuitStatsPaged
-from .express_route_circuit_paged import ExpressRouteCircuitPaged
-from .express_route_service_provider_paged import ExpressRouteServiceProviderPaged
-from .network_management_client_enums import (
-    ApplicationGatewaySkuName,
-    ApplicationGatewayTier,
-    IPAllocationMethod,
-    TransportProtocol,
-    SecurityRuleProtocol,
-    SecurityRuleAccess,
-    SecurityRuleDirection,
-    RouteNextHopType,
-    ApplicationGatewayProtocol,
-    ApplicationGatewayCookieBasedAffinity,
-    ApplicationGatewayRequestRoutingRuleType,
-    ApplicationGatewayOperationalState,
-    LoadDistribution,
-    ProbeProtocol,
-    VirtualNetworkGatewayType,
-    VpnType,
-    VirtualNetworkGatewaySkuName,
-    VirtualNetworkGatewaySkuTier,
-    ProcessorArchitecture,
-    VirtualNetworkGatewayConnectionType,
-    VirtualNetworkGatewayConnectionStatus,
-    AuthorizationUseStatus,
-    ExpressRouteCircuitPeeringAdvertisedPublicPrefixState,
-    ExpressRouteCircuitPeeringType,
-    ExpressRouteCircuitPeeringState,
-    ExpressRouteCircuitSkuTier,
-    ExpressRouteCircuitSkuFamily,
-    ServiceProviderProvisioningState,
-    NetworkOperationStatus,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'ApplicationGatewaySku',
@@ -250,3 +131,124 @@ __all__ = [
     'ServiceProviderProvisioningState',
     'NetworkOperationStatus',
 ]
+
+lazy_models(__name__, {
+    'ApplicationGatewaySku': 'application_gateway_sku',
+    'SubResource': 'sub_resource',
+    'ApplicationGatewayIPConfiguration': 'application_gateway_ip_configuration',
+    'ApplicationGatewaySslCertificate': 'application_gateway_ssl_certificate',
+    'ApplicationGatewayFrontendIPConfiguration': 'application_gateway_frontend_ip_configuration',
+    'ApplicationGatewayFrontendPort': 'application_gateway_frontend_port',
+    'ApplicationGatewayBackendAddress': 'application_gateway_backend_address',
+    'BackendAddressPool': 'backend_address_pool',
+    'InboundNatRule': 'inbound_nat_rule',
+    'SecurityRule': 'security_rule',
+    'NetworkInterfaceDnsSettings': 'network_interface_dns_settings',
+    'NetworkInterface': 'network_interface',
+    'NetworkSecurityGroup': 'network_security_group',
+    'Route': 'route',
+    'RouteTable': 'route_table',
+    'PublicIPAddressDnsSettings': 'public_ip_address_dns_settings',
+    'PublicIPAddress': 'public_ip_address',
+    'IPConfiguration': 'ip_configuration',
+    'Subnet': 'subnet',
+    'NetworkInterfaceIPConfiguration': 'network_interface_ip_configuration',
+    'ApplicationGatewayBackendAddressPool': 'application_gateway_backend_address_pool',
+    'ApplicationGatewayBackendHttpSettings': 'application_gateway_backend_http_settings',
+    'ApplicationGatewayHttpListener': 'application_gateway_http_listener',
+    'ApplicationGatewayPathRule': 'application_gateway_path_rule',
+    'ApplicationGatewayProbe': 'application_gateway_probe',
+    'ApplicationGatewayRequestRoutingRule': 'application_gateway_request_routing_rule',
+    'ApplicationGatewayUrlPathMap': 'application_gateway_url_path_map',
+    'ApplicationGateway': 'application_gateway',
+    'Resource': 'resource',
+    'DnsNameAvailabilityResult': 'dns_name_availability_result',
+    'FrontendIPConfiguration': 'frontend_ip_configuration',
+    'LoadBalancingRule': 'load_balancing_rule',
+    'Probe': 'probe',
+    'InboundNatPool': 'inbound_nat_pool',
+    'OutboundNatRule': 'outbound_nat_rule',
+    'LoadBalancer': 'load_balancer',
+    'AddressSpace': 'address_space',
+    'DhcpOptions': 'dhcp_options',
+    'VirtualNetwork': 'virtual_network',
+    'UsageName': 'usage_name',
+    'Usage': 'usage',
+    'VirtualNetworkGatewayIPConfiguration': 'virtual_network_gateway_ip_configuration',
+    'VirtualNetworkGatewaySku': 'virtual_network_gateway_sku',
+    'VpnClientRootCertificate': 'vpn_client_root_certificate',
+    'VpnClientRevokedCertificate': 'vpn_client_revoked_certificate',
+    'VpnClientConfiguration': 'vpn_client_configuration',
+    'BgpSettings': 'bgp_settings',
+    'VirtualNetworkGateway': 'virtual_network_gateway',
+    'VpnClientParameters': 'vpn_client_parameters',
+    'LocalNetworkGateway': 'local_network_gateway',
+    'VirtualNetworkGatewayConnection': 'virtual_network_gateway_connection',
+    'ConnectionSharedKeyResult': 'connection_shared_key_result',
+    'ConnectionResetSharedKey': 'connection_reset_shared_key',
+    'ConnectionSharedKey': 'connection_shared_key',
+    'ExpressRouteCircuitAuthorization': 'express_route_circuit_authorization',
+    'ExpressRouteCircuitPeeringConfig': 'express_route_circuit_peering_config',
+    'ExpressRouteCircuitStats': 'express_route_circuit_stats',
+    'ExpressRouteCircuitPeering': 'express_route_circuit_peering',
+    'ExpressRouteCircuitSku': 'express_route_circuit_sku',
+    'ExpressRouteCircuitServiceProviderProperties': 'express_route_circuit_service_provider_properties',
+    'ExpressRouteCircuit': 'express_route_circuit',
+    'ExpressRouteCircuitArpTable': 'express_route_circuit_arp_table',
+    'ExpressRouteCircuitRoutesTable': 'express_route_circuit_routes_table',
+    'ExpressRouteServiceProviderBandwidthsOffered': 'express_route_service_provider_bandwidths_offered',
+    'ExpressRouteServiceProvider': 'express_route_service_provider',
+    'ErrorDetails': 'error_details',
+    'Error': 'error',
+    'AzureAsyncOperationResult': 'azure_async_operation_result',
+    'ApplicationGatewayPaged': 'application_gateway_paged',
+    'RouteTablePaged': 'route_table_paged',
+    'RoutePaged': 'route_paged',
+    'PublicIPAddressPaged': 'public_ip_address_paged',
+    'NetworkSecurityGroupPaged': 'network_security_group_paged',
+    'SecurityRulePaged': 'security_rule_paged',
+    'LoadBalancerPaged': 'load_balancer_paged',
+    'VirtualNetworkPaged': 'virtual_network_paged',
+    'SubnetPaged': 'subnet_paged',
+    'NetworkInterfacePaged': 'network_interface_paged',
+    'UsagePaged': 'usage_paged',
+    'VirtualNetworkGatewayPaged': 'virtual_network_gateway_paged',
+    'VirtualNetworkGatewayConnectionPaged': 'virtual_network_gateway_connection_paged',
+    'LocalNetworkGatewayPaged': 'local_network_gateway_paged',
+    'ExpressRouteCircuitAuthorizationPaged': 'express_route_circuit_authorization_paged',
+    'ExpressRouteCircuitPeeringPaged': 'express_route_circuit_peering_paged',
+    'ExpressRouteCircuitArpTablePaged': 'express_route_circuit_arp_table_paged',
+    'ExpressRouteCircuitRoutesTablePaged': 'express_route_circuit_routes_table_paged',
+    'ExpressRouteCircuitStatsPaged': 'express_route_circuit_stats_paged',
+    'ExpressRouteCircuitPaged': 'express_route_circuit_paged',
+    'ExpressRouteServiceProviderPaged': 'express_route_service_provider_paged',
+    'ApplicationGatewaySkuName': 'network_management_client_enums',
+    'ApplicationGatewayTier': 'network_management_client_enums',
+    'IPAllocationMethod': 'network_management_client_enums',
+    'TransportProtocol': 'network_management_client_enums',
+    'SecurityRuleProtocol': 'network_management_client_enums',
+    'SecurityRuleAccess': 'network_management_client_enums',
+    'SecurityRuleDirection': 'network_management_client_enums',
+    'RouteNextHopType': 'network_management_client_enums',
+    'ApplicationGatewayProtocol': 'network_management_client_enums',
+    'ApplicationGatewayCookieBasedAffinity': 'network_management_client_enums',
+    'ApplicationGatewayRequestRoutingRuleType': 'network_management_client_enums',
+    'ApplicationGatewayOperationalState': 'network_management_client_enums',
+    'LoadDistribution': 'network_management_client_enums',
+    'ProbeProtocol': 'network_management_client_enums',
+    'VirtualNetworkGatewayType': 'network_management_client_enums',
+    'VpnType': 'network_management_client_enums',
+    'VirtualNetworkGatewaySkuName': 'network_management_client_enums',
+    'VirtualNetworkGatewaySkuTier': 'network_management_client_enums',
+    'ProcessorArchitecture': 'network_management_client_enums',
+    'VirtualNetworkGatewayConnectionType': 'network_management_client_enums',
+    'VirtualNetworkGatewayConnectionStatus': 'network_management_client_enums',
+    'AuthorizationUseStatus': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringAdvertisedPublicPrefixState': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringType': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringState': 'network_management_client_enums',
+    'ExpressRouteCircuitSkuTier': 'network_management_client_enums',
+    'ExpressRouteCircuitSkuFamily': 'network_management_client_enums',
+    'ServiceProviderProvisioningState': 'network_management_client_enums',
+    'NetworkOperationStatus': 'network_management_client_enums',
+})
@@ -9,242 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .sub_resource import SubResource
-from .backend_address_pool import BackendAddressPool
-from .inbound_nat_rule import InboundNatRule
-from .security_rule import SecurityRule
-from .network_interface_dns_settings import NetworkInterfaceDnsSettings
-from .network_interface import NetworkInterface
-from .network_security_group import NetworkSecurityGroup
-from .route import Route
-from .route_table import RouteTable
-from .public_ip_address_dns_settings import PublicIPAddressDnsSettings
-from .public_ip_address import PublicIPAddress
-from .ip_configuration import IPConfiguration
-from .resource_navigation_link import ResourceNavigationLink
-from .subnet import Subnet
-from .network_interface_ip_configuration import NetworkInterfaceIPConfiguration
-from .application_gateway_backend_address import ApplicationGatewayBackendAddress
-from .application_gateway_backend_address_pool import ApplicationGatewayBackendAddressPool
-from .application_gateway_connection_draining import ApplicationGatewayConnectionDraining
-from .application_gateway_backend_http_settings import ApplicationGatewayBackendHttpSettings
-from .application_gateway_backend_health_server import ApplicationGatewayBackendHealthServer
-from .application_gateway_backend_health_http_settings import ApplicationGatewayBackendHealthHttpSettings
-from .application_gateway_backend_health_pool import ApplicationGatewayBackendHealthPool
-from .application_gateway_backend_health import ApplicationGatewayBackendHealth
-from .application_gateway_sku import ApplicationGatewaySku
-from .application_gateway_ssl_policy import ApplicationGatewaySslPolicy
-from .application_gateway_ip_configuration import ApplicationGatewayIPConfiguration
-from .application_gateway_authentication_certificate import ApplicationGatewayAuthenticationCertificate
-from .application_gateway_ssl_certificate import ApplicationGatewaySslCertificate
-from .application_gateway_frontend_ip_configuration import ApplicationGatewayFrontendIPConfiguration
-from .application_gateway_frontend_port import ApplicationGatewayFrontendPort
-from .application_gateway_http_listener import ApplicationGatewayHttpListener
-from .application_gateway_path_rule import ApplicationGatewayPathRule
-from .application_gateway_probe_health_response_match import ApplicationGatewayProbeHealthResponseMatch
-from .application_gateway_probe import ApplicationGatewayProbe
-from .application_gateway_request_routing_rule import ApplicationGatewayRequestRoutingRule
-from .application_gateway_redirect_configuration import ApplicationGatewayRedirectConfiguration
-from .application_gateway_url_path_map import ApplicationGatewayUrlPathMap
-from .application_gateway_firewall_disabled_rule_group import ApplicationGatewayFirewallDisabledRuleGroup
-from .application_gateway_web_application_firewall_configuration import ApplicationGatewayWebApplicationFirewallConfiguration
-from .application_gateway import ApplicationGateway
-from .application_gateway_firewall_rule import ApplicationGatewayFirewallRule
-from .application_gateway_firewall_rule_group import ApplicationGatewayFirewallRuleGroup
-from .application_gateway_firewall_rule_set import ApplicationGatewayFirewallRuleSet
-from .application_gateway_available_waf_rule_sets_result import ApplicationGatewayAvailableWafRuleSetsResult
-from .application_gateway_available_ssl_options import ApplicationGatewayAvailableSslOptions
-from .application_gateway_ssl_predefined_policy import ApplicationGatewaySslPredefinedPolicy
-from .resource import Resource
-from .dns_name_availability_result import DnsNameAvailabilityResult
-from .express_route_circuit_authorization import ExpressRouteCircuitAuthorization
-from .express_route_circuit_peering_config import ExpressRouteCircuitPeeringConfig
-from .express_route_circuit_stats import ExpressRouteCircuitStats
-from .route_filter_rule import RouteFilterRule
-from .express_route_circuit_peering import ExpressRouteCircuitPeering
-from .route_filter import RouteFilter
-from .express_route_circuit_sku import ExpressRouteCircuitSku
-from .express_route_circuit_service_provider_properties import ExpressRouteCircuitServiceProviderProperties
-from .express_route_circuit import ExpressRouteCircuit
-from .express_route_circuit_arp_table import ExpressRouteCircuitArpTable
-from .express_route_circuits_arp_table_list_result import ExpressRouteCircuitsArpTableListResult
-from .express_route_circuit_routes_table import ExpressRouteCircuitRoutesTable
-from .express_route_circuits_routes_table_list_result import ExpressRouteCircuitsRoutesTableListResult
-from .express_route_circuit_routes_table_summary import ExpressRouteCircuitRoutesTableSummary
-from .express_route_circuits_routes_table_summary_list_result import ExpressRouteCircuitsRoutesTableSummaryListResult
-from .express_route_service_provider_bandwidths_offered import ExpressRouteServiceProviderBandwidthsOffered
-from .express_route_service_provider import ExpressRouteServiceProvider
-from .frontend_ip_configuration import FrontendIPConfiguration
-from .load_balancing_rule import LoadBalancingRule
-from .probe import Probe
-from .inbound_nat_pool import InboundNatPool
-from .outbound_nat_rule import OutboundNatRule
-from .load_balancer import LoadBalancer
-from .error_details import ErrorDetails
-from .error import Error
-from .azure_async_operation_result import AzureAsyncOperationResult
-from .effective_network_security_group_association import EffectiveNetworkSecurityGroupAssociation
-from .effective_network_security_rule import EffectiveNetworkSecurityRule
-from .effective_network_security_group import EffectiveNetworkSecurityGroup
-from .effective_network_security_group_list_result import EffectiveNetworkSecurityGroupListResult
-from .effective_route import EffectiveRoute
-from .effective_route_list_result import EffectiveRouteListResult
-from .network_watcher import NetworkWatcher
-from .topology_parameters import TopologyParameters
-from .topology_association import TopologyAssociation
-from .topology_resource import TopologyResource
-from .topology import Topology
-from .verification_ip_flow_parameters import VerificationIPFlowParameters
-from .verification_ip_flow_result import VerificationIPFlowResult
-from .next_hop_parameters import NextHopParameters
-from .next_hop_result import NextHopResult
-from .security_group_view_parameters import SecurityGroupViewParameters
-from .network_interface_association import NetworkInterfaceAssociation
-from .subnet_association import SubnetAssociation
-from .security_rule_associations import SecurityRuleAssociations
-from .security_group_network_interface import SecurityGroupNetworkInterface
-from .security_group_view_result import SecurityGroupViewResult
-from .packet_capture_storage_location import PacketCaptureStorageLocation
-from .packet_capture_filter import PacketCaptureFilter
-from .packet_capture_parameters import PacketCaptureParameters
-from .packet_capture import PacketCapture
-from .packet_capture_result import PacketCaptureResult
-from .packet_capture_query_status_result import PacketCaptureQueryStatusResult
-from .troubleshooting_parameters import TroubleshootingParameters
-from .query_troubleshooting_parameters import QueryTroubleshootingParameters
-from .troubleshooting_recommended_actions import TroubleshootingRecommendedActions
-from .troubleshooting_details import TroubleshootingDetails
-from .troubleshooting_result import TroubleshootingResult
-from .retention_policy_parameters import RetentionPolicyParameters
-from .flow_log_status_parameters import FlowLogStatusParameters
-from .flow_log_information import FlowLogInformation
-from .connectivity_source import ConnectivitySource
-from .connectivity_destination import ConnectivityDestination
-from .connectivity_parameters import ConnectivityParameters
-from .connectivity_issue import ConnectivityIssue
-from .connectivity_hop import ConnectivityHop
-from .connectivity_information import ConnectivityInformation
-from .patch_route_filter_rule import PatchRouteFilterRule
-from .patch_route_filter import PatchRouteFilter
-from .bgp_community import BGPCommunity
-from .bgp_service_community import BgpServiceCommunity
-from .usage_name import UsageName
-from .usage import Usage
-from .virtual_network_peering import VirtualNetworkPeering
-from .address_space import AddressSpace
-from .dhcp_options import DhcpOptions
-from .virtual_network import VirtualNetwork
-from .ip_address_availability_result import IPAddressAvailabilityResult
-from .virtual_network_usage_name import VirtualNetworkUsageName
-from .virtual_network_usage import VirtualNetworkUsage
-from .virtual_network_gateway_ip_configuration import VirtualNetworkGatewayIPConfiguration
-from .virtual_network_gateway_sku import VirtualNetworkGatewaySku
-from .vpn_client_root_certificate import VpnClientRootCertificate
-from .vpn_client_revoked_certificate import VpnClientRevokedCertificate
-from .vpn_client_configuration import VpnClientConfiguration
-from .bgp_settings import BgpSettings
-from .bgp_peer_status import BgpPeerStatus
-from .gateway_route import GatewayRoute
-from .virtual_network_gateway import VirtualNetworkGateway
-from .vpn_client_parameters import VpnClientParameters
-from .bgp_peer_status_list_result import BgpPeerStatusListResult
-from .gateway_route_list_result import GatewayRouteListResult
-from .tunnel_connection_health import TunnelConnectionHealth
-from .local_network_gateway import LocalNetworkGateway
-from .ipsec_policy import IpsecPolicy
-from .virtual_network_gateway_connection import VirtualNetworkGatewayConnection
-from .connection_reset_shared_key import ConnectionResetSharedKey
-from .connection_shared_key import ConnectionSharedKey
-from .application_gateway_paged import ApplicationGatewayPaged
-from .application_gateway_ssl_predefined_policy_paged import ApplicationGatewaySslPredefinedPolicyPaged
-from .express_route_circuit_authorization_paged import ExpressRouteCircuitAuthorizationPaged
-from .express_route_circuit_peering_paged import ExpressRouteCircuitPeeringPaged
-from .express_route_circuit_paged import ExpressRouteCircuitPaged
-from .express_route_service_provider_paged import ExpressRouteServiceProviderPaged
-from .load_balancer_paged import LoadBalancerPaged
-from .network_interface_paged import NetworkInterfacePaged
-from .network_security_group_paged import NetworkSecurityGroupPaged
-from .security_rule_paged import SecurityRulePaged
-from .network_watcher_paged import NetworkWatcherPaged
-from .packet_capture_result_paged import PacketCaptureResultPaged
-from .public_ip_address_paged import PublicIPAddressPaged
-from .route_filter_paged import RouteFilterPaged
-from .route_filter_rule_paged import RouteFilterRulePaged
-from .route_table_paged import RouteTablePaged
-from .route_paged import RoutePaged
-from .bgp_service_community_paged import BgpServiceCommunityPaged
-from .usage_paged import UsagePaged
-from .virtual_network_paged import VirtualNetworkPaged
-from .virtual_network_usage_paged import VirtualNetworkUsagePaged
-from .subnet_paged import SubnetPaged
-from .virtual_network_peering_paged import VirtualNetworkPeeringPaged
-from .virtual_network_gateway_paged import VirtualNetworkGatewayPaged
-from .virtual_network_gateway_connection_paged import VirtualNetworkGatewayConnectionPaged
-from .local_network_gateway_paged import LocalNetworkGatewayPaged
-from .network_management_client_enums import (
-    TransportProtocol,
-    IPAllocationMethod,
-    IPVersion,
-    SecurityRuleProtocol,
-    SecurityRuleAccess,
-    SecurityRuleDirection,
-    RouteNextHopType,
-    ApplicationGatewayProtocol,
-    ApplicationGatewayCookieBasedAffinity,
-    ApplicationGatewayBackendHealthServerHealth,
-    ApplicationGatewaySkuName,
-    ApplicationGatewayTier,
-    ApplicationGatewaySslProtocol,
-    ApplicationGatewaySslPolicyType,
-    ApplicationGatewaySslPolicyName,
-    ApplicationGatewaySslCipherSuite,
-    ApplicationGatewayRequestRoutingRuleType,
-    ApplicationGatewayRedirectType,
-    ApplicationGatewayOperationalState,
-    ApplicationGatewayFirewallMode,
-    AuthorizationUseStatus,
-    ExpressRouteCircuitPeeringAdvertisedPublicPrefixState,
-    ExpressRouteCircuitPeeringType,
-    ExpressRouteCircuitPeeringState,
-    Access,
-    ExpressRouteCircuitSkuTier,
-    ExpressRouteCircuitSkuFamily,
-    ServiceProviderProvisioningState,
-    LoadDistribution,
-    ProbeProtocol,
-    NetworkOperationStatus,
-    EffectiveRouteSource,
-    EffectiveRouteState,
-    ProvisioningState,
-    AssociationType,
-    Direction,
-    Protocol,
-    NextHopType,
-    PcProtocol,
-    PcStatus,
-    PcError,
-    Origin,
-    Severity,
-    IssueType,
-    ConnectionStatus,
-    VirtualNetworkPeeringState,
-    VirtualNetworkGatewayType,
-    VpnType,
-    VirtualNetworkGatewaySkuName,
-    VirtualNetworkGatewaySkuTier,
-    VpnClientProtocol,
-    BgpPeerState,
-    ProcessorArchitecture,
-    AuthenticationMethod,
-    VirtualNetworkGatewayConnectionStatus,
-    VirtualNetworkGatewayConnectionType,
-    IpsecEncryption,
-    IpsecIntegrity,
-    IkeEncryption,
-    IkeIntegrity,
-    DhGroup,
-    PfsGroup,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'SubResource',
@@ -482,3 +247,240 @@ __all__ = [
     'DhGroup',
     'PfsGroup',
 ]
+
+lazy_models(__name__, {
+    'SubResource': 'sub_resource',
+    'BackendAddressPool': 'backend_address_pool',
+    'InboundNatRule': 'inbound_nat_rule',
+    'SecurityRule': 'security_rule',
+    'NetworkInterfaceDnsSettings': 'network_interface_dns_settings',
+    'NetworkInterface': 'network_interface',
+    'NetworkSecurityGroup': 'network_security_group',
+    'Route': 'route',
+    'RouteTable': 'route_table',
+    'PublicIPAddressDnsSettings': 'public_ip_address_dns_settings',
+    'PublicIPAddress': 'public_ip_address',
+    'IPConfiguration': 'ip_configuration',
+    'ResourceNavigationLink': 'resource_navigation_link',
+    'Subnet': 'subnet',
+    'NetworkInterfaceIPConfiguration': 'network_interface_ip_configuration',
+    'ApplicationGatewayBackendAddress': 'application_gateway_backend_address',
+    'ApplicationGatewayBackendAddressPool': 'application_gateway_backend_address_pool',
+    'ApplicationGatewayConnectionDraining': 'application_gateway_connection_draining',
+    'ApplicationGatewayBackendHttpSettings': 'application_gateway_backend_http_settings',
+    'ApplicationGatewayBackendHealthServer': 'application_gateway_backend_health_server',
+    'ApplicationGatewayBackendHealthHttpSettings': 'application_gateway_backend_health_http_settings',
+    'ApplicationGatewayBackendHealthPool': 'application_gateway_backend_health_pool',
+    'ApplicationGatewayBackendHealth': 'application_gateway_backend_health',
+    'ApplicationGatewaySku': 'application_gateway_sku',
+    'ApplicationGatewaySslPolicy': 'application_gateway_ssl_policy',
+    'ApplicationGatewayIPConfiguration': 'application_gateway_ip_configuration',
+    'ApplicationGatewayAuthenticationCertificate': 'application_gateway_authentication_certificate',
+    'ApplicationGatewaySslCertificate': 'application_gateway_ssl_certificate',
+    'ApplicationGatewayFrontendIPConfiguration': 'application_gateway_frontend_ip_configuration',
+    'ApplicationGatewayFrontendPort': 'application_gateway_frontend_port',
+    'ApplicationGatewayHttpListener': 'application_gateway_http_listener',
+    'ApplicationGatewayPathRule': 'application_gateway_path_rule',
+    'ApplicationGatewayProbeHealthResponseMatch': 'application_gateway_probe_health_response_match',
+    'ApplicationGatewayProbe': 'application_gateway_probe',
+    'ApplicationGatewayRequestRoutingRule': 'application_gateway_request_routing_rule',
+    'ApplicationGatewayRedirectConfiguration': 'application_gateway_redirect_configuration',
+    'ApplicationGatewayUrlPathMap': 'application_gateway_url_path_map',
+    'ApplicationGatewayFirewallDisabledRuleGroup': 'application_gateway_firewall_disabled_rule_group',
+    'ApplicationGatewayWebApplicationFirewallConfiguration': 'application_gateway_web_application_firewall_configuration',
+    'ApplicationGateway': 'application_gateway',
+    'ApplicationGatewayFirewallRule': 'application_gateway_firewall_rule',
+    'ApplicationGatewayFirewallRuleGroup': 'application_gateway_firewall_rule_group',
+    'ApplicationGatewayFirewallRuleSet': 'application_gateway_firewall_rule_set',
+    'ApplicationGatewayAvailableWafRuleSetsResult': 'application_gateway_available_waf_rule_sets_result',
+    'ApplicationGatewayAvailableSslOptions': 'application_gateway_available_ssl_options',
+    'ApplicationGatewaySslPredefinedPolicy': 'application_gateway_ssl_predefined_policy',
+    'Resource': 'resource',
+    'DnsNameAvailabilityResult': 'dns_name_availability_result',
+    'ExpressRouteCircuitAuthorization': 'express_route_circuit_authorization',
+    'ExpressRouteCircuitPeeringConfig': 'express_route_circuit_peering_config',
+    'ExpressRouteCircuitStats': 'express_route_circuit_stats',
+    'RouteFilterRule': 'route_filter_rule',
+    'ExpressRouteCircuitPeering': 'express_route_circuit_peering',
+    'RouteFilter': 'route_filter',
+    'ExpressRouteCircuitSku': 'express_route_circuit_sku',
+    'ExpressRouteCircuitServiceProviderProperties': 'express_route_circuit_service_provider_properties',
+    'ExpressRouteCircuit': 'express_route_circuit',
+    'ExpressRouteCircuitArpTable': 'express_route_circuit_arp_table',
+    'ExpressRouteCircuitsArpTableListResult': 'express_route_circuits_arp_table_list_result',
+    'ExpressRouteCircuitRoutesTable': 'express_route_circuit_routes_table',
+    'ExpressRouteCircuitsRoutesTableListResult': 'express_route_circuits_routes_table_list_result',
+    'ExpressRouteCircuitRoutesTableSummary': 'express_route_circuit_routes_table_summary',
+    'ExpressRouteCircuitsRoutesTableSummaryListResult': 'express_route_circuits_routes_table_summary_list_result',
+    'ExpressRouteServiceProviderBandwidthsOffered': 'express_route_service_provider_bandwidths_offered',
+    'ExpressRouteServiceProvider': 'express_route_service_provider',
+    'FrontendIPConfiguration': 'frontend_ip_configuration',
+    'LoadBalancingRule': 'load_balancing_rule',
+    'Probe': 'probe',
+    'InboundNatPool': 'inbound_nat_pool',
+    'OutboundNatRule': 'outbound_nat_rule',
+    'LoadBalancer': 'load_balancer',
+    'ErrorDetails': 'error_details',
+    'Error': 'error',
+    'AzureAsyncOperationResult': 'azure_async_operation_result',
+    'EffectiveNetworkSecurityGroupAssociation': 'effective_network_security_group_association',
+    'EffectiveNetworkSecurityRule': 'effective_network_security_rule',
+    'EffectiveNetworkSecurityGroup': 'effective_network_security_group',
+    'EffectiveNetworkSecurityGroupListResult': 'effective_network_security_group_list_result',
+    'EffectiveRoute': 'effective_route',
+    'EffectiveRouteListResult': 'effective_route_list_result',
+    'NetworkWatcher': 'network_watcher',
+    'TopologyParameters': 'topology_parameters',
+    'TopologyAssociation': 'topology_association',
+    'TopologyResource': 'topology_resource',
+    'Topology': 'topology',
+    'VerificationIPFlowParameters': 'verification_ip_flow_parameters',
+    'VerificationIPFlowResult': 'verification_ip_flow_result',
+    'NextHopParameters': 'next_hop_parameters',
+    'NextHopResult': 'next_hop_result',
+    'SecurityGroupViewParameters': 'security_group_view_parameters',
+    'NetworkInterfaceAssociation': 'network_interface_association',
+    'SubnetAssociation': 'subnet_association',
+    'SecurityRuleAssociations': 'security_rule_associations',
+    'SecurityGroupNetworkInterface': 'security_group_network_interface',
+    'SecurityGroupViewResult': 'security_group_view_result',
+    'PacketCaptureStorageLocation': 'packet_capture_storage_location',
+    'PacketCaptureFilter': 'packet_capture_filter',
+    'PacketCaptureParameters': 'packet_capture_parameters',
+    'PacketCapture': 'packet_capture',
+    'PacketCaptureResult': 'packet_capture_result',
+    'PacketCaptureQueryStatusResult': 'packet_capture_query_status_result',
+    'TroubleshootingParameters': 'troubleshooting_parameters',
+    'QueryTroubleshootingParameters': 'query_troubleshooting_parameters',
+    'TroubleshootingRecommendedActions': 'troubleshooting_recommended_actions',
+    'TroubleshootingDetails': 'troubleshooting_details',
+    'TroubleshootingResult': 'troubleshooting_result',
+    'RetentionPolicyParameters': 'retention_policy_parameters',
+    'FlowLogStatusParameters': 'flow_log_status_parameters',
+    'FlowLogInformation': 'flow_log_information',
+    'ConnectivitySource': 'connectivity_source',
+    'ConnectivityDestination': 'connectivity_destination',
+    'ConnectivityParameters': 'connectivity_parameters',
+    'ConnectivityIssue': 'connectivity_issue',
+    'ConnectivityHop': 'connectivity_hop',
+    'ConnectivityInformation': 'connectivity_information',
+    'PatchRouteFilterRule': 'patch_route_filter_rule',
+    'PatchRouteFilter': 'patch_route_filter',
+    'BGPCommunity': 'bgp_community',
+    'BgpServiceCommunity': 'bgp_service_community',
+    'UsageName': 'usage_name',
+    'Usage': 'usage',
+    'VirtualNetworkPeering': 'virtual_network_peering',
+    'AddressSpace': 'address_space',
+    'DhcpOptions': 'dhcp_options',
+    'VirtualNetwork': 'virtual_network',
+    'IPAddressAvailabilityResult': 'ip_address_availability_result',
+    'VirtualNetworkUsageName': 'virtual_network_usage_name',
+    'VirtualNetworkUsage': 'virtual_network_usage',
+    'VirtualNetworkGatewayIPConfiguration': 'virtual_network_gateway_ip_configuration',
+    'VirtualNetworkGatewaySku': 'virtual_network_gateway_sku',
+    'VpnClientRootCertificate': 'vpn_client_root_certificate',
+    'VpnClientRevokedCertificate': 'vpn_client_revoked_certificate',
+    'VpnClientConfiguration': 'vpn_client_configuration',
+    'BgpSettings': 'bgp_settings',
+    'BgpPeerStatus': 'bgp_peer_status',
+    'GatewayRoute': 'gateway_route',
+    'VirtualNetworkGateway': 'virtual_network_gateway',
+    'VpnClientParameters': 'vpn_client_parameters',
+    'BgpPeerStatusListResult': 'bgp_peer_status_list_result',
+    'GatewayRouteListResult': 'gateway_route_list_result',
+    'TunnelConnectionHealth': 'tunnel_connection_health',
+    'LocalNetworkGateway': 'local_network_gateway',
+    'IpsecPolicy': 'ipsec_policy',
+    'VirtualNetworkGatewayConnection': 'virtual_network_gateway_connection',
+    'ConnectionResetSharedKey': 'connection_reset_shared_key',
+    'ConnectionSharedKey': 'connection_shared_key',
+    'ApplicationGatewayPaged': 'application_gateway_paged',
+    'ApplicationGatewaySslPredefinedPolicyPaged': 'application_gateway_ssl_predefined_policy_paged',
+    'ExpressRouteCircuitAuthorizationPaged': 'express_route_circuit_authorization_paged',
+    'ExpressRouteCircuitPeeringPaged': 'express_route_circuit_peering_paged',
+    'ExpressRouteCircuitPaged': 'express_route_circuit_paged',
+    'ExpressRouteServiceProviderPaged': 'express_route_service_provider_paged',
+    'LoadBalancerPaged': 'load_balancer_paged',
+    'NetworkInterfacePaged': 'network_interface_paged',
+    'NetworkSecurityGroupPaged': 'network_security_group_paged',
+    'SecurityRulePaged': 'security_rule_paged',
+    'NetworkWatcherPaged': 'network_watcher_paged',
+    'PacketCaptureResultPaged': 'packet_capture_result_paged',
+    'PublicIPAddressPaged': 'public_ip_address_paged',
+    'RouteFilterPaged': 'route_filter_paged',
+    'RouteFilterRulePaged': 'route_filter_rule_paged',
+    'RouteTablePaged': 'route_table_paged',
+    'RoutePaged': 'route_paged',
+    'BgpServiceCommunityPaged': 'bgp_service_community_paged',
+    'UsagePaged': 'usage_paged',
+    'VirtualNetworkPaged': 'virtual_network_paged',
+    'VirtualNetworkUsagePaged': 'virtual_network_usage_paged',
+    'SubnetPaged': 'subnet_paged',
+    'VirtualNetworkPeeringPaged': 'virtual_network_peering_paged',
+    'VirtualNetworkGatewayPaged': 'virtual_network_gateway_paged',
+    'VirtualNetworkGatewayConnectionPaged': 'virtual_network_gateway_connection_paged',
+    'LocalNetworkGatewayPaged': 'local_network_gateway_paged',
+    'TransportProtocol': 'network_management_client_enums',
+    'IPAllocationMethod': 'network_management_client_enums',
+    'IPVersion': 'network_management_client_enums',
+    'SecurityRuleProtocol': 'network_management_client_enums',
+    'SecurityRuleAccess': 'network_management_client_enums',
+    'SecurityRuleDirection': 'network_management_client_enums',
+    'RouteNextHopType': 'network_management_client_enums',
+    'ApplicationGatewayProtocol': 'network_management_client_enums',
+    'ApplicationGatewayCookieBasedAffinity': 'network_management_client_enums',
+    'ApplicationGatewayBackendHealthServerHealth': 'network_management_client_enums',
+    'ApplicationGatewaySkuName': 'network_management_client_enums',
+    'ApplicationGatewayTier': 'network_management_client_enums',
+    'ApplicationGatewaySslProtocol': 'network_management_client_enums',
+    'ApplicationGatewaySslPolicyType': 'network_management_client_enums',
+    'ApplicationGatewaySslPolicyName': 'network_management_client_enums',
+    'ApplicationGatewaySslCipherSuite': 'network_management_client_enums',
+    'ApplicationGatewayRequestRoutingRuleType': 'network_management_client_enums',
+    'ApplicationGatewayRedirectType': 'network_management_client_enums',
+    'ApplicationGatewayOperationalState': 'network_management_client_enums',
+    'ApplicationGatewayFirewallMode': 'network_management_client_enums',
+    'AuthorizationUseStatus': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringAdvertisedPublicPrefixState': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringType': 'network_management_client_enums',
+    'ExpressRouteCircuitPeeringState': 'network_management_client_enums',
+    'Access': 'network_management_client_enums',
+    'ExpressRouteCircuitSkuTier': 'network_management_client_enums',
+    'ExpressRouteCircuitSkuFamily': 'network_management_client_enums',
+    'ServiceProviderProvisioningState': 'network_management_client_enums',
+    'LoadDistribution': 'network_management_client_enums',
+    'ProbeProtocol': 'network_management_client_enums',
+    'NetworkOperationStatus': 'network_management_client_enums',
+    'EffectiveRouteSource': 'network_management_client_enums',
+    'EffectiveRouteState': 'network_management_client_enums',
+    'ProvisioningState': 'network_management_client_enums',
+    'AssociationType': 'network_management_client_enums',
+    'Direction': 'network_management_client_enums',
+    'Protocol': 'network_management_client_enums',
+    'NextHopType': 'network_management_client_enums',
+    'PcProtocol': 'network_management_client_enums',
+    'PcStatus': 'network_management_client_enums',
+    'PcError': 'network_management_client_enums',
+    'Origin': 'network_management_client_enums',
+    'Severity': 'network_management_client_enums',
+    'IssueType': 'network_management_client_enums',
+    'ConnectionStatus': 'network_management_client_enums',
+    'VirtualNetworkPeeringState': 'network_management_client_enums',
+    'VirtualNetworkGatewayType': 'network_management_client_enums',
+    'VpnType': 'network_management_client_enums',
+    'VirtualNetworkGatewaySkuName': 'network_management_client_enums',
+    'VirtualNetworkGatewaySkuTier': 'network_management_client_enums',
+    'VpnClientProtocol': 'network_management_client_enums',
+    'BgpPeerState': 'network_management_client_enums',
+    'ProcessorArchitecture': 'network_management_client_enums',
+    'AuthenticationMethod': 'network_management_client_enums',
+    'VirtualNetworkGatewayConnectionStatus': 'network_management_client_enums',
+    'VirtualNetworkGatewayConnectionType': 'network_management_client_enums',
+    'IpsecEncryption': 'network_management_client_enums',
+    'IpsecIntegrity': 'network_management_client_enums',
+    'IkeEncryption': 'network_management_client_enums',
+    'IkeIntegrity': 'network_management_client_enums',
+    'DhGroup': 'network_management_client_enums',
+    'PfsGroup': 'network_management_client_enums',
+})
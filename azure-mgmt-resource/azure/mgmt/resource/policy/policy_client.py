@@ -11,6 +11,7 @@
 
 from msrest.service_client import ServiceClient
 from msrest import Serializer, Deserializer
+from azure.common.lazy_models import get_model_dependencies, operation_group
 from msrestazure import AzureConfiguration
 from ..version import VERSION
 
@@ -69,10 +70,11 @@ class PolicyClient(object):
         self.config = PolicyClientConfiguration(credentials, subscription_id, base_url)
         self._client = ServiceClient(self.config.credentials, self.config)
 
-        client_models = {k: v for k, v in self.models(api_version).__dict__.items() if isinstance(v, type)}
+        client_models = get_model_dependencies(self.models(api_version))
         self.api_version = api_version
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
 
     @classmethod
     def models(cls, api_version='2016-12-01'):
@@ -93,7 +95,7 @@ class PolicyClient(object):
             return models
         raise NotImplementedError("APIVersion {} is not available".format(api_version))
 
-    @property
+    @operation_group
     def policy_assignments(self):
         """Instance depends on the API version:
 
@@ -111,7 +113,7 @@ class PolicyClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def policy_definitions(self):
         """Instance depends on the API version:
 
@@ -9,13 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .policy_definition import PolicyDefinition
-from .policy_assignment import PolicyAssignment
-from .policy_assignment_paged import PolicyAssignmentPaged
-from .policy_definition_paged import PolicyDefinitionPaged
-from .policy_client_enums import (
-    PolicyType,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'PolicyDefinition',
@@ -24,3 +18,11 @@ __all__ = [
     'PolicyDefinitionPaged',
     'PolicyType',
 ]
+
+lazy_models(__name__, {
+    'PolicyDefinition': 'policy_definition',
+    'PolicyAssignment': 'policy_assignment',
+    'PolicyAssignmentPaged': 'policy_assignment_paged',
+    'PolicyDefinitionPaged': 'policy_definition_paged',
+    'PolicyType': 'policy_client_enums',
+})
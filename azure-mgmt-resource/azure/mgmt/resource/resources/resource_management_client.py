@@ -11,6 +11,7 @@
 
 from msrest.service_client import ServiceClient
 from msrest import Serializer, Deserializer
+from azure.common.lazy_models import get_model_dependencies, operation_group
 from msrestazure import AzureConfiguration
 from ..version import VERSION
 
@@ -71,10 +72,11 @@ class ResourceManagementClient(object):
         self.config = ResourceManagementClientConfiguration(credentials, subscription_id, base_url)
         self._client = ServiceClient(self.config.credentials, self.config)
 
-        client_models = {k: v for k, v in self.models(api_version).__dict__.items() if isinstance(v, type)}
+        client_models = get_model_dependencies(self.models(api_version))
         self.api_version = api_version
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = Serializer()
+        self._deserialize = Deserializer()
+        self._serialize.dependencies = self._deserialize.dependencies = client_models
 
     @classmethod
     def models(cls, api_version=LATEST_API_VERSION):
@@ -95,7 +97,7 @@ class ResourceManagementClient(object):
             return models
         raise NotImplementedError("APIVersion {} is not available".format(api_version))
 
-    @property
+    @operation_group
     def deployment_operations(self):
         """Instance depends on the API version:
 
@@ -113,7 +115,7 @@ class ResourceManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def deployments(self):
         """Instance depends on the API version:
 
@@ -131,7 +133,7 @@ class ResourceManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def providers(self):
         """Instance depends on the API version:
 
@@ -149,7 +151,7 @@ class ResourceManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def resource_groups(self):
         """Instance depends on the API version:
 
@@ -167,7 +169,7 @@ class ResourceManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def resources(self):
         """Instance depends on the API version:
 
@@ -185,7 +187,7 @@ class ResourceManagementClient(object):
             raise NotImplementedError("APIVersion {} is not available".format(self.api_version))
         return OperationClass(self._client, self.config, self._serialize, self._deserialize)
 
-    @property
+    @operation_group
     def tags(self):
         """Instance depends on the API version:
 
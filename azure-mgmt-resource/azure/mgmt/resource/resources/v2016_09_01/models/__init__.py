@@ -9,54 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .deployment_extended_filter import DeploymentExtendedFilter
-from .generic_resource_filter import GenericResourceFilter
-from .resource_group_filter import ResourceGroupFilter
-from .template_link import TemplateLink
-from .parameters_link import ParametersLink
-from .debug_setting import DebugSetting
-from .deployment_properties import DeploymentProperties
-from .deployment import Deployment
-from .deployment_export_result import DeploymentExportResult
-from .resource_management_error_with_details import ResourceManagementErrorWithDetails
-from .alias_path_type import AliasPathType
-from .alias_type import AliasType
-from .provider_resource_type import ProviderResourceType
-from .provider import Provider
-from .basic_dependency import BasicDependency
-from .dependency import Dependency
-from .deployment_properties_extended import DeploymentPropertiesExtended
-from .deployment_validate_result import DeploymentValidateResult
-from .deployment_extended import DeploymentExtended
-from .plan import Plan
-from .sku import Sku
-from .identity import Identity
-from .generic_resource import GenericResource
-from .resource_group_properties import ResourceGroupProperties
-from .resource_group import ResourceGroup
-from .resources_move_info import ResourcesMoveInfo
-from .export_template_request import ExportTemplateRequest
-from .tag_count import TagCount
-from .tag_value import TagValue
-from .tag_details import TagDetails
-from .target_resource import TargetResource
-from .http_message import HttpMessage
-from .deployment_operation_properties import DeploymentOperationProperties
-from .deployment_operation import DeploymentOperation
-from .resource_provider_operation_display_properties import ResourceProviderOperationDisplayProperties
-from .resource import Resource
-from .sub_resource import SubResource
-from .resource_group_export_result import ResourceGroupExportResult
-from .deployment_extended_paged import DeploymentExtendedPaged
-from .provider_paged import ProviderPaged
-from .generic_resource_paged import GenericResourcePaged
-from .resource_group_paged import ResourceGroupPaged
-from .tag_details_paged import TagDetailsPaged
-from .deployment_operation_paged import DeploymentOperationPaged
-from .resource_management_client_enums import (
-    DeploymentMode,
-    ResourceIdentityType,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'DeploymentExtendedFilter',
@@ -106,3 +59,52 @@ __all__ = [
     'DeploymentMode',
     'ResourceIdentityType',
 ]
+
+lazy_models(__name__, {
+    'DeploymentExtendedFilter': 'deployment_extended_filter',
+    'GenericResourceFilter': 'generic_resource_filter',
+    'ResourceGroupFilter': 'resource_group_filter',
+    'TemplateLink': 'template_link',
+    'ParametersLink': 'parameters_link',
+    'DebugSetting': 'debug_setting',
+    'DeploymentProperties': 'deployment_properties',
+    'Deployment': 'deployment',
+    'DeploymentExportResult': 'deployment_export_result',
+    'ResourceManagementErrorWithDetails': 'resource_management_error_with_details',
+    'AliasPathType': 'alias_path_type',
+    'AliasType': 'alias_type',
+    'ProviderResourceType': 'provider_resource_type',
+    'Provider': 'provider',
+    'BasicDependency': 'basic_dependency',
+    'Dependency': 'dependency',
+    'DeploymentPropertiesExtended': 'deployment_properties_extended',
+    'DeploymentValidateResult': 'deployment_validate_result',
+    'DeploymentExtended': 'deployment_extended',
+    'Plan': 'plan',
+    'Sku': 'sku',
+    'Identity': 'identity',
+    'GenericResource': 'generic_resource',
+    'ResourceGroupProperties': 'resource_group_properties',
+    'ResourceGroup': 'resource_group',
+    'ResourcesMoveInfo': 'resources_move_info',
+    'ExportTemplateRequest': 'export_template_request',
+    'TagCount': 'tag_count',
+    'TagValue': 'tag_value',
+    'TagDetails': 'tag_details',
+    'TargetResource': 'target_resource',
+    'HttpMessage': 'http_message',
+    'DeploymentOperationProperties': 'deployment_operation_properties',
+    'DeploymentOperation': 'deployment_operation',
+    'ResourceProviderOperationDisplayProperties': 'resource_provider_operation_display_properties',
+    'Resource': 'resource',
+    'SubResource': 'sub_resource',
+    'ResourceGroupExportResult': 'resource_group_export_result',
+    'DeploymentExtendedPaged': 'deployment_extended_paged',
+    'ProviderPaged': 'provider_paged',
+    'GenericResourcePaged': 'generic_resource_paged',
+    'ResourceGroupPaged': 'resource_group_paged',
+    'TagDetailsPaged': 'tag_details_paged',
+    'DeploymentOperationPaged': 'deployment_operation_paged',
+    'DeploymentMode': 'resource_management_client_enums',
+    'ResourceIdentityType': 'resource_management_client_enums',
+})
@@ -70,7 +70,7 @@ setup(
     zip_safe=False,
     packages=find_packages(),
     install_requires=[
-        'azure-common~=1.1.5',
+        'azure-common~=1.1.7',
         'msrestazure~=0.4.7',
     ],
     cmdclass=cmdclass
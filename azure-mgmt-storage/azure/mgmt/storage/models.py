@@ -4,4 +4,7 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from .v2016_12_01.models import *
\ No newline at end of file
+from azure.common.lazy_models import lazy_models
+from .v2016_12_01.models import __all__
+
+lazy_models(__name__, dict.fromkeys(__all__, 'v2016_12_01.models'))
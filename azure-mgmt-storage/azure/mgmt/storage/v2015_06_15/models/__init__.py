@@ -9,27 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .storage_account_check_name_availability_parameters import StorageAccountCheckNameAvailabilityParameters
-from .check_name_availability_result import CheckNameAvailabilityResult
-from .storage_account_create_parameters import StorageAccountCreateParameters
-from .endpoints import Endpoints
-from .custom_domain import CustomDomain
-from .storage_account import StorageAccount
-from .storage_account_keys import StorageAccountKeys
-from .storage_account_update_parameters import StorageAccountUpdateParameters
-from .storage_account_regenerate_key_parameters import StorageAccountRegenerateKeyParameters
-from .usage_name import UsageName
-from .usage import Usage
-from .resource import Resource
-from .storage_account_paged import StorageAccountPaged
-from .usage_paged import UsagePaged
-from .storage_management_client_enums import (
-    Reason,
-    AccountType,
-    ProvisioningState,
-    AccountStatus,
-    UsageUnit,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'StorageAccountCheckNameAvailabilityParameters',
@@ -52,3 +32,25 @@ __all__ = [
     'AccountStatus',
     'UsageUnit',
 ]
+
+lazy_models(__name__, {
+    'StorageAccountCheckNameAvailabilityParameters': 'storage_account_check_name_availability_parameters',
+    'CheckNameAvailabilityResult': 'check_name_availability_result',
+    'StorageAccountCreateParameters': 'storage_account_create_parameters',
+    'Endpoints': 'endpoints',
+    'CustomDomain': 'custom_domain',
+    'StorageAccount': 'storage_account',
+    'StorageAccountKeys': 'storage_account_keys',
+    'StorageAccountUpdateParameters': 'storage_account_update_parameters',
+    'StorageAccountRegenerateKeyParameters': 'storage_account_regenerate_key_parameters',
+    'UsageName': 'usage_name',
+    'Usage': 'usage',
+    'Resource': 'resource',
+    'StorageAccountPaged': 'storage_account_paged',
+    'UsagePaged': 'usage_paged',
+    'Reason': 'storage_management_client_enums',
+    'AccountType': 'storage_management_client_enums',
+    'ProvisioningState': 'storage_management_client_enums',
+    'AccountStatus': 'storage_management_client_enums',
+    'UsageUnit': 'storage_management_client_enums',
+})
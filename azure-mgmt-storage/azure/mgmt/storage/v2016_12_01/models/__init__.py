@@ -9,41 +9,7 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .storage_account_check_name_availability_parameters import StorageAccountCheckNameAvailabilityParameters
-from .check_name_availability_result import CheckNameAvailabilityResult
-from .sku import Sku
-from .custom_domain import CustomDomain
-from .encryption_service import EncryptionService
-from .encryption_services import EncryptionServices
-from .encryption import Encryption
-from .storage_account_create_parameters import StorageAccountCreateParameters
-from .endpoints import Endpoints
-from .storage_account import StorageAccount
-from .storage_account_key import StorageAccountKey
-from .storage_account_list_keys_result import StorageAccountListKeysResult
-from .storage_account_regenerate_key_parameters import StorageAccountRegenerateKeyParameters
-from .storage_account_update_parameters import StorageAccountUpdateParameters
-from .usage_name import UsageName
-from .usage import Usage
-from .resource import Resource
-from .account_sas_parameters import AccountSasParameters
-from .list_account_sas_response import ListAccountSasResponse
-from .service_sas_parameters import ServiceSasParameters
-from .list_service_sas_response import ListServiceSasResponse
-from .storage_account_paged import StorageAccountPaged
-from .usage_paged import UsagePaged
-from .storage_management_client_enums import (
-    Reason,
-    SkuName,
-    SkuTier,
-    AccessTier,
-    Kind,
-    ProvisioningState,
-    AccountStatus,
-    KeyPermission,
-    UsageUnit,
-    HttpProtocol,
-)
+from azure.common.lazy_models import lazy_models
 
 __all__ = [
     'StorageAccountCheckNameAvailabilityParameters',
@@ -80,3 +46,39 @@ __all__ = [
     'UsageUnit',
     'HttpProtocol',
 ]
+
+lazy_models(__name__, {
+    'StorageAccountCheckNameAvailabilityParameters': 'storage_account_check_name_availability_parameters',
+    'CheckNameAvailabilityResult': 'check_name_availability_result',
+    'Sku': 'sku',
+    'CustomDomain': 'custom_domain',
+    'EncryptionService': 'encryption_service',
+    'EncryptionServices': 'encryption_services',
+    'Encryption': 'encryption',
+    'StorageAccountCreateParameters': 'storage_account_create_parameters',
+    'Endpoints': 'endpoints',
+    'StorageAccount': 'storage_account',
+    'StorageAccountKey': 'storage_account_key',
+    'StorageAccountListKeysResult': 'storage_account_list_keys_result',
+    'StorageAccountRegenerateKeyParameters': 'storage_account_regenerate_key_parameters',
+    'StorageAccountUpdateParameters': 'storage_account_update_parameters',
+    'UsageName': 'usage_name',
+    'Usage': 'usage',
+    'Resource': 'resource',
+    'AccountSasParameters': 'account_sas_parameters',
+    'ListAccountSasResponse': 'list_account_sas_response',
+    'ServiceSasParameters': 'service_sas_parameters',
+    'ListServiceSasResponse': 'list_service_sas_response',
+    'StorageAccountPaged': 'storage_account_paged',
+    'UsagePaged': 'usage_paged',
+    'Reason': 'storage_management_client_enums',
+    'SkuName': 'storage_management_client_enums',
+    'SkuTier': 'storage_management_client_enums',
+    'AccessTier': 'storage_management_client_enums',
+    'Kind': 'storage_management_client_enums',
+    'ProvisioningState': 'storage_management_client_enums',
+    'AccountStatus': 'storage_management_client_enums',
+    'KeyPermission': 'storage_management_client_enums',
+    'UsageUnit': 'storage_management_client_enums',
+    'HttpProtocol': 'storage_management_client_enums',
+})
@@ -10,10 +10,19 @@ import io
 import json
 import logging
 import os
+import shutil
 import sys
+import tempfile
+import threading
 import time
+import timeit
 import unittest
 
+try:
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    from mock import MagicMock, patch
+
 import requests
 
 from testutils.common_recordingtestcase import (
@@ -29,7 +38,10 @@ import azure.mgmt.storage
 import azure.mgmt.batch
 import azure.mgmt.keyvault
 import azure.batch as batch
-from azure.batch.batch_auth import SharedKeyCredentials
+from azure.batch.batch_auth import SharedKeyAuth, SharedKeyCredentials
+from azure.batch.batch_task_submitter import BatchTaskSubmitter
+from azure.batch.batch_file_downloader import BatchFileDownloader
+from msrest.exceptions import ClientRequestError
 from msrestazure.azure_active_directory import AADTokenCredentials
 from azure.common.credentials import ServicePrincipalCredentials
 
@@ -1297,6 +1309,334 @@ class BatchMgmtTestCase(RecordingTestCase):
         self.assertSuccess(_e)
 
 
+class BatchTaskSubmitterTest(unittest.TestCase):
+
+    def _get_tasks(self, count, command_line='cmd /c "echo hello world"'):
+        return (batch.models.TaskAddParameter('python_task_{}'.format(i), command_line) for i in range(count))
+
+    def _get_client(self, server_errors=None, request_errors=None, lost_responses=0, missing=None):
+        server_errors = server_errors or {}
+        request_errors = request_errors or []
+        missing = set(missing or [])
+        lost_responses = [lost_responses]
+        lock = threading.Lock()
+        self.requests = []
+        added = set()
+
+        def add_collection(job_id, value, options=None):
+            with lock:
+                self.requests.append([task.id for task in value])
+                if request_errors:
+                    raise request_errors.pop(0)
+            results = []
+            for task in value:
+                with lock:
+                    failures = server_errors.get(task.id, 0)
+                    server_errors[task.id] = failures - 1
+                    if task.id in missing:
+                        missing.discard(task.id)
+                        continue
+                if failures > 0:
+                    status = batch.models.TaskAddStatus.server_error
+                elif task.id.endswith('_bad'):
+                    status = batch.models.TaskAddStatus.client_error
+                elif task.id in added:
+                    results.append(batch.models.TaskAddResult(
+                        batch.models.TaskAddStatus.client_error, task.id, error=batch.models.BatchError(code='TaskExists')))
+                    continue
+                else:
+                    status = batch.models.TaskAddStatus.success
+                    added.add(task.id)
+                results.append(batch.models.TaskAddResult(status, task.id))
+            with lock:
+                if lost_responses[0]:
+                    # the tasks are added, but the response is not received
+                    lost_responses[0] -= 1
+                    raise ClientRequestError('Read timed out')
+            return batch.models.TaskAddCollectionResult(value=results)
+
+        client = MagicMock()
+        client.task.add_collection.side_effect = add_collection
+        return client
+
+    def _get_error(self, status_code, code=None):
+        error = batch.models.BatchErrorException.__new__(batch.models.BatchErrorException)
+        error.response = MagicMock(status_code=status_code)
+        error.error = batch.models.BatchError(code=code)
+        return error
+
+    def test_submit_chunks(self):
+        client = self._get_client()
+        result = BatchTaskSubmitter(client, threads=8).submit('python_test_job', self._get_tasks(1050))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(len(result.added), 1050)
+        self.assertEqual(len(set(r.task_id for r in result.added)), 1050)
+        self.assertEqual(sorted(len(r) for r in self.requests), [50] + [100] * 10)
+
+        # chunks are limited by the size of the request body as well
+        client = self._get_client()
+        submitter = BatchTaskSubmitter(client, max_request_size=10000)
+        result = submitter.submit('python_test_job', self._get_tasks(30, 'cmd /c "echo {}"'.format('x' * 1000)))
+        self.assertEqual(len(result.added), 30)
+        self.assertTrue(len(self.requests) > 3)
+        for task_ids in self.requests:
+            body = submitter._serialize.body(
+                batch.models.TaskAddCollectionParameter(
+                    [batch.models.TaskAddParameter(i, 'cmd /c "echo {}"'.format('x' * 1000)) for i in task_ids]),
+                'TaskAddCollectionParameter')
+            self.assertLessEqual(len(json.dumps(body)), 10000)
+
+    def test_submit_retries(self):
+        # tasks failing with a server error are retried alone
+        client = self._get_client(server_errors={'python_task_3': 2, 'python_task_7': 1})
+        result = BatchTaskSubmitter(client, retry_delay=0).submit('python_test_job', self._get_tasks(10))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(len(result.added), 10)
+        self.assertEqual(self.requests[1:], [['python_task_3', 'python_task_7'], ['python_task_3']])
+
+        # client errors are not retried, nor are server errors once max_retries is reached
+        tasks = [batch.models.TaskAddParameter('python_task_bad', 'cmd'), batch.models.TaskAddParameter('python_task_1', 'cmd')]
+        client = self._get_client(server_errors={'python_task_1': 5})
+        result = BatchTaskSubmitter(client, max_retries=2, retry_delay=0).submit('python_test_job', tasks)
+        self.assertFalse(result.succeeded)
+        self.assertEqual(sorted(r.task_id for r in result.failed), ['python_task_1', 'python_task_bad'])
+        self.assertEqual(len(self.requests), 3)
+
+    def test_submit_request_errors(self):
+        # transient errors are retried, too large requests are split
+        client = self._get_client(request_errors=[self._get_error(503), self._get_error(413, 'RequestBodyTooLarge')])
+        result = BatchTaskSubmitter(client, threads=1, retry_delay=0).submit('python_test_job', self._get_tasks(10))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(len(result.added), 10)
+        self.assertEqual([len(r) for r in self.requests], [10, 10, 5, 5])
+
+        client = self._get_client(request_errors=[self._get_error(400, 'InvalidPropertyValue')])
+        result = BatchTaskSubmitter(client, threads=1).submit('python_test_job', self._get_tasks(10))
+        self.assertFalse(result.succeeded)
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(len(result.errors[0][0]), 10)
+        self.assertEqual(result.errors[0][1].error.code, 'InvalidPropertyValue')
+
+        # errors raised before the request is sent are not retried
+        client = self._get_client(request_errors=[TypeError('value')])
+        result = BatchTaskSubmitter(client, threads=1, retry_delay=0).submit('python_test_job', self._get_tasks(10))
+        self.assertEqual(len(self.requests), 1)
+        self.assertIsInstance(result.errors[0][1], TypeError)
+
+    def test_submit_lost_results(self):
+        # the tasks added by a request whose response was lost exist when it is retried
+        client = self._get_client(lost_responses=1)
+        result = BatchTaskSubmitter(client, threads=1, retry_delay=0).submit('python_test_job', self._get_tasks(10))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(sorted(r.task_id for r in result.added), sorted(t.id for t in self._get_tasks(10)))
+        self.assertEqual(len(self.requests), 2)
+
+        # the tasks missing from the results are retried, and failed once max_retries is reached
+        client = self._get_client(missing=['python_task_4'])
+        result = BatchTaskSubmitter(client, threads=1, retry_delay=0).submit('python_test_job', self._get_tasks(10))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(len(result.added), 10)
+        self.assertEqual(self.requests[1:], [['python_task_4']])
+
+        client = self._get_client(missing=['python_task_4'])
+        result = BatchTaskSubmitter(client, threads=1, max_retries=0).submit('python_test_job', self._get_tasks(10))
+        self.assertEqual(len(result.added), 9)
+        self.assertEqual([(r.task_id, r.status) for r in result.failed],
+                         [('python_task_4', batch.models.TaskAddStatus.server_error)])
+
+
+class BatchFileDownloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.local_path = os.path.join(self.folder, 'stdout.txt')
+        self.content = os.urandom(1000)
+
+    def _get_client(self, errors=None):
+        errors = errors or {}
+        lock = threading.Lock()
+        self.ranges = []
+
+        def get_from_task(job_id, task_id, file_path, options):
+            self.assertEqual(options.if_unmodified_since, datetime.datetime(2017, 6, 1))
+            start, end = [int(x) for x in options.ocp_range[len('bytes='):].split('-')]
+            with lock:
+                self.ranges.append(start)
+                error = errors.get(start)
+                if error:
+                    errors[start] = error[1:]
+            data = self.content[start:end + 1]
+            if error and error[0] == 'short':
+                # the response ends before the end of the range
+                return iter([data[:7]])
+            if error:
+                raise error[0]
+            return iter([data[:7], data[7:]])
+
+        client = MagicMock()
+        client.file.get_properties_from_task.return_value.headers = {
+            'Content-Length': len(self.content),
+            'Last-Modified': datetime.datetime(2017, 6, 1),
+            'ETag': '0x8D4A8D5E3E0F9F3'}
+        client.file.get_from_task.side_effect = get_from_task
+        client.file.get_properties_from_compute_node = client.file.get_properties_from_task
+        client.file.get_from_compute_node.side_effect = get_from_task
+        return client
+
+    def _get_error(self, status_code):
+        error = batch.models.BatchErrorException.__new__(batch.models.BatchErrorException)
+        error.response = MagicMock(status_code=status_code)
+        return error
+
+    def test_download_ranges(self):
+        client = self._get_client(errors={300: [requests.ConnectionError(), self._get_error(503)]})
+        downloader = BatchFileDownloader(client, threads=4, chunk_size=100, retry_delay=0)
+        size = downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertEqual(size, 1000)
+        with open(self.local_path, 'rb') as local_file:
+            self.assertEqual(local_file.read(), self.content)
+        self.assertEqual(sorted(set(self.ranges)), list(range(0, 1000, 100)))
+        self.assertEqual(len(self.ranges), 12)
+        self.assertFalse(os.path.exists(self.local_path + '.download'))
+
+        self.content = self.content[:950]
+        downloader = BatchFileDownloader(self._get_client(), threads=4, chunk_size=100)
+        downloader.download_from_compute_node('python_test_pool', 'node_1', 'stdout.txt', self.local_path)
+        with open(self.local_path, 'rb') as local_file:
+            self.assertEqual(local_file.read(), self.content)
+
+    def test_download_retries(self):
+        # the chunks failing to be received are requested again, after an exponential backoff
+        client = self._get_client(errors={0: [ClientRequestError('Connection reset'), 'short', self._get_error(500)]})
+        downloader = BatchFileDownloader(client, threads=1, chunk_size=100, retry_delay=0.5)
+        with patch('azure.batch.batch_file_downloader.time.sleep') as sleep:
+            downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [0.5, 1.0, 2.0])
+        self.assertEqual(self.ranges[:4], [0, 0, 0, 0])
+        with open(self.local_path, 'rb') as local_file:
+            self.assertEqual(local_file.read(), self.content)
+
+        # errors other than request errors are not retried
+        client = self._get_client(errors={0: [TypeError('ocp_range')]})
+        downloader = BatchFileDownloader(client, threads=1, chunk_size=100, retry_delay=0)
+        with self.assertRaises(TypeError):
+            downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertEqual(self.ranges, [0])
+
+    def test_download_resume(self):
+        client = self._get_client(errors={500: [self._get_error(412)]})
+        downloader = BatchFileDownloader(client, threads=1, chunk_size=100)
+        with self.assertRaises(batch.models.BatchErrorException):
+            downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertTrue(os.path.exists(self.local_path + '.download'))
+        self.assertEqual(self.ranges, [0, 100, 200, 300, 400, 500])
+
+        # only the missing chunks are downloaded again
+        client = self._get_client()
+        downloader = BatchFileDownloader(client, threads=2, chunk_size=100)
+        downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertEqual(sorted(self.ranges), [500, 600, 700, 800, 900])
+        with open(self.local_path, 'rb') as local_file:
+            self.assertEqual(local_file.read(), self.content)
+
+        # the download starts over when the file changed
+        client = self._get_client(errors={0: [self._get_error(412)]})
+        with self.assertRaises(batch.models.BatchErrorException):
+            downloader = BatchFileDownloader(client, threads=1, chunk_size=100)
+            downloader.download_from_task('python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        client = self._get_client()
+        client.file.get_properties_from_task.return_value.headers['ETag'] = '0x8D4A8D5E3E0F9F4'
+        BatchFileDownloader(client, chunk_size=100).download_from_task(
+            'python_test_job', 'python_task_1', 'stdout.txt', self.local_path)
+        self.assertEqual(len(self.ranges), 10)
+
+
+def _reference_shared_key(request, account_name, key):
+    """The SharedKeyAuth signature as computed before single-pass canonicalization, kept as the
+    baseline of the golden tests and of the benchmark."""
+    from azure.batch.batch_auth import urlparse, parse_qs
+    import base64, hashlib, hmac
+
+    url = urlparse(request.url)
+    uri_path = url.path.replace('%5C', '/').replace('%2F', '/')
+    string_to_sign = request.method + '\n'
+    request_header_dict = {k.lower(): v for k, v in request.headers.items() if v}
+    string_to_sign += '\n'.join(str(request_header_dict.get(x, '')) for x in SharedKeyAuth.headers_to_sign) + '\n'
+    ocp_headers = [(k.lower(), v) for k, v in request.headers.items() if 'ocp-' in k and v]
+    for name, value in sorted(ocp_headers):
+        string_to_sign += "{}:{}\n".format(name, value)
+    string_to_sign += "/{}{}".format(account_name, uri_path)
+    query_to_sign = parse_qs(url.query)
+    for name in sorted(query_to_sign.keys()):
+        value = query_to_sign[name][0]
+        if value:
+            string_to_sign += "\n{}:{}".format(name, value)
+    signed = hmac.HMAC(base64.b64decode(key.encode('utf-8')), string_to_sign.encode('utf-8'), hashlib.sha256)
+    return "SharedKey {}:{}".format(account_name, base64.b64encode(signed.digest()).decode('utf-8'))
+
+
+class BatchSharedKeyAuthTest(unittest.TestCase):
+
+    key = 'ZmFrZV9hY29jdW50X2tleQ=='
+    date = 'Thu, 01 Jun 2017 00:00:00 GMT'
+    base_url = 'https://pythonsdktest.brazilsouth.batch.azure.com'
+
+    def _get_requests(self):
+        yield requests.Request(
+            'GET', self.base_url + '/pools', params={'api-version': '2017-05-01.5.0', 'timeout': 30},
+            headers={'ocp-date': self.date}).prepare()
+        yield requests.Request(
+            'POST', self.base_url + '/jobs/python_test_job/addtaskcollection', params={'api-version': '2017-05-01.5.0'},
+            headers={'ocp-date': self.date, 'Content-Type': 'application/json; odata=minimalmetadata; charset=utf-8',
+                     'client-request-id': 'abc', 'return-client-request-id': 'true'},
+            data='{"value": []}').prepare()
+        yield requests.Request(
+            'GET', self.base_url + '/jobs/python_test_job/tasks/python_task_1/files/wd%5Cstdout.txt',
+            params={'api-version': '2017-05-01.5.0', '$filter': "state eq 'active'", 'empty': ''},
+            headers={'ocp-date': self.date, 'ocp-range': 'bytes=0-99',
+                     'If-Modified-Since': 'Wed, 31 May 2017 00:00:00 GMT', 'Ocp-Custom': 'Value'}).prepare()
+        yield requests.Request(
+            'PATCH', self.base_url + '/pools/python%2Fpool',
+            params=[('api-version', '2017-05-01.5.0'), ('a', '1'), ('a', '2')],
+            headers={'ocp-date': self.date, 'Content-Type': 'application/json', 'If-Match': '"0x8D4"'},
+            data=u'{"metadata": [{"name": "caf\u00e9"}]}'.encode('utf-8')).prepare()
+
+    def test_golden_signatures(self):
+        expected = [
+            'SharedKey pythonsdktest:woy/uTh1dBo2kKyqhMOiLn275uq6Qn4/6kAaMyQU0BU=',
+            'SharedKey pythonsdktest:hrpN5N9vPYnUDJ7d79urESc5jIUGnBlSihZyS8V1T0Y=',
+            'SharedKey pythonsdktest:rGYYtlFbEw9qkqRxFTnHUhSGCXG6RX5SqsAyRyG5ywQ=',
+            'SharedKey pythonsdktest:4evC4Yz758ycm/q6DkUk1ud2Ee81Jg87yaiaJKRhKsg=',
+        ]
+        auth = SharedKeyAuth('Authorization', 'pythonsdktest', self.key)
+        for _ in range(2):
+            # signing a request again gives the same signature
+            for request, signature in zip(self._get_requests(), expected):
+                self.assertEqual(_reference_shared_key(request, 'pythonsdktest', self.key), signature)
+                self.assertEqual(auth(request).headers['Authorization'], signature)
+
+        request = requests.Request('GET', self.base_url + '/pools').prepare()
+        auth(request)
+        self.assertTrue(request.headers['ocp-date'])
+        self.assertEqual(request.headers['Authorization'], _reference_shared_key(request, 'pythonsdktest', self.key))
+
+        with self.assertRaises(ValueError):
+            SharedKeyAuth('Authorization', 'pythonsdktest', 'not a base64 key')(request)
+
+    def test_signature_benchmark(self):
+        auth = SharedKeyAuth('Authorization', 'pythonsdktest', self.key)
+        signed_requests = list(self._get_requests()) * 250
+
+        reference = min(timeit.repeat(
+            lambda: [_reference_shared_key(r, 'pythonsdktest', self.key) for r in signed_requests], number=1, repeat=3))
+        single_pass = min(timeit.repeat(lambda: [auth(r) for r in signed_requests], number=1, repeat=3))
+        LOG.info('sign {} requests: reference {:.2f} ms, single-pass {:.2f} ms'.format(
+            len(signed_requests), reference * 1000, single_pass * 1000))
+        self.assertEqual([auth(r).headers['Authorization'] for r in signed_requests[:4]],
+                         [_reference_shared_key(r, 'pythonsdktest', self.key) for r in signed_requests[:4]])
+
+
 class BatchPool(object):
 
     def __init__(self, live, client, id, **kwargs):
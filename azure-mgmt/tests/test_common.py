@@ -9,10 +9,67 @@
 
 import unittest
 import tempfile
+import threading
+import time
 from io import open
 
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from msrest import Configuration
+from msrest.authentication import BasicTokenAuthentication
+from msrest.service_client import ServiceClient
+
 from azure.common.client_factory import *
 
+AUTH_FILE = b"""
+# sample management library properties file
+subscription=15dbcfa8-4b93-4c9a-881c-6189d39f04d4
+client=a2ab11af-01aa-4759-8345-7803287dbd39
+key=password
+tenant=43413cc1-5886-4711-9804-8cfea3d1c3ee
+managementURI=https://management.core.windows.net/
+baseURL=https://management.azure.com/
+authURL=https://login.windows.net/
+graphURL=https://graph.windows.net/
+"""
+
+
+class FakeServiceClient(object):
+    def __init__(self, credentials, subscription_id, base_url):
+        self.credentials = credentials
+        self.subscription_id = subscription_id
+        self.config = Configuration(base_url)
+        self._client = ServiceClient(credentials, self.config)
+
+    def get(self):
+        request = self._client.get('/subscriptions/' + self.subscription_id)
+        return self._client.send(request).text
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _ConnectionCountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
 class TestCommon(unittest.TestCase):
 
     def setUp(self):
@@ -70,7 +127,101 @@ graphURL=https://graph.windows.net/
         self.assertEquals(credentials_instance, client.credentials)
 
         os.unlink(temp_auth_file.name)
-        
+
+    def _write_auth_file(self):
+        temp_auth_file = tempfile.NamedTemporaryFile(delete=False)
+        temp_auth_file.write(AUTH_FILE)
+        temp_auth_file.close()
+        self.addCleanup(os.unlink, temp_auth_file.name)
+        return temp_auth_file.name
+
+    def test_get_client_from_auth_file_shares_credentials(self):
+        class FakeClient(object):
+            def __init__(self, credentials, subscription_id, base_url):
+                self.credentials = credentials
+
+        auth_path = self._write_auth_file()
+        client = get_client_from_auth_file(FakeClient, auth_path)
+        other_client = get_client_from_auth_file(FakeClient, auth_path)
+        self.assertIs(client.credentials, other_client.credentials)
+
+    def test_get_subscription_clients_from_auth_file(self):
+        auth_path = self._write_auth_file()
+        clients = get_subscription_clients_from_auth_file(FakeServiceClient, ['sub1', 'sub2'], auth_path, max_connections=2)
+
+        self.assertEqual(list(clients), ['sub1', 'sub2'])
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(clients['sub2'].subscription_id, 'sub2')
+        self.assertEqual(clients['sub1'].config.base_url, 'https://management.azure.com/')
+        self.assertIs(clients['sub1'].credentials, clients['sub2'].credentials)
+        self.assertIs(clients.credentials, clients['sub1'].credentials)
+        self.assertEqual(clients.credentials._args[1:], ('a2ab11af-01aa-4759-8345-7803287dbd39', 'password'))
+        self.assertEqual([client.subscription_id for _, client in clients.items()], ['sub1', 'sub2'])
+
+    def test_fan_out(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def operation(client):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            if client.subscription_id == 'sub3':
+                raise ValueError('sub3')
+            return client.subscription_id.upper()
+
+        subscription_ids = ['sub{}'.format(index) for index in range(20)]
+        clients = SubscriptionClients(FakeServiceClient, subscription_ids, 'credentials', base_url='http://localhost')
+        results = list(clients.fan_out(operation, max_workers=4))
+
+        self.assertEqual(sorted(result.subscription_id for result in results), sorted(subscription_ids))
+        self.assertLessEqual(running[1], 4)
+        for result in results:
+            if result.subscription_id == 'sub3':
+                self.assertFalse(result.succeeded)
+                self.assertIsInstance(result.error, ValueError)
+                self.assertIsNone(result.result)
+            else:
+                self.assertTrue(result.succeeded)
+                self.assertEqual(result.result, result.subscription_id.upper())
+
+        started = []
+        results = clients.fan_out(lambda client: started.append(client.subscription_id) or time.sleep(0.01), max_workers=1)
+        next(results)
+        results.close()
+        time.sleep(0.05)
+        self.assertLess(len(started), len(subscription_ids))
+
+        with self.assertRaises(ValueError):
+            next(clients.fan_out(operation, max_workers=0))
+        with self.assertRaises(ValueError):
+            SubscriptionClients(FakeServiceClient, subscription_ids, 'credentials', max_connections=0)
+
+    def test_fan_out_shares_connections(self):
+        server = _ThreadingHTTPServer(('127.0.0.1', 0), _ConnectionCountingHandler)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        base_url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        subscription_ids = ['sub{}'.format(index) for index in range(20)]
+        credentials = BasicTokenAuthentication({'access_token': 'token'})
+        with SubscriptionClients(FakeServiceClient, subscription_ids, credentials,
+                                 max_connections=4, base_url=base_url) as clients:
+            results = list(clients.fan_out(lambda client: [client.get() for _ in range(3)], max_workers=4))
+
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(
+            sorted(result.result[0] for result in results),
+            sorted('/subscriptions/' + subscription_id for subscription_id in subscription_ids))
+        # a client per subscription, but not a connection per client
+        self.assertLessEqual(len(_ConnectionCountingHandler.connections), 4)
+
 
 #------------------------------------------------------------------------------
 if __name__ == '__main__':
@@ -5,33 +5,53 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 #--------------------------------------------------------------------------
+import base64
 import binascii
 import codecs
 import copy
+import datetime
 import string
 
 from dateutil import parser as date_parse
+import yaml
 import hashlib
+import json
+import logging
 import os
 import time
+import timeit
 import unittest
 import random
+import uuid
+import threading
 try:
     from unittest.mock import MagicMock
 except ImportError:
     from mock import MagicMock
 
 from azure.keyvault import KeyVaultId
+from azure.keyvault import KeyVaultObjectId
 from azure.keyvault import HttpBearerChallenge
 from azure.keyvault import HttpBearerChallengeCache
+from azure.keyvault import KeyVaultCache
+from azure.keyvault import KeyVaultCryptoProvider
+from azure.keyvault import KeyVaultAuthBase
+from azure.keyvault import KeyVaultBulkOperations
+from azure.keyvault import KeyVaultClient
 from azure.keyvault.generated.models import \
     (CertificatePolicy, KeyProperties, SecretProperties, IssuerParameters,
      X509CertificateProperties, IssuerBundle, IssuerCredentials, OrganizationDetails,
-     AdministratorDetails, Contact, KeyVaultError, SubjectAlternativeNames, JsonWebKey)
+     AdministratorDetails, Contact, KeyVaultError, SubjectAlternativeNames, JsonWebKey, KeyBundle,
+     SecretItem, KeyItem, SecretItemPaged, KeyAttributes)
+from msrest.serialization import TZ_UTC
+from azure.common.paging import read_ahead
+from azure.keyvault import models
 
 from testutils.common_recordingtestcase import record
 from tests.keyvault_testcase import HttpStatusCode, AzureKeyVaultTestCase, privatevault, sharedvault
 
+LOG = logging.getLogger(__name__)
+
 
 class KeyVaultCustomLayerTest(unittest.TestCase):
 
@@ -186,6 +206,47 @@ class KeyVaultCustomLayerTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             HttpBearerChallengeCache.set_challenge_for_url('https://diffurl.com', test_challenges[0]['challenge'])
 
+    def test_bearer_challenge_cache_instance(self):
+        mock_bearer_challenge = 'Bearer authorization="https://login.windows.net/mock-id", resource="https://vault.azure.net"'
+        challenges = [HttpBearerChallenge('https://mytest{}.url.com'.format(x), mock_bearer_challenge) for x in range(3)]
+
+        cache = HttpBearerChallengeCache.ChallengeCache(max_size=2)
+        for challenge in challenges:
+            cache.set_challenge_for_url(challenge.source_uri + '/keys/mykey?api-version=2016-10-01', challenge)
+
+        # the oldest challenge is evicted
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get_challenge_for_url(challenges[0].source_uri))
+        self.assertIs(cache.get_challenge_for_url(challenges[2].source_uri + '/secrets'), challenges[2])
+
+        # instances do not share their challenges
+        self.assertIsNone(HttpBearerChallengeCache.get_challenge_for_url(challenges[2].source_uri))
+        self.assertIsNone(HttpBearerChallengeCache.ChallengeCache().get_challenge_for_url(challenges[2].source_uri))
+
+        cache.remove_challenge_for_url(challenges[1].source_uri)
+        self.assertIsNone(cache.get_challenge_for_url(challenges[1].source_uri))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        # expired challenges are not returned
+        cache = HttpBearerChallengeCache.ChallengeCache(ttl=0.1)
+        cache.set_challenge_for_url(challenges[0].source_uri, challenges[0])
+        self.assertIs(cache.get_challenge_for_url(challenges[0].source_uri), challenges[0])
+        time.sleep(0.2)
+        self.assertIsNone(cache.get_challenge_for_url(challenges[0].source_uri))
+
+        # the default cache expires and bounds its challenges
+        default_cache = HttpBearerChallengeCache.ChallengeCache()
+        self.assertEqual(default_cache.ttl, 3600)
+        self.assertEqual(default_cache.max_size, 256)
+        self.assertEqual(HttpBearerChallengeCache._cache.ttl, 3600)
+        self.assertEqual(HttpBearerChallengeCache._cache.max_size, 256)
+
+        with self.assertRaises(ValueError):
+            HttpBearerChallengeCache.ChallengeCache(ttl=0)
+        with self.assertRaises(ValueError):
+            HttpBearerChallengeCache.ChallengeCache(max_size=0)
+
     def test_bearer_challenge(self):
         mock_bearer_challenge = '  Bearer authorization="https://login.windows.net/mock-id", resource="https://vault.azure.net"'
 
@@ -208,6 +269,621 @@ class KeyVaultCustomLayerTest(unittest.TestCase):
         challenge = HttpBearerChallenge('https://test.uri.com', mock_bearer_challenge)
         self.assertEqual(challenge.get_authorization_server(), 'https://login.windows.net/mock-id')
 
+class KeyVaultObjectIdTest(unittest.TestCase):
+
+    def test_parse(self):
+        for uri in ['https://myvault.vault.azure.net/keys/mykey/abc123',
+                    ' https://MyVault.vault.azure.net:443/keys/mykey/abc123/ ',
+                    'HTTPS://myvault.vault.azure.net/keys/mykey/abc123',
+                    'https://myvault.vault.azure.net/keys/mykey/abc123?api-version=2016-10-01']:
+            expected = KeyVaultId.parse_key_id(uri)
+            res = KeyVaultObjectId.parse(uri, 'keys')
+            self.assertEqual((res.vault, res.collection, res.name, res.version),
+                             (expected.vault, expected.collection, expected.name, expected.version))
+            self.assertEqual((res.id, res.base_id), (expected.id, expected.base_id))
+
+        res = KeyVaultObjectId.parse('https://myvault.vault.azure.net/secrets/mysecret')
+        self.assertEqual(res.version, KeyVaultId.version_none)
+        self.assertEqual(res.id, 'https://myvault.vault.azure.net/secrets/mysecret')
+        self.assertEqual(res, KeyVaultObjectId('https://myvault.vault.azure.net/', 'secrets', ' mysecret', None))
+
+        with self.assertRaises(ValueError):
+            KeyVaultObjectId.parse('https://myvault.vault.azure.net/keys/mykey/abc123', 'secrets')
+        with self.assertRaises(ValueError):
+            KeyVaultObjectId.parse('https://myvault.vault.azure.net/keys/mykey/abc123/extra')
+        with self.assertRaises(ValueError):
+            KeyVaultObjectId.parse('https://myvault.vault.azure.net')
+        with self.assertRaises(ValueError):
+            KeyVaultObjectId.parse('myvault.vault.azure.net/keys/mykey')
+        with self.assertRaises(ValueError):
+            KeyVaultObjectId('https://myvault.vault.azure.net', 'keys', ' ')
+
+    def test_immutable_and_interned(self):
+        uri = 'https://myvault.vault.azure.net/certificates/mycert/abc123'
+        res = KeyVaultObjectId.parse(uri)
+        self.assertIs(KeyVaultObjectId.parse(uri), res)
+        self.assertEqual(len(set([res, KeyVaultObjectId.parse(uri + '/')])), 1)
+        self.assertEqual(str(res), uri)
+
+        with self.assertRaises(AttributeError):
+            res.name = 'othercert'
+        with self.assertRaises(AttributeError):
+            res.other = 'value'
+        self.assertFalse(hasattr(res, '__dict__'))
+
+    def test_parse_many(self):
+        uris = ['https://myvault.vault.azure.net/secrets/secret{}/{}'.format(x, uuid.uuid4().hex)
+                for x in range(1000)]
+
+        def parse(parse_id):
+            return [(object_id.id, object_id.base_id) for object_id in map(parse_id, uris)]
+
+        expected = parse(KeyVaultId.parse_secret_id)
+        # first parse of new identifiers, then parse of the identifiers in use
+        ids = [KeyVaultObjectId.parse(uri) for uri in uris]
+        self.assertEqual([(object_id.id, object_id.base_id) for object_id in ids], expected)
+        self.assertEqual(parse(KeyVaultObjectId.parse), expected)
+
+    def test_parse_benchmark(self):
+        def new_uris():
+            return ['https://myvault.vault.azure.net/secrets/secret{}/{}'.format(x, uuid.uuid4().hex)
+                    for x in range(1000)]
+
+        def parse_new():
+            # new identifiers on every run, kept in use until they are all parsed
+            uris = new_uris()
+            start = timeit.default_timer()
+            ids = [KeyVaultObjectId.parse(uri) for uri in uris]
+            return timeit.default_timer() - start, ids
+
+        uris = new_uris()
+        in_use = [KeyVaultObjectId.parse(uri) for uri in uris]
+        reference = min(timeit.repeat(lambda: [KeyVaultId.parse_secret_id(uri) for uri in uris], number=1, repeat=3))
+        new = min(parse_new()[0] for _ in range(3))
+        interned = min(timeit.repeat(lambda: [KeyVaultObjectId.parse(uri) for uri in uris], number=1, repeat=3))
+        LOG.info('parse {} ids: KeyVaultId {:.2f} ms, new KeyVaultObjectId {:.2f} ms, interned {:.2f} ms'.format(
+            len(uris), reference * 1000, new * 1000, interned * 1000))
+        self.assertEqual([object_id.id for object_id in in_use],
+                         [KeyVaultId.parse_secret_id(uri).id for uri in uris])
+
+
+class KeyVaultCacheTest(unittest.TestCase):
+
+    def _get_client(self, delay=0):
+        versions = {}
+
+        def get_object(vault, name, version):
+            time.sleep(delay)
+            versions[name] = versions.get(name, 0) + 1
+            return '{}/{}/{}'.format(name, version or 'latest', versions[name])
+
+        client = MagicMock()
+        client.get_secret.side_effect = get_object
+        client.get_key.side_effect = get_object
+        client.get_certificate.side_effect = get_object
+        return client
+
+    def test_cache_hits_and_misses(self):
+        client = self._get_client()
+        cache = KeyVaultCache(client)
+
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/1')
+        self.assertEqual(cache.get_secret(' https://myvault.vault.azure.net ', ' mysecret ', ''), 'mysecret/latest/1')
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret', 'abc123'), 'mysecret/abc123/2')
+        self.assertEqual(cache.get_key('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/3')
+
+        self.assertEqual(client.get_secret.call_count, 2)
+        self.assertEqual(client.get_key.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses, cache.fetches), (1, 3, 3))
+        self.assertEqual(len(cache), 3)
+
+        # test invalidate
+        cache.invalidate(KeyVaultId.create_secret_id('https://myvault.vault.azure.net', 'mysecret'))
+        # the port and the trailing slash are dropped when the identifier is parsed
+        cache.invalidate('https://myvault.vault.azure.net:443/keys/mysecret/')
+        self.assertEqual(len(cache), 1)
+        cache.invalidate(KeyVaultObjectId.parse('https://myvault.vault.azure.net/secrets/mysecret/abc123'))
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            cache.invalidate('mysecret')
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/4')
+
+        # test clear
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_expiry_and_eviction(self):
+        client = self._get_client()
+        cache = KeyVaultCache(client, ttl=0)
+        cache.get_certificate('https://myvault.vault.azure.net', 'mycert')
+        cache.get_certificate('https://myvault.vault.azure.net', 'mycert')
+        self.assertEqual(client.get_certificate.call_count, 2)
+        self.assertEqual(cache.misses, 2)
+
+        cache = KeyVaultCache(client, max_size=2)
+        for name in ['a', 'b', 'a', 'c', 'a', 'b']:
+            cache.get_secret('https://myvault.vault.azure.net', name)
+        # 'b' is evicted by 'c', being the least recently used
+        self.assertEqual(client.get_secret.call_count, 4)
+        self.assertEqual(len(cache), 2)
+
+        with self.assertRaises(ValueError):
+            KeyVaultCache(client, max_size=0)
+
+    def test_cache_single_flight(self):
+        client = self._get_client(delay=0.2)
+        cache = KeyVaultCache(client)
+        results = []
+
+        def get_secret():
+            results.append(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'))
+
+        threads = [threading.Thread(target=get_secret) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.get_secret.call_count, 1)
+        self.assertEqual(results, ['mysecret/latest/1'] * 20)
+        self.assertEqual(cache.fetches, 1)
+
+    def test_cache_errors_are_shared_and_not_cached(self):
+        client = MagicMock()
+        client.get_secret.side_effect = [ValueError('throttled'), 'mysecret']
+        cache = KeyVaultCache(client)
+
+        with self.assertRaises(ValueError):
+            cache.get_secret('https://myvault.vault.azure.net', 'mysecret')
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret')
+        self.assertEqual(client.get_secret.call_count, 2)
+
+    def test_cache_stale_while_revalidate(self):
+        client = self._get_client()
+        refreshed = threading.Event()
+        get_secret = client.get_secret.side_effect
+
+        def get_secret_and_notify(*args):
+            result = get_secret(*args)
+            refreshed.set()
+            return result
+
+        client.get_secret.side_effect = get_secret_and_notify
+        cache = KeyVaultCache(client, ttl=0, stale_ttl=60)
+
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/1')
+        refreshed.clear()
+        # the expired secret is returned while it is refreshed in the background
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/1')
+        self.assertTrue(refreshed.wait(5))
+        while cache._fetches:
+            time.sleep(0.01)
+        self.assertEqual(cache.get_secret('https://myvault.vault.azure.net', 'mysecret'), 'mysecret/latest/2')
+        self.assertEqual(cache.stale_hits, 2)
+
+
+class KeyVaultCryptoProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        # the key imported by test_key_sign_and_verify, and the digest and signature recorded by the service
+        recording = os.path.join(os.path.dirname(__file__), 'recordings',
+                                 'test_key_vault_data.test_key_sign_and_verify.yaml')
+        with open(recording) as f:
+            interactions = yaml.safe_load(f)['interactions']
+        for interaction in interactions:
+            uri = interaction['request']['uri']
+            if '/keys/' not in uri:
+                continue
+            request = json.loads(interaction['request']['body'])
+            response = json.loads(interaction['response']['body']['string'])
+            if interaction['request']['method'] == 'PUT':
+                self.jwk = request['key']
+                self.kid = response['key']['kid']
+            elif '/sign' in uri:
+                self.digest = self._decode(request['value'])
+                self.signature = self._decode(response['value'])
+
+        key = JsonWebKey(kid=self.kid, kty='RSA', key_ops=self.jwk['key_ops'],
+                         n=self._decode(self.jwk['n']), e=self._decode(self.jwk['e']))
+        bundle = KeyBundle()
+        bundle.key = key
+        self.client = MagicMock()
+        self.client.get_key.return_value = bundle
+        self.vault = 'https://pytest-shared-vault.vault.azure.net'
+
+    def _decode(self, value):
+        return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+    def _private_key(self):
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        def _int(name):
+            return int(binascii.hexlify(self._decode(self.jwk[name])), 16)
+
+        public_numbers = rsa.RSAPublicNumbers(_int('e'), _int('n'))
+        return rsa.RSAPrivateNumbers(_int('p'), _int('q'), _int('d'), _int('dp'), _int('dq'), _int('qi'),
+                                     public_numbers).private_key(default_backend())
+
+    def test_verify_recorded_signature(self):
+        crypto = KeyVaultCryptoProvider(self.client)
+
+        self.assertTrue(crypto.verify(self.vault, 'keysign97fd1219', '', 'RS256', self.digest, self.signature).value)
+        self.assertFalse(crypto.verify(self.vault, 'keysign97fd1219', '', 'RS256',
+                                       hashlib.sha256(b'other').digest(), self.signature).value)
+
+        # the key is requested once, and no operation is sent to the vault
+        self.assertEqual(self.client.get_key.call_count, 1)
+        self.assertEqual(self.client.verify.call_count, 0)
+
+    def test_encrypt_and_wrap_locally(self):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        crypto = KeyVaultCryptoProvider(self.client)
+        private_key = self._private_key()
+        plain_text = os.urandom(32)
+
+        result = crypto.encrypt(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', plain_text)
+        self.assertEqual(result.kid, self.kid)
+        oaep = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA1()), algorithm=hashes.SHA1(), label=None)
+        self.assertEqual(private_key.decrypt(result.result, oaep), plain_text)
+
+        result = crypto.wrap_key(self.vault, 'keysign97fd1219', '', 'RSA1_5', plain_text)
+        self.assertEqual(private_key.decrypt(result.result, padding.PKCS1v15()), plain_text)
+
+        self.assertEqual(self.client.get_key.call_count, 1)
+        self.assertEqual(self.client.encrypt.call_count, 0)
+        self.assertEqual(self.client.wrap_key.call_count, 0)
+
+    def test_operations_sent_to_the_vault(self):
+        crypto = KeyVaultCryptoProvider(self.client)
+
+        # private key operations
+        crypto.decrypt(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'cipher')
+        crypto.sign(self.vault, 'keysign97fd1219', '', 'RS256', self.digest)
+        self.assertEqual(self.client.decrypt.call_count, 1)
+        self.assertEqual(self.client.sign.call_count, 1)
+
+        # algorithms not performed locally
+        crypto.verify(self.vault, 'keysign97fd1219', '', 'PS256', self.digest, self.signature)
+        self.assertEqual(self.client.verify.call_count, 1)
+
+        # raw responses
+        crypto.encrypt(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain', raw=True)
+        self.assertEqual(self.client.encrypt.call_count, 1)
+
+        # keys which do not allow the operation
+        self.client.get_key.return_value.key.key_ops = ['verify']
+        crypto = KeyVaultCryptoProvider(self.client)
+        crypto.wrap_key(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain')
+        self.assertEqual(self.client.wrap_key.call_count, 1)
+
+    def test_disabled_keys_sent_to_the_vault(self):
+        self.client.get_key.return_value.attributes = KeyAttributes(enabled=False)
+        crypto = KeyVaultCryptoProvider(self.client)
+
+        crypto.encrypt(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain')
+        crypto.verify(self.vault, 'keysign97fd1219', '', 'RS256', self.digest, self.signature)
+        self.assertEqual(self.client.encrypt.call_count, 1)
+        self.assertEqual(self.client.verify.call_count, 1)
+
+        # the attributes of the cached key are checked on each call
+        self.client.get_key.return_value.attributes.enabled = True
+        self.assertTrue(crypto.verify(self.vault, 'keysign97fd1219', '', 'RS256', self.digest, self.signature).value)
+        self.assertEqual(self.client.verify.call_count, 1)
+
+    def test_keys_outside_their_validity_sent_to_the_vault(self):
+        now = datetime.datetime.now(TZ_UTC)
+        attributes = KeyAttributes(enabled=True, not_before=now - datetime.timedelta(hours=1),
+                                   expires=now + datetime.timedelta(hours=1))
+        self.client.get_key.return_value.attributes = attributes
+        crypto = KeyVaultCryptoProvider(self.client)
+        crypto.wrap_key(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain')
+        self.assertEqual(self.client.wrap_key.call_count, 0)
+
+        # expired
+        attributes.expires = now - datetime.timedelta(seconds=1)
+        crypto.wrap_key(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain')
+        self.assertEqual(self.client.wrap_key.call_count, 1)
+
+        # not yet valid
+        attributes.expires = None
+        attributes.not_before = now + datetime.timedelta(hours=1)
+        crypto.wrap_key(self.vault, 'keysign97fd1219', '', 'RSA-OAEP', b'plain')
+        self.assertEqual(self.client.wrap_key.call_count, 2)
+
+
+class KeyVaultAuthBaseTest(unittest.TestCase):
+
+    mock_bearer_challenge = 'Bearer authorization="https://login.windows.net/mock-id", resource="https://vault.azure.net"'
+
+    def setUp(self):
+        HttpBearerChallengeCache.clear()
+        self.addCleanup(HttpBearerChallengeCache.clear)
+        self.challenge = HttpBearerChallenge('https://myvault.vault.azure.net', self.mock_bearer_challenge)
+        self.tokens = []
+
+    def _get_jwt(self, expires_on):
+        claims = json.dumps({'exp': int(expires_on)}).encode('utf-8')
+        return 'header.{}.signature'.format(base64.urlsafe_b64encode(claims).decode('ascii').rstrip('='))
+
+    def _get_callback(self, expires_in=3600, jwt=True, delay=0):
+        def callback(server, resource, scope):
+            time.sleep(delay)
+            expires_on = time.time() + expires_in
+            token = self._get_jwt(expires_on) if jwt else 'token{}'.format(len(self.tokens))
+            self.tokens.append(token)
+            if jwt:
+                return 'Bearer', token
+            return 'Bearer', token, expires_on
+        return callback
+
+    def _get_authorization(self, auth):
+        request = MagicMock(headers={})
+        auth.set_authorization_header(request, self.challenge)
+        return request.headers['Authorization']
+
+    def test_tokens_are_cached(self):
+        auth = KeyVaultAuthBase(self._get_callback())
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[0])
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[0])
+        self.assertEqual(len(self.tokens), 1)
+
+        # expiry returned by the callback
+        auth = KeyVaultAuthBase(self._get_callback(jwt=False))
+        self._get_authorization(auth)
+        self._get_authorization(auth)
+        self.assertEqual(len(self.tokens), 2)
+
+        # tokens without known expiry are not cached
+        auth = KeyVaultAuthBase(lambda server, resource, scope: ('Bearer', 'opaque'))
+        self.assertEqual(self._get_authorization(auth), 'Bearer opaque')
+
+        auth = KeyVaultAuthBase(self._get_callback(expires_in=-1))
+        self._get_authorization(auth)
+        self._get_authorization(auth)
+        self.assertEqual(len(self.tokens), 4)
+
+    def test_tokens_are_refreshed_before_expiry(self):
+        auth = KeyVaultAuthBase(self._get_callback(expires_in=60, delay=0.2), refresh_margin=120)
+        self._get_authorization(auth)
+        self.assertEqual(len(self.tokens), 1)
+
+        # the cached token is returned while a single refresh runs in the background
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[0])
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[0])
+        time.sleep(0.5)
+        self.assertEqual(len(self.tokens), 2)
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[1])
+
+    def test_rejected_token_is_acquired_again(self):
+        auth = KeyVaultAuthBase(self._get_callback())
+        HttpBearerChallengeCache.set_challenge_for_url('https://myvault.vault.azure.net', self.challenge)
+
+        request = MagicMock(url='https://myvault.vault.azure.net/keys/key0', headers={}, body=None)
+        auth(request)
+        self.assertEqual(request.headers['Authorization'], 'Bearer ' + self.tokens[0])
+        # the 401 of a revoked token is handled even though the challenge is cached
+        request.register_hook.assert_any_call('response', auth.handle_401)
+
+        response = MagicMock(status_code=401, headers={'www-authenticate': self.mock_bearer_challenge})
+        response.request = request
+        response.request.copy.return_value = MagicMock(headers={})
+        resent = auth.handle_401(response)
+
+        self.assertEqual(len(self.tokens), 2)
+        self.assertEqual(resent.request.headers['Authorization'], 'Bearer ' + self.tokens[1])
+        response.raw.read.assert_called_once_with(decode_content=False)
+        response.close.assert_called_once_with()
+        self.assertEqual(self._get_authorization(auth), 'Bearer ' + self.tokens[1])
+
+        # a second 401 for the resent request is returned
+        resent.status_code = 401
+        resent.headers = response.headers
+        self.assertIs(auth.handle_401(resent), resent)
+        self.assertEqual(len(self.tokens), 2)
+
+    def test_prewarm_challenges(self):
+        response = MagicMock(status_code=401, headers={'www-authenticate': self.mock_bearer_challenge})
+        response.request.url = 'https://myvault.vault.azure.net/keys?api-version=2016-10-01'
+        session = MagicMock()
+        session.get.return_value = response
+
+        auth = KeyVaultAuthBase(self._get_callback())
+        auth.prewarm_challenges(['https://myvault.vault.azure.net/'], session)
+        session.get.assert_called_once_with('https://myvault.vault.azure.net/keys',
+                                            params={'api-version': '2016-10-01'})
+        self.assertIsNotNone(HttpBearerChallengeCache.get_challenge_for_url('https://myvault.vault.azure.net'))
+        self.assertEqual(len(self.tokens), 1)
+
+        # cached challenges and tokens are not requested again
+        auth.prewarm_challenges(['https://myvault.vault.azure.net'], session)
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(len(self.tokens), 1)
+
+        # vaults which don't return a bearer challenge are skipped
+        response.status_code = 200
+        auth.prewarm_challenges(['https://othervault.vault.azure.net'], session)
+        self.assertIsNone(HttpBearerChallengeCache.get_challenge_for_url('https://othervault.vault.azure.net'))
+
+    def test_challenge_cache_per_instance(self):
+        response = MagicMock(status_code=401, headers={'www-authenticate': self.mock_bearer_challenge})
+        response.request.url = 'https://myvault.vault.azure.net/keys?api-version=2016-10-01'
+        session = MagicMock()
+        session.get.return_value = response
+
+        cache = HttpBearerChallengeCache.ChallengeCache()
+        auth = KeyVaultAuthBase(self._get_callback(), challenge_cache=cache)
+        auth.prewarm_challenges(['https://myvault.vault.azure.net'], session)
+        self.assertIsNotNone(cache.get_challenge_for_url('https://myvault.vault.azure.net'))
+        self.assertIsNone(HttpBearerChallengeCache.get_challenge_for_url('https://myvault.vault.azure.net'))
+
+
+class KeyVaultBulkOperationsTest(unittest.TestCase):
+
+    vault = 'https://myvault.vault.azure.net'
+
+    def _get_throttled_error(self, retry_after='0'):
+        error = Exception('Too many requests')
+        error.response = MagicMock(status_code=429, headers={'Retry-After': retry_after})
+        return error
+
+    def test_bulk_results_and_errors(self):
+        client = MagicMock()
+
+        def get_secret(vault, name, version):
+            if name == 'missing':
+                raise ValueError(name)
+            return '{}/{}'.format(name, version or 'latest')
+        client.get_secret.side_effect = get_secret
+
+        bulk = KeyVaultBulkOperations(client, max_concurrency=4)
+        ids = ['{}/secrets/secret{}'.format(self.vault, x) for x in range(20)]
+        ids.append('{}/secrets/secret0/version0'.format(self.vault))
+        ids.append('{}/secrets/missing'.format(self.vault))
+        results = list(bulk.get_secrets(ids))
+
+        self.assertEqual(sorted(result.item for result in results), sorted(ids))
+        results = dict((result.item, result) for result in results)
+        self.assertEqual(results[ids[1]].result, 'secret1/latest')
+        self.assertEqual(results[ids[20]].result, 'secret0/version0')
+        self.assertTrue(results[ids[1]].succeeded)
+        self.assertFalse(results[ids[21]].succeeded)
+        self.assertIsInstance(results[ids[21]].error, ValueError)
+
+        results = list(bulk.set_secrets(self.vault, {'secret0': 'value0', 'secret1': 'value1'}))
+        self.assertEqual(len(results), 2)
+        self.assertEqual(client.set_secret.call_count, 2)
+
+    def test_bulk_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def delete_key(vault, name):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+        client = MagicMock()
+        client.delete_key.side_effect = delete_key
+
+        bulk = KeyVaultBulkOperations(client, max_concurrency=3)
+        results = list(bulk.delete_keys(self.vault, ['key{}'.format(x) for x in range(30)]))
+        self.assertEqual(len(results), 30)
+        self.assertTrue(1 < active[1] <= 3)
+
+    def test_bulk_throttling(self):
+        throttled = [3]
+        lock = threading.Lock()
+
+        def backup_secret(vault, name):
+            with lock:
+                if throttled[0]:
+                    throttled[0] -= 1
+                    raise self._get_throttled_error()
+            return name
+        client = MagicMock()
+        client.backup_secret.side_effect = backup_secret
+
+        bulk = KeyVaultBulkOperations(client, max_concurrency=8)
+        results = list(bulk.backup_secrets(self.vault, ['secret{}'.format(x) for x in range(10)]))
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(client.backup_secret.call_count, 13)
+        self.assertLess(bulk._throttle.limit, 8)
+
+        # operations throttled more than max_retries times fail
+        client.backup_secret.side_effect = self._get_throttled_error()
+        bulk = KeyVaultBulkOperations(client, max_concurrency=2, max_retries=1)
+        results = list(bulk.backup_secrets(self.vault, ['secret0']))
+        self.assertEqual(results[0].error.response.status_code, 429)
+
+    def test_bulk_listing_pipeline(self):
+        secrets = [SecretItem(id='{}/secrets/secret{}'.format(self.vault, x)) for x in range(5)]
+        keys = [KeyItem(kid='{}/keys/key{}'.format(self.vault, x)) for x in range(5)]
+
+        def list_secrets():
+            for secret in secrets:
+                yield secret
+            raise ValueError('listing failed')
+        client = MagicMock()
+        client.get_secrets.return_value = list_secrets()
+        client.get_keys.return_value = iter(keys)
+        client.get_key.side_effect = lambda vault, name, version: name
+
+        bulk = KeyVaultBulkOperations(client)
+        self.assertEqual(sorted(result.result for result in bulk.get_all_keys(self.vault, maxresults=25)),
+                         ['key{}'.format(x) for x in range(5)])
+        client.get_keys.assert_called_once_with(self.vault, 25)
+
+        # errors of the listing are raised once the items listed before are done
+        results = []
+        with self.assertRaises(ValueError):
+            for result in bulk.get_all_secrets(self.vault):
+                results.append(result)
+        self.assertEqual(len(results), 5)
+
+
+class KeyVaultPrefetchTest(unittest.TestCase):
+
+    def _get_paged(self, page_count, delay=0):
+        self.requests = []
+        self.started = [threading.Event() for _ in range(abs(page_count))]
+
+        def internal_paging(next_link=None, raw=False):
+            self.requests.append(next_link)
+            self.started[int(next_link or 0)].set()
+            time.sleep(delay)
+            page = int(next_link or 0)
+            if page == 3 and page_count < 0:
+                raise ValueError('page 3')
+            return {
+                'value': [{'id': 'https://myvault.vault.azure.net/secrets/secret{}-{}'.format(page, x)} for x in range(2)],
+                'nextLink': str(page + 1) if page + 1 < abs(page_count) else None
+            }
+        return SecretItemPaged(internal_paging, {'SecretItem': SecretItem})
+
+    def test_prefetch_pages(self):
+        expected = [secret.id for secret in self._get_paged(4)]
+
+        paged = read_ahead(self._get_paged(4))
+        self.assertEqual(next(paged).id, expected[0])
+        # the second page is requested while the first one is consumed
+        self.assertTrue(self.started[1].wait(5))
+        self.assertEqual(self.requests, ['', '1'])
+        self.assertEqual([secret.id for secret in paged], expected[1:])
+        self.assertEqual(self.requests, ['', '1', '2', '3'])
+        with self.assertRaises(StopIteration):
+            paged.advance_page()
+
+    def test_prefetch_overlaps_requests(self):
+        paged = read_ahead(self._get_paged(4, delay=0.1))
+        for index, _ in enumerate(paged):
+            page, item = divmod(index, 2)
+            if item == 0 and page < 3:
+                # the next page is requested before the items of the current page are consumed
+                self.assertTrue(self.started[page + 1].wait(5))
+        self.assertEqual(self.requests, ['', '1', '2', '3'])
+
+    def test_prefetch_errors(self):
+        paged = read_ahead(self._get_paged(-5))
+        secrets = []
+        with self.assertRaises(ValueError):
+            for secret in paged:
+                secrets.append(secret)
+        self.assertEqual(len(secrets), 6)
+
+    def test_client_prefetch_option(self):
+        client = KeyVaultClient(MagicMock())
+        paged = client.get_secret_versions('https://myvault.vault.azure.net', 'mysecret', maxresults=25, prefetch=True)
+        self.assertIsInstance(paged, models.SecretItemPaged)
+        self.assertIs(read_ahead(paged), paged)
+        self.assertIsNot(type(paged), models.SecretItemPaged)
+        self.assertIs(type(client.get_deleted_keys('https://myvault.vault.azure.net')), models.DeletedKeyItemPaged)
+
+
 class KeyVaultKeyTest(AzureKeyVaultTestCase):
 
     def setUp(self):
@@ -0,0 +1,185 @@
+# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+import json
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import timeit
+import unittest
+
+from azure.common.lazy_models import ModelDependencies, get_model_dependencies, operation_group
+
+LOG = logging.getLogger(__name__)
+
+# run in a new interpreter, the models imported by the other tests being imported for good
+_IMPORT_CLIENT = '''
+import json, sys, timeit
+import msrestazure.azure_operation, azure.common.lazy_models
+start = timeit.default_timer()
+from {package} import {client}
+client = {client}(object(), '00000000-0000-0000-0000-000000000000')
+models = client.models(client.api_version)
+if {eager}:
+    # what importing the models package used to do
+    for name in models.__all__:
+        getattr(models, name)
+elapsed = timeit.default_timer() - start
+print(json.dumps({{
+    'elapsed': elapsed,
+    'models': len(models.__all__),
+    'imported': len([name for name in models.__all__ if name in vars(models)]),
+    'modules': len(sys.modules),
+}}))
+'''
+
+
+def _run(script):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.check_output([sys.executable, '-c', textwrap.dedent(script)], env=env)
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+class MgmtLazyModelsTest(unittest.TestCase):
+
+    def _benchmark_client(self, package, client):
+        def run(eager):
+            results = [_run(_IMPORT_CLIENT.format(package=package, client=client, eager=eager)) for _ in range(3)]
+            return min(results, key=lambda result: result['elapsed'])
+
+        lazy = run(False)
+        eager = run(True)
+        LOG.info('import and create {}: lazy {:.2f} ms ({} modules), all {} models {:.2f} ms ({} modules)'.format(
+            client, lazy['elapsed'] * 1000, lazy['modules'],
+            eager['models'], eager['elapsed'] * 1000, eager['modules']))
+        self.assertEqual(lazy['imported'], 0)
+        self.assertEqual(eager['imported'], eager['models'])
+        self.assertLess(lazy['modules'], eager['modules'])
+
+    def test_compute_import_benchmark(self):
+        self._benchmark_client('azure.mgmt.compute', 'ComputeManagementClient')
+
+    def test_network_import_benchmark(self):
+        self._benchmark_client('azure.mgmt.network', 'NetworkManagementClient')
+
+    def test_storage_import_benchmark(self):
+        self._benchmark_client('azure.mgmt.storage', 'StorageManagementClient')
+
+    def test_resource_import_benchmark(self):
+        self._benchmark_client('azure.mgmt.resource', 'ResourceManagementClient')
+
+    def test_policy_import_benchmark(self):
+        self._benchmark_client('azure.mgmt.resource', 'PolicyClient')
+
+    def test_model_imported_with_dependencies(self):
+        result = _run('''
+            import json
+            from azure.mgmt.network import NetworkManagementClient
+            client = NetworkManagementClient(object(), '00000000-0000-0000-0000-000000000000')
+            models = client.models(client.api_version)
+            vnet = client._deserialize('VirtualNetwork', {
+                'name': 'vnet',
+                'properties': {'subnets': [{'name': 'subnet', 'properties': {'addressPrefix': '10.0.0.0/24'}}]},
+            })
+            print(json.dumps({
+                'subnet': type(vnet.subnets[0]).__name__,
+                'prefix': vnet.subnets[0].address_prefix,
+                'imported': [name for name in models.__all__ if name in vars(models)],
+                'copied': sorted(dict(client._deserialize.dependencies)),
+                'models': len(models.__all__),
+            }))
+        ''')
+        self.assertEqual(result['subnet'], 'Subnet')
+        self.assertEqual(result['prefix'], '10.0.0.0/24')
+        self.assertIn('Subnet', result['imported'])
+        self.assertIn('NetworkSecurityGroup', result['imported'])
+        self.assertNotIn('ApplicationGateway', result['imported'])
+        self.assertLess(len(result['imported']), result['models'])
+        self.assertEqual(result['copied'], sorted(result['imported']))
+
+    def test_serialize_and_list(self):
+        result = _run('''
+            import json
+            from azure.mgmt.storage import StorageManagementClient
+            from azure.mgmt.storage.models import Sku, StorageAccountCreateParameters
+            client = StorageManagementClient(object(), '00000000-0000-0000-0000-000000000000')
+            body = client._serialize.body(
+                {'sku': {'name': 'Standard_LRS'}, 'kind': 'Storage', 'location': 'westus'},
+                'StorageAccountCreateParameters')
+            model_body = client._serialize.body(
+                StorageAccountCreateParameters(Sku('Standard_RAGRS'), 'BlobStorage', 'westus', access_tier='Hot'),
+                'StorageAccountCreateParameters')
+            models = client.models(client.api_version)
+            pages = iter([{'value': [{'name': 'account', 'sku': {'name': 'Standard_LRS'}}]}])
+            accounts = list(models.StorageAccountPaged(lambda link, raw=False: next(pages), client._deserialize.dependencies))
+            print(json.dumps({
+                'body': body,
+                'model_body': model_body,
+                'accounts': [(account.name, account.sku.name.value) for account in accounts],
+            }))
+        ''')
+        self.assertEqual(result['body'], {'sku': {'name': 'Standard_LRS'}, 'kind': 'Storage', 'location': 'westus'})
+        self.assertEqual(result['model_body'], {
+            'sku': {'name': 'Standard_RAGRS'}, 'kind': 'BlobStorage', 'location': 'westus',
+            'properties': {'accessTier': 'Hot', 'supportsHttpsTrafficOnly': False}})
+        self.assertEqual(result['accounts'], [['account', 'Standard_LRS']])
+
+    def test_models_module(self):
+        import azure.mgmt.network.models
+        import azure.mgmt.network.v2017_06_01.models as version_models
+
+        self.assertIs(azure.mgmt.network.models.VirtualNetwork, version_models.VirtualNetwork)
+        self.assertIn('VirtualNetwork', dir(azure.mgmt.network.models))
+        with self.assertRaises(AttributeError):
+            azure.mgmt.network.models.NotAModel
+
+        namespace = {}
+        exec('from azure.mgmt.network.models import *', namespace)
+        self.assertEqual(set(namespace) - {'__builtins__'}, set(version_models.__all__))
+
+        dependencies = ModelDependencies(version_models)
+        self.assertIs(dependencies['Subnet'], version_models.Subnet)
+        self.assertIn('Subnet', dependencies)
+        self.assertNotIn('NotAModel', dependencies)
+        self.assertNotIn(['unhashable'], dependencies)
+        self.assertEqual(len(dependencies), len(version_models.__all__))
+        self.assertIn(version_models.Subnet, dependencies.values())
+
+    def test_operation_groups(self):
+        from azure.mgmt.network import NetworkManagementClient
+        from azure.mgmt.network.v2017_06_01.operations import VirtualNetworksOperations
+        import azure.mgmt.network.v2017_06_01.models as version_models
+
+        client = NetworkManagementClient(object(), '00000000-0000-0000-0000-000000000000')
+        other_client = NetworkManagementClient(object(), '11111111-1111-1111-1111-111111111111')
+        old_client = NetworkManagementClient(object(), '00000000-0000-0000-0000-000000000000', api_version='2016-12-01')
+
+        self.assertIsInstance(client.virtual_networks, VirtualNetworksOperations)
+        self.assertIs(client.virtual_networks, client.virtual_networks)
+        self.assertIsNot(client.virtual_networks, other_client.virtual_networks)
+        self.assertEqual(other_client.virtual_networks.config.subscription_id, '11111111-1111-1111-1111-111111111111')
+        self.assertNotIsInstance(old_client.virtual_networks, VirtualNetworksOperations)
+        self.assertIsInstance(NetworkManagementClient.__dict__['virtual_networks'], operation_group)
+        self.assertIn('Instance depends on the API version', NetworkManagementClient.virtual_networks.__doc__)
+
+        self.assertIs(client._deserialize.dependencies, other_client._serialize.dependencies)
+        self.assertIs(client._deserialize.dependencies, get_model_dependencies(version_models))
+        self.assertIsNot(client._deserialize.dependencies, old_client._deserialize.dependencies)
+
+        new_operations = NetworkManagementClient.__dict__['virtual_networks']._create
+        created = min(timeit.repeat(lambda: new_operations(client).get, number=10000, repeat=3))
+        cached = min(timeit.repeat(lambda: client.virtual_networks.get, number=10000, repeat=3))
+        LOG.info('10000 operation group accesses: created {:.2f} ms, cached {:.2f} ms'.format(
+            created * 1000, cached * 1000))
+        self.assertIsNot(new_operations(client), client.virtual_networks)
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
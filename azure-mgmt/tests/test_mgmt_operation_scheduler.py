@@ -0,0 +1,210 @@
+# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+import json
+import logging
+import threading
+import time
+import unittest
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from msrestazure import azure_operation
+from msrestazure.azure_exceptions import CloudError
+
+from azure.common.operation_scheduler import (
+    AzureOperationPoller,
+    OperationScheduler,
+    as_completed,
+    get_default_scheduler,
+    wait_all,
+)
+
+LOG = logging.getLogger(__name__)
+
+OPERATION_URL = 'https://management.azure.com/subscriptions/sub/resourceGroups/group/operations/{}'
+RESOURCE_URL = 'https://management.azure.com/subscriptions/sub/resourceGroups/group/resources/{}'
+
+
+def _response(method, url, status_code, headers=None, body=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+def _get_output(response):
+    if response.status_code == 200 and response.content:
+        return response.json()
+
+
+class FakeOperation(object):
+    """A DELETE operation whose location is polled `polls` times before
+    completing."""
+
+    def __init__(self, name, polls=2, retry_after=None, status_code=200):
+        self.name = name
+        self.remaining = polls
+        self.headers = {'location': OPERATION_URL.format(name)}
+        if retry_after is not None:
+            self.headers['retry-after'] = str(retry_after)
+        self.status_code = status_code
+        self.requests = 0
+        self.threads = set()
+
+    def send(self):
+        return _response('DELETE', RESOURCE_URL.format(self.name), 202, self.headers)
+
+    def update(self, url, headers=None):
+        self.requests += 1
+        self.threads.add(threading.current_thread().name)
+        self.remaining -= 1
+        if self.remaining > 0:
+            return _response('GET', url, 202, self.headers)
+        if self.status_code != 200:
+            return _response('GET', url, self.status_code, body={'error': {'code': 'Conflict', 'message': 'Busy'}})
+        return _response('GET', url, 200, body={'name': self.name})
+
+    def start(self, scheduler, timeout=0):
+        return AzureOperationPoller(self.send, _get_output, self.update, timeout, scheduler=scheduler)
+
+
+class MgmtOperationSchedulerTest(unittest.TestCase):
+
+    def test_poll_until_complete(self):
+        scheduler = OperationScheduler(max_workers=2)
+        operation = FakeOperation('vm', polls=3)
+        poller = operation.start(scheduler)
+
+        self.assertEqual(poller.result(5), {'name': 'vm'})
+        self.assertTrue(poller.done())
+        self.assertEqual(poller.status(), 'Succeeded')
+        self.assertEqual(operation.requests, 3)
+        self.assertEqual(operation.threads, {'OperationScheduler'})
+        # the operation is no longer counted once the poller is done
+        self.assertEqual(len(scheduler), 0)
+        with self.assertRaises(ValueError):
+            poller.add_done_callback(lambda operation: None)
+
+    def test_already_complete(self):
+        poller = AzureOperationPoller(
+            lambda: _response('PUT', RESOURCE_URL.format('vm'), 200, body={'name': 'vm'}),
+            _get_output, None, scheduler=OperationScheduler())
+
+        self.assertTrue(poller.done())
+        self.assertEqual(poller.result(), {'name': 'vm'})
+        self.assertEqual(list(as_completed([poller])), [poller])
+
+    def test_retry_after(self):
+        scheduler = OperationScheduler(max_workers=1)
+        # the timeout is used without Retry-After header
+        slow = FakeOperation('slow', polls=2, retry_after=1).start(scheduler, timeout=0)
+        fast = FakeOperation('fast', polls=4, retry_after=0).start(scheduler, timeout=30)
+        default = FakeOperation('default', polls=1).start(scheduler, timeout=0.5)
+
+        start = time.time()
+        completed = list(as_completed([slow, fast, default]))
+        elapsed = time.time() - start
+
+        self.assertEqual(completed, [fast, default, slow])
+        self.assertGreaterEqual(elapsed, 2)
+        self.assertLess(elapsed, 10)
+
+    def test_flat_threads(self):
+        scheduler = OperationScheduler(max_workers=4)
+        threads = threading.active_count()
+        operations = [FakeOperation('vm{}'.format(index), polls=3) for index in range(200)]
+        start = time.time()
+        pollers = [operation.start(scheduler) for operation in operations]
+        self.assertLessEqual(threading.active_count(), threads + 4)
+
+        done, not_done = wait_all(pollers, timeout=30)
+        LOG.info('200 operations polled 3 times on {} threads: {:.2f} ms'.format(
+            len(scheduler._workers), (time.time() - start) * 1000))
+        self.assertEqual(len(done), 200)
+        self.assertEqual(not_done, [])
+        self.assertEqual([poller.result() for poller in pollers], [{'name': operation.name} for operation in operations])
+        self.assertLessEqual(len(scheduler._workers), 4)
+        self.assertLessEqual(threading.active_count(), threads + 4)
+
+        # what the pollers of msrestazure start
+        operations = [FakeOperation('vm{}'.format(index), polls=2, retry_after=1) for index in range(20)]
+        pollers = [azure_operation.AzureOperationPoller(operation.send, _get_output, operation.update, 0)
+                   for operation in operations]
+        self.assertGreaterEqual(threading.active_count(), threads + 20)
+        for poller in pollers:
+            poller.wait()
+
+    def test_wait_all_timeout(self):
+        scheduler = OperationScheduler(max_workers=2)
+        done_poller = FakeOperation('done', polls=1).start(scheduler)
+        pending_poller = FakeOperation('pending', polls=2, retry_after=60).start(scheduler)
+
+        done, not_done = wait_all([done_poller, pending_poller], timeout=0.5)
+
+        self.assertEqual(done, [done_poller])
+        self.assertEqual(not_done, [pending_poller])
+        self.assertFalse(pending_poller.done())
+        self.assertEqual(len(scheduler), 1)
+
+    def test_errors(self):
+        scheduler = OperationScheduler(max_workers=1)
+        failed = FakeOperation('failed', polls=2, status_code=409).start(scheduler)
+
+        def update(url, headers=None):
+            raise requests.ConnectionError('Connection refused')
+        broken = AzureOperationPoller(FakeOperation('broken').send, _get_output, update, 0, scheduler=scheduler)
+
+        def callback(operation):
+            raise ValueError('Callback failed')
+        callback_failed = FakeOperation('callback', polls=2).start(scheduler)
+        callback_failed.add_done_callback(callback)
+
+        done, not_done = wait_all([failed, broken, callback_failed], timeout=5)
+        self.assertEqual(not_done, [])
+
+        with self.assertRaises(CloudError):
+            failed.result()
+        self.assertEqual(failed.status(), 'Failed')
+        with self.assertRaises(requests.ConnectionError):
+            broken.wait()
+        self.assertEqual(callback_failed.result(), {'name': 'callback'})
+
+        # the worker is still polling
+        self.assertEqual(FakeOperation('next').start(scheduler).result(5), {'name': 'next'})
+
+    def test_callbacks(self):
+        scheduler = OperationScheduler(max_workers=1)
+        poller = FakeOperation('vm', polls=2, retry_after=1).start(scheduler)
+        statuses = []
+
+        def callback(operation):
+            statuses.append(operation.status)
+
+        poller.add_done_callback(callback)
+        poller.add_done_callback(statuses.append)
+        poller.remove_done_callback(statuses.append)
+        poller.wait()
+
+        self.assertEqual(statuses, ['Succeeded'])
+
+    def test_default_scheduler(self):
+        scheduler = get_default_scheduler()
+        self.assertIs(get_default_scheduler(), scheduler)
+        with self.assertRaises(ValueError):
+            OperationScheduler(max_workers=0)
+
+        poller = AzureOperationPoller(FakeOperation('vm').send, _get_output, FakeOperation('vm').update, 0)
+        self.assertEqual(poller.result(5), {'name': 'vm'})
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+import json
+import logging
+import threading
+import time
+import timeit
+import unittest
+
+import requests
+
+from azure.common.paging import iter_raw, read_ahead
+from azure.mgmt.resource import ResourceManagementClient
+
+LOG = logging.getLogger(__name__)
+
+LIST_URL = 'https://management.azure.com/subscriptions/sub/resourcegroups?api-version=2017-05-10'
+PAGE_URL = LIST_URL + '&$skiptoken={}'
+
+
+class FakeListing(object):
+    """The pages of a resource group listing, requested by the internal_paging
+    of the list operations."""
+
+    def __init__(self, pages=3, page_size=2, delay=0, failing=()):
+        self.pages = pages
+        self.page_size = page_size
+        self.delay = delay
+        self.failing = failing
+        self.links = []
+        self.threads = set()
+        self.started = [threading.Event() for _ in range(pages)]
+
+    def internal_paging(self, next_link=None, raw=False):
+        self.links.append(next_link)
+        self.threads.add(threading.current_thread().name)
+        index = int(next_link.rpartition('=')[2]) if next_link else 0
+        self.started[index].set()
+        time.sleep(self.delay)
+        if index in self.failing:
+            raise requests.ConnectionError('Connection refused')
+        page = {'value': [
+            {'id': '/subscriptions/sub/resourceGroups/group{}'.format(index * self.page_size + item),
+             'name': 'group{}'.format(index * self.page_size + item),
+             'location': 'westus',
+             'properties': {'provisioningState': 'Succeeded'}}
+            for item in range(self.page_size)
+        ]}
+        if index + 1 < self.pages:
+            page['nextLink'] = PAGE_URL.format(index + 1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(page).encode('utf-8')
+        response.request = requests.Request('GET', next_link or LIST_URL).prepare()
+        return response
+
+    def names(self):
+        return ['group{}'.format(index) for index in range(self.pages * self.page_size)]
+
+
+class MgmtPagingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ResourceManagementClient(object(), '00000000-0000-0000-0000-000000000000')
+        self.models = self.client.models()
+
+    def _list(self, listing):
+        return self.models.ResourceGroupPaged(listing.internal_paging, self.client._deserialize.dependencies)
+
+    def test_read_ahead(self):
+        listing = FakeListing()
+        paged = read_ahead(self._list(listing))
+
+        self.assertIsInstance(paged, self.models.ResourceGroupPaged)
+        self.assertIs(read_ahead(paged), paged)
+        self.assertIs(type(read_ahead(self._list(listing))), type(paged))
+
+        groups = list(paged)
+        self.assertEqual([group.name for group in groups], listing.names())
+        self.assertIsInstance(groups[0], self.models.ResourceGroup)
+        self.assertEqual(groups[0].properties.provisioning_state, 'Succeeded')
+        self.assertEqual(listing.links, ['', PAGE_URL.format(1), PAGE_URL.format(2)])
+        self.assertEqual(listing.threads, {threading.current_thread().name, 'PageRequest'})
+        self.assertEqual(paged.raw.response.request.url, PAGE_URL.format(2))
+
+        # the page requested ahead is not used once another page is requested
+        paged.reset()
+        self.assertEqual([group.name for group in paged.advance_page()], listing.names()[:2])
+        self.assertEqual([group.name for group in paged.get(PAGE_URL.format(2))], listing.names()[4:])
+        self.assertEqual(sorted(listing.links[3:]), ['', PAGE_URL.format(1), PAGE_URL.format(2)])
+        with self.assertRaises(StopIteration):
+            paged.advance_page()
+
+    def test_read_ahead_errors(self):
+        paged = read_ahead(self._list(FakeListing(failing=[1])))
+
+        self.assertEqual(len(paged.advance_page()), 2)
+        with self.assertRaises(requests.ConnectionError):
+            paged.advance_page()
+
+    def test_read_ahead_overlaps_requests(self):
+        listing = FakeListing(pages=6, delay=0.05)
+        paged = read_ahead(self._list(listing))
+
+        for index, _ in enumerate(paged):
+            page, item = divmod(index, listing.page_size)
+            if item == 0 and page + 1 < listing.pages:
+                # the next page is requested before the items of the current page are consumed
+                self.assertTrue(listing.started[page + 1].wait(5))
+        self.assertEqual(len(listing.links), 6)
+
+    def test_iter_raw(self):
+        listing = FakeListing()
+        paged = self._list(listing)
+
+        items = iter_raw(paged)
+        self.assertEqual(listing.links, [])
+        first = next(items)
+        self.assertEqual(first['properties'], {'provisioningState': 'Succeeded'})
+        self.assertEqual(listing.links, [''])
+        self.assertEqual([first['name']] + [item['name'] for item in items], listing.names())
+        self.assertEqual(listing.links, ['', PAGE_URL.format(1), PAGE_URL.format(2)])
+        self.assertEqual(listing.threads, {threading.current_thread().name})
+        self.assertEqual(paged.current_page, [])
+
+        listing = FakeListing()
+        self.assertEqual([item['name'] for item in iter_raw(self._list(listing), read_ahead=True)], listing.names())
+        self.assertEqual(listing.links, ['', PAGE_URL.format(1), PAGE_URL.format(2)])
+        self.assertIn('PageRequest', listing.threads)
+
+    def test_iter_raw_benchmark(self):
+        listing = FakeListing(pages=20, page_size=100)
+        models = min(timeit.repeat(lambda: [group.name for group in self._list(listing)], number=1, repeat=3))
+        raw = min(timeit.repeat(lambda: [group['name'] for group in iter_raw(self._list(listing))], number=1, repeat=3))
+        LOG.info('2000 resource groups: models {:.2f} ms, raw {:.2f} ms'.format(models * 1000, raw * 1000))
+        self.assertEqual([group['name'] for group in iter_raw(self._list(listing))], listing.names())
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
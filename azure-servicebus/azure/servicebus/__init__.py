@@ -34,6 +34,12 @@ from .models import (
     EventHub,
     AuthorizationRule,
     Message,
+    SettlementResult,
 )
 
+from ._http.transport import TransportConfiguration
+from .lockrenewer import AutoLockRenewer
+from .messagereceiver import MessageReceiver
+from .messagesender import BatchingMessageSender
+
 from .servicebusservice import ServiceBusService
@@ -0,0 +1,90 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import sys
+import threading
+
+if sys.version_info < (3,):
+    from Queue import Queue, Empty
+else:
+    from queue import Queue, Empty
+
+from azure.common.paging import PageRequest
+
+
+def _run_concurrently(func, items, max_concurrency):
+    ''' Calls func on every item, on up to max_concurrency threads.
+
+    Returns a list of (result, exception) pairs in the order of items. A
+    failing call does not stop the others. '''
+    items = list(items)
+    outcomes = [None] * len(items)
+    if not items:
+        return outcomes
+
+    pending = Queue()
+    for index in range(len(items)):
+        pending.put(index)
+
+    def worker():
+        while True:
+            try:
+                index = pending.get_nowait()
+            except Empty:
+                return
+            try:
+                outcomes[index] = (func(items[index]), None)
+            except Exception as ex:
+                outcomes[index] = (None, ex)
+
+    if max_concurrency <= 1 or len(items) == 1:
+        worker()
+        return outcomes
+
+    threads = []
+    for _ in range(min(max_concurrency, len(items))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    return outcomes
+
+
+def _iter_pages(list_page, page_size, prefetch=False):
+    ''' Yields the items of a listing one page at a time.
+
+    list_page is called with the number of items to skip and the page size,
+    and returns the items of a page. The listing ends with the first page
+    holding less than page_size items. If prefetch is True, the next page is
+    listed on a background thread while the items of the current page are
+    consumed. '''
+    skip = 0
+    next_page = None
+    while True:
+        if next_page is None:
+            page = list_page(skip, page_size)
+        else:
+            page = next_page.result()
+            next_page = None
+        skip += len(page)
+        last_page = len(page) < page_size
+        if prefetch and not last_page:
+            next_page = PageRequest(list_page, skip, page_size)
+        for item in page:
+            yield item
+        if last_page:
+            return
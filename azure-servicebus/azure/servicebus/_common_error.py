@@ -29,6 +29,8 @@ _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_UNLOCK = \
     'Message is not peek locked and cannot be unlocked.'
 _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_RENEW_LOCK = \
     'Message is not peek locked and lock cannot be renewed.'
+_ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_SETTLE = \
+    'Message is not peek locked and cannot be settled.'
 _ERROR_EVENT_HUB_NOT_FOUND = 'Event hub was not found'
 _ERROR_QUEUE_NOT_FOUND = 'Queue was not found'
 _ERROR_TOPIC_NOT_FOUND = 'Topic was not found'
@@ -39,6 +41,25 @@ _WARNING_VALUE_SHOULD_BE_BYTES = \
     'automatically, with utf-8 text encoding.'
 _ERROR_VALUE_SHOULD_BE_BYTES = '{0} should be of type bytes.'
 _ERROR_VALUE_NEGATIVE = '{0} should not be negative.'
+_ERROR_VALUE_NOT_POSITIVE = '{0} should be greater than zero.'
+_ERROR_SETTLEMENT_ACTION = \
+    'action should be one of: {0}.'
+_ERROR_LOCK_RENEWER_CLOSED = 'The lock renewer is closed.'
+_ERROR_LOCK_RENEWER_ASYNC_MESSAGE = \
+    'AutoLockRenewer cannot renew the locks of messages received with AsyncServiceBusService.'
+_ERROR_ASYNC_PYTHON_VERSION = \
+    'azure.servicebus.aio requires Python 3.5 or later.'
+_ERROR_SENDER_CLOSED = 'The sender is closed.'
+_ERROR_SENDER_ENTITY = \
+    'Provide exactly one of queue_name, topic_name and hub_name.'
+_ERROR_BATCH_MESSAGE_TOO_LARGE = \
+    'Serialized message is {0} bytes, above the batch size limit of {1} bytes.'
+_ERROR_RECEIVER_ENTITY = \
+    'Provide either queue_name, or both topic_name and subscription_name.'
+_ERROR_REFRESH_MARGIN = \
+    'refresh_margin should be between 0 and token_ttl, excluding token_ttl.'
+_ERROR_TRANSPORT_PROXY = \
+    'The proxy of a service using a transport is set on its TransportConfiguration.'
 
 
 def _general_error_handler(http_error):
@@ -20,10 +20,11 @@ import warnings
 
 if sys.version_info < (3,):
     from cStringIO import StringIO
+    from io import BytesIO
     from urllib2 import quote as url_quote
     from urllib2 import unquote as url_unquote
 else:
-    from io import StringIO
+    from io import BytesIO, StringIO
     from urllib.parse import quote as url_quote
     from urllib.parse import unquote as url_unquote
 
@@ -179,6 +180,52 @@ def _get_request_body(request_body):
     return request_body
 
 
+def _parse_etree_response_body(body):
+    ''' Parses the XML body of a response. A streamed body is parsed as it is
+    read, without buffering it first. '''
+    if hasattr(body, 'read'):
+        return ETree.parse(body).getroot()
+    return ETree.fromstring(body)
+
+
+_etree_atom_entry_tag = '{' + _etree_entity_feed_namespaces['atom'] + '}entry'
+
+
+def _iterparse_etree_feed_entries(body):
+    ''' Parses the XML body of a feed response in a single pass, yielding
+    each entry element of the feed as soon as it is parsed. An entry is
+    removed from the tree once the caller is done with it, so the whole
+    feed is never held in memory. A body holding a single entry element
+    yields it. '''
+    if not hasattr(body, 'read'):
+        if isinstance(body, _unicode_type):
+            body = body.encode('utf-8')
+        body = BytesIO(body)
+
+    root = None
+    depth = 0
+    for event, element in ETree.iterparse(body, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                # some feeds won't have the 'feed' element, just a single
+                # 'entry' element
+                root = element
+                root_name = _get_etree_tag_name_without_ns(root.tag)
+                if root_name not in ('feed', 'entry'):
+                    raise NotImplementedError()
+            continue
+
+        depth -= 1
+        if depth == 0:
+            if root_name == 'entry':
+                yield root
+        elif depth == 1 and root_name == 'feed' and \
+                element.tag == _etree_atom_entry_tag:
+            yield element
+            root.remove(element)
+
+
 class _ETreeXmlToObject(object):
     @staticmethod
     def parse_response(response, return_type):
@@ -186,7 +233,7 @@ class _ETreeXmlToObject(object):
         Parse the HTTPResponse's body and fill all the data into a class of
         return_type.
         '''
-        root = ETree.fromstring(response.body)
+        root = _parse_etree_response_body(response.body)
         xml_name = getattr(return_type, '_xml_name', return_type.__name__) 
         if root.tag == xml_name:
             return _ETreeXmlToObject._parse_response_body_from_xml_node(root, return_type)
@@ -215,7 +262,7 @@ class _ETreeXmlToObject(object):
         #   </Queues>
         # </EnumerationResults>
         return_obj = return_type()
-        root = ETree.fromstring(response.body)
+        root = _parse_etree_response_body(response.body)
 
         items = []
 
@@ -242,7 +289,7 @@ class _ETreeXmlToObject(object):
         respbody = response.body
         res = return_type()
         res_items = []
-        root = ETree.fromstring(respbody)
+        root = _parse_etree_response_body(respbody)
         type_name = type.__name__
         item_name = item_type.__name__
         for item in root.findall(item_name):
@@ -262,18 +309,7 @@ class _ETreeXmlToObject(object):
 
         _set_continuation_from_response_headers(feeds, response)
 
-        root = ETree.fromstring(response.body)
-
-        # some feeds won't have the 'feed' element, just a single 'entry' element
-        root_name = _get_etree_tag_name_without_ns(root.tag)
-        if root_name == 'feed':
-            entries = root.findall("./atom:entry", _etree_entity_feed_namespaces)
-        elif root_name == 'entry':
-            entries = [root]
-        else:
-            raise NotImplementedError()
-
-        for entry in entries:
+        for entry in _iterparse_etree_feed_entries(response.body):
             feeds.append(convert_func(entry))
 
         return feeds
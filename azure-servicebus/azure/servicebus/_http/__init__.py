@@ -38,7 +38,8 @@ class HTTPResponse(object):
     headers:
         the returned headers, as a list of (name, value) pairs
     body:
-        the body of the response
+        the body of the response. When the request was sent with stream set,
+        a file-like object from which the body is read as it is consumed.
     """
 
     def __init__(self, status, message, headers, body):
@@ -67,6 +68,9 @@ class HTTPRequest(object):
     protocol_override:
         specify to use this protocol instead of the global one stored in
         _HTTPClient.
+    stream:
+        read the body of a successful response lazily, as a file-like
+        object, instead of buffering it in memory.
     '''
 
     def __init__(self):
@@ -77,3 +81,4 @@ class HTTPRequest(object):
         self.headers = []    # list of (header name, header value)
         self.body = ''
         self.protocol_override = None
+        self.stream = False
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #--------------------------------------------------------------------------
-import base64
 import os
 import sys
 
@@ -32,7 +31,10 @@ else:
     from urllib.parse import quote as url_quote
 
 from . import HTTPError, HTTPResponse
-from .requestsclient import _RequestsConnection
+from .requestsclient import (
+    _RequestsConnection,
+    _set_session_proxy,
+)
 
 
 DEBUG_REQUESTS = False
@@ -89,6 +91,9 @@ class _HTTPClient(object):
         self.proxy_port = port
         self.proxy_user = user
         self.proxy_password = password
+        if self.request_session is not None:
+            # Applied once to the session, rather than to every connection.
+            _set_session_proxy(self.request_session, host, port, user, password)
 
     def get_uri(self, request):
         ''' Return the target uri for the request.'''
@@ -104,20 +109,10 @@ class _HTTPClient(object):
             if request.protocol_override else self.protocol
         protocol = protocol.lower()
         target_host = request.host
-        target_port = HTTP_PORT if protocol == 'http' else HTTPS_PORT
 
+        # The proxy is set on the session by set_proxy.
         connection = _RequestsConnection(
             target_host, protocol, self.request_session, self.timeout)
-        proxy_host = self.proxy_host
-        proxy_port = self.proxy_port
-
-        if self.proxy_host:
-            headers = None
-            if self.proxy_user and self.proxy_password:
-                auth = base64.encodestring(
-                    "{0}:{1}".format(self.proxy_user, self.proxy_password).encode()).rstrip()
-                headers = {'Proxy-Authorization': 'Basic {0}'.format(auth.decode())}
-            connection.set_tunnel(proxy_host, int(proxy_port), headers)
 
         return connection
 
@@ -176,6 +171,8 @@ class _HTTPClient(object):
         connection = self.get_connection(request)
         try:
             connection.putrequest(request.method, request.path)
+            # Only the requests based connections can stream the body.
+            connection.stream = request.stream
 
             self.send_request_headers(connection, request.headers)
             self.send_request_body(connection, request.body)
@@ -197,12 +194,15 @@ class _HTTPClient(object):
                 respheaders[i] = (value[0].lower(), value[1])
 
             respbody = None
-            if resp.length is None:
+            if request.stream and status < 300 and \
+                    hasattr(resp, 'get_body_stream'):
+                respbody = resp.get_body_stream()
+            elif resp.length is None:
                 respbody = resp.read()
             elif resp.length > 0:
                 respbody = resp.read(resp.length)
 
-            if DEBUG_RESPONSES and respbody:
+            if DEBUG_RESPONSES and respbody and not hasattr(respbody, 'read'):
                 print('response:')
                 try:
                     print(respbody)
@@ -12,17 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #--------------------------------------------------------------------------
+import base64
+
+
+def _set_session_proxy(session, host, port, user=None, password=None):
+    ''' Sends the requests of the session through the proxy. '''
+    session.proxies['http'] = 'http://{}:{}'.format(host, port)
+    session.proxies['https'] = 'https://{}:{}'.format(host, port)
+    if user and password:
+        auth = base64.b64encode(
+            '{0}:{1}'.format(user, password).encode()).decode()
+        session.headers['Proxy-Authorization'] = 'Basic {0}'.format(auth)
+
 
 class _Response(object):
 
     ''' Response class corresponding to the response returned from httplib
     HTTPConnection. '''
 
-    def __init__(self, response):
+    def __init__(self, response, stream=False):
         self.status = response.status_code
         self.reason = response.reason
-        self.respbody = response.content
-        self.length = len(response.content)
+        self.response = response
+        self.stream = stream
+        # A streamed body has not been read yet, its length is unknown.
+        self.length = None if stream else len(response.content)
         self.headers = []
         for key, name in response.headers.items():
             self.headers.append((key.lower(), name))
@@ -31,9 +45,20 @@ class _Response(object):
         '''Returns response headers.'''
         return self.headers
 
-    def read(self, _length):
+    def read(self, _length=None):
         '''Returns response body. '''
-        return self.respbody[:_length]
+        # requests keeps the body it read, return it without copying it
+        content = self.response.content
+        if _length is None or _length >= len(content):
+            return content
+        return content[:_length]
+
+    def get_body_stream(self):
+        '''Returns a file-like object reading the decoded response body from
+        the connection.'''
+        raw = self.response.raw
+        raw.decode_content = True
+        return raw
 
 
 class _RequestsConnection(object):
@@ -48,6 +73,7 @@ class _RequestsConnection(object):
         self.response = None
         self.uri = None
         self.timeout = timeout
+        self.stream = False
 
         # By default, requests adds an Accept:*/* to the session, which causes
         # issues with some Azure REST APIs. Removing it here gives us the flexibility
@@ -78,7 +104,7 @@ class _RequestsConnection(object):
         pass
 
     def send(self, request_body):
-        self.response = self.session.request(self.method, self.uri, data=request_body, headers=self.headers, timeout=self.timeout)
+        self.response = self.session.request(self.method, self.uri, data=request_body, headers=self.headers, timeout=self.timeout, stream=self.stream)
 
     def getresponse(self):
-        return _Response(self.response)
+        return _Response(self.response, self.stream)
@@ -35,8 +35,10 @@ from ._common_serialization import (
     _XmlWriter,
     _make_etree_ns_attr_name,
     _get_etree_text,
+    _get_readable_id,
     ETree,
     _ETreeXmlToObject,
+    _parse_etree_response_body,
 )
 from ._common_error import (
     _ERROR_EVENT_HUB_NOT_FOUND,
@@ -56,13 +58,16 @@ class _XmlSchemas:
     Atom = 'http://www.w3.org/2005/Atom'
 
 
-def _create_message(response, service_instance):
+def _create_message(response, service_instance, message_class=Message):
     ''' Create message from response.
 
     response:
         response from service bus cloud server.
     service_instance:
         the service bus client.
+    message_class:
+        Message or a subclass of it, such as the message of the asyncio
+        client.
     '''
     respbody = response.body
     custom_properties = {}
@@ -113,12 +118,12 @@ def _create_message(response, service_instance):
                     pass
 
     if message_type is None:
-        message = Message(
+        message = message_class(
             respbody, service_instance, message_location, custom_properties,
             'application/atom+xml;type=entry;charset=utf-8', broker_properties)
     else:
-        message = Message(respbody, service_instance, message_location,
-                          custom_properties, message_type, broker_properties)
+        message = message_class(respbody, service_instance, message_location,
+                                custom_properties, message_type, broker_properties)
     return message
 
 # convert functions
@@ -132,7 +137,7 @@ _etree_sb_feed_namespaces = {
 
 
 def _convert_response_to_rule(response):
-    root = ETree.fromstring(response.body)
+    root = _parse_etree_response_body(response.body)
     return _convert_etree_element_to_rule(root)
 
 
@@ -157,40 +162,35 @@ def _convert_etree_element_to_rule(entry_element):
     '''
     rule = Rule()
 
-    rule_element = entry_element.find('./atom:content/sb:RuleDescription', _etree_sb_feed_namespaces)
-    if rule_element is not None:
-        filter_element = rule_element.find('./sb:Filter', _etree_sb_feed_namespaces)
-        if filter_element is not None:
-            rule.filter_type = filter_element.attrib.get(
-                _make_etree_ns_attr_name(_etree_sb_feed_namespaces['i'], 'type'), None)
-            sql_exp_element = filter_element.find('./sb:SqlExpression', _etree_sb_feed_namespaces)
-            if sql_exp_element is not None:
-                rule.filter_expression = sql_exp_element.text
-
-        action_element = rule_element.find('./sb:Action', _etree_sb_feed_namespaces)
-        if action_element is not None:
-            rule.action_type = action_element.attrib.get(
-                _make_etree_ns_attr_name(_etree_sb_feed_namespaces['i'], 'type'), None)
-            sql_exp_element = action_element.find('./sb:SqlExpression', _etree_sb_feed_namespaces)
-            if sql_exp_element is not None:
-                rule.action_expression = sql_exp_element.text
-
-
     # extract id, updated and name value from feed entry and set them of rule.
-    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
-        entry_element, True, '/rules').items():
+    rule_element, properties = _read_entry_element(
+        entry_element, _RULE_DESCRIPTION_TAG, '/rules')
+    if rule_element is not None:
+        for child in rule_element:
+            if child.tag == _FILTER_TAG:
+                rule.filter_type = child.attrib.get(_TYPE_ATTR, None)
+                sql_exp_element = child.find(_SQL_EXPRESSION_TAG)
+                if sql_exp_element is not None:
+                    rule.filter_expression = sql_exp_element.text
+            elif child.tag == _ACTION_TAG:
+                rule.action_type = child.attrib.get(_TYPE_ATTR, None)
+                sql_exp_element = child.find(_SQL_EXPRESSION_TAG)
+                if sql_exp_element is not None:
+                    rule.action_expression = sql_exp_element.text
+
+    for name, value in properties.items():
         setattr(rule, name, value)
 
     return rule
 
 
 def _convert_response_to_queue(response):
-    root = ETree.fromstring(response.body)
+    root = _parse_etree_response_body(response.body)
     return _convert_etree_element_to_queue(root)
 
 
 def _convert_response_to_event_hub(response):
-    root = ETree.fromstring(response.body)
+    root = _parse_etree_response_body(response.body)
     return _convert_etree_element_to_event_hub(root)
 
 
@@ -200,15 +200,145 @@ def _parse_bool(value):
     return False
 
 
-def _read_etree_element(parent_element, child_element_name, target_object, target_field_name, converter):
-    child_element = parent_element.find('./sb:{0}'.format(child_element_name), _etree_sb_feed_namespaces)
-    if child_element is not None:
-        field_value = _get_etree_text(child_element)
-        if converter is not None:
-            field_value = converter(field_value)
-        setattr(target_object, target_field_name, field_value)
-        return True
-    return False
+def _sb_tag(name):
+    return '{' + _XmlSchemas.ServiceBus + '}' + name
+
+
+def _atom_tag(name):
+    return '{' + _XmlSchemas.Atom + '}' + name
+
+
+def _compile_mappings(mappings):
+    ''' Builds the table of the child elements of a description, from the
+    (element name, field name, converter) mappings of a model. The table maps
+    the qualified tag of each element to its field name and converter. '''
+    return dict((_sb_tag(element_name), (field_name, converter))
+                for element_name, field_name, converter in mappings)
+
+
+_QUEUE_FIELDS = _compile_mappings([
+    ('LockDuration', 'lock_duration', None),
+    ('MaxSizeInMegabytes', 'max_size_in_megabytes', int),
+    ('RequiresDuplicateDetection', 'requires_duplicate_detection', _parse_bool),
+    ('RequiresSession', 'requires_session', _parse_bool),
+    ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
+    ('DeadLetteringOnMessageExpiration', 'dead_lettering_on_message_expiration', _parse_bool),
+    ('DuplicateDetectionHistoryTimeWindow', 'duplicate_detection_history_time_window', None),
+    ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
+    ('MaxDeliveryCount', 'max_delivery_count', int),
+    ('MessageCount', 'message_count', int),
+    ('SizeInBytes', 'size_in_bytes', int),
+])
+
+_TOPIC_FIELDS = _compile_mappings([
+    ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
+    ('MaxSizeInMegabytes', 'max_size_in_megabytes', int),
+    ('RequiresDuplicateDetection', 'requires_duplicate_detection', _parse_bool),
+    ('DuplicateDetectionHistoryTimeWindow', 'duplicate_detection_history_time_window', None),
+    ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
+    ('SizeInBytes', 'size_in_bytes', int),
+])
+
+_SUBSCRIPTION_FIELDS = _compile_mappings([
+    ('LockDuration', 'lock_duration', None),
+    ('RequiresSession', 'requires_session', _parse_bool),
+    ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
+    ('DeadLetteringOnFilterEvaluationExceptions', 'dead_lettering_on_filter_evaluation_exceptions', _parse_bool),
+    ('DeadLetteringOnMessageExpiration', 'dead_lettering_on_message_expiration', _parse_bool),
+    ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
+    ('MaxDeliveryCount', 'max_delivery_count', int),
+    ('MessageCount', 'message_count', int),
+])
+
+_EVENT_HUB_FIELDS = _compile_mappings([
+    ('SizeInBytes', 'size_in_bytes', int),
+    ('MessageRetentionInDays', 'message_retention_in_days', int),
+    ('Status', 'status', None),
+    ('UserMetadata', 'user_metadata', None),
+    ('PartitionCount', 'partition_count', int),
+    ('EntityAvailableStatus', 'entity_available_status', None),
+])
+
+_AUTHORIZATION_RULE_FIELDS = _compile_mappings([
+    ('ClaimType', 'claim_type', None),
+    ('ClaimValue', 'claim_value', None),
+    ('ModifiedTime', 'modified_time', None),
+    ('CreatedTime', 'created_time', None),
+    ('KeyName', 'key_name', None),
+    ('PrimaryKey', 'primary_key', None),
+    ('SecondaryKey', 'secondary_key', None),
+])
+
+_QUEUE_DESCRIPTION_TAG = _sb_tag('QueueDescription')
+_TOPIC_DESCRIPTION_TAG = _sb_tag('TopicDescription')
+_SUBSCRIPTION_DESCRIPTION_TAG = _sb_tag('SubscriptionDescription')
+_RULE_DESCRIPTION_TAG = _sb_tag('RuleDescription')
+_EVENT_HUB_DESCRIPTION_TAG = _sb_tag('EventHubDescription')
+_FILTER_TAG = _sb_tag('Filter')
+_ACTION_TAG = _sb_tag('Action')
+_SQL_EXPRESSION_TAG = _sb_tag('SqlExpression')
+_PARTITION_IDS_TAG = _sb_tag('PartitionIds')
+_PARTITION_ID_TAG = '{' + _XmlSchemas.SerializationArrays + '}string'
+_AUTHORIZATION_RULES_TAG = _sb_tag('AuthorizationRules')
+_AUTHORIZATION_RULE_TAG = _sb_tag('AuthorizationRule')
+_RIGHTS_TAG = _sb_tag('Rights')
+_ACCESS_RIGHTS_TAG = _sb_tag('AccessRights')
+_TYPE_ATTR = _make_etree_ns_attr_name(_XmlSchemas.SchemaInstance, 'type')
+_ETAG_ATTR = _make_etree_ns_attr_name(_XmlSchemas.DataServicesMetadata, 'etag')
+_ATOM_CONTENT_TAG = _atom_tag('content')
+_ATOM_ID_TAG = _atom_tag('id')
+_ATOM_UPDATED_TAG = _atom_tag('updated')
+_ATOM_AUTHOR_TAG = _atom_tag('author')
+_ATOM_NAME_TAG = _atom_tag('name')
+
+
+def _read_etree_elements(parent_element, fields, target_object):
+    ''' Reads the children of parent_element found in the fields table
+    built by _compile_mappings into target_object, in a single pass over
+    the children. Returns True if any field was read. '''
+    found = False
+    for child_element in parent_element:
+        field = fields.get(child_element.tag)
+        if field is not None:
+            target_field_name, converter = field
+            field_value = _get_etree_text(child_element)
+            if converter is not None:
+                field_value = converter(field_value)
+            setattr(target_object, target_field_name, field_value)
+            found = True
+    return found
+
+
+def _read_entry_element(entry_element, description_tag, id_prefix_to_skip=None):
+    ''' Reads an atom entry in a single pass over its children. Returns the
+    description element found in its content, or None, and the same entry
+    properties as _ETreeXmlToObject.get_entry_properties_from_element. '''
+    description_element = None
+    properties = {}
+
+    etag = entry_element.attrib.get(_ETAG_ATTR, None)
+    if etag is not None:
+        properties['etag'] = etag
+
+    for child_element in entry_element:
+        tag = child_element.tag
+        if tag == _ATOM_CONTENT_TAG:
+            if description_element is None:
+                description_element = child_element.find(description_tag)
+        elif tag == _ATOM_ID_TAG:
+            if 'name' not in properties and child_element.text:
+                properties['name'] = _get_readable_id(
+                    child_element.text, id_prefix_to_skip)
+        elif tag == _ATOM_UPDATED_TAG:
+            if 'updated' not in properties and child_element.text:
+                properties['updated'] = child_element.text
+        elif tag == _ATOM_AUTHOR_TAG:
+            if 'author' not in properties:
+                author_name = child_element.findtext(_ATOM_NAME_TAG, '')
+                if author_name:
+                    properties['author'] = author_name
+
+    return description_element, properties
 
 
 def _convert_etree_element_to_queue(entry_element):
@@ -230,41 +360,21 @@ def _convert_etree_element_to_queue(entry_element):
 
     # get node for each attribute in Queue class, if nothing found then the
     # response is not valid xml for Queue.
-    invalid_queue = True
-
-    queue_element = entry_element.find('./atom:content/sb:QueueDescription', _etree_sb_feed_namespaces)
-    if queue_element is not None:
-        mappings = [
-            ('LockDuration', 'lock_duration', None),
-            ('MaxSizeInMegabytes', 'max_size_in_megabytes', int),
-            ('RequiresDuplicateDetection', 'requires_duplicate_detection', _parse_bool),
-            ('RequiresSession', 'requires_session', _parse_bool),
-            ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
-            ('DeadLetteringOnMessageExpiration', 'dead_lettering_on_message_expiration', _parse_bool),
-            ('DuplicateDetectionHistoryTimeWindow', 'duplicate_detection_history_time_window', None),
-            ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
-            ('MaxDeliveryCount', 'max_delivery_count', int),
-            ('MessageCount', 'message_count', int),
-            ('SizeInBytes', 'size_in_bytes', int),
-        ]
-
-        for map in mappings:
-            if _read_etree_element(queue_element, map[0], queue, map[1], map[2]):
-                invalid_queue = False
-
-    if invalid_queue:
+    queue_element, properties = _read_entry_element(
+        entry_element, _QUEUE_DESCRIPTION_TAG)
+    if queue_element is None or \
+            not _read_etree_elements(queue_element, _QUEUE_FIELDS, queue):
         raise AzureServiceBusResourceNotFound(_ERROR_QUEUE_NOT_FOUND)
 
     # extract id, updated and name value from feed entry and set them of queue.
-    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
-        entry_element, True).items():
+    for name, value in properties.items():
         setattr(queue, name, value)
 
     return queue
 
 
 def _convert_response_to_topic(response):
-    root = ETree.fromstring(response.body)
+    root = _parse_etree_response_body(response.body)
     return _convert_etree_element_to_topic(root)
 
 
@@ -288,36 +398,21 @@ def _convert_etree_element_to_topic(entry_element):
     '''
     topic = Topic()
 
-    invalid_topic = True
-
-    topic_element = entry_element.find('./atom:content/sb:TopicDescription', _etree_sb_feed_namespaces)
-    if topic_element is not None:
-        mappings = [
-            ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
-            ('MaxSizeInMegabytes', 'max_size_in_megabytes', int),
-            ('RequiresDuplicateDetection', 'requires_duplicate_detection', _parse_bool),
-            ('DuplicateDetectionHistoryTimeWindow', 'duplicate_detection_history_time_window', None),
-            ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
-            ('SizeInBytes', 'size_in_bytes', int),
-        ]
-
-        for map in mappings:
-            if _read_etree_element(topic_element, map[0], topic, map[1], map[2]):
-                invalid_topic = False
-
-    if invalid_topic:
+    topic_element, properties = _read_entry_element(
+        entry_element, _TOPIC_DESCRIPTION_TAG)
+    if topic_element is None or \
+            not _read_etree_elements(topic_element, _TOPIC_FIELDS, topic):
         raise AzureServiceBusResourceNotFound(_ERROR_TOPIC_NOT_FOUND)
 
     # extract id, updated and name value from feed entry and set them of topic.
-    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
-        entry_element, True).items():
+    for name, value in properties.items():
         setattr(topic, name, value)
 
     return topic
 
 
 def _convert_response_to_subscription(response):
-    root = ETree.fromstring(response.body)
+    root = _parse_etree_response_body(response.body)
     return _convert_etree_element_to_subscription(root)
 
 
@@ -341,24 +436,13 @@ def _convert_etree_element_to_subscription(entry_element):
     '''
     subscription = Subscription()
 
-    subscription_element = entry_element.find('./atom:content/sb:SubscriptionDescription', _etree_sb_feed_namespaces)
+    subscription_element, properties = _read_entry_element(
+        entry_element, _SUBSCRIPTION_DESCRIPTION_TAG, '/subscriptions')
     if subscription_element is not None:
-        mappings = [
-            ('LockDuration', 'lock_duration', None),
-            ('RequiresSession', 'requires_session', _parse_bool),
-            ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
-            ('DeadLetteringOnFilterEvaluationExceptions', 'dead_lettering_on_filter_evaluation_exceptions', _parse_bool),
-            ('DeadLetteringOnMessageExpiration', 'dead_lettering_on_message_expiration', _parse_bool),
-            ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
-            ('MaxDeliveryCount', 'max_delivery_count', int),
-            ('MessageCount', 'message_count', int),
-        ]
-
-        for map in mappings:
-            _read_etree_element(subscription_element, map[0], subscription, map[1], map[2])
-
-    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
-        entry_element, True, '/subscriptions').items():
+        _read_etree_elements(
+            subscription_element, _SUBSCRIPTION_FIELDS, subscription)
+
+    for name, value in properties.items():
         setattr(subscription, name, value)
 
     return subscription
@@ -371,50 +455,30 @@ def _convert_etree_element_to_event_hub(entry_element):
     # get node for each attribute in EventHub class, if nothing found then the
     # response is not valid xml for EventHub.
 
-    hub_element = entry_element.find('./atom:content/sb:EventHubDescription', _etree_sb_feed_namespaces)
+    hub_element, properties = _read_entry_element(
+        entry_element, _EVENT_HUB_DESCRIPTION_TAG)
     if hub_element is not None:
-        mappings = [
-            ('SizeInBytes', 'size_in_bytes', int),
-            ('MessageRetentionInDays', 'message_retention_in_days', int),
-            ('Status', 'status', None),
-            ('UserMetadata', 'user_metadata', None),
-            ('PartitionCount', 'partition_count', int),
-            ('EntityAvailableStatus', 'entity_available_status', None),
-        ]
-
-        for map in mappings:
-            if _read_etree_element(hub_element, map[0], hub, map[1], map[2]):
-                invalid_event_hub = False
-
-        ids = hub_element.find('./sb:PartitionIds', _etree_sb_feed_namespaces)
+        if _read_etree_elements(hub_element, _EVENT_HUB_FIELDS, hub):
+            invalid_event_hub = False
+
+        ids = hub_element.find(_PARTITION_IDS_TAG)
         if ids is not None:
-            for id_node in ids.findall('./arrays:string', _etree_sb_feed_namespaces):
+            for id_node in ids.iterfind(_PARTITION_ID_TAG):
                 value = _get_etree_text(id_node)
                 if value:
                     hub.partition_ids.append(value)
 
-        rules_nodes = hub_element.find('./sb:AuthorizationRules', _etree_sb_feed_namespaces)
+        rules_nodes = hub_element.find(_AUTHORIZATION_RULES_TAG)
         if rules_nodes is not None:
             invalid_event_hub = False
-            for rule_node in rules_nodes.findall('./sb:AuthorizationRule', _etree_sb_feed_namespaces):
+            for rule_node in rules_nodes.iterfind(_AUTHORIZATION_RULE_TAG):
                 rule = AuthorizationRule()
 
-                mappings = [
-                    ('ClaimType', 'claim_type', None),
-                    ('ClaimValue', 'claim_value', None),
-                    ('ModifiedTime', 'modified_time', None),
-                    ('CreatedTime', 'created_time', None),
-                    ('KeyName', 'key_name', None),
-                    ('PrimaryKey', 'primary_key', None),
-                    ('SecondaryKey', 'secondary_key', None),
-                ]
-
-                for map in mappings:
-                    _read_etree_element(rule_node, map[0], rule, map[1], map[2])
+                _read_etree_elements(rule_node, _AUTHORIZATION_RULE_FIELDS, rule)
 
-                rights_nodes = rule_node.find('./sb:Rights', _etree_sb_feed_namespaces)
+                rights_nodes = rule_node.find(_RIGHTS_TAG)
                 if rights_nodes is not None:
-                    for access_rights_node in rights_nodes.findall('./sb:AccessRights', _etree_sb_feed_namespaces):
+                    for access_rights_node in rights_nodes.iterfind(_ACCESS_RIGHTS_TAG):
                         node_value = _get_etree_text(access_rights_node)
                         if node_value:
                             rule.rights.append(node_value)
@@ -425,8 +489,7 @@ def _convert_etree_element_to_event_hub(entry_element):
         raise AzureServiceBusResourceNotFound(_ERROR_EVENT_HUB_NOT_FOUND)
 
     # extract id, updated and name value from feed entry and set them of queue.
-    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
-        entry_element, True).items():
+    for name, value in properties.items():
         if name == 'name':
             value = value.partition('?')[0]
         setattr(hub, name, value)
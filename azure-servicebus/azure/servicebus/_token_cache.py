@@ -0,0 +1,59 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import threading
+
+from collections import OrderedDict
+
+
+class _TokenCache(object):
+
+    ''' Thread-safe cache of authorization tokens with their expiry time.
+    When full, the least recently used token is evicted. '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, valid_until):
+        ''' Returns the token cached for key, or None if there is none or if
+        it expires before valid_until (in seconds since Epoch). '''
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            token, expires_on = entry
+            if expires_on <= valid_until:
+                return None
+            # Re-insert to mark it as the most recently used.
+            self._entries[key] = entry
+            return token
+
+    def set(self, key, token, expires_on):
+        ''' Caches the token for key, until expires_on (in seconds since
+        Epoch). '''
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (token, expires_on)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,27 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+'''asyncio clients, available on Python 3.5 and later. They need aiohttp,
+installed with the "async" extra: pip install azure-servicebus[async]'''
+
+import sys
+
+from .._common_error import _ERROR_ASYNC_PYTHON_VERSION
+
+# the modules below use the async/await syntax
+if sys.version_info < (3, 5):
+    raise ImportError(_ERROR_ASYNC_PYTHON_VERSION)
+
+from .models import AsyncMessage
+from .servicebusservice import AsyncServiceBusService
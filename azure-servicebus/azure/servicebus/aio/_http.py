@@ -0,0 +1,105 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+from urllib.parse import urlparse
+
+from .._http import HTTPError, HTTPResponse
+
+
+_ERROR_AIOHTTP_REQUIRED = \
+    'aiohttp is required by the asyncio client. Install it with ' + \
+    '"pip install azure-servicebus[async]".'
+
+
+class _AsyncHTTPClient(object):
+
+    '''
+    Takes the request and sends it to cloud service with aiohttp, and returns
+    the response.
+    '''
+
+    def __init__(self, protocol='https', session=None, timeout=65,
+                 user_agent=''):
+        '''
+        protocol:
+            http or https.
+        session:
+            aiohttp.ClientSession to send the requests with. If None, a
+            session is created on the first request, and closed by close.
+        timeout:
+            timeout for the http request, in seconds.
+        user_agent:
+            user agent string to set in http header.
+        '''
+        self.protocol = protocol
+        self.session = session
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._owns_session = session is None
+
+    async def close(self):
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            if aiohttp is None:
+                raise ImportError(_ERROR_AIOHTTP_REQUIRED)
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def perform_request(self, request):
+        ''' Sends request to cloud service server and return the response. '''
+        session = self._get_session()
+        protocol = request.protocol_override \
+            if request.protocol_override else self.protocol
+        # request.path is already quoted, with its query string.
+        url = URL(protocol.lower() + '://' + request.host + request.path,
+                  encoded=True)
+        headers = [(name, value) for name, value in request.headers if value]
+        headers.append(('User-Agent', self.user_agent))
+
+        async with session.request(
+                request.method, url, headers=headers,
+                data=request.body or None,
+                # Like requests, keeps Accept out of the requests, it causes
+                # issues with some Azure REST APIs.
+                skip_auto_headers=('Accept',),
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
+            status = resp.status
+            message = resp.reason
+            respbody = await resp.read()
+            # for consistency across platforms, make header names lowercase
+            respheaders = [(name.lower(), value)
+                           for name, value in resp.headers.items()]
+
+        if status == 307:
+            new_url = urlparse(dict(respheaders)['location'])
+            request.host = new_url.hostname
+            request.path = new_url.path
+            if new_url.query:
+                request.path += '?' + new_url.query
+            return await self.perform_request(request)
+        if status >= 300:
+            raise HTTPError(status, message, respheaders, respbody)
+
+        return HTTPResponse(status, message, respheaders, respbody)
@@ -0,0 +1,40 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+from ..models import Message
+
+
+class AsyncMessage(Message):
+
+    ''' Message received with AsyncServiceBusService, whose delete, unlock and
+    renew_lock methods are coroutines. The message is only marked as settled
+    once the delete or unlock request has completed. AutoLockRenewer, which
+    renews the locks on threads, does not accept these messages. '''
+
+    # rejected by AutoLockRenewer.register
+    _is_async = True
+
+    async def delete(self):
+        ''' Deletes itself if find queue name or topic name and subscription
+        name. '''
+        result = await self._delete()
+        self._lock_settled = True
+        return result
+
+    async def unlock(self):
+        ''' Unlocks itself if find queue name or topic name and subscription
+        name. '''
+        result = await self._unlock()
+        self._lock_settled = True
+        return result
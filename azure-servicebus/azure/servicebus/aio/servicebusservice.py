@@ -0,0 +1,469 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import json
+
+from azure.common import (
+    AzureHttpError,
+)
+from ..constants import (
+    DEFAULT_HTTP_TIMEOUT,
+    SERVICE_BUS_HOST_BASE,
+    _USER_AGENT_STRING,
+)
+from .._common_conversion import _str
+from .._common_error import (
+    _dont_fail_not_exist,
+    _dont_fail_on_exist,
+    _validate_not_none,
+)
+from .._common_serialization import _ETreeXmlToObject
+from .._http import HTTPError
+from .._serialization import (
+    _convert_response_to_topic,
+    _convert_response_to_queue,
+    _convert_response_to_subscription,
+    _convert_response_to_rule,
+    _convert_response_to_event_hub,
+    _convert_etree_element_to_queue,
+    _convert_etree_element_to_topic,
+    _convert_etree_element_to_subscription,
+    _convert_etree_element_to_rule,
+    _create_message,
+    _service_bus_error_handler,
+)
+from ..servicebusservice import (
+    ServiceBusService,
+    ServiceBusWrapTokenAuthentication,
+)
+from ._http import _AsyncHTTPClient
+from .models import AsyncMessage
+
+
+class AsyncServiceBusService(object):
+
+    ''' asyncio counterpart of ServiceBusService, for queues, topics,
+    subscriptions, rules and event hubs. Its operations are coroutines, which
+    take the same parameters and return the same results as the matching
+    ServiceBusService operations.
+
+    The requests are built, and the responses parsed, by the same code as
+    ServiceBusService; only the I/O runs on aiohttp. The delete, unlock and
+    renew_lock methods of the messages it returns are coroutines as well. '''
+
+    def __init__(self, service_namespace=None, account_key=None, issuer=None,
+                 host_base=SERVICE_BUS_HOST_BASE,
+                 shared_access_key_name=None, shared_access_key_value=None,
+                 authentication=None, timeout=DEFAULT_HTTP_TIMEOUT,
+                 session=None):
+        '''
+        Initializes the service bus service for a namespace with the specified
+        authentication settings (SAS or ACS).
+
+        service_namespace:
+            Service bus namespace, required for all operations. If None,
+            the value is set to the AZURE_SERVICEBUS_NAMESPACE env variable.
+        account_key:
+            ACS authentication account key. If None, the value is set to the
+            AZURE_SERVICEBUS_ACCESS_KEY env variable.
+            Note that if both SAS and ACS settings are specified, SAS is used.
+        issuer:
+            ACS authentication issuer. If None, the value is set to the
+            AZURE_SERVICEBUS_ISSUER env variable.
+            Note that if both SAS and ACS settings are specified, SAS is used.
+        host_base:
+            Optional. Live host base url. Defaults to Azure url. Override this
+            for on-premise.
+        shared_access_key_name:
+            SAS authentication key name.
+            Note that if both SAS and ACS settings are specified, SAS is used.
+        shared_access_key_value:
+            SAS authentication key value.
+            Note that if both SAS and ACS settings are specified, SAS is used.
+        authentication:
+            Instance of authentication class. If this is specified, then
+            ACS and SAS parameters are ignored.
+        timeout:
+            Optional. Timeout for the http request, in seconds.
+        session:
+            Optional. aiohttp.ClientSession to use for http requests. It is
+            not closed by close.
+        '''
+        # Builds and signs the requests, it never sends them.
+        self._service = ServiceBusService(
+            service_namespace=service_namespace,
+            account_key=account_key,
+            issuer=issuer,
+            host_base=host_base,
+            shared_access_key_name=shared_access_key_name,
+            shared_access_key_value=shared_access_key_value,
+            authentication=authentication,
+            timeout=timeout)
+        self._httpclient = _AsyncHTTPClient(
+            session=session,
+            timeout=timeout,
+            user_agent=_USER_AGENT_STRING,
+        )
+        self._filter = self._httpclient.perform_request
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        ''' Closes the aiohttp session, unless it was given to the service. '''
+        await self._httpclient.close()
+
+    @property
+    def service_namespace(self):
+        return self._service.service_namespace
+
+    @property
+    def host_base(self):
+        return self._service.host_base
+
+    @property
+    def authentication(self):
+        return self._service.authentication
+
+    @property
+    def timeout(self):
+        return self._httpclient.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._httpclient.timeout = value
+
+    async def create_queue(self, queue_name, queue=None, fail_on_exist=False):
+        ''' See ServiceBusService.create_queue. '''
+        return await self._perform_create(
+            self._service._create_queue_request(queue_name, queue),
+            fail_on_exist)
+
+    async def delete_queue(self, queue_name, fail_not_exist=False):
+        ''' See ServiceBusService.delete_queue. '''
+        return await self._perform_delete(
+            self._service._delete_queue_request(queue_name),
+            fail_not_exist)
+
+    async def get_queue(self, queue_name):
+        ''' See ServiceBusService.get_queue. '''
+        response = await self._perform_request(
+            self._service._get_queue_request(queue_name))
+        return _convert_response_to_queue(response)
+
+    async def list_queues(self, skip=None, top=None):
+        ''' See ServiceBusService.list_queues. '''
+        response = await self._perform_request(
+            self._service._list_queues_request(skip, top))
+        return _ETreeXmlToObject.convert_response_to_feeds(
+            response, _convert_etree_element_to_queue)
+
+    async def create_topic(self, topic_name, topic=None, fail_on_exist=False):
+        ''' See ServiceBusService.create_topic. '''
+        return await self._perform_create(
+            self._service._create_topic_request(topic_name, topic),
+            fail_on_exist)
+
+    async def delete_topic(self, topic_name, fail_not_exist=False):
+        ''' See ServiceBusService.delete_topic. '''
+        return await self._perform_delete(
+            self._service._delete_topic_request(topic_name),
+            fail_not_exist)
+
+    async def get_topic(self, topic_name):
+        ''' See ServiceBusService.get_topic. '''
+        response = await self._perform_request(
+            self._service._get_topic_request(topic_name))
+        return _convert_response_to_topic(response)
+
+    async def list_topics(self, skip=None, top=None):
+        ''' See ServiceBusService.list_topics. '''
+        response = await self._perform_request(
+            self._service._list_topics_request(skip, top))
+        return _ETreeXmlToObject.convert_response_to_feeds(
+            response, _convert_etree_element_to_topic)
+
+    async def create_rule(self, topic_name, subscription_name, rule_name,
+                          rule=None, fail_on_exist=False):
+        ''' See ServiceBusService.create_rule. '''
+        return await self._perform_create(
+            self._service._create_rule_request(
+                topic_name, subscription_name, rule_name, rule),
+            fail_on_exist)
+
+    async def delete_rule(self, topic_name, subscription_name, rule_name,
+                          fail_not_exist=False):
+        ''' See ServiceBusService.delete_rule. '''
+        return await self._perform_delete(
+            self._service._delete_rule_request(
+                topic_name, subscription_name, rule_name),
+            fail_not_exist)
+
+    async def get_rule(self, topic_name, subscription_name, rule_name):
+        ''' See ServiceBusService.get_rule. '''
+        response = await self._perform_request(
+            self._service._get_rule_request(
+                topic_name, subscription_name, rule_name))
+        return _convert_response_to_rule(response)
+
+    async def list_rules(self, topic_name, subscription_name, skip=None,
+                         top=None):
+        ''' See ServiceBusService.list_rules. '''
+        response = await self._perform_request(
+            self._service._list_rules_request(
+                topic_name, subscription_name, skip, top))
+        return _ETreeXmlToObject.convert_response_to_feeds(
+            response, _convert_etree_element_to_rule)
+
+    async def create_subscription(self, topic_name, subscription_name,
+                                  subscription=None, fail_on_exist=False):
+        ''' See ServiceBusService.create_subscription. '''
+        return await self._perform_create(
+            self._service._create_subscription_request(
+                topic_name, subscription_name, subscription),
+            fail_on_exist)
+
+    async def delete_subscription(self, topic_name, subscription_name,
+                                  fail_not_exist=False):
+        ''' See ServiceBusService.delete_subscription. '''
+        return await self._perform_delete(
+            self._service._delete_subscription_request(
+                topic_name, subscription_name),
+            fail_not_exist)
+
+    async def get_subscription(self, topic_name, subscription_name):
+        ''' See ServiceBusService.get_subscription. '''
+        response = await self._perform_request(
+            self._service._get_subscription_request(
+                topic_name, subscription_name))
+        return _convert_response_to_subscription(response)
+
+    async def list_subscriptions(self, topic_name, skip=None, top=None):
+        ''' See ServiceBusService.list_subscriptions. '''
+        response = await self._perform_request(
+            self._service._list_subscriptions_request(topic_name, skip, top))
+        return _ETreeXmlToObject.convert_response_to_feeds(
+            response, _convert_etree_element_to_subscription)
+
+    async def send_topic_message(self, topic_name, message=None):
+        ''' See ServiceBusService.send_topic_message. '''
+        await self._perform_request(
+            self._service._send_topic_message_request(topic_name, message))
+
+    async def send_topic_message_batch(self, topic_name, messages=None):
+        ''' See ServiceBusService.send_topic_message_batch. '''
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('messages', messages)
+        await self._send_message_batch(
+            '/' + _str(topic_name) + '/messages',
+            json.dumps([m.as_batch_body() for m in messages]))
+
+    async def peek_lock_subscription_message(self, topic_name,
+                                             subscription_name, timeout='60'):
+        ''' See ServiceBusService.peek_lock_subscription_message. '''
+        response = await self._perform_request(
+            self._service._peek_lock_subscription_message_request(
+                topic_name, subscription_name, timeout))
+        return _create_message(response, self, AsyncMessage)
+
+    async def unlock_subscription_message(self, topic_name, subscription_name,
+                                          sequence_number, lock_token):
+        ''' See ServiceBusService.unlock_subscription_message. '''
+        await self._perform_request(
+            self._service._unlock_subscription_message_request(
+                topic_name, subscription_name, sequence_number, lock_token))
+
+    async def renew_lock_subscription_message(self, topic_name,
+                                              subscription_name,
+                                              sequence_number, lock_token):
+        ''' See ServiceBusService.renew_lock_subscription_message. '''
+        await self._perform_request(
+            self._service._renew_lock_subscription_message_request(
+                topic_name, subscription_name, sequence_number, lock_token))
+
+    async def read_delete_subscription_message(self, topic_name,
+                                               subscription_name,
+                                               timeout='60'):
+        ''' See ServiceBusService.read_delete_subscription_message. '''
+        response = await self._perform_request(
+            self._service._read_delete_subscription_message_request(
+                topic_name, subscription_name, timeout))
+        return _create_message(response, self, AsyncMessage)
+
+    async def delete_subscription_message(self, topic_name, subscription_name,
+                                          sequence_number, lock_token):
+        ''' See ServiceBusService.delete_subscription_message. '''
+        await self._perform_request(
+            self._service._delete_subscription_message_request(
+                topic_name, subscription_name, sequence_number, lock_token))
+
+    async def send_queue_message(self, queue_name, message=None):
+        ''' See ServiceBusService.send_queue_message. '''
+        await self._perform_request(
+            self._service._send_queue_message_request(queue_name, message))
+
+    async def send_queue_message_batch(self, queue_name, messages=None):
+        ''' See ServiceBusService.send_queue_message_batch. '''
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('messages', messages)
+        await self._send_message_batch(
+            '/' + _str(queue_name) + '/messages',
+            json.dumps([m.as_batch_body() for m in messages]))
+
+    async def peek_lock_queue_message(self, queue_name, timeout='60'):
+        ''' See ServiceBusService.peek_lock_queue_message. '''
+        response = await self._perform_request(
+            self._service._peek_lock_queue_message_request(queue_name, timeout))
+        return _create_message(response, self, AsyncMessage)
+
+    async def unlock_queue_message(self, queue_name, sequence_number,
+                                   lock_token):
+        ''' See ServiceBusService.unlock_queue_message. '''
+        await self._perform_request(
+            self._service._unlock_queue_message_request(
+                queue_name, sequence_number, lock_token))
+
+    async def renew_lock_queue_message(self, queue_name, sequence_number,
+                                       lock_token):
+        ''' See ServiceBusService.renew_lock_queue_message. '''
+        await self._perform_request(
+            self._service._renew_lock_queue_message_request(
+                queue_name, sequence_number, lock_token))
+
+    async def read_delete_queue_message(self, queue_name, timeout='60'):
+        ''' See ServiceBusService.read_delete_queue_message. '''
+        response = await self._perform_request(
+            self._service._read_delete_queue_message_request(
+                queue_name, timeout))
+        return _create_message(response, self, AsyncMessage)
+
+    async def delete_queue_message(self, queue_name, sequence_number,
+                                   lock_token):
+        ''' See ServiceBusService.delete_queue_message. '''
+        await self._perform_request(
+            self._service._delete_queue_message_request(
+                queue_name, sequence_number, lock_token))
+
+    async def receive_queue_message(self, queue_name, peek_lock=True,
+                                    timeout=60):
+        ''' See ServiceBusService.receive_queue_message. '''
+        if peek_lock:
+            return await self.peek_lock_queue_message(queue_name, timeout)
+        else:
+            return await self.read_delete_queue_message(queue_name, timeout)
+
+    async def receive_subscription_message(self, topic_name, subscription_name,
+                                           peek_lock=True, timeout=60):
+        ''' See ServiceBusService.receive_subscription_message. '''
+        if peek_lock:
+            return await self.peek_lock_subscription_message(
+                topic_name, subscription_name, timeout)
+        else:
+            return await self.read_delete_subscription_message(
+                topic_name, subscription_name, timeout)
+
+    async def create_event_hub(self, hub_name, hub=None, fail_on_exist=False):
+        ''' See ServiceBusService.create_event_hub. '''
+        return await self._perform_create(
+            self._service._create_event_hub_request(hub_name, hub),
+            fail_on_exist)
+
+    async def update_event_hub(self, hub_name, hub=None):
+        ''' See ServiceBusService.update_event_hub. '''
+        response = await self._perform_request(
+            self._service._update_event_hub_request(hub_name, hub))
+        return _convert_response_to_event_hub(response)
+
+    async def delete_event_hub(self, hub_name, fail_not_exist=False):
+        ''' See ServiceBusService.delete_event_hub. '''
+        return await self._perform_delete(
+            self._service._delete_event_hub_request(hub_name),
+            fail_not_exist)
+
+    async def get_event_hub(self, hub_name):
+        ''' See ServiceBusService.get_event_hub. '''
+        response = await self._perform_request(
+            self._service._get_event_hub_request(hub_name))
+        return _convert_response_to_event_hub(response)
+
+    async def send_event(self, hub_name, message, device_id=None,
+                         broker_properties=None):
+        ''' See ServiceBusService.send_event. '''
+        await self._perform_request(
+            self._service._send_event_request(
+                hub_name, message, device_id, broker_properties))
+
+    async def send_event_batch(self, hub_name, messages, device_id=None):
+        ''' See ServiceBusService.send_event_batch. '''
+        _validate_not_none('hub_name', hub_name)
+        _validate_not_none('messages', messages)
+        await self._send_message_batch(
+            self._service._get_event_hub_messages_path(hub_name, device_id),
+            json.dumps([m.as_batch_body() for m in messages]))
+
+    async def _send_message_batch(self, path, body):
+        await self._perform_request(
+            self._service._send_message_batch_request(path, body))
+
+    async def _perform_create(self, request, fail_on_exist):
+        if not fail_on_exist:
+            try:
+                await self._perform_request(request)
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            await self._perform_request(request)
+            return True
+
+    async def _perform_delete(self, request, fail_not_exist):
+        if not fail_not_exist:
+            try:
+                await self._perform_request(request)
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            await self._perform_request(request)
+            return True
+
+    async def _perform_request(self, request):
+        request.headers = await self._update_service_bus_header(request)
+        try:
+            resp = await self._filter(request)
+        except HTTPError as ex:
+            return _service_bus_error_handler(ex)
+
+        return resp
+
+    async def _update_service_bus_header(self, request):
+        ''' Add additional headers for service bus. '''
+        authentication = self._service.authentication
+        if isinstance(authentication, ServiceBusWrapTokenAuthentication):
+            # Gets the token from the access control server without blocking
+            # the event loop; signing the request then finds it in the cache.
+            wrap_scope = authentication._get_wrap_scope(
+                request.host, request.path)
+            if authentication._get_cached_token(wrap_scope) is None:
+                resp = await self._httpclient.perform_request(
+                    authentication._get_token_request(
+                        request.host, request.path))
+                authentication._cache_token(wrap_scope, resp)
+
+        return self._service._update_service_bus_header(request)
@@ -0,0 +1,256 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+
+from datetime import datetime
+from email.utils import formatdate
+
+if sys.version_info < (3,):
+    from Queue import Queue
+else:
+    from queue import Queue
+
+from ._common_error import (
+    _ERROR_LOCK_RENEWER_ASYNC_MESSAGE,
+    _ERROR_LOCK_RENEWER_CLOSED,
+    _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_RENEW_LOCK,
+    _ERROR_VALUE_NEGATIVE,
+    _ERROR_VALUE_NOT_POSITIVE,
+    _validate_not_none,
+)
+from .models import AzureServiceBusPeekLockError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minimum number of seconds between two renewals of the same lock.
+_MIN_RENEW_INTERVAL = 1
+
+
+def _total_seconds(delta):
+    return delta.days * 86400 + delta.seconds + delta.microseconds / 1e6
+
+
+class _LockRenewal(object):
+
+    ''' Renewal state of one registered message. '''
+
+    def __init__(self, message, lock_duration, deadline):
+        self.message = message
+        self.lock_duration = lock_duration
+        self.deadline = deadline
+        self.cancelled = False
+
+
+class AutoLockRenewer(object):
+
+    ''' Keeps the peek locks of registered messages alive while they are
+    processed.
+
+    A timer thread schedules every registered message to be renewed
+    renew_margin seconds before its lock expires, based on
+    BrokerProperties['LockedUntilUtc'], and a small pool of threads sends
+    the renew lock requests. A message is no longer renewed once it is
+    deleted or unlocked, once it is unregistered, or when renewing its lock
+    fails. '''
+
+    def __init__(self, renew_margin=10, max_workers=4,
+                 max_renewal_duration=None, on_renew_failure=None):
+        '''
+        renew_margin:
+            Optional. Number of seconds before the lock expiry at which the
+            lock is renewed.
+        max_workers:
+            Optional. Number of threads sending renew lock requests.
+        max_renewal_duration:
+            Optional. Number of seconds after registration at which a
+            message stops being renewed. Renewed until settled if None.
+        on_renew_failure:
+            Optional. Callable invoked with the message and the exception
+            when renewing a lock fails.
+        '''
+        if renew_margin < 0:
+            raise ValueError(_ERROR_VALUE_NEGATIVE.format('renew_margin'))
+        if max_workers < 1:
+            raise ValueError(_ERROR_VALUE_NOT_POSITIVE.format('max_workers'))
+
+        self.renew_margin = renew_margin
+        self.max_renewal_duration = max_renewal_duration
+        self.on_renew_failure = on_renew_failure
+
+        self._condition = threading.Condition()
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._renewals = {}
+        self._work = Queue()
+        self._closed = False
+
+        self._threads = []
+        scheduler = threading.Thread(target=self._schedule_loop,
+                                     name='AutoLockRenewer-scheduler')
+        scheduler.daemon = True
+        scheduler.start()
+        self._threads.append(scheduler)
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._renew_loop,
+                                      name='AutoLockRenewer-{0}'.format(i))
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._renewals)
+
+    def register(self, message, lock_duration=None):
+        '''
+        Starts renewing the lock of a peek-locked message.
+
+        message:
+            Message received with peek lock. The locks of AsyncMessage,
+            renewed with coroutines, are not supported.
+        lock_duration:
+            Optional. Lock duration of the queue or subscription, in seconds.
+            Each renewal extends the lock by this duration. If None, it is
+            estimated from the time left on the lock at registration.
+        '''
+        _validate_not_none('message', message)
+        if getattr(message, '_is_async', False):
+            raise TypeError(_ERROR_LOCK_RENEWER_ASYNC_MESSAGE)
+        locked_until = message.locked_until_utc
+        if locked_until is None:
+            raise AzureServiceBusPeekLockError(
+                _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_RENEW_LOCK)
+
+        now = time.time()
+        remaining = _total_seconds(locked_until - datetime.utcnow())
+        if lock_duration is None:
+            lock_duration = max(remaining, 0)
+        deadline = None
+        if self.max_renewal_duration is not None:
+            deadline = now + self.max_renewal_duration
+
+        renewal = _LockRenewal(message, lock_duration, deadline)
+        with self._condition:
+            if self._closed:
+                raise ValueError(_ERROR_LOCK_RENEWER_CLOSED)
+            previous = self._renewals.pop(message, None)
+            if previous is not None:
+                previous.cancelled = True
+            self._renewals[message] = renewal
+            self._push(renewal, now + max(remaining - self.renew_margin, 0))
+
+    def unregister(self, message):
+        '''
+        Stops renewing the lock of a message.
+
+        message:
+            Message previously registered.
+        '''
+        with self._condition:
+            renewal = self._renewals.pop(message, None)
+            if renewal is not None:
+                renewal.cancelled = True
+
+    def close(self):
+        ''' Stops renewing the locks of all the registered messages. '''
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            for renewal in self._renewals.values():
+                renewal.cancelled = True
+            self._renewals.clear()
+            del self._schedule[:]
+            self._condition.notify_all()
+
+        for _ in self._threads[1:]:
+            self._work.put(None)
+
+    def _push(self, renewal, due):
+        heapq.heappush(self._schedule, (due, next(self._sequence), renewal))
+        self._condition.notify_all()
+
+    def _forget(self, renewal):
+        with self._condition:
+            if self._renewals.get(renewal.message) is renewal:
+                del self._renewals[renewal.message]
+
+    def _schedule_loop(self):
+        with self._condition:
+            while not self._closed:
+                if not self._schedule:
+                    self._condition.wait()
+                    continue
+                due, _, renewal = self._schedule[0]
+                delay = due - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                heapq.heappop(self._schedule)
+                if not renewal.cancelled:
+                    self._work.put(renewal)
+
+    def _renew_loop(self):
+        while True:
+            renewal = self._work.get()
+            if renewal is None:
+                return
+            self._renew(renewal)
+
+    def _renew(self, renewal):
+        message = renewal.message
+        if renewal.cancelled:
+            return
+        if message._lock_settled or \
+                (renewal.deadline is not None and time.time() >= renewal.deadline):
+            self._forget(renewal)
+            return
+
+        try:
+            message.renew_lock()
+        except Exception as ex:
+            self._forget(renewal)
+            if self.on_renew_failure is not None:
+                try:
+                    self.on_renew_failure(message, ex)
+                except Exception:  # pylint: disable=broad-except
+                    # the worker keeps renewing the other locks
+                    _LOGGER.exception(
+                        "on_renew_failure callback of %r failed", self)
+            return
+
+        now = time.time()
+        message.broker_properties['LockedUntilUtc'] = formatdate(
+            now + renewal.lock_duration, usegmt=True)
+
+        # Never renew more often than every half lock duration, even when
+        # the lock duration is shorter than the margin.
+        delay = max(renewal.lock_duration - self.renew_margin,
+                    renewal.lock_duration / 2.0,
+                    _MIN_RENEW_INTERVAL)
+        with self._condition:
+            if not renewal.cancelled and not self._closed:
+                self._push(renewal, now + delay)
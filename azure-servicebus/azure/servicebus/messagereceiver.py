@@ -0,0 +1,248 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import sys
+import threading
+import time
+
+from datetime import datetime, timedelta
+
+if sys.version_info < (3,):
+    from Queue import Queue, Empty
+else:
+    from queue import Queue, Empty
+
+from ._common_error import (
+    _ERROR_RECEIVER_ENTITY,
+    _ERROR_VALUE_NEGATIVE,
+    _ERROR_VALUE_NOT_POSITIVE,
+    _validate_not_none,
+)
+
+
+# Put in the buffer when the receiver is closed, to wake up a waiting consumer.
+_RECEIVER_CLOSED = object()
+
+# Seconds a receive thread waits before polling again after a failure.
+_RECEIVE_ERROR_BACKOFF = 1
+
+
+class MessageReceiver(object):
+
+    ''' Receives peek-locked messages from a queue or a subscription.
+
+    Several long-polls are kept in flight on background threads and the
+    received messages are buffered locally, so that the consumer does not pay
+    a full round-trip per message. Iterating over the receiver yields messages
+    until it is closed.
+
+    Use ServiceBusService.get_queue_receiver or
+    ServiceBusService.get_subscription_receiver to create a receiver. '''
+
+    def __init__(self, service_bus_service, queue_name=None, topic_name=None,
+                 subscription_name=None, prefetch_count=10,
+                 max_concurrent_receives=4, timeout=60, lock_margin=5,
+                 lock_renewer=None):
+        '''
+        service_bus_service:
+            ServiceBusService instance used to receive the messages.
+        queue_name:
+            Name of the queue to receive from.
+        topic_name:
+            Name of the topic to receive from. Requires subscription_name.
+        subscription_name:
+            Name of the subscription to receive from. Requires topic_name.
+        prefetch_count:
+            Maximum number of messages held by the receiver, counting both
+            the buffered messages and the long-polls in flight.
+        max_concurrent_receives:
+            Number of long-polls kept in flight. Capped by prefetch_count.
+        timeout:
+            Optional. The timeout of each long-poll, in seconds.
+        lock_margin:
+            Buffered messages whose lock expires in less than lock_margin
+            seconds are dropped instead of being returned.
+        lock_renewer:
+            Optional. AutoLockRenewer with which every returned message is
+            registered, so that its lock is kept alive until it is settled.
+        '''
+        _validate_not_none('service_bus_service', service_bus_service)
+        if queue_name is not None:
+            if topic_name is not None or subscription_name is not None:
+                raise ValueError(_ERROR_RECEIVER_ENTITY)
+        elif topic_name is None or subscription_name is None:
+            raise ValueError(_ERROR_RECEIVER_ENTITY)
+        if prefetch_count < 1:
+            raise ValueError(_ERROR_VALUE_NOT_POSITIVE.format('prefetch_count'))
+        if max_concurrent_receives < 1:
+            raise ValueError(
+                _ERROR_VALUE_NOT_POSITIVE.format('max_concurrent_receives'))
+        if lock_margin < 0:
+            raise ValueError(_ERROR_VALUE_NEGATIVE.format('lock_margin'))
+
+        self.service_bus_service = service_bus_service
+        self.queue_name = queue_name
+        self.topic_name = topic_name
+        self.subscription_name = subscription_name
+        self.prefetch_count = prefetch_count
+        self.max_concurrent_receives = min(max_concurrent_receives,
+                                           prefetch_count)
+        self.timeout = timeout
+        self.lock_margin = lock_margin
+        self.lock_renewer = lock_renewer
+
+        # Every item in the buffer, and every long-poll in flight, holds one
+        # slot. Slots are given back when the consumer takes the item.
+        self._slots = threading.Semaphore(prefetch_count)
+        self._buffer = Queue()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+        self._threads = []
+        for i in range(self.max_concurrent_receives):
+            thread = threading.Thread(
+                target=self._receive_loop,
+                name='MessageReceiver-{0}'.format(i))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        message = self.receive()
+        if message is None:
+            raise StopIteration()
+        return message
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
+
+    def receive(self, timeout=None):
+        '''
+        Returns the next buffered message whose lock is still valid. Returns
+        None if the receiver is closed, or if no message arrived within
+        timeout.
+
+        timeout:
+            Optional. Time to wait for a message, in seconds. Waits until a
+            message arrives or the receiver is closed if None.
+        '''
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            if deadline is None:
+                wait = None
+            else:
+                wait = max(deadline - time.time(), 0)
+            try:
+                item = self._buffer.get(True, wait)
+            except Empty:
+                return None
+
+            if item is _RECEIVER_CLOSED:
+                # Leave the marker for any other waiting consumer.
+                self._buffer.put(item)
+                return None
+
+            self._slots.release()
+            if isinstance(item, Exception):
+                raise item
+            if self._lock_expired(item):
+                continue
+            if self.lock_renewer is not None:
+                self.lock_renewer.register(item)
+            return item
+
+    def close(self):
+        '''
+        Stops receiving. Buffered messages that were not handed out yet are
+        unlocked, so that they can be received again right away.
+        Long-polls already in flight complete in the background.
+        '''
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+
+        while True:
+            try:
+                item = self._buffer.get_nowait()
+            except Empty:
+                break
+            if item is not _RECEIVER_CLOSED and not isinstance(item, Exception):
+                self._unlock(item)
+
+        self._buffer.put(_RECEIVER_CLOSED)
+
+        # Wake up the threads waiting for a slot.
+        for _ in self._threads:
+            self._slots.release()
+
+    def _receive_loop(self):
+        while not self._closed.is_set():
+            self._slots.acquire()
+            if self._closed.is_set():
+                break
+
+            try:
+                message = self._peek_lock()
+            except Exception as ex:
+                with self._lock:
+                    if not self._closed.is_set():
+                        self._buffer.put(ex)
+                self._closed.wait(_RECEIVE_ERROR_BACKOFF)
+                continue
+
+            if message.broker_properties is None:
+                # The long-poll timed out without a message.
+                self._slots.release()
+                continue
+
+            with self._lock:
+                closed = self._closed.is_set()
+                if not closed:
+                    self._buffer.put(message)
+            if closed:
+                self._unlock(message)
+
+    def _peek_lock(self):
+        if self.queue_name is not None:
+            return self.service_bus_service.peek_lock_queue_message(
+                self.queue_name, self.timeout)
+        return self.service_bus_service.peek_lock_subscription_message(
+            self.topic_name, self.subscription_name, self.timeout)
+
+    def _lock_expired(self, message):
+        locked_until = message.locked_until_utc
+        if locked_until is None:
+            return False
+        margin = timedelta(seconds=self.lock_margin)
+        return locked_until - datetime.utcnow() < margin
+
+    def _unlock(self, message):
+        try:
+            message.unlock()
+        except Exception:
+            # Best effort: the lock expires on its own otherwise.
+            pass
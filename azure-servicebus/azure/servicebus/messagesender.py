@@ -0,0 +1,295 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import json
+import logging
+import sys
+import threading
+import time
+
+if sys.version_info < (3,):
+    from Queue import Queue
+else:
+    from queue import Queue
+
+from ._common_conversion import _str
+from ._common_error import (
+    _ERROR_BATCH_MESSAGE_TOO_LARGE,
+    _ERROR_SENDER_CLOSED,
+    _ERROR_SENDER_ENTITY,
+    _ERROR_VALUE_NEGATIVE,
+    _ERROR_VALUE_NOT_POSITIVE,
+    _validate_not_none,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Size of the '[' and ']' around the serialized batch, and of the ', '
+# between two serialized messages, as written by json.dumps.
+_BATCH_ENVELOPE_SIZE = 2
+_BATCH_SEPARATOR = ', '
+
+# Maximum size of a batch accepted by the service, for standard tier
+# namespaces.
+DEFAULT_MAX_BATCH_SIZE_IN_BYTES = 256 * 1024
+
+
+class _Batch(object):
+
+    ''' Messages sealed into one batch, with their serialized body. '''
+
+    def __init__(self, messages, parts):
+        self.messages = messages
+        self.body = '[' + _BATCH_SEPARATOR.join(parts) + ']'
+
+
+class BatchingMessageSender(object):
+
+    ''' Buffers messages sent one at a time and sends them in batches to a
+    queue, a topic or an Event Hub.
+
+    A batch is sealed when adding a message would make its serialized body
+    larger than max_batch_size_in_bytes, when it holds max_batch_count
+    messages, or linger_time seconds after its first message was added.
+    Sealed batches are sent on background threads. When
+    max_pending_batches batches are waiting to be sent, send blocks until
+    one of them is sent.
+
+    Use ServiceBusService.get_queue_sender, ServiceBusService.get_topic_sender
+    or ServiceBusService.get_event_hub_sender to create a sender. '''
+
+    def __init__(self, service_bus_service, queue_name=None, topic_name=None,
+                 hub_name=None, device_id=None,
+                 max_batch_size_in_bytes=DEFAULT_MAX_BATCH_SIZE_IN_BYTES,
+                 max_batch_count=100, linger_time=0.1,
+                 max_concurrent_sends=2, max_pending_batches=4,
+                 on_send_failure=None):
+        '''
+        service_bus_service:
+            ServiceBusService instance used to send the batches.
+        queue_name:
+            Name of the queue to send to.
+        topic_name:
+            Name of the topic to send to.
+        hub_name:
+            Name of the Event Hub to send to.
+        device_id:
+            Optional. Publisher the events are sent as. Only used with
+            hub_name.
+        max_batch_size_in_bytes:
+            Optional. Maximum size of the serialized body of a batch.
+        max_batch_count:
+            Optional. Maximum number of messages in a batch.
+        linger_time:
+            Optional. Maximum time, in seconds, a message waits in a batch
+            that is not full before the batch is sent.
+        max_concurrent_sends:
+            Optional. Number of batches sent concurrently.
+        max_pending_batches:
+            Optional. Number of sealed batches waiting to be sent above which
+            send blocks.
+        on_send_failure:
+            Optional. Callable invoked with the list of messages of a batch
+            and the exception when sending the batch fails. If None, the
+            failures are appended to send_failures.
+        '''
+        _validate_not_none('service_bus_service', service_bus_service)
+        if len([name for name in (queue_name, topic_name, hub_name)
+                if name is not None]) != 1:
+            raise ValueError(_ERROR_SENDER_ENTITY)
+        if max_batch_size_in_bytes <= _BATCH_ENVELOPE_SIZE:
+            raise ValueError(
+                _ERROR_VALUE_NOT_POSITIVE.format('max_batch_size_in_bytes'))
+        if max_batch_count < 1:
+            raise ValueError(_ERROR_VALUE_NOT_POSITIVE.format('max_batch_count'))
+        if linger_time < 0:
+            raise ValueError(_ERROR_VALUE_NEGATIVE.format('linger_time'))
+        if max_concurrent_sends < 1:
+            raise ValueError(
+                _ERROR_VALUE_NOT_POSITIVE.format('max_concurrent_sends'))
+        if max_pending_batches < 1:
+            raise ValueError(
+                _ERROR_VALUE_NOT_POSITIVE.format('max_pending_batches'))
+
+        self.service_bus_service = service_bus_service
+        self.queue_name = queue_name
+        self.topic_name = topic_name
+        self.hub_name = hub_name
+        self.device_id = device_id
+        self.max_batch_size_in_bytes = max_batch_size_in_bytes
+        self.max_batch_count = max_batch_count
+        self.linger_time = linger_time
+        self.on_send_failure = on_send_failure
+        self.send_failures = []
+
+        if queue_name is not None:
+            self._path = '/' + _str(queue_name) + '/messages'
+        elif topic_name is not None:
+            self._path = '/' + _str(topic_name) + '/messages'
+        else:
+            self._path = service_bus_service._get_event_hub_messages_path(
+                hub_name, device_id)
+
+        self._condition = threading.Condition()
+        self._messages = []
+        self._parts = []
+        self._size = _BATCH_ENVELOPE_SIZE
+        self._started = None
+        self._closed = False
+        # Number of threads putting sealed batches on _batches, which close
+        # waits for before stopping the workers.
+        self._putting = 0
+        self._batches = Queue(max_pending_batches)
+
+        self._threads = []
+        lingerer = threading.Thread(target=self._linger_loop,
+                                    name='BatchingMessageSender-linger')
+        lingerer.daemon = True
+        lingerer.start()
+        self._threads.append(lingerer)
+        for i in range(max_concurrent_sends):
+            worker = threading.Thread(target=self._send_loop,
+                                      name='BatchingMessageSender-{0}'.format(i))
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def send(self, message):
+        '''
+        Adds a message to the current batch. Blocks while too many batches
+        are waiting to be sent.
+
+        message:
+            Message object containing message body and properties.
+        '''
+        _validate_not_none('message', message)
+        # json.dumps escapes non-ASCII characters, so the length of the
+        # serialized message is its size in bytes.
+        part = json.dumps(message.as_batch_body())
+        part_size = len(part)
+        if _BATCH_ENVELOPE_SIZE + part_size > self.max_batch_size_in_bytes:
+            raise ValueError(_ERROR_BATCH_MESSAGE_TOO_LARGE.format(
+                part_size, self.max_batch_size_in_bytes))
+
+        sealed = []
+        with self._condition:
+            if self._closed:
+                raise ValueError(_ERROR_SENDER_CLOSED)
+            if self._parts and \
+                    self._size + len(_BATCH_SEPARATOR) + part_size > self.max_batch_size_in_bytes:
+                sealed.append(self._seal())
+            if self._parts:
+                self._size += len(_BATCH_SEPARATOR)
+            else:
+                self._started = time.time()
+                self._condition.notify_all()
+            self._messages.append(message)
+            self._parts.append(part)
+            self._size += part_size
+            if len(self._parts) >= self.max_batch_count:
+                sealed.append(self._seal())
+            if sealed:
+                self._putting += 1
+
+        if sealed:
+            self._put(sealed)
+
+    def flush(self):
+        '''
+        Sends the current batch, and waits until every sealed batch is sent.
+        '''
+        with self._condition:
+            batch = self._seal() if self._parts else None
+            if batch is not None:
+                self._putting += 1
+        if batch is not None:
+            self._put([batch])
+        self._batches.join()
+
+    def close(self):
+        '''
+        Flushes the pending messages and stops the background threads.
+        '''
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            # The batches sealed before the sender was closed are sent too.
+            while self._putting:
+                self._condition.wait()
+
+        self.flush()
+        for _ in self._threads[1:]:
+            self._batches.put(None)
+
+    def _put(self, batches):
+        try:
+            for batch in batches:
+                self._batches.put(batch)
+        finally:
+            with self._condition:
+                self._putting -= 1
+                self._condition.notify_all()
+
+    def _seal(self):
+        batch = _Batch(self._messages, self._parts)
+        self._messages = []
+        self._parts = []
+        self._size = _BATCH_ENVELOPE_SIZE
+        self._started = None
+        return batch
+
+    def _linger_loop(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._parts:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                delay = self._started + self.linger_time - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                batch = self._seal()
+                self._putting += 1
+            self._put([batch])
+
+    def _send_loop(self):
+        while True:
+            batch = self._batches.get()
+            try:
+                if batch is None:
+                    return
+                try:
+                    self.service_bus_service._send_message_batch(
+                        self._path, batch.body)
+                except Exception as ex:
+                    if self.on_send_failure is not None:
+                        try:
+                            self.on_send_failure(batch.messages, ex)
+                        except Exception:  # pylint: disable=broad-except
+                            # the worker keeps sending the other batches
+                            _LOGGER.exception(
+                                "on_send_failure callback of %r failed", self)
+                    else:
+                        self.send_failures.append((batch.messages, ex))
+            finally:
+                self._batches.task_done()
@@ -16,6 +16,7 @@ import sys
 import json
 
 from datetime import datetime
+from email.utils import parsedate
 from azure.common import (
     AzureException,
 )
@@ -159,6 +160,22 @@ class AuthorizationRule(WindowsAzureData):
         self.secondary_key = secondary_key
 
 
+class SettlementResult(object):
+
+    ''' Outcome of settling (deleting, unlocking or renewing the lock of) one
+    peek-locked message. '''
+
+    def __init__(self, sequence_number, lock_token, error=None, message=None):
+        self.sequence_number = sequence_number
+        self.lock_token = lock_token
+        self.error = error
+        self.message = message
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
 class Message(WindowsAzureData):
 
     ''' Message class that used in send message/get mesage apis. '''
@@ -176,6 +193,8 @@ class Message(WindowsAzureData):
         self._topic_name = None
         self._subscription_name = None
         self._queue_name = None
+        # set once the message is deleted or unlocked, its lock is gone
+        self._lock_settled = False
 
         if not service_bus_service:
             return
@@ -195,16 +214,43 @@ class Message(WindowsAzureData):
                 pos1 = location.find('/messages/')
                 self._queue_name = location[pos+len(service_bus_service.host_base):pos1]
 
+    @property
+    def locked_until_utc(self):
+        ''' UTC datetime until which the peek lock on this message is held,
+        as reported in BrokerProperties['LockedUntilUtc']. None if the
+        message is not peek locked. '''
+        if not self.broker_properties or not hasattr(self.broker_properties, 'get'):
+            return None
+        value = self.broker_properties.get('LockedUntilUtc')
+        if not value:
+            return None
+        parsed = parsedate(value)
+        if parsed is None:
+            return None
+        return datetime(*parsed[:6])
+
     def delete(self):
         ''' Deletes itself if find queue name or topic name and subscription
         name. '''
+        result = self._delete()
+        self._lock_settled = True
+        return result
+
+    def unlock(self):
+        ''' Unlocks itself if find queue name or topic name and subscription
+        name. '''
+        result = self._unlock()
+        self._lock_settled = True
+        return result
+
+    def _delete(self):
         if self._queue_name:
-            self.service_bus_service.delete_queue_message(
+            return self.service_bus_service.delete_queue_message(
                 self._queue_name,
                 self.broker_properties['SequenceNumber'],
                 self.broker_properties['LockToken'])
         elif self._topic_name and self._subscription_name:
-            self.service_bus_service.delete_subscription_message(
+            return self.service_bus_service.delete_subscription_message(
                 self._topic_name,
                 self._subscription_name,
                 self.broker_properties['SequenceNumber'],
@@ -212,16 +258,14 @@ class Message(WindowsAzureData):
         else:
             raise AzureServiceBusPeekLockError(_ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_DELETE)
 
-    def unlock(self):
-        ''' Unlocks itself if find queue name or topic name and subscription
-        name. '''
+    def _unlock(self):
         if self._queue_name:
-            self.service_bus_service.unlock_queue_message(
+            return self.service_bus_service.unlock_queue_message(
                 self._queue_name,
                 self.broker_properties['SequenceNumber'],
                 self.broker_properties['LockToken'])
         elif self._topic_name and self._subscription_name:
-            self.service_bus_service.unlock_subscription_message(
+            return self.service_bus_service.unlock_subscription_message(
                 self._topic_name,
                 self._subscription_name,
                 self.broker_properties['SequenceNumber'],
@@ -233,18 +277,19 @@ class Message(WindowsAzureData):
         ''' Renew lock on itself if find queue name or topic name and subscription
         name. '''
         if self._queue_name:
-            self.service_bus_service.renew_lock_queue_message(
+            result = self.service_bus_service.renew_lock_queue_message(
                 self._queue_name,
                 self.broker_properties['SequenceNumber'],
                 self.broker_properties['LockToken'])
         elif self._topic_name and self._subscription_name:
-            self.service_bus_service.renew_lock_subscription_message(
+            result = self.service_bus_service.renew_lock_subscription_message(
                 self._topic_name,
                 self._subscription_name,
                 self.broker_properties['SequenceNumber'],
                 self.broker_properties['LockToken'])
         else:
             raise AzureServiceBusPeekLockError(_ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_RENEW_LOCK)
+        return result
 
     def _serialize_escaped_properties_value(self, value):
         if sys.version_info < (3,) and isinstance(value, unicode):
@@ -30,7 +30,16 @@ from .constants import (
     SERVICE_BUS_HOST_BASE,
     _USER_AGENT_STRING,
 )
+from ._common_concurrency import (
+    _iter_pages,
+    _run_concurrently,
+)
 from ._common_error import (
+    _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_SETTLE,
+    _ERROR_REFRESH_MARGIN,
+    _ERROR_SETTLEMENT_ACTION,
+    _ERROR_TRANSPORT_PROXY,
+    _ERROR_VALUE_NOT_POSITIVE,
     _dont_fail_not_exist,
     _dont_fail_on_exist,
     _validate_not_none,
@@ -55,6 +64,16 @@ from ._http import (
     HTTPRequest,
 )
 from ._http.httpclient import _HTTPClient
+from .models import (
+    AzureServiceBusPeekLockError,
+    SettlementResult,
+)
+from .messagereceiver import MessageReceiver
+from .messagesender import (
+    BatchingMessageSender,
+    DEFAULT_MAX_BATCH_SIZE_IN_BYTES,
+)
+from ._token_cache import _TokenCache
 from ._serialization import (
     _convert_event_hub_to_xml,
     _convert_topic_to_xml,
@@ -75,13 +94,42 @@ from ._serialization import (
 )
 
 
+# Settlement actions, named after the matching *_queue_message and
+# *_subscription_message operations.
+_SETTLEMENT_ACTIONS = ('delete', 'unlock', 'renew_lock')
+
+# Default number of settlement requests sent concurrently.
+_DEFAULT_SETTLEMENT_CONCURRENCY = 8
+
+# Default number of entities requested at a time by the iter_* listings.
+_DEFAULT_LIST_PAGE_SIZE = 100
+
+
+def _get_list_query(skip, top):
+    return [('$skip', _int_or_none(skip)), ('$top', _int_or_none(top))]
+
+
+def _validate_page_size(page_size):
+    if page_size < 1:
+        raise ValueError(_ERROR_VALUE_NOT_POSITIVE.format('page_size'))
+
+
+def _get_message_lock(message):
+    ''' Returns the (sequence_number, lock_token) pair of a received message. '''
+    broker_properties = message.broker_properties
+    if not hasattr(broker_properties, 'get'):
+        return None, None
+    return (broker_properties.get('SequenceNumber'),
+            broker_properties.get('LockToken'))
+
+
 class ServiceBusService(object):
 
     def __init__(self, service_namespace=None, account_key=None, issuer=None,
                  x_ms_version='2011-06-01', host_base=SERVICE_BUS_HOST_BASE,
                  shared_access_key_name=None, shared_access_key_value=None,
                  authentication=None, timeout=DEFAULT_HTTP_TIMEOUT,
-                 request_session=None):
+                 request_session=None, transport=None):
         '''
         Initializes the service bus service for a namespace with the specified
         authentication settings (SAS or ACS).
@@ -115,6 +163,11 @@ class ServiceBusService(object):
             Optional. Timeout for the http request, in seconds.
         request_session:
             Optional. Session object to use for http requests.
+        transport:
+            Optional. TransportConfiguration whose session is used for http
+            requests, when request_session is not specified. Share it between
+            services to share their connection pools. The proxy of the
+            service is set on the transport rather than with set_proxy.
         '''
         self.requestid = None
         self.service_namespace = service_namespace
@@ -146,10 +199,13 @@ class ServiceBusService(object):
                 raise ValueError(
                     'You need to provide servicebus access key and Issuer OR shared access key and value')
 
+        # The session of a transport is shared with its other services.
+        self._transport = transport if not request_session else None
         self._httpclient = _HTTPClient(
             service_instance=self,
             timeout=timeout,
-            request_session=request_session or requests.Session(),
+            request_session=request_session or
+            (transport.session if transport else requests.Session()),
             user_agent=_USER_AGENT_STRING,
         )
         self._filter = self._httpclient.perform_request
@@ -194,7 +250,10 @@ class ServiceBusService(object):
         '''
         res = ServiceBusService(
             service_namespace=self.service_namespace,
-            authentication=self.authentication)
+            authentication=self.authentication,
+            request_session=None if self._transport else
+            self._httpclient.request_session,
+            transport=self._transport)
 
         old_filter = self._filter
 
@@ -216,7 +275,13 @@ class ServiceBusService(object):
             User for proxy authorization.
         password:
             Password for proxy authorization.
+
+        The session of a service using a transport is shared with the other
+        services of the transport, its proxy is set with the proxy settings
+        of the TransportConfiguration instead.
         '''
+        if self._transport is not None:
+            raise ValueError(_ERROR_TRANSPORT_PROXY)
         self._httpclient.set_proxy(host, port, user, password)
 
     @property
@@ -239,13 +304,7 @@ class ServiceBusService(object):
         fail_on_exist:
             Specify whether to throw an exception when the queue exists.
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + ''
-        request.body = _get_request_body(_convert_queue_to_xml(queue))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._create_queue_request(queue_name, queue)
         request.headers = self._update_service_bus_header(request)
         if not fail_on_exist:
             try:
@@ -268,12 +327,7 @@ class ServiceBusService(object):
         fail_not_exist:
             Specify whether to throw an exception if the queue doesn't exist.
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_queue_request(queue_name)
         request.headers = self._update_service_bus_header(request)
         if not fail_not_exist:
             try:
@@ -293,32 +347,43 @@ class ServiceBusService(object):
         queue_name:
             Name of the queue.
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._get_queue_request(queue_name)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _convert_response_to_queue(response)
 
-    def list_queues(self):
+    def list_queues(self, skip=None, top=None):
         '''
         Enumerates the queues in the service namespace.
+
+        skip:
+            Optional. Number of queues to skip, from the start of the listing.
+        top:
+            Optional. Maximum number of queues to return.
         '''
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/$Resources/Queues'
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._list_queues_request(skip, top)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _ETreeXmlToObject.convert_response_to_feeds(
             response, _convert_etree_element_to_queue)
 
+    def iter_queues(self, page_size=_DEFAULT_LIST_PAGE_SIZE, prefetch=False):
+        '''
+        Enumerates the queues in the service namespace lazily. Returns a
+        generator which lists the queues one page at a time, using $skip and
+        $top, and yields them as the pages arrive.
+
+        page_size:
+            Optional. Number of queues requested at a time.
+        prefetch:
+            Optional. If True, the next page is requested on a background
+            thread while the queues of the current page are consumed.
+        '''
+        _validate_page_size(page_size)
+        return _iter_pages(self.list_queues, page_size, prefetch)
+
     def create_topic(self, topic_name, topic=None, fail_on_exist=False):
         '''
         Creates a new topic. Once created, this topic resource manifest is
@@ -331,13 +396,7 @@ class ServiceBusService(object):
         fail_on_exist:
             Specify whether to throw an exception when the topic exists.
         '''
-        _validate_not_none('topic_name', topic_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + ''
-        request.body = _get_request_body(_convert_topic_to_xml(topic))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._create_topic_request(topic_name, topic)
         request.headers = self._update_service_bus_header(request)
         if not fail_on_exist:
             try:
@@ -360,12 +419,7 @@ class ServiceBusService(object):
         fail_not_exist:
             Specify whether throw exception when topic doesn't exist.
         '''
-        _validate_not_none('topic_name', topic_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_topic_request(topic_name)
         request.headers = self._update_service_bus_header(request)
         if not fail_not_exist:
             try:
@@ -385,32 +439,43 @@ class ServiceBusService(object):
         topic_name:
             Name of the topic.
         '''
-        _validate_not_none('topic_name', topic_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._get_topic_request(topic_name)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _convert_response_to_topic(response)
 
-    def list_topics(self):
+    def list_topics(self, skip=None, top=None):
         '''
         Retrieves the topics in the service namespace.
+
+        skip:
+            Optional. Number of topics to skip, from the start of the listing.
+        top:
+            Optional. Maximum number of topics to return.
         '''
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/$Resources/Topics'
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._list_topics_request(skip, top)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _ETreeXmlToObject.convert_response_to_feeds(
             response, _convert_etree_element_to_topic)
 
+    def iter_topics(self, page_size=_DEFAULT_LIST_PAGE_SIZE, prefetch=False):
+        '''
+        Retrieves the topics in the service namespace lazily. Returns a
+        generator which lists the topics one page at a time, using $skip and
+        $top, and yields them as the pages arrive.
+
+        page_size:
+            Optional. Number of topics requested at a time.
+        prefetch:
+            Optional. If True, the next page is requested on a background
+            thread while the topics of the current page are consumed.
+        '''
+        _validate_page_size(page_size)
+        return _iter_pages(self.list_topics, page_size, prefetch)
+
     def create_rule(self, topic_name, subscription_name, rule_name, rule=None,
                     fail_on_exist=False):
         '''
@@ -426,17 +491,8 @@ class ServiceBusService(object):
         fail_on_exist:
             Specify whether to throw an exception when the rule exists.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('rule_name', rule_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
-            _str(subscription_name) + \
-            '/rules/' + _str(rule_name) + ''
-        request.body = _get_request_body(_convert_rule_to_xml(rule))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._create_rule_request(
+            topic_name, subscription_name, rule_name, rule)
         request.headers = self._update_service_bus_header(request)
         if not fail_on_exist:
             try:
@@ -464,16 +520,8 @@ class ServiceBusService(object):
         fail_not_exist:
             Specify whether throw exception when rule doesn't exist.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('rule_name', rule_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
-            _str(subscription_name) + \
-            '/rules/' + _str(rule_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_rule_request(
+            topic_name, subscription_name, rule_name)
         request.headers = self._update_service_bus_header(request)
         if not fail_not_exist:
             try:
@@ -497,22 +545,14 @@ class ServiceBusService(object):
         rule_name:
             Name of the rule.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('rule_name', rule_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
-            _str(subscription_name) + \
-            '/rules/' + _str(rule_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._get_rule_request(
+            topic_name, subscription_name, rule_name)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _convert_response_to_rule(response)
 
-    def list_rules(self, topic_name, subscription_name):
+    def list_rules(self, topic_name, subscription_name, skip=None, top=None):
         '''
         Retrieves the rules that exist under the specified subscription.
 
@@ -520,22 +560,45 @@ class ServiceBusService(object):
             Name of the topic.
         subscription_name:
             Name of the subscription.
+        skip:
+            Optional. Number of rules to skip, from the start of the listing.
+        top:
+            Optional. Maximum number of rules to return.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + \
-            _str(topic_name) + '/subscriptions/' + \
-            _str(subscription_name) + '/rules/'
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._list_rules_request(
+            topic_name, subscription_name, skip, top)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _ETreeXmlToObject.convert_response_to_feeds(
             response, _convert_etree_element_to_rule)
 
+    def iter_rules(self, topic_name, subscription_name,
+                   page_size=_DEFAULT_LIST_PAGE_SIZE, prefetch=False):
+        '''
+        Retrieves the rules that exist under the specified subscription
+        lazily. Returns a generator which lists the rules one page at a time,
+        using $skip and $top, and yields them as the pages arrive.
+
+        topic_name:
+            Name of the topic.
+        subscription_name:
+            Name of the subscription.
+        page_size:
+            Optional. Number of rules requested at a time.
+        prefetch:
+            Optional. If True, the next page is requested on a background
+            thread while the rules of the current page are consumed.
+        '''
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_page_size(page_size)
+
+        def list_page(skip, top):
+            return self.list_rules(topic_name, subscription_name, skip, top)
+
+        return _iter_pages(list_page, page_size, prefetch)
+
     def create_subscription(self, topic_name, subscription_name,
                             subscription=None, fail_on_exist=False):
         '''
@@ -549,16 +612,8 @@ class ServiceBusService(object):
         fail_on_exist:
             Specify whether throw exception when subscription exists.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + \
-            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
-        request.body = _get_request_body(
-            _convert_subscription_to_xml(subscription))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._create_subscription_request(
+            topic_name, subscription_name, subscription)
         request.headers = self._update_service_bus_header(request)
         if not fail_on_exist:
             try:
@@ -584,14 +639,8 @@ class ServiceBusService(object):
             Specify whether to throw an exception when the subscription
             doesn't exist.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + \
-            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_subscription_request(
+            topic_name, subscription_name)
         request.headers = self._update_service_bus_header(request)
         if not fail_not_exist:
             try:
@@ -613,38 +662,53 @@ class ServiceBusService(object):
         subscription_name:
             Name of the subscription.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + \
-            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._get_subscription_request(topic_name, subscription_name)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _convert_response_to_subscription(response)
 
-    def list_subscriptions(self, topic_name):
+    def list_subscriptions(self, topic_name, skip=None, top=None):
         '''
         Retrieves the subscriptions in the specified topic.
 
         topic_name:
             Name of the topic.
+        skip:
+            Optional. Number of subscriptions to skip, from the start of the listing.
+        top:
+            Optional. Maximum number of subscriptions to return.
         '''
-        _validate_not_none('topic_name', topic_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/subscriptions/'
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._list_subscriptions_request(topic_name, skip, top)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
         return _ETreeXmlToObject.convert_response_to_feeds(
             response, _convert_etree_element_to_subscription)
 
+    def iter_subscriptions(self, topic_name,
+                           page_size=_DEFAULT_LIST_PAGE_SIZE, prefetch=False):
+        '''
+        Retrieves the subscriptions in the specified topic lazily. Returns a
+        generator which lists the subscriptions one page at a time, using
+        $skip and $top, and yields them as the pages arrive.
+
+        topic_name:
+            Name of the topic.
+        page_size:
+            Optional. Number of subscriptions requested at a time.
+        prefetch:
+            Optional. If True, the next page is requested on a background
+            thread while the subscriptions of the current page are consumed.
+        '''
+        _validate_not_none('topic_name', topic_name)
+        _validate_page_size(page_size)
+
+        def list_page(skip, top):
+            return self.list_subscriptions(topic_name, skip, top)
+
+        return _iter_pages(list_page, page_size, prefetch)
+
     def send_topic_message(self, topic_name, message=None):
         '''
         Enqueues a message into the specified topic. The limit to the number
@@ -658,15 +722,7 @@ class ServiceBusService(object):
         message:
             Message object containing message body and properties.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('message', message)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/messages'
-        request.headers = message.add_headers(request)
-        request.body = _get_request_body(message.body)
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._send_topic_message_request(topic_name, message)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -685,15 +741,9 @@ class ServiceBusService(object):
         '''
         _validate_not_none('topic_name', topic_name)
         _validate_not_none('messages', messages)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + '/messages'
-        request.headers.append(('Content-Type', 'application/vnd.microsoft.servicebus.json'))
-        request.body = _get_request_body(json.dumps([m.as_batch_body() for m in messages]))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
-        request.headers = self._update_service_bus_header(request)
-        self._perform_request(request)
+        self._send_message_batch(
+            '/' + _str(topic_name) + '/messages',
+            json.dumps([m.as_batch_body() for m in messages]))
 
     def peek_lock_subscription_message(self, topic_name, subscription_name,
                                        timeout='60'):
@@ -718,16 +768,8 @@ class ServiceBusService(object):
         timeout:
             Optional. The timeout parameter is expressed in seconds.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + \
-            _str(topic_name) + '/subscriptions/' + \
-            _str(subscription_name) + '/messages/head'
-        request.query = [('timeout', _int_or_none(timeout))]
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._peek_lock_subscription_message_request(
+            topic_name, subscription_name, timeout)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -752,18 +794,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + \
-                       '/subscriptions/' + str(subscription_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._unlock_subscription_message_request(
+            topic_name, subscription_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -785,18 +817,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + \
-                       '/subscriptions/' + str(subscription_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._renew_lock_subscription_message_request(
+            topic_name, subscription_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -815,16 +837,8 @@ class ServiceBusService(object):
         timeout:
             Optional. The timeout parameter is expressed in seconds.
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + \
-                       '/subscriptions/' + _str(subscription_name) + \
-                       '/messages/head'
-        request.query = [('timeout', _int_or_none(timeout))]
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._read_delete_subscription_message_request(
+            topic_name, subscription_name, timeout)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -849,18 +863,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('topic_name', topic_name)
-        _validate_not_none('subscription_name', subscription_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(topic_name) + \
-                       '/subscriptions/' + _str(subscription_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_subscription_message_request(
+            topic_name, subscription_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -877,15 +881,7 @@ class ServiceBusService(object):
         message:
             Message object containing message body and properties.
         '''
-        _validate_not_none('queue_name', queue_name)
-        _validate_not_none('message', message)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + '/messages'
-        request.headers = message.add_headers(request)
-        request.body = _get_request_body(message.body)
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._send_queue_message_request(queue_name, message)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -904,15 +900,9 @@ class ServiceBusService(object):
         '''
         _validate_not_none('queue_name', queue_name)
         _validate_not_none('messages', messages)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + '/messages'
-        request.headers.append(('Content-Type', 'application/vnd.microsoft.servicebus.json'))
-        request.body = _get_request_body(json.dumps([m.as_batch_body() for m in messages]))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
-        request.headers = self._update_service_bus_header(request)
-        self._perform_request(request)
+        self._send_message_batch(
+            '/' + _str(queue_name) + '/messages',
+            json.dumps([m.as_batch_body() for m in messages]))
 
     def peek_lock_queue_message(self, queue_name, timeout='60'):
         '''
@@ -931,13 +921,7 @@ class ServiceBusService(object):
         timeout:
             Optional. The timeout parameter is expressed in seconds.
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + '/messages/head'
-        request.query = [('timeout', _int_or_none(timeout))]
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._peek_lock_queue_message_request(queue_name, timeout)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -959,16 +943,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('queue_name', queue_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._unlock_queue_message_request(
+            queue_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -987,16 +963,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('queue_name', queue_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'POST'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._renew_lock_queue_message_request(
+            queue_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -1012,13 +980,7 @@ class ServiceBusService(object):
         timeout:
             Optional. The timeout parameter is expressed in seconds.
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + '/messages/head'
-        request.query = [('timeout', _int_or_none(timeout))]
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._read_delete_queue_message_request(queue_name, timeout)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -1040,16 +1002,8 @@ class ServiceBusService(object):
             The ID of the lock as returned by the Peek Message operation in
             BrokerProperties['LockToken']
         '''
-        _validate_not_none('queue_name', queue_name)
-        _validate_not_none('sequence_number', sequence_number)
-        _validate_not_none('lock_token', lock_token)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(queue_name) + \
-                       '/messages/' + _str(sequence_number) + \
-                       '/' + _str(lock_token) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_queue_message_request(
+            queue_name, sequence_number, lock_token)
         request.headers = self._update_service_bus_header(request)
         self._perform_request(request)
 
@@ -1094,6 +1048,175 @@ class ServiceBusService(object):
                                                          subscription_name,
                                                          timeout)
 
+    def settle_queue_messages(self, queue_name, locks, action='delete',
+                              max_concurrency=_DEFAULT_SETTLEMENT_CONCURRENCY):
+        '''
+        Settles many peek-locked messages of a queue concurrently. Returns a
+        list of SettlementResult, in the order of locks. A failure does not
+        stop the settlement of the other messages.
+
+        queue_name:
+            Name of the queue.
+        locks:
+            Iterable of (sequence_number, lock_token) pairs, as returned in
+            BrokerProperties by the Peek Message operation.
+        action:
+            Optional. 'delete' to complete the messages, 'unlock' to abandon
+            them or 'renew_lock' to renew their locks. Default is 'delete'.
+        max_concurrency:
+            Optional. Maximum number of requests in flight.
+        '''
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('locks', locks)
+        operation = self._get_settlement_operation('queue', action)
+
+        def settle(lock):
+            operation(queue_name, lock[0], lock[1])
+
+        return self._settle_locks(settle, locks, max_concurrency)
+
+    def settle_subscription_messages(self, topic_name, subscription_name,
+                                     locks, action='delete',
+                                     max_concurrency=_DEFAULT_SETTLEMENT_CONCURRENCY):
+        '''
+        Settles many peek-locked messages of a subscription concurrently.
+        Returns a list of SettlementResult, in the order of locks. A failure
+        does not stop the settlement of the other messages.
+
+        topic_name:
+            Name of the topic.
+        subscription_name:
+            Name of the subscription.
+        locks:
+            Iterable of (sequence_number, lock_token) pairs, as returned in
+            BrokerProperties by the Peek Message operation.
+        action:
+            Optional. 'delete' to complete the messages, 'unlock' to abandon
+            them or 'renew_lock' to renew their locks. Default is 'delete'.
+        max_concurrency:
+            Optional. Maximum number of requests in flight.
+        '''
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('locks', locks)
+        operation = self._get_settlement_operation('subscription', action)
+
+        def settle(lock):
+            operation(topic_name, subscription_name, lock[0], lock[1])
+
+        return self._settle_locks(settle, locks, max_concurrency)
+
+    def settle_messages(self, messages, action='delete',
+                        max_concurrency=_DEFAULT_SETTLEMENT_CONCURRENCY):
+        '''
+        Settles many peek-locked Message objects concurrently. The messages
+        may come from different queues and subscriptions. Returns a list of
+        SettlementResult, in the order of messages. A failure does not stop
+        the settlement of the other messages.
+
+        messages:
+            Iterable of messages received with peek lock.
+        action:
+            Optional. 'delete' to complete the messages, 'unlock' to abandon
+            them or 'renew_lock' to renew their locks. Default is 'delete'.
+        max_concurrency:
+            Optional. Maximum number of requests in flight.
+        '''
+        _validate_not_none('messages', messages)
+        queue_operation = self._get_settlement_operation('queue', action)
+        subscription_operation = self._get_settlement_operation(
+            'subscription', action)
+        messages = list(messages)
+
+        def settle(message):
+            sequence_number, lock_token = _get_message_lock(message)
+            if message._queue_name:
+                queue_operation(message._queue_name, sequence_number,
+                                lock_token)
+            elif message._topic_name and message._subscription_name:
+                subscription_operation(message._topic_name,
+                                       message._subscription_name,
+                                       sequence_number, lock_token)
+            else:
+                raise AzureServiceBusPeekLockError(
+                    _ERROR_MESSAGE_NOT_PEEK_LOCKED_ON_SETTLE)
+            if action != 'renew_lock':
+                message._lock_settled = True
+
+        outcomes = _run_concurrently(settle, messages, max_concurrency)
+        results = []
+        for message, (_, error) in zip(messages, outcomes):
+            sequence_number, lock_token = _get_message_lock(message)
+            results.append(SettlementResult(
+                sequence_number, lock_token, error, message))
+        return results
+
+    def get_queue_receiver(self, queue_name, prefetch_count=10,
+                           max_concurrent_receives=4, timeout=60,
+                           lock_margin=5, lock_renewer=None):
+        '''
+        Returns a MessageReceiver which peek locks messages from a queue with
+        several long-polls in flight, and buffers them locally. Iterate over
+        the receiver to process the messages, and close it when done.
+
+        queue_name:
+            Name of the queue.
+        prefetch_count:
+            Optional. Maximum number of messages held by the receiver,
+            counting both the buffered messages and the long-polls in flight.
+        max_concurrent_receives:
+            Optional. Number of long-polls kept in flight.
+        timeout:
+            Optional. The timeout of each long-poll, in seconds.
+        lock_margin:
+            Optional. Buffered messages whose lock expires in less than
+            lock_margin seconds are dropped instead of being returned.
+        lock_renewer:
+            Optional. AutoLockRenewer with which every returned message is
+            registered, so that its lock is kept alive until it is settled.
+        '''
+        _validate_not_none('queue_name', queue_name)
+        return MessageReceiver(
+            self, queue_name=queue_name, prefetch_count=prefetch_count,
+            max_concurrent_receives=max_concurrent_receives, timeout=timeout,
+            lock_margin=lock_margin, lock_renewer=lock_renewer)
+
+    def get_subscription_receiver(self, topic_name, subscription_name,
+                                  prefetch_count=10, max_concurrent_receives=4,
+                                  timeout=60, lock_margin=5,
+                                  lock_renewer=None):
+        '''
+        Returns a MessageReceiver which peek locks messages from a
+        subscription with several long-polls in flight, and buffers them
+        locally. Iterate over the receiver to process the messages, and close
+        it when done.
+
+        topic_name:
+            Name of the topic.
+        subscription_name:
+            Name of the subscription.
+        prefetch_count:
+            Optional. Maximum number of messages held by the receiver,
+            counting both the buffered messages and the long-polls in flight.
+        max_concurrent_receives:
+            Optional. Number of long-polls kept in flight.
+        timeout:
+            Optional. The timeout of each long-poll, in seconds.
+        lock_margin:
+            Optional. Buffered messages whose lock expires in less than
+            lock_margin seconds are dropped instead of being returned.
+        lock_renewer:
+            Optional. AutoLockRenewer with which every returned message is
+            registered, so that its lock is kept alive until it is settled.
+        '''
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        return MessageReceiver(
+            self, topic_name=topic_name, subscription_name=subscription_name,
+            prefetch_count=prefetch_count,
+            max_concurrent_receives=max_concurrent_receives, timeout=timeout,
+            lock_margin=lock_margin, lock_renewer=lock_renewer)
+
     def create_event_hub(self, hub_name, hub=None, fail_on_exist=False):
         '''
         Creates a new Event Hub.
@@ -1110,13 +1233,7 @@ class ServiceBusService(object):
         fail_on_exist:
             Specify whether to throw an exception when the event hub exists.
         '''
-        _validate_not_none('hub_name', hub_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
-        request.body = _get_request_body(_convert_event_hub_to_xml(hub))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._create_event_hub_request(hub_name, hub)
         request.headers = self._update_service_bus_header(request)
         if not fail_on_exist:
             try:
@@ -1140,14 +1257,7 @@ class ServiceBusService(object):
         hub.message_retention_in_days:
             Number of days to retain the events for this Event Hub.
         '''
-        _validate_not_none('hub_name', hub_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host = self._get_host()
-        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
-        request.body = _get_request_body(_convert_event_hub_to_xml(hub))
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
-        request.headers.append(('If-Match', '*'))
+        request = self._update_event_hub_request(hub_name, hub)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -1163,12 +1273,7 @@ class ServiceBusService(object):
         fail_not_exist:
             Specify whether to throw an exception if the event hub doesn't exist.
         '''
-        _validate_not_none('hub_name', hub_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host = self._get_host()
-        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._delete_event_hub_request(hub_name)
         request.headers = self._update_service_bus_header(request)
         if not fail_not_exist:
             try:
@@ -1188,12 +1293,7 @@ class ServiceBusService(object):
         hub_name:
             Name of the event hub.
         '''
-        _validate_not_none('hub_name', hub_name)
-        request = HTTPRequest()
-        request.method = 'GET'
-        request.host = self._get_host()
-        request.path = '/' + _str(hub_name) + ''
-        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request = self._get_event_hub_request(hub_name)
         request.headers = self._update_service_bus_header(request)
         response = self._perform_request(request)
 
@@ -1204,25 +1304,579 @@ class ServiceBusService(object):
         '''
         Sends a new message event to an Event Hub.
         '''
+        request = self._send_event_request(
+            hub_name, message, device_id, broker_properties)
+        request.headers = self._update_service_bus_header(request)
+        self._perform_request(request)
+
+    def send_event_batch(self, hub_name, messages, device_id=None):
+        '''
+        Sends a batch of events to an Event Hub, in a single request.
+
+        hub_name:
+            Name of the event hub.
+        messages:
+            List of message objects containing event body and properties.
+        device_id:
+            Optional. Publisher the events are sent as.
+        '''
+        _validate_not_none('hub_name', hub_name)
+        _validate_not_none('messages', messages)
+        self._send_message_batch(
+            self._get_event_hub_messages_path(hub_name, device_id),
+            json.dumps([m.as_batch_body() for m in messages]))
+
+    def get_queue_sender(self, queue_name,
+                         max_batch_size_in_bytes=DEFAULT_MAX_BATCH_SIZE_IN_BYTES,
+                         max_batch_count=100, linger_time=0.1,
+                         max_concurrent_sends=2, max_pending_batches=4,
+                         on_send_failure=None):
+        '''
+        Returns a BatchingMessageSender which buffers the messages sent one
+        at a time and sends them to a queue in batches, on background
+        threads. Close the sender to send the pending messages.
+
+        queue_name:
+            Name of the queue.
+        max_batch_size_in_bytes:
+            Optional. Maximum size of the serialized body of a batch.
+        max_batch_count:
+            Optional. Maximum number of messages in a batch.
+        linger_time:
+            Optional. Maximum time, in seconds, a message waits in a batch
+            that is not full before the batch is sent.
+        max_concurrent_sends:
+            Optional. Number of batches sent concurrently.
+        max_pending_batches:
+            Optional. Number of batches waiting to be sent above which
+            sending a message blocks.
+        on_send_failure:
+            Optional. Callable invoked with the messages of a batch and the
+            exception when sending the batch fails.
+        '''
+        _validate_not_none('queue_name', queue_name)
+        return BatchingMessageSender(
+            self, queue_name=queue_name,
+            max_batch_size_in_bytes=max_batch_size_in_bytes,
+            max_batch_count=max_batch_count, linger_time=linger_time,
+            max_concurrent_sends=max_concurrent_sends,
+            max_pending_batches=max_pending_batches,
+            on_send_failure=on_send_failure)
+
+    def get_topic_sender(self, topic_name,
+                         max_batch_size_in_bytes=DEFAULT_MAX_BATCH_SIZE_IN_BYTES,
+                         max_batch_count=100, linger_time=0.1,
+                         max_concurrent_sends=2, max_pending_batches=4,
+                         on_send_failure=None):
+        '''
+        Returns a BatchingMessageSender which buffers the messages sent one
+        at a time and sends them to a topic in batches, on background
+        threads. Close the sender to send the pending messages.
+
+        topic_name:
+            Name of the topic.
+        max_batch_size_in_bytes:
+            Optional. Maximum size of the serialized body of a batch.
+        max_batch_count:
+            Optional. Maximum number of messages in a batch.
+        linger_time:
+            Optional. Maximum time, in seconds, a message waits in a batch
+            that is not full before the batch is sent.
+        max_concurrent_sends:
+            Optional. Number of batches sent concurrently.
+        max_pending_batches:
+            Optional. Number of batches waiting to be sent above which
+            sending a message blocks.
+        on_send_failure:
+            Optional. Callable invoked with the messages of a batch and the
+            exception when sending the batch fails.
+        '''
+        _validate_not_none('topic_name', topic_name)
+        return BatchingMessageSender(
+            self, topic_name=topic_name,
+            max_batch_size_in_bytes=max_batch_size_in_bytes,
+            max_batch_count=max_batch_count, linger_time=linger_time,
+            max_concurrent_sends=max_concurrent_sends,
+            max_pending_batches=max_pending_batches,
+            on_send_failure=on_send_failure)
+
+    def get_event_hub_sender(self, hub_name, device_id=None,
+                             max_batch_size_in_bytes=DEFAULT_MAX_BATCH_SIZE_IN_BYTES,
+                             max_batch_count=100, linger_time=0.1,
+                             max_concurrent_sends=2, max_pending_batches=4,
+                             on_send_failure=None):
+        '''
+        Returns a BatchingMessageSender which buffers the events sent one at
+        a time and sends them to an Event Hub in batches, on background
+        threads. Close the sender to send the pending events.
+
+        hub_name:
+            Name of the event hub.
+        device_id:
+            Optional. Publisher the events are sent as.
+        max_batch_size_in_bytes:
+            Optional. Maximum size of the serialized body of a batch.
+        max_batch_count:
+            Optional. Maximum number of events in a batch.
+        linger_time:
+            Optional. Maximum time, in seconds, an event waits in a batch
+            that is not full before the batch is sent.
+        max_concurrent_sends:
+            Optional. Number of batches sent concurrently.
+        max_pending_batches:
+            Optional. Number of batches waiting to be sent above which
+            sending an event blocks.
+        on_send_failure:
+            Optional. Callable invoked with the events of a batch and the
+            exception when sending the batch fails.
+        '''
+        _validate_not_none('hub_name', hub_name)
+        return BatchingMessageSender(
+            self, hub_name=hub_name, device_id=device_id,
+            max_batch_size_in_bytes=max_batch_size_in_bytes,
+            max_batch_count=max_batch_count, linger_time=linger_time,
+            max_concurrent_sends=max_concurrent_sends,
+            max_pending_batches=max_pending_batches,
+            on_send_failure=on_send_failure)
+
+    # The _*_request methods build the requests of the operations, without
+    # service bus headers. They are shared with the asyncio client.
+    def _create_queue_request(self, queue_name, queue=None):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + ''
+        request.body = _get_request_body(_convert_queue_to_xml(queue))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_queue_request(self, queue_name):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _get_queue_request(self, queue_name):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _list_queues_request(self, skip=None, top=None):
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/$Resources/Queues'
+        request.query = _get_list_query(skip, top)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        # The feed is parsed as it is read from the connection.
+        request.stream = True
+        return request
+
+    def _create_topic_request(self, topic_name, topic=None):
+        _validate_not_none('topic_name', topic_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + ''
+        request.body = _get_request_body(_convert_topic_to_xml(topic))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_topic_request(self, topic_name):
+        _validate_not_none('topic_name', topic_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _get_topic_request(self, topic_name):
+        _validate_not_none('topic_name', topic_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _list_topics_request(self, skip=None, top=None):
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/$Resources/Topics'
+        request.query = _get_list_query(skip, top)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request.stream = True
+        return request
+
+    def _create_rule_request(self, topic_name, subscription_name, rule_name,
+                             rule=None):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('rule_name', rule_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
+            _str(subscription_name) + \
+            '/rules/' + _str(rule_name) + ''
+        request.body = _get_request_body(_convert_rule_to_xml(rule))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_rule_request(self, topic_name, subscription_name, rule_name):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('rule_name', rule_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
+            _str(subscription_name) + \
+            '/rules/' + _str(rule_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _get_rule_request(self, topic_name, subscription_name, rule_name):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('rule_name', rule_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + '/subscriptions/' + \
+            _str(subscription_name) + \
+            '/rules/' + _str(rule_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _list_rules_request(self, topic_name, subscription_name, skip=None,
+                            top=None):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + \
+            _str(topic_name) + '/subscriptions/' + \
+            _str(subscription_name) + '/rules/'
+        request.query = _get_list_query(skip, top)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request.stream = True
+        return request
+
+    def _create_subscription_request(self, topic_name, subscription_name,
+                                     subscription=None):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + \
+            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
+        request.body = _get_request_body(
+            _convert_subscription_to_xml(subscription))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_subscription_request(self, topic_name, subscription_name):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + \
+            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _get_subscription_request(self, topic_name, subscription_name):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + \
+            _str(topic_name) + '/subscriptions/' + _str(subscription_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _list_subscriptions_request(self, topic_name, skip=None, top=None):
+        _validate_not_none('topic_name', topic_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + '/subscriptions/'
+        request.query = _get_list_query(skip, top)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request.stream = True
+        return request
+
+    def _send_topic_message_request(self, topic_name, message=None):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('message', message)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + '/messages'
+        request.headers = message.add_headers(request)
+        request.body = _get_request_body(message.body)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _peek_lock_subscription_message_request(self, topic_name,
+                                                subscription_name,
+                                                timeout='60'):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + \
+            _str(topic_name) + '/subscriptions/' + \
+            _str(subscription_name) + '/messages/head'
+        request.query = [('timeout', _int_or_none(timeout))]
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _unlock_subscription_message_request(self, topic_name,
+                                             subscription_name,
+                                             sequence_number, lock_token):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + \
+                       '/subscriptions/' + str(subscription_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _renew_lock_subscription_message_request(self, topic_name,
+                                                 subscription_name,
+                                                 sequence_number, lock_token):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + \
+                       '/subscriptions/' + str(subscription_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _read_delete_subscription_message_request(self, topic_name,
+                                                  subscription_name,
+                                                  timeout='60'):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + \
+                       '/subscriptions/' + _str(subscription_name) + \
+                       '/messages/head'
+        request.query = [('timeout', _int_or_none(timeout))]
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_subscription_message_request(self, topic_name,
+                                             subscription_name,
+                                             sequence_number, lock_token):
+        _validate_not_none('topic_name', topic_name)
+        _validate_not_none('subscription_name', subscription_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(topic_name) + \
+                       '/subscriptions/' + _str(subscription_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _send_queue_message_request(self, queue_name, message=None):
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('message', message)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + '/messages'
+        request.headers = message.add_headers(request)
+        request.body = _get_request_body(message.body)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _peek_lock_queue_message_request(self, queue_name, timeout='60'):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + '/messages/head'
+        request.query = [('timeout', _int_or_none(timeout))]
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _unlock_queue_message_request(self, queue_name, sequence_number,
+                                      lock_token):
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _renew_lock_queue_message_request(self, queue_name, sequence_number,
+                                          lock_token):
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _read_delete_queue_message_request(self, queue_name, timeout='60'):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + '/messages/head'
+        request.query = [('timeout', _int_or_none(timeout))]
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _delete_queue_message_request(self, queue_name, sequence_number,
+                                      lock_token):
+        _validate_not_none('queue_name', queue_name)
+        _validate_not_none('sequence_number', sequence_number)
+        _validate_not_none('lock_token', lock_token)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(queue_name) + \
+                       '/messages/' + _str(sequence_number) + \
+                       '/' + _str(lock_token) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _create_event_hub_request(self, hub_name, hub=None):
+        _validate_not_none('hub_name', hub_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
+        request.body = _get_request_body(_convert_event_hub_to_xml(hub))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _update_event_hub_request(self, hub_name, hub=None):
+        _validate_not_none('hub_name', hub_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host = self._get_host()
+        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
+        request.body = _get_request_body(_convert_event_hub_to_xml(hub))
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        request.headers.append(('If-Match', '*'))
+        return request
+
+    def _delete_event_hub_request(self, hub_name):
+        _validate_not_none('hub_name', hub_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host = self._get_host()
+        request.path = '/' + _str(hub_name) + '?api-version=2014-01'
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _get_event_hub_request(self, hub_name):
+        _validate_not_none('hub_name', hub_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host = self._get_host()
+        request.path = '/' + _str(hub_name) + ''
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
+
+    def _send_event_request(self, hub_name, message, device_id=None,
+                            broker_properties=None):
         _validate_not_none('hub_name', hub_name)
         request = HTTPRequest()
         request.method = 'POST'
         request.host = self._get_host()
-        if device_id:
-            request.path = '/{0}/publishers/{1}/messages?api-version=2014-01'.format(hub_name, device_id)
-        else:
-            request.path = '/{0}/messages?api-version=2014-01'.format(hub_name)
+        request.path = self._get_event_hub_messages_path(hub_name, device_id)
         if broker_properties:
             request.headers.append(
                 ('BrokerProperties', str(broker_properties)))
         request.body = _get_request_body(message)
         request.path, request.query = self._httpclient._update_request_uri_query(request)
-        request.headers = self._update_service_bus_header(request)
-        self._perform_request(request)
+        return request
+
+    def _send_message_batch_request(self, path, body):
+        request = HTTPRequest()
+        request.method = 'POST'
+        request.host = self._get_host()
+        request.path = path
+        request.headers.append(('Content-Type', 'application/vnd.microsoft.servicebus.json'))
+        request.body = _get_request_body(body)
+        request.path, request.query = self._httpclient._update_request_uri_query(request)
+        return request
 
     def _get_host(self):
         return self.service_namespace + self.host_base
 
+    def _get_event_hub_messages_path(self, hub_name, device_id=None):
+        if device_id:
+            return '/{0}/publishers/{1}/messages?api-version=2014-01'.format(hub_name, device_id)
+        return '/{0}/messages?api-version=2014-01'.format(hub_name)
+
+    def _send_message_batch(self, path, body):
+        ''' Sends a serialized batch of messages, as a JSON array. '''
+        request = self._send_message_batch_request(path, body)
+        request.headers = self._update_service_bus_header(request)
+        self._perform_request(request)
+
+    def _get_settlement_operation(self, entity_type, action):
+        if action not in _SETTLEMENT_ACTIONS:
+            raise ValueError(_ERROR_SETTLEMENT_ACTION.format(
+                ', '.join(_SETTLEMENT_ACTIONS)))
+        return getattr(self, '{0}_{1}_message'.format(action, entity_type))
+
+    def _settle_locks(self, settle, locks, max_concurrency):
+        locks = list(locks)
+        outcomes = _run_concurrently(settle, locks, max_concurrency)
+        return [SettlementResult(lock[0], lock[1], error)
+                for lock, (_, error) in zip(locks, outcomes)]
+
     def _perform_request(self, request):
         try:
             resp = self._filter(request)
@@ -1255,13 +1909,26 @@ class ServiceBusService(object):
 
 # Token cache for Authentication
 # Shared by the different instances of ServiceBusWrapTokenAuthentication
-_tokens = {}
+_tokens = _TokenCache(max_size=1024)
+
+# Number of seconds before expiry at which a cached token is no longer used,
+# so that it does not expire while the request is sent.
+_DEFAULT_TOKEN_REFRESH_MARGIN = 30
+
+
+def _get_wrap_token_expiry(token):
+    ''' Returns the ExpiresOn value of a WRAP token, in seconds since Epoch. '''
+    time_pos_begin = token.find('ExpiresOn=') + len('ExpiresOn=')
+    time_pos_end = token.find('&', time_pos_begin)
+    return int(token[time_pos_begin:time_pos_end])
 
 
 class ServiceBusWrapTokenAuthentication:
-    def __init__(self, account_key, issuer):
+    def __init__(self, account_key, issuer,
+                 refresh_margin=_DEFAULT_TOKEN_REFRESH_MARGIN):
         self.account_key = account_key
         self.issuer = issuer
+        self.refresh_margin = refresh_margin
 
     def sign_request(self, request, httpclient):
         request.headers.append(
@@ -1274,14 +1941,12 @@ class ServiceBusWrapTokenAuthentication:
 
     def _token_is_expired(self, token):
         ''' Check if token expires or not. '''
-        time_pos_begin = token.find('ExpiresOn=') + len('ExpiresOn=')
-        time_pos_end = token.find('&', time_pos_begin)
-        token_expire_time = int(token[time_pos_begin:time_pos_end])
-        time_now = time.mktime(time.localtime())
+        token_expire_time = _get_wrap_token_expiry(token)
+        time_now = time.time()
 
-        # Adding 30 seconds so the token wouldn't be expired when we send the
-        # token to server.
-        return (token_expire_time - time_now) < 30
+        # Adding the refresh margin so the token wouldn't be expired when we
+        # send the token to server.
+        return (token_expire_time - time_now) < self.refresh_margin
 
     def _get_token(self, host, path, httpclient):
         '''
@@ -1292,16 +1957,25 @@ class ServiceBusWrapTokenAuthentication:
         path:
             the service bus service request.
         '''
-        wrap_scope = 'http://' + host + path + self.issuer + self.account_key
+        wrap_scope = self._get_wrap_scope(host, path)
 
         # Check whether has unexpired cache, return cached token if it is still
         # usable.
-        if wrap_scope in _tokens:
-            token = _tokens[wrap_scope]
-            if not self._token_is_expired(token):
-                return token
+        token = self._get_cached_token(wrap_scope)
+        if token is not None:
+            return token
 
         # get token from accessconstrol server
+        resp = httpclient.perform_request(self._get_token_request(host, path))
+        return self._cache_token(wrap_scope, resp)
+
+    def _get_wrap_scope(self, host, path):
+        return 'http://' + host + path + self.issuer + self.account_key
+
+    def _get_cached_token(self, wrap_scope):
+        return _tokens.get(wrap_scope, time.time() + self.refresh_margin)
+
+    def _get_token_request(self, host, path):
         request = HTTPRequest()
         request.protocol_override = 'https'
         request.host = host.replace('.servicebus.', '-sb.accesscontrol.')
@@ -1312,19 +1986,41 @@ class ServiceBusWrapTokenAuthentication:
                         '&wrap_scope=' +
                         url_quote('http://' + host + path)).encode('utf-8')
         request.headers.append(('Content-Length', str(len(request.body))))
-        resp = httpclient.perform_request(request)
+        return request
 
+    def _cache_token(self, wrap_scope, resp):
         token = resp.body.decode('utf-8-sig')
         token = url_unquote(token[token.find('=') + 1:token.rfind('&')])
-        _tokens[wrap_scope] = token
-
+        _tokens.set(wrap_scope, token, _get_wrap_token_expiry(token))
         return token
 
 
 class ServiceBusSASAuthentication:
-    def __init__(self, key_name, key_value):
+    def __init__(self, key_name, key_value, token_ttl=300,
+                 refresh_margin=_DEFAULT_TOKEN_REFRESH_MARGIN,
+                 max_cached_tokens=1024):
+        '''
+        key_name:
+            SAS authentication key name.
+        key_value:
+            SAS authentication key value.
+        token_ttl:
+            Optional. Number of seconds for which a signature is valid.
+        refresh_margin:
+            Optional. A cached signature is reused for the same resource URI
+            until it expires in less than refresh_margin seconds. Must be less
+            than token_ttl.
+        max_cached_tokens:
+            Optional. Maximum number of resource URIs whose signature is
+            cached. The least recently used signature is evicted when full.
+        '''
+        if not 0 <= refresh_margin < token_ttl:
+            raise ValueError(_ERROR_REFRESH_MARGIN)
         self.key_name = key_name
         self.key_value = key_value
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self._tokens = _TokenCache(max_size=max_cached_tokens)
 
     def sign_request(self, request, httpclient):
         request.headers.append(
@@ -1332,18 +2028,25 @@ class ServiceBusSASAuthentication:
 
     def _get_authorization(self, request, httpclient):
         uri = httpclient.get_uri(request)
+        # Signatures made with a previous key must not be reused.
+        cache_key = (self.key_name, self.key_value, uri)
+        auth = self._tokens.get(cache_key, time.time() + self.refresh_margin)
+        if auth is not None:
+            return auth
+
         uri = url_quote(uri, '').lower()
-        expiry = str(self._get_expiry())
+        expiry = self._get_expiry()
 
-        to_sign = uri + '\n' + expiry
+        to_sign = uri + '\n' + str(expiry)
         signature = url_quote(_sign_string(self.key_value, to_sign, False), '')
 
         auth_format = 'SharedAccessSignature sig={0}&se={1}&skn={2}&sr={3}'
         auth = auth_format.format(signature, expiry, self.key_name, uri)
+        self._tokens.set(cache_key, auth, expiry)
 
         return auth
 
     def _get_expiry(self):
-        '''Returns the UTC datetime, in seconds since Epoch, when this signed 
-        request expires (5 minutes from now).'''
-        return int(round(time.time() + 300))
+        '''Returns the UTC datetime, in seconds since Epoch, when this signed
+        request expires (token_ttl seconds from now, 5 minutes by default).'''
+        return int(round(time.time() + self.token_ttl))
@@ -64,10 +64,18 @@ setup(
         'azure',
         'azure.servicebus',
         'azure.servicebus._http',
+        # always listed since the wheel is universal; importing it raises
+        # ImportError before Python 3.5
+        'azure.servicebus.aio',
     ],
     install_requires=[
-        'azure-common>=1.1.5',
+        'azure-common~=1.1.7',
         'requests',
     ],
+    extras_require={
+        'async:python_version>="3.5"': [
+            'aiohttp>=3.3',
+        ],
+    },
     cmdclass=cmdclass
 )
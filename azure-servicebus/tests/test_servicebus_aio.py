@@ -0,0 +1,237 @@
+﻿# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import asyncio
+import json
+import sys
+import time
+import unittest
+
+from azure.common import AzureMissingResourceHttpError
+from azure.servicebus._common_serialization import url_quote
+from azure.servicebus import AutoLockRenewer
+from azure.servicebus._http import (
+    HTTPError,
+    HTTPResponse,
+)
+from azure.servicebus.servicebusservice import (
+    ServiceBusWrapTokenAuthentication,
+    _tokens,
+)
+if sys.version_info >= (3, 5):
+    from azure.servicebus.aio import AsyncMessage, AsyncServiceBusService
+
+
+_QUEUE_ENTRY = \
+    '<entry xmlns="http://www.w3.org/2005/Atom"><title type="text">myqueue</title>' \
+    '<content type="application/xml"><QueueDescription ' \
+    'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect">' \
+    '<LockDuration>PT1M</LockDuration><MaxSizeInMegabytes>1024</MaxSizeInMegabytes>' \
+    '<MessageCount>3</MessageCount></QueueDescription></content></entry>'
+
+
+class _FakeAsyncFilter(object):
+    '''Stands in for the aiohttp transport, answering every request with the
+    next response of a list. A response which is an HTTPError is raised.'''
+
+    def __init__(self, loop, responses):
+        self.loop = loop
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        future = self.loop.create_future()
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            future.set_exception(response)
+        else:
+            future.set_result(response)
+        return future
+
+
+#------------------------------------------------------------------------------
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5')
+class AsyncServiceBusServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.sbs = AsyncServiceBusService(
+            'mynamespace',
+            shared_access_key_name='RootManageSharedAccessKey',
+            shared_access_key_value='bXlrZXl2YWx1ZQ==')
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.sbs.close())
+        self.loop.close()
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    #--Test cases for async service -------------------------------------------
+    def test_get_queue(self):
+        # Arrange
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(200, 'OK', [], _QUEUE_ENTRY.encode('utf-8'))])
+
+        # Act
+        queue = self._run(self.sbs.get_queue('myqueue'))
+
+        # Assert
+        request = self.sbs._filter.requests[0]
+        self.assertEqual('GET', request.method)
+        self.assertEqual('mynamespace.servicebus.windows.net', request.host)
+        self.assertEqual('/myqueue', request.path)
+        self.assertTrue(dict(request.headers)['Authorization'].startswith(
+            'SharedAccessSignature sig='))
+        self.assertEqual('PT1M', queue.lock_duration)
+        self.assertEqual(3, queue.message_count)
+
+    def test_concurrent_requests(self):
+        # Arrange
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(200, 'OK', [], _QUEUE_ENTRY.encode('utf-8'))
+            for _ in range(10)])
+
+        # Act
+        queues = self._run(asyncio.gather(
+            *[self.loop.create_task(self.sbs.get_queue('myqueue{0}'.format(i)))
+              for i in range(10)]))
+
+        # Assert
+        self.assertEqual(10, len(queues))
+        self.assertEqual(
+            sorted('/myqueue{0}'.format(i) for i in range(10)),
+            sorted(request.path for request in self.sbs._filter.requests))
+
+    def test_delete_queue_with_non_existing_queue(self):
+        # Arrange
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPError(404, 'Not Found', [], b''),
+            HTTPError(404, 'Not Found', [], b'')])
+
+        # Act
+        deleted = self._run(self.sbs.delete_queue('myqueue'))
+
+        # Assert
+        self.assertFalse(deleted)
+        with self.assertRaises(AzureMissingResourceHttpError):
+            self._run(self.sbs.delete_queue('myqueue', fail_not_exist=True))
+
+    def test_peek_lock_queue_message_and_delete(self):
+        # Arrange
+        broker_properties = {'SequenceNumber': 7, 'LockToken': 'token'}
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(
+                201, 'Created',
+                [('brokerproperties', json.dumps(broker_properties)),
+                 ('location',
+                  'https://mynamespace.servicebus.windows.net/myqueue/messages/7/token')],
+                b'hello'),
+            HTTPResponse(200, 'OK', [], b'')])
+
+        # Act
+        msg = self._run(self.sbs.peek_lock_queue_message('myqueue'))
+        self._run(msg.delete())
+
+        # Assert
+        self.assertEqual(b'hello', msg.body)
+        delete_request = self.sbs._filter.requests[1]
+        self.assertEqual('DELETE', delete_request.method)
+        self.assertEqual('/myqueue/messages/7/token', delete_request.path)
+
+    def test_message_is_settled_once_unlocked(self):
+        # Arrange
+        broker_properties = {'SequenceNumber': 7, 'LockToken': 'token'}
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(
+                201, 'Created',
+                [('brokerproperties', json.dumps(broker_properties)),
+                 ('location',
+                  'https://mynamespace.servicebus.windows.net/myqueue/messages/7/token')],
+                b'hello'),
+            HTTPError(404, 'Not Found', [], b''),
+            HTTPResponse(200, 'OK', [], b'')])
+        msg = self._run(self.sbs.peek_lock_queue_message('myqueue'))
+
+        # Act
+        unlocking = msg.unlock()
+        settled_before_await = msg._lock_settled
+        with self.assertRaises(AzureMissingResourceHttpError):
+            self._run(unlocking)
+        settled_after_failure = msg._lock_settled
+        self._run(msg.unlock())
+
+        # Assert
+        self.assertIsInstance(msg, AsyncMessage)
+        self.assertFalse(settled_before_await)
+        self.assertFalse(settled_after_failure)
+        self.assertTrue(msg._lock_settled)
+        self.assertEqual('PUT', self.sbs._filter.requests[2].method)
+
+    def test_lock_renewer_rejects_async_message(self):
+        # Arrange
+        broker_properties = {'SequenceNumber': 7, 'LockToken': 'token',
+                             'LockedUntilUtc': 'Sun, 18 Oct 2026 10:00:00 GMT'}
+        self.sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(
+                201, 'Created',
+                [('brokerproperties', json.dumps(broker_properties)),
+                 ('location',
+                  'https://mynamespace.servicebus.windows.net/myqueue/messages/7/token')],
+                b'hello')])
+        msg = self._run(self.sbs.peek_lock_queue_message('myqueue'))
+        renewer = AutoLockRenewer()
+        self.addCleanup(renewer.close)
+
+        # Act
+        with self.assertRaises(TypeError):
+            renewer.register(msg, lock_duration=60)
+
+        # Assert
+        self.assertEqual(1, len(self.sbs._filter.requests))
+
+    def test_wrap_token_is_requested_through_async_transport(self):
+        # Arrange
+        _tokens.clear()
+        sbs = AsyncServiceBusService(
+            'mynamespace',
+            authentication=ServiceBusWrapTokenAuthentication('mykey', 'owner'))
+        token = 'ExpiresOn={0}&HMACSHA256=sig'.format(int(time.time()) + 1200)
+        token_responses = _FakeAsyncFilter(self.loop, [HTTPResponse(
+            200, 'OK', [],
+            ('wrap_access_token=' + url_quote(token, '') +
+             '&wrap_access_token_expires_in=1200').encode('utf-8'))])
+        sbs._httpclient.perform_request = token_responses
+        sbs._filter = _FakeAsyncFilter(self.loop, [
+            HTTPResponse(200, 'OK', [], _QUEUE_ENTRY.encode('utf-8'))
+            for _ in range(2)])
+
+        # Act
+        self._run(sbs.get_queue('myqueue'))
+        self._run(sbs.get_queue('myqueue'))
+
+        # Assert
+        self.assertEqual(1, len(token_responses.requests))
+        self.assertEqual('mynamespace-sb.accesscontrol.windows.net',
+                         token_responses.requests[0].host)
+        self.assertEqual('WRAP access_token="' + token + '"',
+                         dict(sbs._filter.requests[1].headers)['Authorization'])
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,288 @@
+﻿# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import io
+import timeit
+import unittest
+
+from azure.servicebus import (
+    AzureServiceBusResourceNotFound,
+    Queue,
+)
+from azure.servicebus._common_serialization import (
+    ETree,
+    _ETreeXmlToObject,
+    _get_etree_text,
+)
+from azure.servicebus._http import HTTPResponse
+from azure.servicebus._serialization import (
+    _convert_etree_element_to_event_hub,
+    _convert_etree_element_to_queue,
+    _convert_etree_element_to_rule,
+    _convert_etree_element_to_subscription,
+    _convert_response_to_queue,
+    _parse_bool,
+)
+
+
+_FEED_START = \
+    '<?xml version="1.0" encoding="utf-8"?>' \
+    '<feed xmlns="http://www.w3.org/2005/Atom">' \
+    '<title type="text">Queues</title>' \
+    '<id>https://mynamespace.servicebus.windows.net/$Resources/Queues</id>' \
+    '<updated>2016-05-01T10:00:00Z</updated>'
+
+_QUEUE_ENTRY = \
+    '<entry><id>https://mynamespace.servicebus.windows.net/{0}</id>' \
+    '<title type="text">{0}</title><updated>2016-05-01T10:00:00Z</updated>' \
+    '<author><name>mynamespace</name></author>' \
+    '<content type="application/xml"><QueueDescription ' \
+    'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect" ' \
+    'xmlns:i="http://www.w3.org/2001/XMLSchema-instance">' \
+    '<LockDuration>PT1M</LockDuration><MaxSizeInMegabytes>1024</MaxSizeInMegabytes>' \
+    '<RequiresDuplicateDetection>false</RequiresDuplicateDetection>' \
+    '<RequiresSession>true</RequiresSession>' \
+    '<DefaultMessageTimeToLive>P10675199DT2H48M5.4775807S</DefaultMessageTimeToLive>' \
+    '<DeadLetteringOnMessageExpiration>false</DeadLetteringOnMessageExpiration>' \
+    '<DuplicateDetectionHistoryTimeWindow>PT10M</DuplicateDetectionHistoryTimeWindow>' \
+    '<MaxDeliveryCount>10</MaxDeliveryCount>' \
+    '<EnableBatchedOperations>true</EnableBatchedOperations>' \
+    '<SizeInBytes>{1}</SizeInBytes><MessageCount>{2}</MessageCount>' \
+    '<IsAnonymousAccessible>false</IsAnonymousAccessible>' \
+    '<Status>Active</Status><SupportOrdering>true</SupportOrdering>' \
+    '</QueueDescription></content></entry>'
+
+_SUBSCRIPTION_ENTRY = \
+    '<entry xmlns="http://www.w3.org/2005/Atom">' \
+    '<id>https://mynamespace.servicebus.windows.net/mytopic/subscriptions/mysub</id>' \
+    '<content type="application/xml"><SubscriptionDescription ' \
+    'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect">' \
+    '<LockDuration>PT5M</LockDuration><RequiresSession>false</RequiresSession>' \
+    '<MessageCount>7</MessageCount>' \
+    '</SubscriptionDescription></content></entry>'
+
+_RULE_ENTRY = \
+    '<entry xmlns="http://www.w3.org/2005/Atom">' \
+    '<id>https://mynamespace.servicebus.windows.net/mytopic/subscriptions/mysub/rules/myrule</id>' \
+    '<content type="application/xml"><RuleDescription ' \
+    'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect" ' \
+    'xmlns:i="http://www.w3.org/2001/XMLSchema-instance">' \
+    '<Filter i:type="SqlFilter"><SqlExpression>number &gt; 40</SqlExpression></Filter>' \
+    '<Action i:type="SqlRuleAction"><SqlExpression>SET number = 5</SqlExpression></Action>' \
+    '</RuleDescription></content></entry>'
+
+_EVENT_HUB_ENTRY = \
+    '<entry xmlns="http://www.w3.org/2005/Atom">' \
+    '<id>https://mynamespace.servicebus.windows.net/myhub?api-version=2014-01</id>' \
+    '<content type="application/xml"><EventHubDescription ' \
+    'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect">' \
+    '<MessageRetentionInDays>7</MessageRetentionInDays>' \
+    '<AuthorizationRules><AuthorizationRule>' \
+    '<ClaimType>SharedAccessKey</ClaimType><ClaimValue>None</ClaimValue>' \
+    '<Rights><AccessRights>Listen</AccessRights><AccessRights>Send</AccessRights></Rights>' \
+    '<KeyName>mykey</KeyName></AuthorizationRule></AuthorizationRules>' \
+    '<PartitionCount>2</PartitionCount>' \
+    '<PartitionIds xmlns:d2p1="http://schemas.microsoft.com/2003/10/Serialization/Arrays">' \
+    '<d2p1:string>0</d2p1:string><d2p1:string>1</d2p1:string></PartitionIds>' \
+    '</EventHubDescription></content></entry>'
+
+
+def _make_queue_feed(count):
+    entries = [_QUEUE_ENTRY.format('queue{0}'.format(i), i * 100, i)
+               for i in range(count)]
+    return (_FEED_START + ''.join(entries) + '</feed>').encode('utf-8')
+
+
+def _make_response(body):
+    return HTTPResponse(200, 'OK', [], body)
+
+
+#------------------------------------------------------------------------------
+# Per-field implementation the single-pass parser replaced, used to check the
+# results are unchanged and as the baseline of the benchmark.
+_reference_namespaces = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'sb': 'http://schemas.microsoft.com/netservices/2010/10/servicebus/connect',
+}
+
+_reference_queue_mappings = [
+    ('LockDuration', 'lock_duration', None),
+    ('MaxSizeInMegabytes', 'max_size_in_megabytes', int),
+    ('RequiresDuplicateDetection', 'requires_duplicate_detection', _parse_bool),
+    ('RequiresSession', 'requires_session', _parse_bool),
+    ('DefaultMessageTimeToLive', 'default_message_time_to_live', None),
+    ('DeadLetteringOnMessageExpiration', 'dead_lettering_on_message_expiration', _parse_bool),
+    ('DuplicateDetectionHistoryTimeWindow', 'duplicate_detection_history_time_window', None),
+    ('EnableBatchedOperations', 'enable_batched_operations', _parse_bool),
+    ('MaxDeliveryCount', 'max_delivery_count', int),
+    ('MessageCount', 'message_count', int),
+    ('SizeInBytes', 'size_in_bytes', int),
+]
+
+
+def _reference_convert_etree_element_to_queue(entry_element):
+    queue = Queue()
+    queue_element = entry_element.find(
+        './atom:content/sb:QueueDescription', _reference_namespaces)
+    for element_name, field_name, converter in _reference_queue_mappings:
+        child_element = queue_element.find(
+            './sb:{0}'.format(element_name), _reference_namespaces)
+        if child_element is not None:
+            field_value = _get_etree_text(child_element)
+            if converter is not None:
+                field_value = converter(field_value)
+            setattr(queue, field_name, field_value)
+    for name, value in _ETreeXmlToObject.get_entry_properties_from_element(
+            entry_element, True).items():
+        setattr(queue, name, value)
+    return queue
+
+
+def _reference_list_queues(body):
+    root = ETree.fromstring(body)
+    return [_reference_convert_etree_element_to_queue(entry) for entry
+            in root.findall('./atom:entry', _reference_namespaces)]
+
+
+def _fast_list_queues(body):
+    return _ETreeXmlToObject.convert_response_to_feeds(
+        _make_response(body), _convert_etree_element_to_queue)
+
+
+#------------------------------------------------------------------------------
+class ServiceBusSerializationTest(unittest.TestCase):
+
+    def test_convert_feed_matches_reference_parser(self):
+        # Arrange
+        body = _make_queue_feed(50)
+
+        # Act
+        queues = _fast_list_queues(body)
+        expected = _reference_list_queues(body)
+
+        # Assert
+        self.assertEqual(len(queues), 50)
+        for queue, expected_queue in zip(queues, expected):
+            self.assertEqual(vars(queue), vars(expected_queue))
+        self.assertEqual(queues[3].name, 'queue3')
+        self.assertEqual(queues[3].size_in_bytes, 300)
+        self.assertEqual(queues[3].message_count, 3)
+        self.assertEqual(queues[3].max_size_in_megabytes, 1024)
+        self.assertTrue(queues[3].requires_session)
+        self.assertFalse(queues[3].requires_duplicate_detection)
+        self.assertEqual(queues[3].author, 'mynamespace')
+        self.assertEqual(queues[3].updated, '2016-05-01T10:00:00Z')
+
+    def test_convert_feed_from_stream(self):
+        # Arrange
+        body = _make_queue_feed(5)
+
+        # Act
+        queues = _fast_list_queues(io.BytesIO(body))
+
+        # Assert
+        self.assertEqual([queue.name for queue in queues],
+                         ['queue0', 'queue1', 'queue2', 'queue3', 'queue4'])
+
+    def test_convert_feed_with_single_entry(self):
+        # Arrange
+        body = _QUEUE_ENTRY.format('myqueue', 10, 1).replace(
+            '<entry>', '<entry xmlns="http://www.w3.org/2005/Atom">')
+
+        # Act
+        queues = _fast_list_queues(body)
+
+        # Assert
+        self.assertEqual(len(queues), 1)
+        self.assertEqual(queues[0].name, 'myqueue')
+
+    def test_convert_feed_with_no_entries(self):
+        # Act
+        queues = _fast_list_queues(_make_queue_feed(0))
+
+        # Assert
+        self.assertEqual(len(queues), 0)
+
+    def test_convert_feed_with_unknown_root(self):
+        # Act
+        with self.assertRaises(NotImplementedError):
+            _fast_list_queues(b'<queues />')
+
+    def test_convert_response_to_queue_not_found(self):
+        # Arrange
+        body = b'<entry xmlns="http://www.w3.org/2005/Atom"><content /></entry>'
+
+        # Act
+        with self.assertRaises(AzureServiceBusResourceNotFound):
+            _convert_response_to_queue(_make_response(body))
+
+    def test_convert_subscription(self):
+        # Act
+        subscription = _convert_etree_element_to_subscription(
+            ETree.fromstring(_SUBSCRIPTION_ENTRY))
+
+        # Assert
+        self.assertEqual(subscription.name, 'mysub')
+        self.assertEqual(subscription.lock_duration, 'PT5M')
+        self.assertFalse(subscription.requires_session)
+        self.assertEqual(subscription.message_count, 7)
+
+    def test_convert_rule(self):
+        # Act
+        rule = _convert_etree_element_to_rule(ETree.fromstring(_RULE_ENTRY))
+
+        # Assert
+        self.assertEqual(rule.name, 'myrule')
+        self.assertEqual(rule.filter_type, 'SqlFilter')
+        self.assertEqual(rule.filter_expression, 'number > 40')
+        self.assertEqual(rule.action_type, 'SqlRuleAction')
+        self.assertEqual(rule.action_expression, 'SET number = 5')
+
+    def test_convert_event_hub(self):
+        # Act
+        hub = _convert_etree_element_to_event_hub(
+            ETree.fromstring(_EVENT_HUB_ENTRY))
+
+        # Assert
+        self.assertEqual(hub.name, 'myhub')
+        self.assertEqual(hub.message_retention_in_days, 7)
+        self.assertEqual(hub.partition_count, 2)
+        self.assertEqual(hub.partition_ids, ['0', '1'])
+        self.assertEqual(len(hub.authorization_rules), 1)
+        self.assertEqual(hub.authorization_rules[0].key_name, 'mykey')
+        self.assertEqual(hub.authorization_rules[0].rights, ['Listen', 'Send'])
+
+
+#------------------------------------------------------------------------------
+def benchmark(count=2000, number=5):
+    ''' Times listing count queues with the single-pass parser and with the
+    per-field implementation it replaced. '''
+    body = _make_queue_feed(count)
+    reference = min(timeit.repeat(
+        lambda: _reference_list_queues(body), number=number, repeat=3))
+    fast = min(timeit.repeat(
+        lambda: _fast_list_queues(body), number=number, repeat=3))
+    print('list {0} queues: reference {1:.2f} ms, single-pass {2:.2f} ms'.format(
+        count, reference * 1000 / number, fast * 1000 / number))
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    import sys
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        unittest.main()
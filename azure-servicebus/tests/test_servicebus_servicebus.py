@@ -15,31 +15,48 @@
 # limitations under the License.
 #--------------------------------------------------------------------------
 import base64
+import io
+import json
 import os
 import random
 import sys
+import threading
 import time
 import unittest
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from requests import Response
 from azure.common import (
     AzureHttpError,
     AzureMissingResourceHttpError,
     AzureConflictHttpError,
 )
-from azure.servicebus._http import HTTPError
+from azure.servicebus._http import (
+    HTTPError,
+    HTTPRequest,
+    HTTPResponse,
+)
 from azure.servicebus import (
     AZURE_SERVICEBUS_NAMESPACE,
     AZURE_SERVICEBUS_ACCESS_KEY,
     AZURE_SERVICEBUS_ISSUER,
     AzureServiceBusPeekLockError,
     AzureServiceBusResourceNotFound,
+    AutoLockRenewer,
     Message,
+    MessageReceiver,
     Queue,
     Rule,
     ServiceBusService,
     Subscription,
     Topic,
+    TransportConfiguration,
+)
+from azure.servicebus._common_serialization import url_quote
+from azure.servicebus.servicebusservice import (
+    ServiceBusSASAuthentication,
+    ServiceBusWrapTokenAuthentication,
+    _tokens,
 )
 from testutils.common_recordingtestcase import (
     TestMode,
@@ -48,6 +65,176 @@ from testutils.common_recordingtestcase import (
 from tests.servicebus_testcase import ServiceBusTestCase
 
 
+#------------------------------------------------------------------------------
+def _lock_expiry(seconds):
+    expiry = datetime.utcnow() + timedelta(seconds=seconds)
+    return expiry.strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+
+class _FakeLockService(object):
+    '''Stands in for ServiceBusService, serving peek-locked messages from
+    memory and recording every lock operation.'''
+
+    host_base = '.servicebus.windows.net'
+
+    def __init__(self, bodies=(), lock_seconds=60):
+        self._lock = threading.Lock()
+        self._bodies = list(bodies)
+        self._lock_seconds = lock_seconds
+        self._sequence_number = 0
+        self.unlocked = []
+        self.renewed = []
+        self.deleted = []
+        self.failing_renewals = set()
+
+    def _next_message(self, location):
+        with self._lock:
+            if not self._bodies:
+                body = None
+            else:
+                body = self._bodies.pop(0)
+                self._sequence_number += 1
+                sequence_number = self._sequence_number
+        if body is None:
+            time.sleep(0.01)
+            return Message(None, self)
+        broker_properties = {
+            'SequenceNumber': sequence_number,
+            'LockToken': 'token{0}'.format(sequence_number),
+            'LockedUntilUtc': _lock_expiry(self._lock_seconds),
+        }
+        return Message(body, self, location.format(sequence_number),
+                       broker_properties=broker_properties)
+
+    def peek_lock_queue_message(self, queue_name, timeout='60'):
+        return self._next_message(
+            'https://fakesbnamespace.servicebus.windows.net/' + queue_name +
+            '/messages/{0}/token')
+
+    def peek_lock_subscription_message(self, topic_name, subscription_name,
+                                       timeout='60'):
+        return self._next_message(
+            'https://fakesbnamespace.servicebus.windows.net/' + topic_name +
+            '/subscriptions/' + subscription_name + '/messages/{0}/token')
+
+    def unlock_queue_message(self, queue_name, sequence_number, lock_token):
+        with self._lock:
+            self.unlocked.append((queue_name, sequence_number))
+
+    def unlock_subscription_message(self, topic_name, subscription_name,
+                                    sequence_number, lock_token):
+        with self._lock:
+            self.unlocked.append((subscription_name, sequence_number))
+
+    def renew_lock_queue_message(self, queue_name, sequence_number,
+                                 lock_token):
+        if sequence_number in self.failing_renewals:
+            raise AzureMissingResourceHttpError('Gone', 410)
+        with self._lock:
+            self.renewed.append((queue_name, sequence_number))
+
+    def delete_queue_message(self, queue_name, sequence_number, lock_token):
+        with self._lock:
+            self.deleted.append((queue_name, sequence_number))
+
+
+class _FakeAuthHttpClient(object):
+    '''Stands in for _HTTPClient when signing requests, answering WRAP
+    token requests with a token expiring in expires_in seconds.'''
+
+    def __init__(self, expires_in=1200):
+        self.expires_in = expires_in
+        self.token_requests = []
+
+    def get_uri(self, request):
+        return 'https://' + request.host + request.path
+
+    def perform_request(self, request):
+        self.token_requests.append(request)
+        expires_on = int(time.time()) + self.expires_in
+        token = 'net.windows.servicebus.action=Listen&ExpiresOn={0}&' \
+                'HMACSHA256=sig{1}'.format(expires_on, len(self.token_requests))
+        body = 'wrap_access_token=' + url_quote(token, '') + \
+               '&wrap_access_token_expires_in=' + str(self.expires_in)
+        return HTTPResponse(200, 'OK', [], body.encode('utf-8'))
+
+
+def _auth_request(path):
+    request = HTTPRequest()
+    request.host = 'mynamespace.servicebus.windows.net'
+    request.path = path
+    return request
+
+
+class _FakeStreamingSession(object):
+    '''Stands in for requests.Session, answering every request with body
+    and recording whether the response was streamed.'''
+
+    def __init__(self, body):
+        self.body = body
+        self.headers = {}
+        self.proxies = {}
+        self.streamed = []
+
+    def request(self, method, uri, data=None, headers=None, timeout=None,
+                stream=False):
+        self.streamed.append(stream)
+        response = Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.raw = io.BytesIO(self.body)
+        if not stream:
+            response.content
+        return response
+
+
+class _FakeHttpFilter(object):
+    '''Replaces the http pipeline of a ServiceBusService, answering every
+    request with 200 except the ones whose path contains a failing token.'''
+
+    def __init__(self, failing_tokens=()):
+        self._lock = threading.Lock()
+        self.failing_tokens = failing_tokens
+        self.requests = []
+        self.bodies = []
+
+    def __call__(self, request):
+        with self._lock:
+            self.requests.append((request.method, request.path))
+            self.bodies.append(request.body)
+        for token in self.failing_tokens:
+            if token in request.path:
+                raise HTTPError(404, 'Not Found', [], None)
+        return HTTPResponse(200, 'OK', [], None)
+
+
+class _FakePagedFilter(object):
+    '''Replaces the http pipeline of a ServiceBusService, answering list
+    requests with the page of a feed of count queues selected by their $skip
+    and $top query parameters.'''
+
+    def __init__(self, count):
+        self._lock = threading.Lock()
+        self.count = count
+        self.queries = []
+
+    def __call__(self, request):
+        query = dict(request.query)
+        with self._lock:
+            self.queries.append((query.get('$skip'), query.get('$top')))
+        skip = int(query.get('$skip') or 0)
+        top = int(query.get('$top') or self.count)
+        entries = ''.join(
+            '<entry><id>https://mynamespace.servicebus.windows.net/queue{0}</id>'
+            '<content type="application/xml"><QueueDescription '
+            'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect">'
+            '<MessageCount>{0}</MessageCount></QueueDescription></content>'
+            '</entry>'.format(i)
+            for i in range(skip, min(skip + top, self.count)))
+        body = '<feed xmlns="http://www.w3.org/2005/Atom">' + entries + '</feed>'
+        return HTTPResponse(200, 'OK', [], body.encode('utf-8'))
+
+
 #------------------------------------------------------------------------------
 
 
@@ -1691,6 +1878,653 @@ class ServiceBusServiceBusTest(ServiceBusTestCase):
         self.assertIsNotNone(received_msg)
         self.assertEqual(sent_msg.body, received_msg.body)
 
+    #--Test cases for message settlement --------------------------------------
+    def test_settle_queue_messages(self):
+        # Arrange
+        http_filter = _FakeHttpFilter(failing_tokens=['token2'])
+        self.sbs._filter = http_filter
+        locks = [(1, 'token1'), (2, 'token2'), (3, 'token3')]
+
+        # Act
+        results = self.sbs.settle_queue_messages('myqueue', locks)
+
+        # Assert
+        self.assertEqual([1, 2, 3], [r.sequence_number for r in results])
+        self.assertEqual([True, False, True], [r.succeeded for r in results])
+        self.assertIsInstance(results[1].error, AzureMissingResourceHttpError)
+        self.assertEqual(3, len(http_filter.requests))
+        self.assertEqual(set(['DELETE']),
+                         set(method for method, _ in http_filter.requests))
+        self.assertIn(('DELETE', '/myqueue/messages/3/token3'),
+                      http_filter.requests)
+
+    def test_settle_subscription_messages_renew_lock(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        locks = [(i, 'token{0}'.format(i)) for i in range(20)]
+
+        # Act
+        results = self.sbs.settle_subscription_messages(
+            'mytopic', 'mysub', locks, action='renew_lock', max_concurrency=4)
+
+        # Assert
+        self.assertTrue(all(r.succeeded for r in results))
+        self.assertEqual(20, len(http_filter.requests))
+        self.assertIn(
+            ('POST', '/mytopic/subscriptions/mysub/messages/7/token7'),
+            http_filter.requests)
+
+    def test_settle_messages_unlock(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        host = 'https://' + self.settings.SERVICEBUS_NAME + self.sbs.host_base
+        queue_msg = Message(
+            b'm1', self.sbs, host + '/myqueue/messages/1/token1',
+            broker_properties={'SequenceNumber': 1, 'LockToken': 'token1'})
+        subscription_msg = Message(
+            b'm2', self.sbs,
+            host + '/mytopic/subscriptions/mysub/messages/2/token2',
+            broker_properties={'SequenceNumber': 2, 'LockToken': 'token2'})
+        not_locked_msg = Message(b'm3')
+
+        # Act
+        results = self.sbs.settle_messages(
+            [queue_msg, subscription_msg, not_locked_msg], action='unlock')
+
+        # Assert
+        self.assertEqual([True, True, False], [r.succeeded for r in results])
+        self.assertIs(subscription_msg, results[1].message)
+        self.assertIsInstance(results[2].error, AzureServiceBusPeekLockError)
+        self.assertEqual(
+            sorted([('PUT', '/myqueue/messages/1/token1'),
+                    ('PUT', '/mytopic/subscriptions/mysub/messages/2/token2')]),
+            sorted(http_filter.requests))
+
+    def test_settle_messages_invalid_action(self):
+        # Arrange
+
+        # Act
+        with self.assertRaises(ValueError):
+            self.sbs.settle_queue_messages('myqueue', [(1, 'token1')],
+                                           action='complete')
+
+        # Assert
+
+    #--Test cases for batching sender -----------------------------------------
+    def test_queue_sender_batches_by_count(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        messages = [Message('message {0}'.format(i),
+                            custom_properties={'index': i})
+                    for i in range(7)]
+
+        # Act
+        with self.sbs.get_queue_sender('myqueue', max_batch_count=3,
+                                       linger_time=10) as sender:
+            for msg in messages:
+                sender.send(msg)
+
+        # Assert
+        self.assertEqual([('POST', '/myqueue/messages')] * 3,
+                         http_filter.requests)
+        sent = sorted(http_filter.bodies, key=len, reverse=True)
+        self.assertEqual(
+            sorted(json.dumps([m.as_batch_body() for m in chunk]).encode('utf-8')
+                   for chunk in (messages[0:3], messages[3:6], messages[6:])),
+            sorted(sent))
+        self.assertEqual([], sender.send_failures)
+
+    def test_topic_sender_batches_by_size(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        messages = [Message('x' * (i * 7 % 50)) for i in range(100)]
+
+        # Act
+        with self.sbs.get_topic_sender('mytopic', max_batch_size_in_bytes=500,
+                                       linger_time=10) as sender:
+            for msg in messages:
+                sender.send(msg)
+
+        # Assert
+        self.assertGreater(len(http_filter.bodies), 1)
+        received = []
+        for body in http_filter.bodies:
+            self.assertLessEqual(len(body), 500)
+            received.extend(m['Body'] for m in json.loads(body.decode('utf-8')))
+        self.assertEqual(sorted(m.body for m in messages), sorted(received))
+        self.assertEqual(set([('POST', '/mytopic/messages')]),
+                         set(http_filter.requests))
+
+    def test_sender_rejects_message_above_batch_size(self):
+        # Arrange
+        sender = self.sbs.get_queue_sender('myqueue',
+                                           max_batch_size_in_bytes=100)
+
+        # Act
+        with self.assertRaises(ValueError):
+            sender.send(Message('x' * 100))
+        sender.close()
+        with self.assertRaises(ValueError):
+            sender.send(Message('small'))
+
+        # Assert
+
+    def test_event_hub_sender_sends_after_linger_time(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        sender = self.sbs.get_event_hub_sender('myhub', device_id='dev1',
+                                               linger_time=0.05)
+
+        # Act
+        sender.send(Message('event 1'))
+        sender.send(Message('event 2'))
+        deadline = time.time() + 5
+        while not http_filter.requests and time.time() < deadline:
+            time.sleep(0.01)
+        sender.close()
+
+        # Assert
+        self.assertEqual(
+            [('POST', '/myhub/publishers/dev1/messages?api-version=2014-01')],
+            http_filter.requests)
+        self.assertEqual(
+            [{'Body': 'event 1'}, {'Body': 'event 2'}],
+            json.loads(http_filter.bodies[0].decode('utf-8')))
+
+    def test_sender_close_waits_for_sealed_batches(self):
+        # Arrange
+        http_filter = _FakeHttpFilter()
+        self.sbs._filter = http_filter
+        sender = self.sbs.get_queue_sender('myqueue', max_batch_count=1,
+                                           linger_time=10)
+        putting = threading.Event()
+        resume = threading.Event()
+        put = sender._batches.put
+
+        def slow_put(batch):
+            if batch is not None:
+                putting.set()
+                resume.wait(5)
+            put(batch)
+        sender._batches.put = slow_put
+
+        # Act
+        sending = threading.Thread(target=sender.send,
+                                   args=(Message('message'),))
+        sending.start()
+        putting.wait(5)
+        closing = threading.Thread(target=sender.close)
+        closing.start()
+        closing.join(0.1)
+        closed_early = not closing.is_alive()
+        resume.set()
+        sending.join(5)
+        closing.join(5)
+
+        # Assert
+        self.assertFalse(closed_early)
+        self.assertEqual([('POST', '/myqueue/messages')], http_filter.requests)
+
+    def test_sender_reports_send_failures(self):
+        # Arrange
+        self.sbs._filter = _FakeHttpFilter(failing_tokens=['myqueue'])
+        msg = Message('message')
+
+        # Act
+        with self.sbs.get_queue_sender('myqueue') as sender:
+            sender.send(msg)
+
+        # Assert
+        self.assertEqual(1, len(sender.send_failures))
+        self.assertEqual([msg], sender.send_failures[0][0])
+        self.assertIsInstance(sender.send_failures[0][1],
+                              AzureMissingResourceHttpError)
+
+    def test_sender_survives_failing_send_failure_callback(self):
+        # Arrange
+        self.sbs._filter = _FakeHttpFilter(failing_tokens=['myqueue'])
+        messages = [Message('message 1'), Message('message 2')]
+        failures = []
+
+        def on_send_failure(batch_messages, ex):
+            failures.append(batch_messages)
+            raise RuntimeError('callback failed')
+
+        # Act
+        with self.sbs.get_queue_sender(
+                'myqueue', max_batch_count=1, max_concurrent_sends=1,
+                on_send_failure=on_send_failure) as sender:
+            for msg in messages:
+                sender.send(msg)
+
+        # Assert
+        self.assertEqual([[messages[0]], [messages[1]]], failures)
+        self.assertEqual([], sender.send_failures)
+
+    #--Test cases for lock renewal --------------------------------------------
+    def test_lock_renewer_renews_until_settled(self):
+        # Arrange
+        service = _FakeLockService([b'm1'], lock_seconds=2)
+        msg = service.peek_lock_queue_message('myqueue')
+        renewer = AutoLockRenewer(renew_margin=1.5)
+
+        # Act
+        renewer.register(msg, lock_duration=60)
+        deadline = time.time() + 5
+        while not service.renewed and time.time() < deadline:
+            time.sleep(0.05)
+        msg.delete()
+        renewed_count = len(service.renewed)
+        time.sleep(1.5)
+        renewer.close()
+
+        # Assert
+        self.assertEqual([('myqueue', 1)], service.renewed[:1])
+        self.assertEqual(renewed_count, len(service.renewed))
+        self.assertEqual([('myqueue', 1)], service.deleted)
+        self.assertEqual(0, len(renewer))
+        self.assertGreater(msg.locked_until_utc,
+                           datetime.utcnow() + timedelta(seconds=30))
+
+    def test_lock_renewer_reports_renew_failure(self):
+        # Arrange
+        service = _FakeLockService([b'm1'], lock_seconds=1)
+        service.failing_renewals.add(1)
+        msg = service.peek_lock_queue_message('myqueue')
+        failures = []
+        renewer = AutoLockRenewer(
+            renew_margin=1,
+            on_renew_failure=lambda m, ex: failures.append((m, ex)))
+
+        # Act
+        renewer.register(msg)
+        deadline = time.time() + 5
+        while not failures and time.time() < deadline:
+            time.sleep(0.05)
+        renewer.close()
+
+        # Assert
+        self.assertEqual(1, len(failures))
+        self.assertIs(msg, failures[0][0])
+        self.assertIsInstance(failures[0][1], AzureMissingResourceHttpError)
+        self.assertEqual(0, len(renewer))
+
+    def test_lock_renewer_survives_failing_renew_failure_callback(self):
+        # Arrange
+        service = _FakeLockService([b'm1', b'm2'], lock_seconds=1)
+        service.failing_renewals.update([1, 2])
+        messages = [service.peek_lock_queue_message('myqueue')
+                    for _ in range(2)]
+        failures = []
+
+        def on_renew_failure(msg, ex):
+            failures.append(msg)
+            raise RuntimeError('callback failed')
+
+        renewer = AutoLockRenewer(renew_margin=1, max_workers=1,
+                                  on_renew_failure=on_renew_failure)
+
+        # Act
+        for msg in messages:
+            renewer.register(msg)
+        deadline = time.time() + 5
+        while len(failures) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        renewer.close()
+
+        # Assert
+        self.assertEqual(sorted(messages, key=id), sorted(failures, key=id))
+        self.assertEqual(0, len(renewer))
+
+    def test_lock_renewer_requires_peek_locked_message(self):
+        # Arrange
+        renewer = AutoLockRenewer()
+
+        # Act
+        with self.assertRaises(AzureServiceBusPeekLockError):
+            renewer.register(Message(b'not locked'))
+        renewer.close()
+        with self.assertRaises(ValueError):
+            renewer.register(_FakeLockService([b'm1']).peek_lock_queue_message('q'))
+
+        # Assert
+
+    def test_receiver_registers_messages_with_lock_renewer(self):
+        # Arrange
+        service = _FakeLockService([b'm1'])
+        renewer = AutoLockRenewer()
+
+        # Act
+        with MessageReceiver(service, queue_name='myqueue',
+                             lock_renewer=renewer) as receiver:
+            msg = receiver.receive(timeout=5)
+
+        # Assert
+        self.assertEqual(1, len(renewer))
+        renewer.unregister(msg)
+        self.assertEqual(0, len(renewer))
+        renewer.close()
+
+    #--Test cases for message receiver ----------------------------------------
+    def test_receiver_requires_single_entity(self):
+        # Arrange
+        service = _FakeLockService()
+
+        # Act
+        with self.assertRaises(ValueError):
+            MessageReceiver(service)
+        with self.assertRaises(ValueError):
+            MessageReceiver(service, queue_name='q', topic_name='t',
+                            subscription_name='s')
+        with self.assertRaises(ValueError):
+            MessageReceiver(service, topic_name='t')
+
+        # Assert
+
+    def test_queue_receiver_prefetches_messages(self):
+        # Arrange
+        service = _FakeLockService([b'm1', b'm2', b'm3', b'm4', b'm5'])
+
+        # Act
+        receiver = MessageReceiver(service, queue_name='myqueue',
+                                   prefetch_count=3,
+                                   max_concurrent_receives=2)
+        with receiver:
+            received = [receiver.receive(timeout=5) for _ in range(5)]
+
+        # Assert
+        self.assertTrue(receiver.closed)
+        self.assertEqual(
+            [b'm1', b'm2', b'm3', b'm4', b'm5'],
+            sorted(msg.body for msg in received))
+        self.assertEqual('myqueue', received[0]._queue_name)
+        self.assertIsNone(receiver.receive(timeout=0))
+
+    def test_subscription_receiver_iterates_until_closed(self):
+        # Arrange
+        service = _FakeLockService([b'm1', b'm2'])
+        receiver = MessageReceiver(service, topic_name='mytopic',
+                                   subscription_name='mysub')
+
+        # Act
+        received = []
+        for msg in receiver:
+            received.append(msg)
+            if len(received) == 2:
+                receiver.close()
+
+        # Assert
+        self.assertEqual([b'm1', b'm2'], sorted(msg.body for msg in received))
+        self.assertEqual('mysub', received[0]._subscription_name)
+
+    def test_receiver_drops_messages_with_expired_lock(self):
+        # Arrange
+        service = _FakeLockService([b'm1', b'm2'], lock_seconds=2)
+
+        # Act
+        receiver = MessageReceiver(service, queue_name='myqueue',
+                                   lock_margin=10)
+        msg = receiver.receive(timeout=0.5)
+        receiver.close()
+
+        # Assert
+        self.assertIsNone(msg)
+
+    def test_receiver_close_unlocks_buffered_messages(self):
+        # Arrange
+        service = _FakeLockService([b'm1', b'm2', b'm3'])
+        receiver = MessageReceiver(service, queue_name='myqueue',
+                                   prefetch_count=3)
+        while receiver._buffer.qsize() < 3:
+            time.sleep(0.01)
+
+        # Act
+        receiver.close()
+
+        # Assert
+        self.assertEqual(
+            [('myqueue', 1), ('myqueue', 2), ('myqueue', 3)],
+            sorted(service.unlocked))
+
+    #--Test cases for token caching ------------------------------------------
+    def test_sas_authentication_reuses_signature(self):
+        # Arrange
+        auth = ServiceBusSASAuthentication('mykeyname', 'bXlrZXl2YWx1ZQ==')
+        httpclient = _FakeAuthHttpClient()
+
+        # Act
+        first = auth._get_authorization(_auth_request('/myqueue/messages'), httpclient)
+        second = auth._get_authorization(_auth_request('/myqueue/messages'), httpclient)
+        other = auth._get_authorization(_auth_request('/otherqueue/messages'), httpclient)
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertTrue(first.startswith('SharedAccessSignature sig='))
+
+    def test_sas_authentication_refreshes_signature_near_expiry(self):
+        # Arrange
+        auth = ServiceBusSASAuthentication('mykeyname', 'bXlrZXl2YWx1ZQ==',
+                                           token_ttl=10, refresh_margin=5)
+        httpclient = _FakeAuthHttpClient()
+        cache_key = ('mykeyname', 'bXlrZXl2YWx1ZQ==',
+                     'https://mynamespace.servicebus.windows.net/myqueue/messages')
+        first = auth._get_authorization(_auth_request('/myqueue/messages'), httpclient)
+
+        # Act
+        # the cached signature now expires within the refresh margin
+        auth._tokens.set(cache_key, first, time.time() + 1)
+        auth.token_ttl = 20
+        second = auth._get_authorization(_auth_request('/myqueue/messages'), httpclient)
+        third = auth._get_authorization(_auth_request('/myqueue/messages'), httpclient)
+
+        # Assert
+        self.assertNotEqual(first, second)
+        self.assertGreater(int(second.split('&se=')[1].split('&')[0]),
+                           int(first.split('&se=')[1].split('&')[0]))
+        self.assertEqual(second, third)
+        self.assertEqual(second, auth._tokens.get(cache_key, time.time()))
+
+    def test_sas_authentication_rejects_refresh_margin(self):
+        # Act/Assert
+        for token_ttl, refresh_margin in ((10, 10), (10, 11), (10, -1)):
+            with self.assertRaises(ValueError):
+                ServiceBusSASAuthentication('mykeyname', 'bXlrZXl2YWx1ZQ==',
+                                            token_ttl=token_ttl,
+                                            refresh_margin=refresh_margin)
+
+    def test_sas_authentication_bounds_cached_signatures(self):
+        # Arrange
+        auth = ServiceBusSASAuthentication('mykeyname', 'bXlrZXl2YWx1ZQ==',
+                                           max_cached_tokens=2)
+        httpclient = _FakeAuthHttpClient()
+
+        # Act
+        for name in ('q1', 'q2', 'q3', 'q1'):
+            auth._get_authorization(_auth_request('/' + name), httpclient)
+
+        # Assert
+        self.assertEqual(2, len(auth._tokens))
+
+    def test_wrap_authentication_caches_token_until_expiry(self):
+        # Arrange
+        _tokens.clear()
+        auth = ServiceBusWrapTokenAuthentication('myaccountkey', 'owner')
+        httpclient = _FakeAuthHttpClient()
+
+        # Act
+        first = auth._get_token('mynamespace.servicebus.windows.net', '/myqueue', httpclient)
+        second = auth._get_token('mynamespace.servicebus.windows.net', '/myqueue', httpclient)
+        httpclient.expires_in = 10
+        auth._get_token('mynamespace.servicebus.windows.net', '/otherqueue', httpclient)
+        auth._get_token('mynamespace.servicebus.windows.net', '/otherqueue', httpclient)
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(3, len(httpclient.token_requests))
+        self.assertEqual('mynamespace-sb.accesscontrol.windows.net',
+                         httpclient.token_requests[0].host)
+        self.assertFalse(auth._token_is_expired(first))
+
+    #--Test cases for streamed responses -------------------------------------
+    def test_list_queues_parses_streamed_feed(self):
+        # Arrange
+        entry = ('<entry xmlns="http://www.w3.org/2005/Atom">'
+                 '<title type="text">myqueue</title>'
+                 '<content type="application/xml"><QueueDescription '
+                 'xmlns="http://schemas.microsoft.com/netservices/2010/10/servicebus/connect">'
+                 '<MessageCount>3</MessageCount></QueueDescription></content></entry>')
+        feed = '<feed xmlns="http://www.w3.org/2005/Atom">' + \
+               entry.replace(' xmlns="http://www.w3.org/2005/Atom"', '') + '</feed>'
+        session = _FakeStreamingSession(feed.encode('utf-8'))
+        sbs = ServiceBusService(
+            'mynamespace',
+            shared_access_key_name='RootManageSharedAccessKey',
+            shared_access_key_value='bXlrZXl2YWx1ZQ==',
+            request_session=session)
+
+        # Act
+        queues = sbs.list_queues()
+        session.body = entry.encode('utf-8')
+        queue = sbs.get_queue('myqueue')
+
+        # Assert
+        self.assertEqual([True, False], session.streamed)
+        self.assertEqual(1, len(queues))
+        self.assertEqual(3, queues[0].message_count)
+        self.assertEqual(3, queue.message_count)
+
+    #--Test cases for paged listings -----------------------------------------
+    def test_list_queues_with_skip_and_top(self):
+        # Arrange
+        http_filter = _FakePagedFilter(5)
+        self.sbs._filter = http_filter
+
+        # Act
+        queues = self.sbs.list_queues(skip=1, top=2)
+
+        # Assert
+        self.assertEqual([('1', '2')], http_filter.queries)
+        self.assertEqual(['queue1', 'queue2'], [queue.name for queue in queues])
+
+    def test_iter_queues_lists_pages_lazily(self):
+        # Arrange
+        http_filter = _FakePagedFilter(5)
+        self.sbs._filter = http_filter
+
+        # Act
+        queues = self.sbs.iter_queues(page_size=2)
+        self.assertEqual([], http_filter.queries)
+        first = next(queues)
+        queries_after_first = list(http_filter.queries)
+        rest = list(queues)
+
+        # Assert
+        self.assertEqual([('0', '2')], queries_after_first)
+        self.assertEqual([('0', '2'), ('2', '2'), ('4', '2')],
+                         http_filter.queries)
+        self.assertEqual(['queue0', 'queue1', 'queue2', 'queue3', 'queue4'],
+                         [queue.name for queue in [first] + rest])
+        self.assertEqual(4, rest[-1].message_count)
+
+    def test_iter_queues_with_prefetch(self):
+        # Arrange
+        http_filter = _FakePagedFilter(4)
+        self.sbs._filter = http_filter
+
+        # Act
+        queues = list(self.sbs.iter_queues(page_size=2, prefetch=True))
+
+        # Assert
+        self.assertEqual(['queue0', 'queue1', 'queue2', 'queue3'],
+                         [queue.name for queue in queues])
+        self.assertEqual([('0', '2'), ('2', '2'), ('4', '2')],
+                         sorted(http_filter.queries))
+
+    def test_iter_subscriptions_uses_topic_path(self):
+        # Arrange
+        http_filter = _FakePagedFilter(3)
+        paths = []
+
+        def record_path(request):
+            paths.append(request.path)
+            return http_filter(request)
+
+        self.sbs._filter = record_path
+
+        # Act
+        subscriptions = list(self.sbs.iter_subscriptions('mytopic', page_size=10))
+
+        # Assert
+        self.assertEqual(3, len(subscriptions))
+        self.assertEqual(['/mytopic/subscriptions/?$skip=0&$top=10'], paths)
+
+    def test_iter_queues_with_invalid_page_size(self):
+        # Act
+        with self.assertRaises(ValueError):
+            self.sbs.iter_queues(page_size=0)
+
+    #--Test cases for transport configuration --------------------------------
+    def test_transport_session_is_shared(self):
+        # Arrange
+        transport = TransportConfiguration(pool_maxsize=64, max_retries=3)
+
+        # Act
+        sbs1 = ServiceBusService(
+            'mynamespace', shared_access_key_name='RootManageSharedAccessKey',
+            shared_access_key_value='bXlrZXl2YWx1ZQ==', transport=transport)
+        sbs2 = ServiceBusService(
+            'mynamespace', shared_access_key_name='RootManageSharedAccessKey',
+            shared_access_key_value='bXlrZXl2YWx1ZQ==', transport=transport)
+
+        # Assert
+        session = sbs1._httpclient.request_session
+        self.assertIs(session, sbs2._httpclient.request_session)
+        self.assertIs(session, sbs1.with_filter(
+            lambda request, next: next(request))._httpclient.request_session)
+        adapter = session.get_adapter('https://mynamespace.servicebus.windows.net')
+        self.assertEqual(64, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.total)
+        self.assertNotIn('Accept', session.headers)
+
+    def test_transport_proxy_is_set_once(self):
+        # Arrange
+        transport = TransportConfiguration(
+            proxy_host='192.168.0.100', proxy_port=6000,
+            proxy_user='user', proxy_password='password', keep_alive=False)
+
+        # Act
+        session = transport.session
+
+        # Assert
+        self.assertEqual('http://192.168.0.100:6000', session.proxies['http'])
+        self.assertEqual('Basic dXNlcjpwYXNzd29yZA==',
+                         session.headers['Proxy-Authorization'])
+        self.assertEqual('close', session.headers['Connection'])
+        self.assertIs(session, transport.session)
+
+    def test_transport_rejects_set_proxy(self):
+        # Arrange
+        transport = TransportConfiguration()
+        sbs = ServiceBusService(
+            'mynamespace', shared_access_key_name='RootManageSharedAccessKey',
+            shared_access_key_value='bXlrZXl2YWx1ZQ==', transport=transport)
+
+        # Act
+        with self.assertRaises(ValueError):
+            sbs.set_proxy('192.168.0.100', 6000)
+        with self.assertRaises(ValueError):
+            sbs.with_filter(lambda request, next: next(request)).set_proxy(
+                '192.168.0.100', 6000)
+
+        # Assert
+        self.assertEqual({}, transport.session.proxies)
+
 #------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main()
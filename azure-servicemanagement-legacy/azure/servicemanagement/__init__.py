@@ -23,6 +23,7 @@ from .constants import (
 
 from .models import *
 
+from ._http.transport import TransportConfiguration
 from .publishsettings import get_certificate_from_publish_settings
 from .servicemanagementclient import parse_response_for_async_op
 
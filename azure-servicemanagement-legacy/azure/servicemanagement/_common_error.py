@@ -24,6 +24,10 @@ _ERROR_UNKNOWN = 'Unknown error ({0})'
 _ERROR_VALUE_NONE = '{0} should not be None.'
 _ERROR_ASYNC_OP_FAILURE = 'Asynchronous operation did not succeed.'
 _ERROR_ASYNC_OP_TIMEOUT = 'Timed out waiting for async operation to complete.'
+_ERROR_TRANSPORT_CERT = \
+    'cert_file differs from the cert of the transport.'
+_ERROR_TRANSPORT_PROXY = \
+    'The proxy of a service using a transport is set on its TransportConfiguration.'
 
 
 def _general_error_handler(http_error):
@@ -43,7 +43,8 @@ class _HTTPClient(object):
     '''
 
     def __init__(self, service_instance, cert_file=None, protocol='https',
-                 request_session=None, timeout=65, user_agent=''):
+                 request_session=None, timeout=65, user_agent='',
+                 request_cert=None):
         '''
         service_instance:
             service client instance.
@@ -57,6 +58,9 @@ class _HTTPClient(object):
             timeout for the http request, in seconds.
         user_agent:
             user agent string to set in http header.
+        request_cert:
+            certificate file path sent with each request of the session,
+            rather than set on the session.
         '''
         self.service_instance = service_instance
         self.cert_file = cert_file
@@ -68,6 +72,7 @@ class _HTTPClient(object):
         self.request_session = request_session
         self.timeout = timeout
         self.user_agent = user_agent
+        self.request_cert = request_cert
 
     def set_proxy(self, host, port, user, password):
         '''
@@ -86,6 +91,10 @@ class _HTTPClient(object):
         self.proxy_port = port
         self.proxy_user = user
         self.proxy_password = password
+        if self.request_session is not None:
+            from .requestsclient import _set_session_proxy
+            # Applied once to the session, rather than to every connection.
+            _set_session_proxy(self.request_session, host, port, user, password)
 
     def get_uri(self, request):
         ''' Return the target uri for the request.'''
@@ -104,17 +113,17 @@ class _HTTPClient(object):
         target_port = HTTP_PORT if protocol == 'http' else HTTPS_PORT
 
         if self.request_session:
+            # The proxy is set on the session by set_proxy.
             from .requestsclient import _RequestsConnection
-            connection = _RequestsConnection(
-                target_host, protocol, self.request_session, self.timeout)
-            proxy_host = self.proxy_host
-            proxy_port = self.proxy_port
-        else:
-            from .winhttp import _HTTPConnection
-            connection = _HTTPConnection(
-                target_host, self.cert_file, protocol, self.timeout)
-            proxy_host = self.proxy_host
-            proxy_port = self.proxy_port
+            return _RequestsConnection(
+                target_host, protocol, self.request_session, self.timeout,
+                self.request_cert)
+
+        from .winhttp import _HTTPConnection
+        connection = _HTTPConnection(
+            target_host, self.cert_file, protocol, self.timeout)
+        proxy_host = self.proxy_host
+        proxy_port = self.proxy_port
 
         if self.proxy_host:
             headers = None
@@ -173,6 +182,8 @@ class _HTTPClient(object):
         connection = self.get_connection(request)
         try:
             connection.putrequest(request.method, request.path)
+            # Only the requests based connections can stream the body.
+            connection.stream = request.stream
 
             if not self.request_session:
                 if self.proxy_host and self.proxy_user:
@@ -199,12 +210,15 @@ class _HTTPClient(object):
                 respheaders[i] = (value[0].lower(), value[1])
 
             respbody = None
-            if resp.length is None:
+            if request.stream and status < 300 and \
+                    hasattr(resp, 'get_body_stream'):
+                respbody = resp.get_body_stream()
+            elif resp.length is None:
                 respbody = resp.read()
             elif resp.length > 0:
                 respbody = resp.read(resp.length)
 
-            if DEBUG_RESPONSES and respbody:
+            if DEBUG_RESPONSES and respbody and not hasattr(respbody, 'read'):
                 print('response:')
                 try:
                     print(respbody)
@@ -0,0 +1,109 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#--------------------------------------------------------------------------
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .requestsclient import _set_session_proxy
+
+
+class TransportConfiguration(object):
+
+    '''
+    Connection pooling, retry and proxy settings of the requests session
+    the service clients send their requests with.
+
+    The session is created and configured once, on first use. Share one
+    TransportConfiguration between clients so that they reuse the same
+    pooled connections instead of opening their own.
+    '''
+
+    def __init__(self, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, max_retries=0, keep_alive=True,
+                 proxy_host=None, proxy_port=None, proxy_user=None,
+                 proxy_password=None,
+                 cert=None):
+        '''
+        pool_connections:
+            Optional. Number of hosts for which a connection pool is kept.
+        pool_maxsize:
+            Optional. Maximum number of connections kept open to one host.
+            Set it to the number of threads sending requests concurrently,
+            connections opened above it are closed after use.
+        pool_block:
+            Optional. If True, a request waits for a pooled connection to be
+            available instead of opening a connection above pool_maxsize.
+        max_retries:
+            Optional. Number of retries of the requests failing to connect,
+            or a urllib3 Retry object.
+        keep_alive:
+            Optional. If False, connections are closed after each request.
+        proxy_host:
+            Optional. Address of the proxy. Ex: '192.168.0.100'
+        proxy_port:
+            Optional. Port of the proxy. Ex: 6000
+        proxy_user:
+            Optional. User for proxy authorization.
+        proxy_password:
+            Optional. Password for proxy authorization.
+        cert:
+            Optional. Path to the .pem certificate file used to authenticate
+            the requests.
+        '''
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        self.proxy_host = proxy_host
+        self.proxy_port = proxy_port
+        self.proxy_user = proxy_user
+        self.proxy_password = proxy_password
+        self.cert = cert
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        ''' The shared requests.Session, created on first use. '''
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+
+    def create_session(self):
+        ''' Returns a new requests.Session configured with these settings. '''
+        session = requests.Session()
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=self.max_retries,
+                pool_block=self.pool_block))
+
+        # See _RequestsConnection, the Accept header added by requests causes
+        # issues with some Azure REST APIs.
+        session.headers.pop('Accept', None)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        if self.proxy_host:
+            _set_session_proxy(session, self.proxy_host, self.proxy_port,
+                               self.proxy_user, self.proxy_password)
+        if self.cert:
+            session.cert = self.cert
+
+        return session
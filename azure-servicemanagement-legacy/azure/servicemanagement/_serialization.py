@@ -63,6 +63,14 @@ class JSONEncoder(json.JSONEncoder):
             return super(JSONEncoder, self).default(obj)
 
 
+def _parse_minidom_response_body(body):
+    ''' Parses the XML body of a response. A streamed body is parsed as it is
+    read, without buffering it first. '''
+    if hasattr(body, 'read'):
+        return minidom.parse(body)
+    return minidom.parseString(body)
+
+
 class _MinidomXmlToObject(object):
 
     @staticmethod
@@ -71,7 +79,7 @@ class _MinidomXmlToObject(object):
         Parse the HTTPResponse's body and fill all the data into a class of
         return_type.
         '''
-        doc = minidom.parseString(response.body)
+        doc = _parse_minidom_response_body(response.body)
         return_obj = return_type()
         xml_name = return_type._xml_name if hasattr(return_type, '_xml_name') else return_type.__name__ 
         for node in _MinidomXmlToObject.get_child_nodes(doc, xml_name):
@@ -86,7 +94,7 @@ class _MinidomXmlToObject(object):
         Parse the HTTPResponse's body and fill all the data into a class of
         return_type.
         '''
-        doc = minidom.parseString(response.body)
+        doc = _parse_minidom_response_body(response.body)
         return_obj = _list_of(return_type)
         for node in _MinidomXmlToObject.get_children_from_path(doc, "ServiceResources", "ServiceResource"):
             local_obj = return_type()
@@ -173,7 +181,7 @@ class _MinidomXmlToObject(object):
 
         _set_continuation_from_response_headers(feeds, response)
 
-        xmldoc = minidom.parseString(response.body)
+        xmldoc = _parse_minidom_response_body(response.body)
         xml_entries = _MinidomXmlToObject.get_children_from_path(xmldoc, 'feed', 'entry')
         if not xml_entries:
             # in some cases, response contains only entry but no feed
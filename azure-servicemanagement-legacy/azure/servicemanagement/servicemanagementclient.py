@@ -37,6 +37,8 @@ from ._common_conversion import (
 from ._common_error import (
     _ERROR_ASYNC_OP_FAILURE,
     _ERROR_ASYNC_OP_TIMEOUT,
+    _ERROR_TRANSPORT_CERT,
+    _ERROR_TRANSPORT_PROXY,
     _general_error_handler,
     _validate_not_none,
 )
@@ -57,7 +59,17 @@ class _ServiceManagementClient(object):
 
     def __init__(self, subscription_id=None, cert_file=None,
                  host=MANAGEMENT_HOST, request_session=None,
-                 timeout=DEFAULT_HTTP_TIMEOUT):
+                 timeout=DEFAULT_HTTP_TIMEOUT, transport=None):
+        self._transport = None
+        if not request_session and transport is not None:
+            if cert_file and transport.cert and cert_file != transport.cert:
+                raise ValueError(_ERROR_TRANSPORT_CERT)
+            # The session is shared with the other services of the transport,
+            # a cert_file of this service is passed with each request instead.
+            self._transport = transport
+            request_session = transport.session
+            cert_file = cert_file or transport.cert
+
         self.requestid = None
         self.subscription_id = subscription_id
         self.cert_file = cert_file
@@ -66,7 +78,7 @@ class _ServiceManagementClient(object):
         self.x_ms_version = X_MS_VERSION
         self.content_type = 'application/atom+xml;type=entry;charset=utf-8'
 
-        if not self.cert_file and not request_session:
+        if not self.cert_file and (self._transport or not request_session):
             if AZURE_MANAGEMENT_CERTFILE in os.environ:
                 self.cert_file = os.environ[AZURE_MANAGEMENT_CERTFILE]
 
@@ -88,7 +100,8 @@ class _ServiceManagementClient(object):
         self._httpclient = _HTTPClient(
             service_instance=self, cert_file=self.cert_file,
             request_session=self.request_session, timeout=timeout,
-            user_agent=_USER_AGENT_STRING)
+            user_agent=_USER_AGENT_STRING,
+            request_cert=self.cert_file if self._transport else None)
         self._filter = self._httpclient.perform_request
 
     @staticmethod
@@ -122,8 +135,12 @@ class _ServiceManagementClient(object):
         and another lambda.  The filter can perform any pre-processing on the
         request, pass it off to the next lambda, and then perform any
         post-processing on the response.'''
-        res = type(self)(self.subscription_id, self.cert_file, self.host,
-                         self.request_session, self._httpclient.timeout)
+        if self._transport is not None:
+            res = type(self)(self.subscription_id, self.cert_file, self.host,
+                             None, self._httpclient.timeout, self._transport)
+        else:
+            res = type(self)(self.subscription_id, self.cert_file, self.host,
+                             self.request_session, self._httpclient.timeout)
         old_filter = self._filter
 
         def new_filter(request):
@@ -144,7 +161,13 @@ class _ServiceManagementClient(object):
             User for proxy authorization.
         password:
             Password for proxy authorization.
+
+        The session of a service using a transport is shared with the other
+        services of the transport, its proxy is set with the proxy settings
+        of the TransportConfiguration instead.
         '''
+        if self._transport is not None:
+            raise ValueError(_ERROR_TRANSPORT_PROXY)
         self._httpclient.set_proxy(host, port, user, password)
 
     @property
@@ -155,7 +178,7 @@ class _ServiceManagementClient(object):
     def timeout(self, value):
         self._httpclient.timeout = value
 
-    def perform_get(self, path, x_ms_version=None):
+    def perform_get(self, path, x_ms_version=None, stream=False):
         '''
         Performs a GET request and returns the response.
 
@@ -165,11 +188,15 @@ class _ServiceManagementClient(object):
         x_ms_version:
             If specified, this is used for the x-ms-version header.
             Otherwise, self.x_ms_version is used.
+        stream:
+            If True, the body of a successful response is a file-like object
+            read from the connection as it is consumed, instead of bytes.
         '''
         request = HTTPRequest()
         request.method = 'GET'
         request.host = self.host
         request.path = path
+        request.stream = stream
         request.path, request.query = self._httpclient._update_request_uri_query(request)
         request.headers = self._update_management_header(request, x_ms_version)
         response = self._perform_request(request)
@@ -362,7 +389,9 @@ class _ServiceManagementClient(object):
         return request.headers
 
     def _perform_get(self, path, response_type=None, x_ms_version=None):
-        response = self.perform_get(path, x_ms_version)
+        # The body is parsed as it is read when it is converted here.
+        response = self.perform_get(path, x_ms_version,
+                                    stream=response_type is not None)
 
         if response_type is not None:
             return _MinidomXmlToObject.parse_response(response, response_type)
@@ -69,7 +69,7 @@ class ServiceManagementService(_ServiceManagementClient):
 
     def __init__(self, subscription_id=None, cert_file=None,
                  host=MANAGEMENT_HOST, request_session=None,
-                 timeout=DEFAULT_HTTP_TIMEOUT):
+                 timeout=DEFAULT_HTTP_TIMEOUT, transport=None):
         '''
         Initializes the management service.
 
@@ -94,9 +94,17 @@ class ServiceManagementService(_ServiceManagementClient):
             attribute.
         timeout:
             Optional. Timeout for the http request, in seconds.
+        transport:
+            Optional. TransportConfiguration whose session is used for http
+            requests, when request_session is not specified. Share it between
+            services to share their connection pools.
+            cert_file is sent with each request, and must match the cert
+            of the transport when both are set. The proxy of the service is
+            set on the transport rather than with set_proxy.
         '''
         super(ServiceManagementService, self).__init__(
-            subscription_id, cert_file, host, request_session, timeout)
+            subscription_id, cert_file, host, request_session, timeout,
+            transport)
 
     #--Operations for subscriptions --------------------------------------
     def list_role_sizes(self):
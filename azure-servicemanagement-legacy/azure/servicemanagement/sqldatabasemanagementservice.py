@@ -43,7 +43,7 @@ class SqlDatabaseManagementService(_ServiceManagementClient):
 
     def __init__(self, subscription_id=None, cert_file=None,
                  host=MANAGEMENT_HOST, request_session=None,
-                 timeout=DEFAULT_HTTP_TIMEOUT):
+                 timeout=DEFAULT_HTTP_TIMEOUT, transport=None):
         '''
         Initializes the sql database management service.
 
@@ -68,9 +68,17 @@ class SqlDatabaseManagementService(_ServiceManagementClient):
             attribute.
         timeout:
             Optional. Timeout for the http request, in seconds.
+        transport:
+            Optional. TransportConfiguration whose session is used for http
+            requests, when request_session is not specified. Share it between
+            services to share their connection pools.
+            cert_file is sent with each request, and must match the cert
+            of the transport when both are set. The proxy of the service is
+            set on the transport rather than with set_proxy.
         '''
         super(SqlDatabaseManagementService, self).__init__(
-            subscription_id, cert_file, host, request_session, timeout)
+            subscription_id, cert_file, host, request_session, timeout,
+            transport)
         self.content_type = 'application/xml'
 
     #--Operations for sql servers ----------------------------------------